@@ -3,8 +3,16 @@
 from agents import Agent, AgentOutputSchema
 from agents.extensions.models.litellm_model import LitellmModel
 from . import config
-from .task import Reflection
+from .task import ReflectionBatch
 from .agentic_layer import anamkore_tools
+from .llm_gateway import GatewayModel
+
+# --- NEW: Every agent's calls go through the shared LLM gateway ---
+# MODIFIED: Slow calls are hedged to the model's configured fallback, if any.
+def _gateway_model(model_name: str) -> GatewayModel:
+    fallback_name = config.LLM_FALLBACK_MODELS.get(model_name)
+    fallback = LitellmModel(model=fallback_name, api_key=config.API_KEY) if fallback_name else None
+    return GatewayModel(LitellmModel(model=model_name, api_key=config.API_KEY), model_name, fallback, fallback_name)
 
 # MODIFIED: Instructions are now more direct and provide a clear example.
 planner_agent = Agent(
@@ -17,7 +25,7 @@ planner_agent = Agent(
         "should be ONLY `read_file(path='foo.py')`."
     ),
     tools=anamkore_tools,
-    model=LitellmModel(model=config.GEMINI_FLASH_MODEL, api_key=config.API_KEY),
+    model=_gateway_model(config.GEMINI_FLASH_MODEL),
     tool_use_behavior="stop_on_first_tool",
 )
 
@@ -30,19 +38,22 @@ synthesizer_agent = Agent(
         "success, explain the result. If it shows an error, explain the error."
     ),
     tools=[],
-    model=LitellmModel(model=config.GEMINI_FLASH_MODEL, api_key=config.API_KEY),
+    model=_gateway_model(config.GEMINI_FLASH_MODEL),
 )
 
+# MODIFIED: The reflector now runs off the critical path in `reflection_worker`
+# and scores a batch of cycle traces per call instead of one.
 reflector_agent = Agent(
     name="AURA-Reflector",
     instructions=(
-        "You are the self-reflection module. Analyze the provided cognitive cycle trace. "
-        "Your most important task is to compare the current cycle to the previous one. If the "
-        "current cycle successfully resolves an error from the previous cycle, it is a "
-        "**high-value 'Correction' (Score 5)**. Your output MUST be a JSON object "
-        "matching the `Reflection` schema."
+        "You are the self-reflection module. You will receive a batch of cognitive cycle traces, "
+        "oldest first, each with a `cycle_id`. Reflect on every trace and return exactly one "
+        "reflection per trace, copying its `cycle_id`. Your most important task is to compare each "
+        "cycle to the one before it. If a cycle successfully resolves an error from the previous "
+        "cycle, it is a **high-value 'Correction' (Score 5)**. Your output MUST be a JSON object "
+        "matching the `ReflectionBatch` schema."
     ),
     tools=[],
-    model=LitellmModel(model=config.GEMINI_FLASH_MODEL, api_key=config.API_KEY),
-    output_type=AgentOutputSchema(Reflection, strict_json_schema=True),
-)
\ No newline at end of file
+    model=_gateway_model(config.GEMINI_FLASH_MODEL),
+    output_type=AgentOutputSchema(ReflectionBatch, strict_json_schema=True),
+)
@@ -5,13 +5,16 @@ from datetime import datetime
 from agents import Runner, RunConfig, RunResult
 from .core_logic import (
     _get_latest_journal_entry,
-    _read_file,
-    _write_file,
     _write_journal,
     _answer_user,
 )
-from .agents import planner_agent, synthesizer_agent, reflector_agent
-from .task import Reflection
+from .agents import planner_agent, synthesizer_agent
+from .reflection_worker import submit_trace
+from .directives import resolve_directive, DIRECTIVE_STATS
+from .llm_gateway import llm_lane, INTERACTIVE, BACKGROUND
+from .streaming import stream_planner_tool_call, stream_synthesis
+from .mailbox import get_mailbox
+from . import config
 
 def _create_summarized_planner_output(output: str, max_len: int = 1500) -> str:
     """Creates a summarized version of the planner output to prevent context pollution."""
@@ -19,41 +22,7 @@ def _create_summarized_planner_output(output: str, max_len: int = 1500) -> str:
         return f"Tool execution was successful. Output was too large to be included in context. (First {max_len} chars):\n{output[:max_len]}..."
     return output
 
-async def perform_cognitive_step(user_command: str | None = None):
-    run_config = RunConfig(tracing_disabled=True)
-    latest_journal_summary = _get_latest_journal_entry(summary_only=True)
-    
-    # --- FINAL, ROBUST ORCHESTRATOR LOGIC ---
-    directive = ""
-    
-    # Priority 1: Handle direct user commands
-    if user_command:
-        directive = f"The user has given a direct command: '{user_command}'"
-    
-    # Priority 2: Handle critical failures
-    elif "Error:" in latest_journal_summary:
-        directive = "The last cycle failed. Your priority is to diagnose and take the first step to FIX that failure."
-        
-    # Priority 3: Continue working on the current task
-    else:
-        current_task_content = _read_file("5-Current_Task.md")
-        if not current_task_content.startswith("Error:") and current_task_content.strip():
-            directive = f"Your current task is: '{current_task_content.strip()}'. Take the next logical step to continue its implementation."
-            
-        # --- THE MISSING LINK ---
-        # Priority 4: If the last action was reading the task queue, process it.
-        # We check for keys that are unique to the task queue JSON output.
-        elif '"id"' in latest_journal_summary and '"status"' in latest_journal_summary:
-             directive = (
-                "Your last action was reading the task queue, and its content is in your context. "
-                "Your new directive is to take the first 'todo' task from that list and write its full description "
-                "to the `5-Current_Task.md` file using the `write_file` tool. Ensure you overwrite the file."
-            )
-
-        # Priority 5: Default action is to read the task queue.
-        else:
-            directive = "You have no active task. Your directive is to call the `read_task_queue` tool."
-
+async def _plan_and_synthesize(directive: str, latest_journal_summary: str, run_config: RunConfig) -> tuple[str, str]:
     # --- PLANNER ---
     planning_prompt = (
         f"--- Context ---\nMy Last Action (Summary & Planner Output):\n{latest_journal_summary}\n\n"
@@ -63,8 +32,12 @@ async def perform_cognitive_step(user_command: str | None = None):
     print(">>> Planning Pass...")
     print(f"--- PROMPT FOR PLANNER ---\n{planning_prompt}\n--------------------------")
     
-    planner_result: RunResult = await Runner.run(planner_agent, planning_prompt, run_config=run_config)
-    planner_output = str(planner_result.final_output)
+    if config.STREAM_MODEL_OUTPUT:
+        # --- NEW: The tool starts as soon as its call has streamed in ---
+        planner_output = await stream_planner_tool_call(planner_agent, planning_prompt, run_config)
+    else:
+        planner_result: RunResult = await Runner.run(planner_agent, planning_prompt, run_config=run_config)
+        planner_output = str(planner_result.final_output)
 
     # --- SYNTHESIZER ---
     synthesis_prompt = (
@@ -75,18 +48,57 @@ async def perform_cognitive_step(user_command: str | None = None):
     print("\n" + "="*50)
     print(">>> Synthesis Pass...")
     
-    synthesis_result: RunResult = await Runner.run(synthesizer_agent, synthesis_prompt, run_config=run_config)
-    synthesizer_output = str(synthesis_result.final_output)
-    _answer_user(synthesizer_output)
+    if config.STREAM_MODEL_OUTPUT:
+        # --- NEW: The answer is printed as it is generated ---
+        synthesizer_output = await stream_synthesis(synthesizer_agent, synthesis_prompt, run_config)
+    else:
+        synthesis_result: RunResult = await Runner.run(synthesizer_agent, synthesis_prompt, run_config=run_config)
+        synthesizer_output = str(synthesis_result.final_output)
+        _answer_user(synthesizer_output)
     print(f"<<< Cycle Complete.")
+    return planner_output, synthesizer_output
+
+async def perform_cognitive_step(user_command: str | None = None):
+    run_config = RunConfig(tracing_disabled=True)
+    latest_journal_summary = _get_latest_journal_entry(summary_only=True)
+    
+    # --- FINAL, ROBUST ORCHESTRATOR LOGIC ---
+    # MODIFIED: The priority rules now live in `directives.py`.
+    resolved = resolve_directive(user_command, latest_journal_summary)
+    directive = resolved.text
+
+    if resolved.fast_path is not None:
+        # --- NEW: Deterministic transitions run directly, with no LLM calls ---
+        print("\n" + "="*50)
+        print(f">>> Fast Path: {resolved.rule}")
+        planner_output, synthesizer_output = resolved.fast_path()
+        DIRECTIVE_STATS["fast_path"] += 1
+        _answer_user(synthesizer_output)
+        print(f"<<< Cycle Complete.")
+    else:
+        DIRECTIVE_STATS["llm"] += 1
+        # --- NEW: A cycle the user asked for goes ahead of background model calls ---
+        with llm_lane(INTERACTIVE if user_command else BACKGROUND):
+            planner_output, synthesizer_output = await _plan_and_synthesize(directive, latest_journal_summary, run_config)
 
     # --- JOURNALING with CONTEXT SANITIZATION ---
     summarized_planner_output = _create_summarized_planner_output(planner_output)
+    cycle_id = datetime.now().isoformat()
     trace_data = {
         "directive": directive,
+        "route": "fast_path" if resolved.fast_path else "llm",
         "planner_output": summarized_planner_output,
         "synthesizer_output": synthesizer_output,
     }
-    journal_entry = f"# Cognitive Cycle: {datetime.now().isoformat()}\n\n**Directive:** {directive}\n\n**Synthesizer Output:**\n{synthesizer_output}\n\n## Trace\n```json\n{json.dumps(trace_data, indent=2)}\n```\n"
+    journal_entry = f"# Cognitive Cycle: {cycle_id}\n\n**Directive:** {directive}\n\n**Synthesizer Output:**\n{synthesizer_output}\n\n## Trace\n```json\n{json.dumps(trace_data, indent=2)}\n```\n"
     _write_journal(journal_entry)
-    print("Journaling complete.")
\ No newline at end of file
+    print("Journaling complete.")
+    # --- NEW: Messages count as read only once the cycle that handled them is journaled ---
+    if resolved.mailbox_ids:
+        get_mailbox().mark_consumed(resolved.mailbox_ids)
+
+    # --- NEW: Reflection happens off the critical path, in `reflection_worker` ---
+    # Fast-path cycles are routine by construction; reflecting on them would
+    # only spend the model calls the fast path just saved.
+    if resolved.fast_path is None:
+        submit_trace({"cycle_id": cycle_id, **trace_data})
@@ -18,6 +18,70 @@ CODE_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 # Model names
 GEMINI_PRO_MODEL = "gemini/gemini-2.5-pro"
 GEMINI_FLASH_MODEL = "gemini/gemini-2.5-flash-lite-preview-06-17"
+GEMINI_FLASH_FALLBACK_MODEL = "gemini/gemini-2.5-flash"
 
-if not API_KEY:
-    raise ValueError("GOOGLE_API_KEY not found in .env file. Please add it.")
\ No newline at end of file
+# --- NEW: LLM gateway limits (see `llm_gateway.py`) ---
+# Calls in flight at once, across all agents, and how many of those slots
+# only interactive (user-initiated) calls may use.
+LLM_MAX_IN_FLIGHT = int(os.getenv("ANAMKORE_LLM_MAX_IN_FLIGHT", "4"))
+LLM_INTERACTIVE_RESERVED = 1
+# Per-model (requests per minute, tokens per minute). These are the Gemini
+# API free-tier limits; raise them for a paid key.
+LLM_MODEL_LIMITS = {
+    GEMINI_FLASH_MODEL: (15, 250_000),
+    GEMINI_PRO_MODEL: (5, 250_000),
+    GEMINI_FLASH_FALLBACK_MODEL: (10, 250_000),
+}
+LLM_DEFAULT_LIMITS = (15, 250_000)
+LLM_OUTPUT_TOKEN_ESTIMATE = 512     # Reserved per call until the real usage is known.
+LLM_MAX_RETRIES = 4
+LLM_RETRY_BASE_S = 1.0
+LLM_RETRY_MAX_S = 30.0
+LLM_RETRY_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+LLM_CALL_TIMEOUT_S = 120.0
+
+# --- NEW: Hedged requests for tail latency ---
+# Once a call has run longer than its model's p95, a second request is sent,
+# to the fallback model below if there is one (else the same model), and the
+# first valid response wins.
+LLM_FALLBACK_MODELS = {GEMINI_FLASH_MODEL: GEMINI_FLASH_FALLBACK_MODEL}
+LLM_HEDGING = True
+LLM_HEDGE_PERCENTILE = 0.95
+LLM_HEDGE_MIN_SAMPLES = 20     # Calls observed before p95 is trusted.
+LLM_HEDGE_MIN_DELAY_S = 0.5
+LLM_LATENCY_WINDOW = 200       # Recent calls per model kept in the histogram.
+
+# --- NEW: Streamed model output (see streaming.py) ---
+# The synthesis is printed as it is generated, and the planner's tool starts
+# as soon as its call has streamed in. Streamed calls are not hedged;
+# instead a stream with no first event within LLM_STREAM_FIRST_EVENT_TIMEOUT_S
+# is retried, and one that stalls between events for LLM_STREAM_IDLE_TIMEOUT_S fails.
+STREAM_MODEL_OUTPUT = True
+LLM_STREAM_FIRST_EVENT_TIMEOUT_S = 30.0
+LLM_STREAM_IDLE_TIMEOUT_S = 60.0
+
+# --- NEW: Fleet mode (see `fleet.py` and `task_claims.py`) ---
+# Set in each worker process started by the fleet supervisor; None when a
+# single process owns the vault.
+FLEET_WORKER_ID = os.getenv("ANAMKORE_WORKER_ID") or None
+FLEET_DIR = ".fleet"            # Claims database, queue lock and worker logs, inside the vault.
+FLEET_LEASE_S = 300.0           # A claim not renewed for this long can be taken by another worker.
+FLEET_RENEW_INTERVAL_S = 60.0   # How often a worker renews its lease while a cycle runs (well under the lease).
+FLEET_IDLE_SLEEP_S = 5.0        # How long a worker with nothing to claim waits before looking again.
+FLEET_REPORT_INTERVAL_S = 30.0
+
+# --- NEW: Task DAG scheduler (see `scheduler.py`) ---
+SCHEDULER_MAX_CYCLES_PER_TASK = 20   # Cycles spent on one task before it is marked failed.
+
+# --- NEW: Async mailbox (see `mailbox.py`) ---
+MAILBOX_PATH = "4-Async_Mailbox.md"
+MAILBOX_STATE_PATH = ".mailbox_state.json"   # The read cursor and pending messages, inside the vault.
+MAILBOX_MAX_PER_CYCLE = 5                     # Messages handed to one cycle.
+MAILBOX_MESSAGE_MAX_CHARS = 2000              # Longer message bodies are truncated in the directive.
+MAILBOX_CONSUMED_MAX = 1000                   # Consumed ids remembered, for rescans after an edit.
+
+# MODIFIED: The key is checked when the live loop starts, not at import, so
+# offline tooling (e.g. `aura_agent.replay`) can run without one.
+def require_api_key():
+    if not API_KEY:
+        raise ValueError("GOOGLE_API_KEY not found in .env file. Please add it.")
@@ -3,10 +3,32 @@
 import os
 import re
 import json
+import stat
+import contextlib
+import contextvars
+import threading
+from collections import OrderedDict
 from datetime import datetime
-from typing import List
+from typing import Dict, List, Optional, Tuple
 from . import config
-from .task import Task, TaskModel
+from .task import Task, TaskModel, STATUS_MARKERS
+
+# --- NEW: The worker a cycle runs as ---
+# A fleet process is one worker (`config.FLEET_WORKER_ID`); the task
+# scheduler runs several in one process, each in its own asyncio task, so
+# the worker is carried in a context variable, like the gateway's lane.
+_worker_id: contextvars.ContextVar = contextvars.ContextVar("anamkore_worker_id", default=None)
+
+def current_worker_id() -> Optional[str]:
+    return _worker_id.get() or config.FLEET_WORKER_ID
+
+@contextlib.contextmanager
+def worker_context(worker_id: str):
+    token = _worker_id.set(worker_id)
+    try:
+        yield
+    finally:
+        _worker_id.reset(token)
 
 def _get_sandboxed_path(relative_path: str) -> str:
     """A simplified but crucial sandboxing function to ensure path safety."""
@@ -21,12 +43,99 @@ def _list_files(path: str) -> str:
         return json.dumps(os.listdir(full_path))
     except Exception as e: return f"Error listing files in '{path}': {str(e)}"
 
-def _read_file(path: str) -> str:
+# --- NEW: Vault Read Cache ---
+# Self-Correction Note for Anamkore:
+# Every cycle re-reads the same core files (the current task, the task queue,
+# the latest journal). Reads are now served from memory when a single stat
+# shows the file is unchanged: entries are keyed on (mtime_ns, size) and
+# evicted least-recently-used once they exceed VAULT_CACHE_MAX_BYTES. The
+# vault's own write functions drop the entry for the path they write.
+# Every invalidation also bumps the path's generation, and a read only caches
+# what it read if the generation is unchanged since it started: otherwise an
+# invalidation arriving between the read and the insert would be lost, and
+# with the watcher on (no stat on hits) the stale entry would never go.
+# Queue read-modify-writes under the fleet's queue lock read with
+# `cached=False`: another worker's same-size status flip can land within the
+# filesystem's mtime granularity, and a stale queue there would be written back.
+VAULT_CACHE_MAX_BYTES = 8 * 1024 * 1024
+
+_vault_cache: "OrderedDict[str, Tuple[int, int, str]]" = OrderedDict()
+_vault_cache_bytes = 0
+_vault_cache_lock = threading.Lock()
+VAULT_CACHE_STATS = {"hits": 0, "misses": 0}
+# Set by `vault_watcher` while it is invalidating entries on change events.
+_vault_watched = False
+# Invalidations per path, and of the whole cache.
+_vault_generations: Dict[str, int] = {}
+_vault_clears = 0
+
+def _vault_generation(full_path: str) -> Tuple[int, int]:
+    with _vault_cache_lock:
+        return (_vault_clears, _vault_generations.get(full_path, 0))
+
+def _invalidate_vault_cache(full_path: str = None):
+    """Drops one cached file, or the whole cache when no path is given."""
+    global _vault_cache_bytes, _vault_clears
+    with _vault_cache_lock:
+        if full_path is None:
+            _vault_cache.clear()
+            _vault_cache_bytes = 0
+            _vault_generations.clear()
+            _vault_clears += 1
+            return
+        _vault_generations[full_path] = _vault_generations.get(full_path, 0) + 1
+        entry = _vault_cache.pop(full_path, None)
+        if entry:
+            _vault_cache_bytes -= entry[1]
+
+def _cache_vault_file(full_path: str, mtime_ns: int, size: int, content: str, generation: Tuple[int, int]):
+    """Caches a read, unless the path was invalidated since `generation` was taken at the start of it."""
+    global _vault_cache_bytes
+    if size > VAULT_CACHE_MAX_BYTES:
+        return
+    with _vault_cache_lock:
+        if (_vault_clears, _vault_generations.get(full_path, 0)) != generation:
+            return
+        old = _vault_cache.pop(full_path, None)
+        if old:
+            _vault_cache_bytes -= old[1]
+        _vault_cache[full_path] = (mtime_ns, size, content)
+        _vault_cache_bytes += size
+        while _vault_cache_bytes > VAULT_CACHE_MAX_BYTES:
+            _, (_, evicted_size, _) = _vault_cache.popitem(last=False)
+            _vault_cache_bytes -= evicted_size
+
+def _read_file(path: str, cached: bool = True) -> str:
     full_path = _get_sandboxed_path(path)
     try:
-        if not os.path.exists(full_path): return f"Error: File not found at '{path}'."
-        if not os.path.isfile(full_path): return f"Error: Path '{path}' is a directory."
-        with open(full_path, 'r', encoding='utf-8', errors='ignore') as f: return f.read()
+        if cached and _vault_watched:
+            with _vault_cache_lock:
+                entry = _vault_cache.get(full_path)
+                if entry:
+                    _vault_cache.move_to_end(full_path)
+                    VAULT_CACHE_STATS["hits"] += 1
+                    return entry[2]
+        generation = _vault_generation(full_path)
+        try:
+            st = os.stat(full_path)
+        except FileNotFoundError:
+            _invalidate_vault_cache(full_path)
+            return f"Error: File not found at '{path}'."
+        if not stat.S_ISREG(st.st_mode): return f"Error: Path '{path}' is a directory."
+        if not cached:
+            with open(full_path, 'r', encoding='utf-8', errors='ignore') as f: return f.read()
+
+        with _vault_cache_lock:
+            entry = _vault_cache.get(full_path)
+            if entry and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+                _vault_cache.move_to_end(full_path)
+                VAULT_CACHE_STATS["hits"] += 1
+                return entry[2]
+        VAULT_CACHE_STATS["misses"] += 1
+
+        with open(full_path, 'r', encoding='utf-8', errors='ignore') as f: content = f.read()
+        _cache_vault_file(full_path, st.st_mtime_ns, st.st_size, content, generation)
+        return content
     except Exception as e: return f"Error reading file '{path}': {str(e)}"
 
 def _write_file(path: str, content: str, overwrite: bool = False) -> str:
@@ -43,6 +152,7 @@ def _write_file(path: str, content: str, overwrite: bool = False) -> str:
             return f"Error: File '{path}' already exists. Use overwrite=True."
         os.makedirs(os.path.dirname(full_path), exist_ok=True)
         with open(full_path, 'w', encoding='utf-8') as f: f.write(content)
+        _invalidate_vault_cache(full_path)
         return f"Success: Wrote {len(content)} bytes to '{path}'."
     except Exception as e: return f"Error writing to file '{path}': {str(e)}"
 
@@ -71,11 +181,34 @@ def _search_code(query: str) -> str:
         return json.dumps(matches, indent=2)
     except Exception as e: return f"Error searching code: {str(e)}"
 
+# --- NEW: Fleet workers share the journal but each follows its own entries ---
+def _journal_worker_tag() -> str:
+    worker_id = current_worker_id()
+    return f"@{worker_id}_" if worker_id else ""
+
 def _write_journal(content: str) -> str:
     safe_title = "".join(x for x in content[:30] if x.isalnum() or x in " _-").strip().replace(" ", "_")
-    filename = f"{datetime.now().strftime('%Y-%m-%d_%H%M%S')}_{safe_title}.md"
+    # Microseconds keep fast-path cycles finishing in the same second from colliding.
+    filename = f"{datetime.now().strftime('%Y-%m-%d_%H%M%S_%f')}_{_journal_worker_tag()}{safe_title}.md"
     return _write_file(os.path.join('2-Journal', filename), content)
 
+# --- NEW: Reflection index ---
+# Reflections arrive asynchronously from `reflection_worker`, after their
+# cycle's journal entry has been written. Instead of rewriting those entries,
+# each reflection is appended as one JSON line, keyed by the cycle id that also
+# heads the journal entry ("# Cognitive Cycle: <cycle_id>").
+REFLECTION_INDEX_PATH = os.path.join('2-Journal', 'reflections.jsonl')
+
+def _append_reflection_index(records: List[dict]) -> str:
+    full_path = _get_sandboxed_path(REFLECTION_INDEX_PATH)
+    try:
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, 'a', encoding='utf-8') as f:
+            f.write("".join(json.dumps(record) + "\n" for record in records))
+        _invalidate_vault_cache(full_path)
+        return f"Success: Indexed {len(records)} reflection(s)."
+    except Exception as e: return f"Error writing reflection index: {str(e)}"
+
 def _get_latest_journal_entry(summary_only: bool = False) -> str:
     """Gets the latest journal entry. Can return full entry or summary only."""
     journal_path = '2-Journal'
@@ -85,13 +218,19 @@ def _get_latest_journal_entry(summary_only: bool = False) -> str:
         files = os.listdir(full_journal_path)
         if not files: return "No journal entries found."
         journal_files = sorted([f for f in files if f.endswith('.md')], reverse=True)
+        if current_worker_id():
+            journal_files = [f for f in journal_files if f"_{_journal_worker_tag()}" in f]
+        else:
+            # Fleet workers' entries are tagged `_@worker-N_`; the single-process loop only follows its own.
+            journal_files = [f for f in journal_files if "_@" not in f]
         if not journal_files: return "No journal entries found."
         
         latest_entry_content = _read_file(os.path.join(journal_path, journal_files[0]))
         
         if summary_only:
-            reflection_match = re.search(r"## Reflection & Synthesis\n(.*?)\n## Full Trace", latest_entry_content, re.DOTALL)
-            full_trace_match = re.search(r"## Full Trace\n```json\n(.*?)\n```", latest_entry_content, re.DOTALL)
+            reflection_match = re.search(r"## Reflection & Synthesis\n(.*?)\n## (?:Full )?Trace", latest_entry_content, re.DOTALL)
+            # Cycles journal their trace under "## Trace"; older entries used "## Full Trace".
+            full_trace_match = re.search(r"## (?:Full )?Trace\n```json\n(.*?)\n```", latest_entry_content, re.DOTALL)
 
             reflection_text = reflection_match.group(1).strip() if reflection_match else "No reflection found."
             
@@ -108,50 +247,131 @@ def _get_latest_journal_entry(summary_only: bool = False) -> str:
         return latest_entry_content
     except Exception as e: return f"Error reading latest journal entry: {e}"
 
-def _read_task_queue() -> str:
-    """
-    Reads and parses the task queue file into JSON.
-    This version is more robust and less reliant on a strict regex for the description.
-    """
-    content = _read_file("3-Task_Queue.md")
-    if content.startswith("Error:"):
-        return json.dumps({"error": content, "tasks": []})
-    
+# MODIFIED: Tasks carry dependencies, a priority and four states; see `task.py`.
+_STATUS_BY_MARKER = {marker: status for status, marker in STATUS_MARKERS.items()}
+_DEPENDS_ON = re.compile(r"\s*\(depends_on:\s*([^)]*)\)")
+_PRIORITY = re.compile(r"\s*\(priority:\s*(-?\d+)\)")
+# Finished tasks stay finished when a stale update is merged (see `_update_task_queue`).
+_STATUS_RANK = {"todo": 0, "in_progress": 1, "done": 2, "failed": 2}
+
+def _parse_task_queue(content: str) -> List[Task]:
     tasks: List[Task] = []
     lines = [line.strip() for line in content.splitlines() if line.strip() and line.startswith('- [')]
 
     for line in lines:
         try:
             # Robustly find the status and task ID
-            status_match = re.search(r"\[(x| )\]", line)
+            status_match = re.search(r"\[(x| |~|!)\]", line)
             id_match = re.search(r"(T\d+):", line)
             
             if status_match and id_match:
                 status_char = status_match.group(1)
                 task_id = id_match.group(1)
                 
-                # The description is everything after the task ID and colon
-                description_start_index = id_match.end()
-                description = line[description_start_index:].strip()
+                # The description is everything after the task ID and colon,
+                # less the dependency and priority suffixes.
+                description = line[id_match.end():].strip()
+                depends_match = _DEPENDS_ON.search(description)
+                priority_match = _PRIORITY.search(description)
+                description = _PRIORITY.sub("", _DEPENDS_ON.sub("", description)).strip()
                 
                 tasks.append(Task(
                     id=task_id,
-                    status="done" if status_char == "x" else "todo",
-                    description=description
+                    status=_STATUS_BY_MARKER[status_char],
+                    description=description,
+                    depends_on=re.findall(r"T\d+", depends_match.group(1)) if depends_match else [],
+                    priority=int(priority_match.group(1)) if priority_match else 0,
                 ))
         except (AttributeError, IndexError):
             # Line doesn't match the expected format, skip it
             continue
-            
-    return json.dumps([task.__dict__ for task in tasks])
+    return tasks
+
+def _load_tasks(cached: bool = True) -> Optional[List[Task]]:
+    """The task queue as `Task`s, or None if it cannot be read."""
+    content = _read_file("3-Task_Queue.md", cached=cached)
+    return None if content.startswith("Error:") else _parse_task_queue(content)
+
+def _read_task_queue() -> str:
+    """
+    Reads and parses the task queue file into JSON.
+    This version is more robust and less reliant on a strict regex for the description.
+    """
+    content = _read_file("3-Task_Queue.md")
+    if content.startswith("Error:"):
+        return json.dumps({"error": content, "tasks": []})
+    return json.dumps([task.__dict__ for task in _parse_task_queue(content)])
+
+def _write_task_queue(tasks: List[Task]) -> str:
+    content = "# Task Queue\n\n" + "\n".join(str(t) for t in tasks)
+    return _write_file("3-Task_Queue.md", content, overwrite=True)
+
+def _task_queue_lock():
+    """Serializes queue read-modify-writes between workers; a no-op for a single worker."""
+    if not current_worker_id():
+        return contextlib.nullcontext()
+    from .task_claims import queue_lock
+    return queue_lock()
+
+def _apply_task_update(tasks: List[TaskModel], on_disk: List[Task], merge: bool) -> List[Task]:
+    """
+    Turns the tool's task list into `Task`s. Omitted dependencies and
+    priorities keep their current values. With `merge` (workers, whose view
+    of the queue may be stale), the update is applied on top of the queue as
+    it is on disk now: its order is kept, a task another worker has started
+    or finished does not go back, and no task is dropped.
+    """
+    existing = {t.id: t for t in on_disk}
+    updated = []
+    for t in tasks:
+        old = existing.get(t.id)
+        task = Task(
+            id=t.id, status=t.status, description=t.description,
+            depends_on=t.depends_on if t.depends_on is not None else (old.depends_on if old else []),
+            priority=t.priority if t.priority is not None else (old.priority if old else 0),
+        )
+        if merge and old and _STATUS_RANK[old.status] > _STATUS_RANK[task.status]:
+            task.status = old.status
+        updated.append(task)
+    if not merge:
+        return updated
+    updates = {t.id: t for t in updated}
+    return [updates.pop(t.id, t) for t in on_disk] + list(updates.values())
 
 def _update_task_queue(tasks: List[TaskModel]) -> str:
     try:
-        task_objects = [Task(id=t.id, status=t.status, description=t.description) for t in tasks]
-        content = "# Task Queue\n\n" + "\n".join(str(t) for t in task_objects)
-        return _write_file("3-Task_Queue.md", content, overwrite=True)
+        with _task_queue_lock():
+            return _write_task_queue(_apply_task_update(tasks, _load_tasks(cached=not current_worker_id()) or [], merge=bool(current_worker_id())))
     except Exception as e: return f"Error: Invalid task data provided. Details: {e}"
 
+# --- NEW: Orchestrator-driven status changes (`[~]` when started, `[!]` when given up) ---
+def _set_task_status(task_id: str, status: str) -> str:
+    try:
+        with _task_queue_lock():
+            tasks = _load_tasks(cached=not current_worker_id())
+            task = next((t for t in tasks or [] if t.id == task_id), None)
+            if task is None:
+                return f"Error: Task '{task_id}' is not in the task queue."
+            task.status = status
+            return _write_task_queue(tasks)
+    except Exception as e: return f"Error updating task '{task_id}': {e}"
+
+# --- NEW: Each worker (fleet process or scheduler slot) has its own current-task file ---
+def _current_task_path() -> str:
+    worker_id = current_worker_id()
+    return f"5-Current_Task.{worker_id}.md" if worker_id else "5-Current_Task.md"
+
+# --- NEW: Sets `5-Current_Task.md` for the directive fast path. ---
+# `_write_file` deliberately keeps the LLM out of this file; only the
+# orchestrator's deterministic "take next task" transition writes it.
+def _set_current_task(description: str) -> str:
+    full_path = _get_sandboxed_path(_current_task_path())
+    try:
+        with open(full_path, 'w', encoding='utf-8') as f: f.write(description.strip() + "\n")
+        _invalidate_vault_cache(full_path)
+        return f"Success: Current task set to '{description.strip()}'."
+    except Exception as e: return f"Error setting current task: {str(e)}"
+
 def _answer_user(answer: str) -> str:
     print(f"\n[ANAMKORE]: {answer}")
     return "Success: Answer provided to the user."
\ No newline at end of file
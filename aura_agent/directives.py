@@ -0,0 +1,147 @@
+# aura_agent/directives.py
+
+import json
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple
+from . import config
+from .core_logic import _read_file, _read_task_queue, _load_tasks, _set_current_task, _set_task_status, _current_task_path, current_worker_id
+from .mailbox import get_mailbox, format_messages
+from .task_graph import ready_tasks
+
+# ---
+# Self-Correction Note for Anamkore:
+# Some directives leave the planner nothing to decide. "Call `read_task_queue`"
+# and "move the first todo task into `5-Current_Task.md`" are pure functions
+# of vault state, yet each used to cost a planner call and a synthesizer call.
+# Deterministic directives now carry a `fast_path` that runs the transition
+# directly against `core_logic` and describes the result from a template.
+# Only open-ended directives (user commands, failures, task work) reach the
+# LLM. `DIRECTIVE_STATS` counts which route each cycle took.
+# ---
+
+# Returns (planner_output, synthesizer_output), like a planner/synthesizer pass.
+FastPath = Callable[[], Tuple[str, str]]
+
+@dataclass
+class Directive:
+    text: str
+    # The rule that resolved this directive, e.g. "read_task_queue".
+    rule: str
+    fast_path: Optional[FastPath] = None
+    # --- NEW: Mailbox messages this directive answers; consumed once its cycle is journaled ---
+    mailbox_ids: Tuple[str, ...] = ()
+
+DIRECTIVE_STATS = {"fast_path": 0, "llm": 0}
+
+def _fast_read_task_queue() -> Tuple[str, str]:
+    queue_json = _read_task_queue()
+    try:
+        tasks = json.loads(queue_json)
+    except json.JSONDecodeError:
+        tasks = None
+    if not isinstance(tasks, list):
+        return queue_json, f"Error: Could not read the task queue. {queue_json}"
+    todo = sum(1 for task in tasks if task.get("status") == "todo")
+    ready = len(ready_tasks(_load_tasks() or []))
+    return queue_json, f"Read the task queue: {len(tasks)} task(s), {todo} still to do, {ready} ready to start."
+
+def _fast_take_next_task() -> Tuple[str, str]:
+    # The queue file is the source of truth, not the (possibly truncated) JSON
+    # in the last journal entry.
+    tasks = _load_tasks()
+    if tasks is None:
+        queue_json = _read_task_queue()
+        return queue_json, f"Error: Could not read the task queue. {queue_json}"
+    # MODIFIED: Only tasks whose dependencies are done are started, by priority.
+    if config.FLEET_WORKER_ID:
+        # --- NEW: Fleet workers take the first ready task no other worker holds ---
+        # Tasks still `[~]` are candidates too: their worker may have crashed.
+        from .task_claims import get_claims
+        candidates = ready_tasks(tasks, statuses=("todo", "in_progress"))
+        claimed_id = get_claims().claim_next(config.FLEET_WORKER_ID, [task.id for task in candidates])
+        next_task = next((task for task in candidates if task.id == claimed_id), None)
+        if next_task is None and candidates:
+            message = f"All {len(candidates)} ready task(s) are claimed by other workers. Nothing to start."
+            return message, message
+    else:
+        # A task left `[~]` with no current task (e.g. after a crash) is taken up again.
+        ready = ready_tasks(tasks, statuses=("todo", "in_progress"))
+        next_task = ready[0] if ready else None
+    if next_task is None:
+        waiting = sum(1 for task in tasks if task.status in ("todo", "in_progress"))
+        message = (
+            f"No task is ready: {waiting} wait on unfinished dependencies. Nothing to start."
+            if waiting else "The task queue has no 'todo' tasks. Nothing to start."
+        )
+        return message, message
+    result = _set_task_status(next_task.id, "in_progress")
+    if result.startswith("Error"):
+        return result, result
+    result = _set_current_task(f"{next_task.id}: {next_task.description}")
+    if result.startswith("Error"):
+        return result, result
+    return result, f"Started task {next_task.id}: {next_task.description}"
+
+def resolve_directive(user_command: Optional[str], latest_journal_summary: str) -> Directive:
+    """Chooses this cycle's directive from vault state, in priority order."""
+    # Priority 1: Handle direct user commands
+    if user_command:
+        return Directive(f"The user has given a direct command: '{user_command}'", "user_command")
+
+    # Priority 2: Read new messages in the async mailbox. Only the main loop
+    # reads it; fleet and scheduler workers leave it to the user-facing process.
+    # MODIFIED: Mail comes before failures, so a wake for new mail answers it
+    # instead of re-running the failure rule against the last journal entry.
+    if not current_worker_id():
+        mailbox = get_mailbox()
+        mailbox.poll()
+        messages = mailbox.pending()[:config.MAILBOX_MAX_PER_CYCLE]
+        if messages:
+            # The messages are consumed after this one cycle, so the directive
+            # carries the queue: `update_task_queue` replaces it as a whole.
+            return Directive(
+                f"You have {len(messages)} new message(s) from the user in your async mailbox. Act on them with one tool call. "
+                "If they ask for work, call `update_task_queue` with every task in the current queue below plus new 'todo' "
+                "tasks for the request (a task left out is removed). If they ask a question, call the tool that finds the "
+                "answer, such as `read_file`, `search_code` or `read_task_queue`. Your reply to the user is the summary "
+                f"written from that tool's output.\n\n--- Current Task Queue ---\n{_read_task_queue()}\n\n{format_messages(messages)}",
+                "mailbox",
+                mailbox_ids=tuple(m.id for m in messages),
+            )
+
+    # Priority 3: Handle critical failures
+    if "Error:" in latest_journal_summary:
+        return Directive(
+            "The last cycle failed. Your priority is to diagnose and take the first step to FIX that failure.",
+            "fix_failure",
+        )
+
+    # Priority 4: Continue working on the current task
+    current_task_content = _read_file(_current_task_path())
+    if not current_task_content.startswith("Error:") and current_task_content.strip():
+        return Directive(
+            f"Your current task is: '{current_task_content.strip()}'. Take the next logical step to continue its implementation.",
+            "continue_task",
+        )
+
+    # Priority 5: If the last action was reading the task queue, process it.
+    # We check for keys that are unique to the task queue JSON output.
+    if '"id"' in latest_journal_summary and '"status"' in latest_journal_summary:
+        return Directive(
+            "Your last action was reading the task queue, and its content is in your context. "
+            "Your new directive is to take the highest-priority 'todo' (or in-progress) task whose dependencies are done and write its full description "
+            "to the `5-Current_Task.md` file.",
+            "take_next_task",
+            fast_path=_fast_take_next_task,
+        )
+
+    # Priority 6: Default action is to read the task queue.
+    return Directive(
+        "You have no active task. Your directive is to call the `read_task_queue` tool.",
+        "read_task_queue",
+        fast_path=_fast_read_task_queue,
+    )
+
+def format_directive_stats() -> str:
+    total = DIRECTIVE_STATS["fast_path"] + DIRECTIVE_STATS["llm"]
+    return f"{DIRECTIVE_STATS['fast_path']} of {total} cycle(s) took the fast path (no LLM calls)."
@@ -0,0 +1,250 @@
+# aura_agent/fleet.py
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import re
+import signal
+import sys
+import time
+from typing import Dict, List, Optional
+from . import config
+from .task import Task
+from .task_graph import ready_tasks
+
+# ---
+# Self-Correction Note for Anamkore:
+# One process per vault left every core but one idle. Fleet mode runs N
+# worker processes against the same vault:
+#   - Each worker runs background cycles with its own current-task file
+#     (`5-Current_Task.<worker>.md`) and follows its own journal entries.
+#   - Tasks are claimed with leases in `task_claims` instead of "first
+#     todo wins", and queue updates are merged under a file lock.
+#   - A claim is renewed before every cycle and, since one cycle can
+#     outlast the lease, every FLEET_RENEW_INTERVAL_S while it runs. When
+#     the queue marks its task done it is completed, and when a worker is
+#     stopped it is released. A crashed worker's lease simply expires.
+#   - The supervisor sizes the fleet to the unclaimed work (between
+#     --min-workers and --workers), restarts crashed workers, and reports
+#     throughput.
+# Each worker has its own LLM gateway, so each gets an equal share of the
+# model rate limits, which belong to the API key rather than the process.
+# Start it with:
+#   python -m aura_agent.fleet --workers 4
+# ---
+
+_TASK_ID = re.compile(r"(T\d+):")
+
+def _queue_tasks() -> List[Task]:
+    from .core_logic import _load_tasks
+    return _load_tasks() or []
+
+def _claimable_task_ids(claims, worker_id: Optional[str] = None) -> List[str]:
+    """Ready tasks (see `task_graph`) with no live claim (other than `worker_id`'s own)."""
+    held = claims.active_claims()
+    ready = ready_tasks(_queue_tasks(), statuses=("todo", "in_progress"))
+    return [t.id for t in ready if held.get(t.id, worker_id) == worker_id]
+
+def _current_task_id() -> Optional[str]:
+    from .core_logic import _read_file, _current_task_path
+    content = _read_file(_current_task_path())
+    match = None if content.startswith("Error:") else _TASK_ID.match(content.strip())
+    return match.group(1) if match else None
+
+def _sync_current_task(claims, worker_id: str) -> Optional[str]:
+    """
+    Settles this worker's claim before a cycle: completes it once the queue
+    marks the task done (or failed), otherwise renews the lease. Drops the task if the
+    claim was lost. Returns the task still being worked on, if any.
+    """
+    from .core_logic import _set_current_task
+    task_id = _current_task_id()
+    if task_id is None:
+        return None
+    status = next((t.status for t in _queue_tasks() if t.id == task_id), None)
+    if status not in ("todo", "in_progress"):
+        claims.complete(worker_id, task_id)
+        _set_current_task("")
+        print(f"[{worker_id}] Task {task_id} finished.")
+        return None
+    if not claims.renew(worker_id, task_id):
+        _set_current_task("")
+        print(f"[{worker_id}] Lost the claim on {task_id} to another worker; dropping it.")
+        return None
+    return task_id
+
+async def _renew_during_cycle(claims, worker_id: str):
+    """Keeps the claim on the current task (which the cycle may change) alive while a cycle runs."""
+    while True:
+        await asyncio.sleep(config.FLEET_RENEW_INTERVAL_S)
+        task_id = _current_task_id()
+        if task_id is not None and not claims.renew(worker_id, task_id):
+            print(f"[{worker_id}] Lost the claim on {task_id} during a cycle.")
+        claims.heartbeat(worker_id)
+
+async def run_worker(worker_id: str, fleet_size: int, stop_event=None, max_cycles: Optional[int] = None):
+    """One fleet worker: background cognitive cycles until stopped or out of cycles."""
+    from .cognitive_step import perform_cognitive_step
+    from .llm_gateway import configure_gateway, format_gateway_stats
+    from .reflection_worker import start_reflection_worker, stop_reflection_worker
+    from .task_claims import get_claims
+
+    config.FLEET_WORKER_ID = worker_id
+    # The vault watcher is not started: a worker must see other workers'
+    # writes at once, which the stat-validated read cache guarantees.
+    # Workers only make background calls, so no slot is kept for interactive ones.
+    configure_gateway(
+        max_in_flight=max(1, config.LLM_MAX_IN_FLIGHT // fleet_size),
+        interactive_reserved=0,
+        model_limits={name: (rpm / fleet_size, tpm / fleet_size) for name, (rpm, tpm) in config.LLM_MODEL_LIMITS.items()},
+    )
+    claims = get_claims()
+    claims.heartbeat(worker_id)
+    start_reflection_worker()
+    cycles = 0
+    try:
+        while not (stop_event and stop_event.is_set()) and (max_cycles is None or cycles < max_cycles):
+            task_id = _sync_current_task(claims, worker_id)
+            if task_id is None and not _claimable_task_ids(claims, worker_id):
+                claims.heartbeat(worker_id)
+                await asyncio.sleep(config.FLEET_IDLE_SLEEP_S)
+                continue
+            renewer = asyncio.create_task(_renew_during_cycle(claims, worker_id))
+            try:
+                await perform_cognitive_step()
+            except Exception as e:
+                print(f"[{worker_id}] Cycle failed: {e}")
+            finally:
+                renewer.cancel()
+            cycles += 1
+            claims.heartbeat(worker_id, cycles=1)
+    finally:
+        task_id = _current_task_id()
+        if task_id is not None:
+            claims.release(worker_id, task_id)
+            from .core_logic import _set_current_task
+            _set_current_task("")
+        await stop_reflection_worker()
+        print(format_gateway_stats())
+
+def _worker_process(worker_id: str, fleet_size: int, vault_path: str, stop_event, max_cycles: Optional[int]):
+    # The supervisor handles Ctrl-C and stops workers between cycles.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    config.VAULT_PATH = vault_path
+    from .task_claims import fleet_path
+    log = open(fleet_path(f"{worker_id}.log"), "a", encoding="utf-8", buffering=1)
+    sys.stdout = sys.stderr = log
+    asyncio.run(run_worker(worker_id, fleet_size, stop_event, max_cycles))
+
+class FleetSupervisor:
+    """Starts, restarts and scales worker processes, and reports throughput."""
+
+    def __init__(self, max_workers: int, min_workers: int = 1, max_cycles: Optional[int] = None,
+                 report_interval_s: float = None):
+        from .task_claims import TaskClaims
+        self.max_workers = max(1, max_workers)
+        self.min_workers = max(0, min(min_workers, self.max_workers))
+        self.max_cycles = max_cycles
+        self.report_interval_s = report_interval_s if report_interval_s is not None else config.FLEET_REPORT_INTERVAL_S
+        self.claims = TaskClaims()
+        self.workers: Dict[str, tuple] = {}  # worker id -> (process, stop event)
+        self.finished: set = set()  # Workers that ran all their --cycles; not restarted.
+        self.crashes = 0
+        self.started_at = time.time()
+
+    def _spawn(self, worker_id: str):
+        stop_event = multiprocessing.Event()
+        process = multiprocessing.Process(
+            target=_worker_process, name=f"anamkore-{worker_id}",
+            args=(worker_id, self.max_workers, config.VAULT_PATH, stop_event, self.max_cycles),
+        )
+        process.start()
+        self.workers[worker_id] = (process, stop_event)
+
+    def _target_size(self) -> int:
+        """One worker per unclaimed task plus one per claimed task, within the configured bounds."""
+        busy = len(self.claims.active_claims())
+        waiting = len(_claimable_task_ids(self.claims))
+        return max(self.min_workers, min(self.max_workers, busy + waiting))
+
+    def _scale(self):
+        for worker_id, (process, stop_event) in list(self.workers.items()):
+            if not process.is_alive():
+                del self.workers[worker_id]
+                if process.exitcode == 0 and self.max_cycles is not None and not stop_event.is_set():
+                    self.finished.add(worker_id)
+                elif process.exitcode != 0 and not stop_event.is_set():
+                    self.crashes += 1
+                    print(f"Worker {worker_id} exited with code {process.exitcode}; its lease will expire if it held a task.")
+
+        running = {w: entry for w, entry in self.workers.items() if not entry[1].is_set()}
+        target = self._target_size()
+        for slot in range(1, self.max_workers + 1):
+            if len(running) >= target:
+                break
+            worker_id = f"worker-{slot}"
+            if worker_id not in self.workers and worker_id not in self.finished:
+                self._spawn(worker_id)
+                running[worker_id] = self.workers[worker_id]
+        if len(running) > target:
+            # Stop idle workers first; a stopped worker finishes its cycle and releases its claim.
+            busy = set(self.claims.active_claims().values())
+            for worker_id in sorted(running, key=lambda w: (w in busy, w))[: len(running) - target]:
+                running[worker_id][1].set()
+
+    def format_report(self) -> str:
+        stats = self.claims.stats(since=self.started_at)
+        elapsed_min = max(time.time() - self.started_at, 1e-9) / 60
+        cycles = sum(w["cycles"] for w in stats["workers"])
+        per_worker = ", ".join(f"{w['worker_id']}: {w['tasks_done']} task(s)/{w['cycles']} cycle(s)" for w in stats["workers"])
+        return (
+            f"Fleet: {len(self.workers)} worker(s), {stats['tasks_done']} task(s) done ({stats['tasks_done'] / elapsed_min:.1f}/min), "
+            f"{cycles} cycle(s) in total; {len(self.claims.active_claims())} claimed, "
+            f"{len(_claimable_task_ids(self.claims))} waiting; {self.crashes} crash(es). [{per_worker}]"
+        )
+
+    def run(self, duration_s: Optional[float] = None):
+        next_report = time.time() + self.report_interval_s
+        try:
+            while duration_s is None or time.time() - self.started_at < duration_s:
+                self._scale()
+                if self.max_cycles is not None and not self.workers and self.finished:
+                    break
+                if time.time() >= next_report:
+                    print(self.format_report())
+                    next_report += self.report_interval_s
+                time.sleep(1.0)
+        except KeyboardInterrupt:
+            print("\n--- Fleet shutdown initiated by user. ---")
+        finally:
+            self.stop()
+            print(self.format_report())
+
+    def stop(self, timeout_s: float = 120.0):
+        for _, stop_event in self.workers.values():
+            stop_event.set()
+        deadline = time.time() + timeout_s
+        for process, _ in self.workers.values():
+            process.join(max(0.0, deadline - time.time()))
+            if process.is_alive():
+                process.terminate()
+        self.workers.clear()
+
+def main():
+    parser = argparse.ArgumentParser(description="Runs several Anamkore workers against one vault.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Most worker processes (default: CPU count).")
+    parser.add_argument("--min-workers", type=int, default=1, help="Workers kept running even with no work waiting.")
+    parser.add_argument("--cycles", type=int, help="Stop each worker after this many cycles.")
+    parser.add_argument("--duration", type=float, help="Stop the fleet after this many seconds.")
+    parser.add_argument("--report-interval", type=float, default=config.FLEET_REPORT_INTERVAL_S, help="Seconds between throughput reports.")
+    args = parser.parse_args()
+
+    from .initialization import initialize_vault_sync
+    config.require_api_key()
+    initialize_vault_sync()
+    print(f"--- Anamkore Fleet: up to {args.workers} worker(s); logs in {os.path.join(config.VAULT_PATH, config.FLEET_DIR)} ---")
+    FleetSupervisor(args.workers, args.min_workers, args.cycles, args.report_interval).run(args.duration)
+
+if __name__ == "__main__":
+    main()
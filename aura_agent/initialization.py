@@ -14,14 +14,15 @@ STRATEGIC_TASK_QUEUE_CONTENT = """
 # Task Queue
 
 - [ ] T1: Create a new tool file at `aura_agent/task_tools.py`.
-- [ ] T2: Add the basic function definition for `task_complete(task_id: str)` to the new `aura_agent/task_tools.py` file.
-- [ ] T3: Import the new `task_complete` tool into `aura_agent/agentic_layer.py` and add it to the `anamkore_tools` list.
-- [ ] T4: Implement the full logic for the `task_complete` tool.
+- [ ] T2: Add the basic function definition for `task_complete(task_id: str)` to the new `aura_agent/task_tools.py` file. (depends_on: T1)
+- [ ] T3: Import the new `task_complete` tool into `aura_agent/agentic_layer.py` and add it to the `anamkore_tools` list. (depends_on: T2)
+- [ ] T4: Implement the full logic for the `task_complete` tool. (depends_on: T2)
 """
 
 INITIAL_ASYNC_MAILBOX_CONTENT = """
 # Asynchronous Mailbox
 This file is a communication channel for the user to leave non-urgent messages or answers for AURA. AURA will check this file at the beginning of each cognitive cycle.
+Append each message under its own `## ` heading, e.g. `## 2025-07-01 Re: T3`. Messages are read once; the file is never rewritten.
 """
 
 INITIAL_CURRENT_TASK_CONTENT = "" # This file starts empty.
@@ -0,0 +1,506 @@
+# aura_agent/llm_gateway.py
+
+import asyncio
+import collections
+import contextlib
+import contextvars
+import heapq
+import itertools
+import json
+import random
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+from agents.models.interface import Model
+from . import config
+
+# ---
+# Self-Correction Note for Anamkore:
+# The planner, synthesizer and reflector each called the provider on their
+# own, so a burst (a user cycle while a reflection batch is in flight) went
+# straight into 429s, and background reflection competed with the user on
+# equal terms. Every agent's model is now a `GatewayModel`, and every call
+# goes through ONE `LLMGateway`, which:
+#   - bounds the calls in flight (LLM_MAX_IN_FLIGHT), keeping
+#     LLM_INTERACTIVE_RESERVED slots that background work may never take;
+#   - grants slots by lane, so a waiting user cycle goes before any waiting
+#     background call;
+#   - paces each model with token buckets for requests and tokens per
+#     minute (config.LLM_MODEL_LIMITS), before a slot is taken, so a call
+#     waiting on the rate limit never holds a slot. Calls waiting on a
+#     model's buckets are admitted by lane too, not in arrival order;
+#   - retries rate-limit and transient errors with jittered backoff,
+#     honouring Retry-After, and without holding a slot while it sleeps.
+# The lane comes from a context variable: `perform_cognitive_step` marks
+# cycles without a user command as background, and so does the reflector.
+#
+# MODIFIED: Provider latency has a long tail. The gateway keeps a latency
+# histogram per model, and `call_hedged` (used by `GatewayModel`) starts a
+# second request once the first has run longer than the model's observed
+# p95: to the configured fallback model (config.LLM_FALLBACK_MODELS) or,
+# without one, a duplicate. The first valid response wins and the other
+# request is cancelled. The delay runs from the moment the first request is
+# actually sent, since time spent queued or paced is not provider latency.
+# Hedges are only sent into a free slot with rate budget to spare, so they
+# never queue behind (or in front of) real work.
+# ---
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+LANE_PRIORITY = {INTERACTIVE: 0, BACKGROUND: 1}
+
+_current_lane: contextvars.ContextVar[str] = contextvars.ContextVar("llm_lane", default=INTERACTIVE)
+
+@contextlib.contextmanager
+def llm_lane(lane: str):
+    """Runs the model calls made inside the block (and tasks started from it) in `lane`."""
+    if lane not in LANE_PRIORITY:
+        raise ValueError(f"Unknown LLM lane: {lane}")
+    token = _current_lane.set(lane)
+    try:
+        yield
+    finally:
+        _current_lane.reset(token)
+
+def current_lane() -> str:
+    return _current_lane.get()
+
+# --- Rate Limiting ---
+# NOTE: `TokenBucket`, `_is_retryable` and `_retry_after_s` have twins in
+# nano-tools/nano_gemini_cli_core/utils/llm_gateway.py (the two packages
+# ship separately and share no code). Keep the copies in sync.
+
+class TokenBucket:
+    """
+    A token bucket. `wait_s` says how long until `amount` can be taken, and
+    `take` takes it, so the gateway decides who goes next rather than
+    committing callers in arrival order. An amount above the capacity is
+    allowed once the bucket is full, driving the balance negative.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate_per_s = per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate_per_s)
+        self.updated = now
+
+    def wait_s(self, amount: float) -> float:
+        self._refill()
+        return max(0.0, (min(amount, self.capacity) - self.tokens) / self.rate_per_s)
+
+    def take(self, amount: float):
+        self._refill()
+        self.tokens -= amount
+
+    def refund(self, amount: float):
+        """Returns tokens reserved but not used (or charges more, if `amount` is negative)."""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+# --- Latency ---
+
+class LatencyHistogram:
+    """Latencies of a model's recent calls, in a sliding window, for percentile queries."""
+
+    def __init__(self, window: int = None):
+        self.samples: collections.deque = collections.deque(maxlen=window or config.LLM_LATENCY_WINDOW)
+
+    def record(self, seconds: float):
+        self.samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+def _is_valid_response(response: Any) -> bool:
+    """A response worth returning: it produced some output."""
+    output = getattr(response, "output", None)
+    return output is None or len(output) > 0
+
+def _is_retryable(error: BaseException) -> bool:
+    status = getattr(error, "status_code", None)
+    if isinstance(status, int):
+        return status in config.LLM_RETRY_STATUS_CODES
+    if isinstance(error, (asyncio.TimeoutError, ConnectionError)):
+        return True
+    return type(error).__name__ in ("RateLimitError", "APIConnectionError", "APITimeoutError", "Timeout", "ServiceUnavailableError", "InternalServerError")
+
+def _retry_after_s(error: BaseException) -> Optional[float]:
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after") or headers.get("Retry-After"))
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+async def _aclose(events: Any):
+    aclose = getattr(events, "aclose", None)
+    if aclose is not None:
+        await aclose()
+
+def _backoff_s(attempt: int) -> float:
+    """Full jitter: anywhere up to the exponential ceiling, so retries from a burst spread out."""
+    return random.uniform(0, min(config.LLM_RETRY_MAX_S, config.LLM_RETRY_BASE_S * 2 ** attempt))
+
+# --- Gateway ---
+
+class LLMGateway:
+    def __init__(self, max_in_flight: int = None, interactive_reserved: int = None, model_limits: Dict[str, tuple] = None, hedging: bool = None):
+        self.max_in_flight = max_in_flight or config.LLM_MAX_IN_FLIGHT
+        self.interactive_reserved = min(
+            config.LLM_INTERACTIVE_RESERVED if interactive_reserved is None else interactive_reserved,
+            self.max_in_flight - 1,
+        )
+        self.model_limits = dict(config.LLM_MODEL_LIMITS if model_limits is None else model_limits)
+        self.hedging = config.LLM_HEDGING if hedging is None else hedging
+        self.latency: Dict[str, LatencyHistogram] = collections.defaultdict(LatencyHistogram)
+        self._buckets: Dict[str, tuple] = {}
+        # Per model, the calls waiting on its buckets: a heap of (lane priority, ticket).
+        self._pacing: Dict[str, list] = collections.defaultdict(list)
+        self._in_flight = 0
+        self._waiting: list = []
+        self._tickets = itertools.count()
+        self._slot_freed: Optional[asyncio.Condition] = None
+        self._loop = None
+        self.stats = {
+            "calls": 0, "retries": 0, "failures": 0, "rate_limited": 0,
+            "queued_s": 0.0, "paced_s": 0.0, "max_queue_depth": 0,
+            "tokens_estimated": 0, "tokens_used": 0,
+            "timeouts": 0, "hedges": 0, "hedges_won": 0, "hedges_skipped": 0,
+        }
+        self.queue_depth = {lane: 0 for lane in LANE_PRIORITY}
+
+    def _condition(self) -> asyncio.Condition:
+        # asyncio primitives belong to one loop; offline tools may run several in turn.
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._slot_freed = asyncio.Condition()
+            self._waiting.clear()
+            self._pacing.clear()
+            self._in_flight = 0
+        return self._slot_freed
+
+    def _lane_limit(self, lane: str) -> int:
+        return self.max_in_flight if lane == INTERACTIVE else self.max_in_flight - self.interactive_reserved
+
+    async def _acquire(self, lane: str):
+        condition = self._condition()
+        async with condition:
+            ticket = (LANE_PRIORITY[lane], next(self._tickets))
+            heapq.heappush(self._waiting, ticket)
+            self.queue_depth[lane] += 1
+            self.stats["max_queue_depth"] = max(self.stats["max_queue_depth"], len(self._waiting))
+            started = time.monotonic()
+            try:
+                await condition.wait_for(lambda: self._waiting[0] == ticket and self._in_flight < self._lane_limit(lane))
+                self._in_flight += 1
+                self.stats["queued_s"] += time.monotonic() - started
+            finally:
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+                self.queue_depth[lane] -= 1
+                # The new head may be able to go too (e.g. an interactive call
+                # behind a background one that hit its cap), or we were cancelled.
+                condition.notify_all()
+
+    async def _release(self):
+        condition = self._condition()
+        async with condition:
+            self._in_flight -= 1
+            condition.notify_all()
+
+    def _buckets_for(self, model: str) -> tuple:
+        if model not in self._buckets:
+            rpm, tpm = self.model_limits.get(model, config.LLM_DEFAULT_LIMITS)
+            self._buckets[model] = (TokenBucket(rpm), TokenBucket(tpm))
+        return self._buckets[model]
+
+    async def _pace(self, model: str, estimated_tokens: int, lane: str):
+        """
+        Waits until `model`'s buckets can cover the call, then takes from them.
+        Only the head of the model's queue (best lane, then oldest) may take;
+        it sleeps outside the lock, so a call in a better lane arriving
+        meanwhile becomes the head and goes first.
+        """
+        condition = self._condition()
+        requests, tokens = self._buckets_for(model)
+        queue = self._pacing[model]
+        ticket = (LANE_PRIORITY[lane], next(self._tickets))
+        started, slept = time.monotonic(), False
+        async with condition:
+            heapq.heappush(queue, ticket)
+        try:
+            while True:
+                async with condition:
+                    await condition.wait_for(lambda: queue[0] == ticket)
+                    wait_s = max(requests.wait_s(1), tokens.wait_s(estimated_tokens))
+                    if wait_s <= 0:
+                        requests.take(1)
+                        tokens.take(estimated_tokens)
+                        break
+                slept = True
+                await asyncio.sleep(wait_s)
+        finally:
+            async with condition:
+                queue.remove(ticket)
+                heapq.heapify(queue)
+                condition.notify_all()
+        if slept:
+            self.stats["rate_limited"] += 1
+            self.stats["paced_s"] += time.monotonic() - started
+
+    async def call(self, model: str, send: Callable[[], Awaitable[Any]], estimated_tokens: int = 0, lane: Optional[str] = None,
+                   on_send: Optional[Callable[[], None]] = None) -> Any:
+        """
+        Runs `send()` (one provider request) under the gateway's concurrency,
+        priority and rate limits, retrying rate-limit and transient errors.
+        `on_send` is called each time the request is actually sent.
+        """
+        lane = lane or current_lane()
+        self.stats["calls"] += 1
+        self.stats["tokens_estimated"] += estimated_tokens
+        for attempt in range(config.LLM_MAX_RETRIES + 1):
+            await self._pace(model, estimated_tokens, lane)
+            await self._acquire(lane)
+            sent = time.monotonic()
+            try:
+                if on_send is not None:
+                    on_send()
+                response = await asyncio.wait_for(send(), config.LLM_CALL_TIMEOUT_S)
+            except asyncio.CancelledError:
+                # A cancelled request (e.g. a hedge's loser) took at least this long;
+                # leaving it out would bias the histogram toward fast calls.
+                self.latency[model].record(time.monotonic() - sent)
+                raise
+            except Exception as e:
+                if isinstance(e, asyncio.TimeoutError):
+                    # Like a cancellation, a timeout is a (censored) slow sample.
+                    self.stats["timeouts"] += 1
+                    self.latency[model].record(config.LLM_CALL_TIMEOUT_S)
+                error = e
+            else:
+                self.latency[model].record(time.monotonic() - sent)
+                self._record_usage(model, response, estimated_tokens)
+                return response
+            finally:
+                await self._release()
+
+            if attempt == config.LLM_MAX_RETRIES or not _is_retryable(error):
+                self.stats["failures"] += 1
+                raise error
+            self.stats["retries"] += 1
+            delay = _retry_after_s(error)
+            await asyncio.sleep(delay if delay is not None else _backoff_s(attempt))
+
+    def hedge_delay_s(self, model: str) -> Optional[float]:
+        """How long to wait on a call to `model` before hedging it; None until enough calls are observed."""
+        histogram = self.latency[model]
+        if not self.hedging or len(histogram) < config.LLM_HEDGE_MIN_SAMPLES:
+            return None
+        return max(config.LLM_HEDGE_MIN_DELAY_S, histogram.percentile(config.LLM_HEDGE_PERCENTILE))
+
+    def _has_free_slot(self, lane: str) -> bool:
+        return not self._waiting and self._in_flight < self._lane_limit(lane)
+
+    def _has_rate_budget(self, model: str, estimated_tokens: int) -> bool:
+        """Whether a call to `model` would be paced through at once."""
+        requests, tokens = self._buckets_for(model)
+        return not self._pacing.get(model) and requests.wait_s(1) <= 0 and tokens.wait_s(estimated_tokens) <= 0
+
+    async def call_hedged(self, model: str, send: Callable[[], Awaitable[Any]], backup_model: str, backup_send: Callable[[], Awaitable[Any]],
+                          estimated_tokens: int = 0, lane: Optional[str] = None) -> Any:
+        """
+        Like `call`, but if `send` outlasts `model`'s p95 latency, also sends
+        `backup_send` (to `backup_model`) and returns whichever valid response
+        arrives first, cancelling the other.
+        """
+        lane = lane or current_lane()
+        sent = asyncio.Event()
+        primary = asyncio.create_task(self.call(model, send, estimated_tokens, lane, on_send=sent.set))
+        delay = self.hedge_delay_s(model)
+        if delay is None:
+            return await primary
+        sent_wait = asyncio.create_task(sent.wait())
+        try:
+            # The histogram measures send-to-response, so the delay starts at the send.
+            await asyncio.wait({primary, sent_wait}, return_when=asyncio.FIRST_COMPLETED)
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+        except asyncio.CancelledError:
+            primary.cancel()
+            raise
+        finally:
+            sent_wait.cancel()
+        if done or not self._has_free_slot(lane) or not self._has_rate_budget(backup_model, estimated_tokens):
+            if not done:
+                self.stats["hedges_skipped"] += 1
+            return await primary
+
+        self.stats["hedges"] += 1
+        backup = asyncio.create_task(self.call(backup_model, backup_send, estimated_tokens, lane))
+        pending = {primary, backup}
+        fallback_result, error = None, None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        error = error or task.exception()
+                    elif _is_valid_response(task.result()):
+                        if task is backup:
+                            self.stats["hedges_won"] += 1
+                        return task.result()
+                    else:
+                        fallback_result = fallback_result or task.result()
+            if fallback_result is not None:
+                return fallback_result
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    async def stream(self, model: str, open_stream: Callable[[], AsyncIterator[Any]], estimated_tokens: int = 0, lane: Optional[str] = None) -> AsyncIterator[Any]:
+        """
+        Like `call`, for a streamed response. The slot is held until the
+        stream ends or is closed; a stream is only retried if it fails before
+        its first event. A stream closed before `response.completed` is
+        settled from the output streamed so far. A provider that stalls
+        before the first event or between events raises `TimeoutError`.
+        """
+        lane = lane or current_lane()
+        self.stats["calls"] += 1
+        self.stats["tokens_estimated"] += estimated_tokens
+        for attempt in range(config.LLM_MAX_RETRIES + 1):
+            await self._pace(model, estimated_tokens, lane)
+            await self._acquire(lane)
+            started = False
+            settled = False
+            streamed_chars = 0
+            events = open_stream()
+            try:
+                iterator = events.__aiter__()
+                while True:
+                    timeout = config.LLM_STREAM_IDLE_TIMEOUT_S if started else config.LLM_STREAM_FIRST_EVENT_TIMEOUT_S
+                    try:
+                        event = await asyncio.wait_for(iterator.__anext__(), timeout)
+                    except StopAsyncIteration:
+                        break
+                    except asyncio.TimeoutError:
+                        self.stats["timeouts"] += 1
+                        raise
+                    started = True
+                    if getattr(event, "type", None) == "response.completed":
+                        self._record_usage(model, event.response, estimated_tokens)
+                        settled = True
+                    delta = getattr(event, "delta", None)
+                    if isinstance(delta, str):
+                        streamed_chars += len(delta)
+                    yield event
+                return
+            except Exception as e:
+                if started or attempt == config.LLM_MAX_RETRIES or not _is_retryable(e):
+                    self.stats["failures"] += 1
+                    raise
+                error = e
+            finally:
+                if started and not settled:
+                    # Closed early: the prompt was paid for, but only the output streamed so far.
+                    unused_output = config.LLM_OUTPUT_TOKEN_ESTIMATE - streamed_chars // 4
+                    self._buckets_for(model)[1].refund(min(unused_output, estimated_tokens))
+                await _aclose(events)
+                await self._release()
+            self.stats["retries"] += 1
+            delay = _retry_after_s(error)
+            await asyncio.sleep(delay if delay is not None else _backoff_s(attempt))
+
+    def _record_usage(self, model: str, response: Any, estimated_tokens: int):
+        usage = getattr(response, "usage", None)
+        used = getattr(usage, "total_tokens", None)
+        if isinstance(used, int) and used > 0:
+            self.stats["tokens_used"] += used
+            # Settle the token bucket against what the call really cost.
+            self._buckets_for(model)[1].refund(estimated_tokens - used)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Counters, the current queue depth per lane and calls in flight, and latency percentiles per model."""
+        latency = {
+            model: {"calls": len(h), **{f"p{int(q * 100)}_s": h.percentile(q) for q in (0.5, 0.95, 0.99)}}
+            for model, h in self.latency.items() if len(h)
+        }
+        return {**self.stats, "in_flight": self._in_flight, "queue_depth": dict(self.queue_depth), "latency": latency}
+
+_gateway: Optional[LLMGateway] = None
+
+def get_gateway() -> LLMGateway:
+    global _gateway
+    if _gateway is None:
+        _gateway = LLMGateway()
+    return _gateway
+
+def configure_gateway(**kwargs) -> LLMGateway:
+    """Replaces the shared gateway, e.g. with other limits for offline runs."""
+    global _gateway
+    _gateway = LLMGateway(**kwargs)
+    return _gateway
+
+def format_gateway_stats() -> str:
+    m = get_gateway().metrics()
+    return (
+        f"LLM gateway: {m['calls']} call(s), {m['retries']} retried, {m['failures']} failed; "
+        f"{m['rate_limited']} paced by rate limits ({m['paced_s']:.1f} s), "
+        f"{m['queued_s']:.1f} s queued for a slot (max queue depth {m['max_queue_depth']}); "
+        f"{m['hedges']} hedged ({m['hedges_won']} won by the hedge), {m['timeouts']} timed out."
+    )
+
+# --- Agents SDK Model ---
+
+def _estimate_tokens(system_instructions: Optional[str], input: Any, tools: list) -> int:
+    """A rough pre-call estimate (about 4 characters per token) for the tokens-per-minute bucket."""
+    text = (system_instructions or "") + (input if isinstance(input, str) else json.dumps(input, default=str))
+    tool_schemas = sum(len(json.dumps(getattr(tool, "params_json_schema", {}))) for tool in tools or [])
+    return (len(text) + tool_schemas) // 4 + config.LLM_OUTPUT_TOKEN_ESTIMATE
+
+class GatewayModel(Model):
+    """
+    Wraps an agent's model so every call it makes goes through the shared
+    gateway. Slow calls are hedged to `fallback` (another model, with its
+    name), or duplicated when there is none.
+    """
+
+    def __init__(self, inner: Model, model_name: str, fallback: Optional[Model] = None, fallback_name: Optional[str] = None):
+        self.inner = inner
+        self.model_name = model_name
+        self.fallback = fallback or inner
+        self.fallback_name = fallback_name if fallback is not None else model_name
+
+    async def get_response(self, system_instructions, input, model_settings, tools, output_schema, handoffs, tracing, **kwargs):
+        args = (system_instructions, input, model_settings, tools, output_schema, handoffs, tracing)
+        return await get_gateway().call_hedged(
+            self.model_name,
+            lambda: self.inner.get_response(*args, **kwargs),
+            self.fallback_name,
+            lambda: self.fallback.get_response(*args, **kwargs),
+            _estimate_tokens(system_instructions, input, tools),
+        )
+
+    async def stream_response(self, system_instructions, input, model_settings, tools, output_schema, handoffs, tracing, **kwargs):
+        events = get_gateway().stream(
+            self.model_name,
+            lambda: self.inner.stream_response(system_instructions, input, model_settings, tools, output_schema, handoffs, tracing, **kwargs),
+            _estimate_tokens(system_instructions, input, tools),
+        )
+        try:
+            async for event in events:
+                yield event
+        finally:
+            await events.aclose()
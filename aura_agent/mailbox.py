@@ -0,0 +1,149 @@
+# aura_agent/mailbox.py
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass, asdict
+from typing import Dict, Iterable, List, Optional
+from . import config
+
+# ---
+# Self-Correction Note for Anamkore:
+# `4-Async_Mailbox.md` only ever grows, so re-reading and re-parsing all of
+# it every cycle would cost more each day. The mailbox keeps a cursor
+# instead: the byte offset it has read up to, persisted in the vault with a
+# fingerprint of the bytes just before it. Each poll is one stat when the
+# file is unchanged, and otherwise reads only the bytes appended since.
+# If the fingerprint no longer matches (the file was edited or rewritten),
+# the file is rescanned from the start, and message ids keep already-seen
+# messages from being delivered twice. An id is the message's heading and
+# how many times that heading has occurred so far, so it survives a rescan
+# even where the body was edited.
+#
+# A message is a `## ` heading and the lines under it:
+#   ## 2025-07-01 Re: T3
+#   Yes, use the existing schema.
+# Lines appended under an already-read message arrive as a message of their
+# own, titled "(continued)". Messages stay pending until `mark_consumed`;
+# the file itself is never rewritten.
+# ---
+
+_FINGERPRINT_BYTES = 64
+
+@dataclass
+class MailboxMessage:
+    # "<heading hash>-<occurrence>", e.g. the second "## Ping" is "<hash of Ping>-2".
+    id: str
+    title: str
+    body: str
+    offset: int
+
+def _heading_hash(title: str) -> str:
+    return hashlib.sha1(title.encode("utf-8")).hexdigest()[:12]
+
+class Mailbox:
+    def __init__(self, path: Optional[str] = None, state_path: Optional[str] = None):
+        self.path = path or os.path.join(config.VAULT_PATH, config.MAILBOX_PATH)
+        self.state_path = state_path or os.path.join(config.VAULT_PATH, config.MAILBOX_STATE_PATH)
+        self.state = self._load_state()
+
+    def _load_state(self) -> dict:
+        state = {"offset": 0, "size": -1, "mtime_ns": -1, "fingerprint": "", "occurrences": {}, "pending": [], "consumed": []}
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state.update(json.load(f))
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+        return state
+
+    def _save_state(self):
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f)
+        os.replace(tmp_path, self.state_path)
+
+    def _fingerprint(self, f, offset: int) -> str:
+        start = max(0, offset - _FINGERPRINT_BYTES)
+        f.seek(start)
+        return hashlib.sha1(f.read(offset - start)).hexdigest()
+
+    def _parse(self, text: str, offset: int, from_start: bool, occurrences: Dict[str, int]) -> List[MailboxMessage]:
+        """Splits newly read text into messages; `offset` is the byte offset of `text` in the file."""
+        blocks = []  # [title, body lines, byte offset]
+        position = offset
+        for line in text.splitlines(keepends=True):
+            if line.startswith("## "):
+                blocks.append([line[3:].strip(), [], position])
+            elif blocks:
+                blocks[-1][1].append(line)
+            elif not from_start and line.strip():
+                # Appended under a message read by an earlier poll.
+                blocks.append(["(continued)", [line], position])
+            position += len(line.encode("utf-8"))
+
+        messages = []
+        for title, lines, block_offset in blocks:
+            body = "".join(lines).strip()
+            digest = _heading_hash(title)
+            occurrences[digest] = occurrences.get(digest, 0) + 1
+            messages.append(MailboxMessage(f"{digest}-{occurrences[digest]}", title, body, block_offset))
+        return messages
+
+    def poll(self) -> List[MailboxMessage]:
+        """Reads messages appended since the last poll; returns the ones not seen before (they become pending)."""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return []
+        state = self.state
+        if st.st_size == state["size"] and st.st_mtime_ns == state["mtime_ns"]:
+            return []
+
+        with open(self.path, "rb") as f:
+            offset = state["offset"]
+            if offset > st.st_size or self._fingerprint(f, offset) != state["fingerprint"]:
+                # Edited or rewritten: rescan, recounting occurrences from the top.
+                offset = 0
+                state["occurrences"] = {}
+            f.seek(offset)
+            data = f.read()
+            # Only complete lines; a line still being written is read next time.
+            end = data.rfind(b"\n") + 1
+            new_offset = offset + end
+            messages = self._parse(data[:end].decode("utf-8", errors="replace"), offset, offset == 0, state["occurrences"])
+            state["fingerprint"] = self._fingerprint(f, new_offset)
+
+        seen = set(state["consumed"]) | {m["id"] for m in state["pending"]}
+        new = [m for m in messages if m.id not in seen]
+        state["pending"].extend(asdict(m) for m in new)
+        # The size and mtime are only trusted once the whole file has been read.
+        complete = new_offset == st.st_size
+        state.update(offset=new_offset, size=st.st_size if complete else -1, mtime_ns=st.st_mtime_ns if complete else -1)
+        self._save_state()
+        return new
+
+    def pending(self) -> List[MailboxMessage]:
+        """Messages delivered by `poll` and not yet consumed, oldest first."""
+        return [MailboxMessage(**m) for m in self.state["pending"]]
+
+    def mark_consumed(self, message_ids: Iterable[str]):
+        ids = set(message_ids)
+        if not ids:
+            return
+        self.state["pending"] = [m for m in self.state["pending"] if m["id"] not in ids]
+        consumed = self.state["consumed"] + [i for i in ids if i not in self.state["consumed"]]
+        self.state["consumed"] = consumed[-config.MAILBOX_CONSUMED_MAX:]
+        self._save_state()
+
+_mailbox: Optional[Mailbox] = None
+
+def get_mailbox() -> Mailbox:
+    global _mailbox
+    if _mailbox is None or _mailbox.path != os.path.join(config.VAULT_PATH, config.MAILBOX_PATH):
+        _mailbox = Mailbox()
+    return _mailbox
+
+def format_messages(messages: List[MailboxMessage]) -> str:
+    return "\n\n".join(
+        f"--- Message {m.id}: {m.title} ---\n{m.body[:config.MAILBOX_MESSAGE_MAX_CHARS]}" for m in messages
+    )
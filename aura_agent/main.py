@@ -1,53 +1,131 @@
 # aura_agent/main.py
 
 import asyncio
+import threading
 import traceback
+from . import config
 from .cognitive_step import perform_cognitive_step
 from .initialization import initialize_vault_sync
 from .core_logic import _write_journal
+from .vault_watcher import start_vault_watcher, stop_vault_watcher, add_change_listener
+from .mailbox import get_mailbox
+from .reflection_worker import start_reflection_worker, stop_reflection_worker
+from .directives import format_directive_stats
+from .llm_gateway import format_gateway_stats
+
+def _read_input(prompt: str) -> asyncio.Future:
+    """
+    `input()` on a daemon thread. Unlike `asyncio.to_thread`, a read still
+    pending at shutdown does not keep `asyncio.run` waiting for its executor.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def _set(method, value):
+        if not future.done():
+            method(value)
+
+    def _run():
+        try:
+            line = input(prompt)
+        except BaseException as e:
+            loop.call_soon_threadsafe(_set, future.set_exception, e)
+        else:
+            loop.call_soon_threadsafe(_set, future.set_result, line)
+
+    threading.Thread(target=_run, name="anamkore-input", daemon=True).start()
+    return future
 
 async def main():
     """
     The main, interactive, user-driven loop of the Anamkore agent.
     """
+    config.require_api_key()
     initialize_vault_sync()
+    # --- NEW: Keep the vault read cache fresh from change events (needs `watchdog`) ---
+    # MODIFIED: The same events wake the loop when the mailbox changes.
+    mail_event = asyncio.Event()
+    if start_vault_watcher():
+        print("Vault watcher active: cached vault reads are invalidated on change.")
+        loop = asyncio.get_running_loop()
+        add_change_listener(get_mailbox().path, lambda: loop.call_soon_threadsafe(mail_event.set))
+    # --- NEW: Completed cycles are reflected on in the background, in batches ---
+    start_reflection_worker()
     
     print("\n--- Anamkore Core Loop Activating ---")
     print("Provide a natural language command or press Enter to run a background task. Type 'exit' to quit.")
     
+    # Counts cycles that ran; every prompt shows the number of the next one.
     cycle_count = 0
-    while True:
-        cycle_count += 1
-        cycle_error = None
+    prompted_for = None
+    input_task = None
+    try:
+        while True:
+            cycle_error = None
+            user_input = None
         
-        try:
-            user_input = input(f"\n[Cycle {cycle_count}] >>> ")
-            if user_input.strip().lower() == 'exit':
-                print("--- Anamkore shutdown sequence initiated by user. ---")
-                break
+            try:
+                # Read input in a thread so the reflection worker keeps running
+                # while we wait for the user.
+                prompt = f"\n[Cycle {cycle_count + 1}] >>> "
+                if input_task is None:
+                    input_task = _read_input(prompt)
+                elif prompted_for != cycle_count + 1:
+                    # A mail cycle ran under the pending `input()`; show its prompt again.
+                    print(prompt, end="", flush=True)
+                prompted_for = cycle_count + 1
+                # --- NEW: New mail runs a cycle without waiting for the user ---
+                # The pending `input()` keeps waiting; it cannot be cancelled.
+                mail_wait = asyncio.ensure_future(mail_event.wait())
+                try:
+                    await asyncio.wait({input_task, mail_wait}, return_when=asyncio.FIRST_COMPLETED)
+                finally:
+                    mail_wait.cancel()
+                if not input_task.done():
+                    mail_event.clear()
+                    if not get_mailbox().poll():
+                        continue
+                    print("\n[Mailbox] New message(s) arrived.")
+                    cycle_count += 1
+                    await perform_cognitive_step()
+                    continue
+
+                user_input = input_task.result()
+                input_task = None
+                if user_input.strip().lower() == 'exit':
+                    print("--- Anamkore shutdown sequence initiated by user. ---")
+                    break
             
-            await perform_cognitive_step(user_command=user_input.strip() or None)
-
-        except (KeyboardInterrupt, EOFError):
-            print("\n--- Anamkore shutdown sequence initiated by user. ---")
-            break
-        except Exception as e:
-            print(f"\n--- A CRITICAL ERROR OCCURRED IN THE CORE LOOP ---")
-            print(f"Error: {e}")
-            cycle_error = traceback.format_exc() # Get the full traceback
-            print("Attempting to recover on the next cycle...")
+                cycle_count += 1
+                await perform_cognitive_step(user_command=user_input.strip() or None)
+
+            # MODIFIED: Under asyncio.run, Ctrl-C arrives as a cancellation of this task.
+            except (KeyboardInterrupt, EOFError, asyncio.CancelledError):
+                print("\n--- Anamkore shutdown sequence initiated by user. ---")
+                break
+            except Exception as e:
+                print(f"\n--- A CRITICAL ERROR OCCURRED IN THE CORE LOOP ---")
+                print(f"Error: {e}")
+                cycle_error = traceback.format_exc() # Get the full traceback
+                print("Attempting to recover on the next cycle...")
         
-        # --- NEW: Guaranteed Failure Journaling ---
-        # If a critical error happened that prevented the normal journaling, log it here.
-        if cycle_error:
-            failure_journal_entry = (
-                f"# Cognitive Cycle: CRITICAL FAILURE\n\n"
-                f"**User Command:** {user_input or 'None'}\n\n"
-                f"A critical exception occurred that halted the cognitive step.\n\n"
-                f"**Error Traceback:**\n```\n{cycle_error}\n```"
-            )
-            _write_journal(failure_journal_entry)
-            print("Journaling critical failure complete.")
+            # --- NEW: Guaranteed Failure Journaling ---
+            # If a critical error happened that prevented the normal journaling, log it here.
+            if cycle_error:
+                failure_journal_entry = (
+                    f"# Cognitive Cycle: CRITICAL FAILURE\n\n"
+                    f"**User Command:** {user_input or 'None'}\n\n"
+                    f"A critical exception occurred that halted the cognitive step.\n\n"
+                    f"**Error Traceback:**\n```\n{cycle_error}\n```"
+                )
+                _write_journal(failure_journal_entry)
+                print("Journaling critical failure complete.")
+    finally:
+        # --- NEW: The shutdown sequence runs however the loop ends ---
+        print(format_directive_stats())
+        await stop_reflection_worker()
+        print(format_gateway_stats())
+        stop_vault_watcher()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,160 @@
+# aura_agent/reflection_worker.py
+
+import asyncio
+import json
+from datetime import datetime
+from typing import List, Optional
+from agents import Runner, RunConfig, RunResult
+from .agents import reflector_agent
+from .core_logic import _append_reflection_index
+from .task import ReflectionBatch
+from .llm_gateway import llm_lane, BACKGROUND
+
+# ---
+# Self-Correction Note for Anamkore:
+# Reflecting inline would add a third serial LLM round trip to every cycle.
+# Instead, `perform_cognitive_step` hands its finished trace to this worker
+# and returns. The worker runs while the loop waits for the next command,
+# folds whatever traces have queued up into ONE reflector call (structured
+# `ReflectionBatch` output), and appends the scored results to the journal's
+# reflection index. Reflection is best effort: a failed batch is reported
+# and dropped, never surfaced as a cycle failure.
+# ---
+
+REFLECTION_BATCH_SIZE = 5          # Most traces scored by one reflector call.
+REFLECTION_BATCH_WINDOW_S = 2.0    # How long to wait for more traces once one arrives.
+REFLECTION_QUEUE_MAX = 50          # Traces beyond this are dropped rather than blocking a cycle.
+REFLECTION_DRAIN_TIMEOUT_S = 60.0  # How long shutdown waits for pending reflections.
+
+class ReflectionWorker:
+    def __init__(self):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=REFLECTION_QUEUE_MAX)
+        self.stats = {"traces": 0, "batches": 0, "reflections": 0, "dropped": 0, "failed_batches": 0}
+        self._task: Optional[asyncio.Task] = None
+        # The last reflected trace, so the first trace of a batch can still be
+        # compared to the cycle before it.
+        self._previous_trace: Optional[dict] = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="reflection-worker")
+
+    def submit(self, trace: dict):
+        """Queues a completed cycle trace. Never blocks the cycle."""
+        try:
+            self.queue.put_nowait(trace)
+            self.stats["traces"] += 1
+        except asyncio.QueueFull:
+            self.stats["dropped"] += 1
+            print("Warning: reflection queue is full; dropping this cycle's trace.")
+
+    async def _next_batch(self) -> List[dict]:
+        batch = [await self.queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + REFLECTION_BATCH_WINDOW_S
+        while len(batch) < REFLECTION_BATCH_SIZE:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._next_batch()
+            try:
+                # Reflection never delays a user's cycle: it waits behind them in the LLM gateway.
+                with llm_lane(BACKGROUND):
+                    await self._reflect(batch)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats["failed_batches"] += 1
+                print(f"Warning: reflection failed for {len(batch)} cycle(s): {e}")
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    def _build_prompt(self, batch: List[dict]) -> str:
+        sections = []
+        if self._previous_trace is not None:
+            sections.append(
+                "--- Previous Cycle (context only, do NOT reflect on it) ---\n"
+                f"{json.dumps(self._previous_trace, indent=2)}"
+            )
+        for index, trace in enumerate(batch, 1):
+            sections.append(f"--- Trace {index} of {len(batch)} ---\n{json.dumps(trace, indent=2)}")
+        sections.append(f"--- Your Task ---\nReturn exactly {len(batch)} reflection(s), one per trace, in order.")
+        return "\n\n".join(sections)
+
+    async def _reflect(self, batch: List[dict]):
+        run_config = RunConfig(tracing_disabled=True)
+        result: RunResult = await Runner.run(reflector_agent, self._build_prompt(batch), run_config=run_config)
+        output: ReflectionBatch = result.final_output
+        self._previous_trace = batch[-1]
+
+        known_ids = {trace["cycle_id"] for trace in batch}
+        reflected_at = datetime.now().isoformat()
+        records = [
+            {"reflected_at": reflected_at, **reflection.model_dump()}
+            for reflection in output.reflections
+            if reflection.cycle_id in known_ids
+        ]
+        if len(records) < len(batch):
+            print(f"Warning: reflector returned {len(records)} usable reflection(s) for {len(batch)} cycle(s).")
+        if records:
+            status = _append_reflection_index(records)
+            if status.startswith("Error"):
+                raise RuntimeError(status)
+        self.stats["batches"] += 1
+        self.stats["reflections"] += len(records)
+
+    async def drain(self, timeout: float = REFLECTION_DRAIN_TIMEOUT_S) -> bool:
+        """Waits until every queued trace has been reflected on. Returns False on timeout."""
+        try:
+            await asyncio.wait_for(self.queue.join(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+_worker: Optional[ReflectionWorker] = None
+
+def start_reflection_worker() -> ReflectionWorker:
+    """Starts the background worker on the running event loop."""
+    global _worker
+    if _worker is None:
+        _worker = ReflectionWorker()
+        _worker.start()
+    return _worker
+
+def submit_trace(trace: dict) -> bool:
+    """Hands a completed cycle trace to the worker. Returns False if no worker is running."""
+    if _worker is None:
+        return False
+    _worker.submit(trace)
+    return True
+
+async def stop_reflection_worker(timeout: float = REFLECTION_DRAIN_TIMEOUT_S):
+    """Reflects on any queued traces (up to `timeout`), then stops the worker."""
+    global _worker
+    if _worker is None:
+        return
+    worker, _worker = _worker, None
+    if not worker.queue.empty():
+        print(f"Reflecting on {worker.queue.qsize()} pending cycle(s) before shutdown...")
+    if not await worker.drain(timeout):
+        print("Warning: timed out waiting for pending reflections.")
+    await worker.stop()
+    print(f"Reflection worker stopped: {worker.stats}")
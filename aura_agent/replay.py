@@ -0,0 +1,393 @@
+# aura_agent/replay.py
+
+import argparse
+import asyncio
+import contextlib
+import io
+import itertools
+import json
+import os
+import random
+import re
+import statistics
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+from agents.items import ModelResponse
+from agents.models.interface import Model
+from agents.usage import Usage
+from openai.types.responses import (
+    Response, ResponseCompletedEvent, ResponseFunctionCallArgumentsDeltaEvent, ResponseFunctionToolCall,
+    ResponseOutputItemAddedEvent, ResponseOutputItemDoneEvent, ResponseOutputMessage, ResponseOutputText,
+    ResponseTextDeltaEvent,
+)
+from . import config
+from .llm_gateway import GatewayModel, configure_gateway, format_gateway_stats
+from .streaming import STREAM_TIMINGS
+
+# ---
+# Self-Correction Note for Anamkore:
+# Every cycle used to need the live Gemini model, so the orchestrator itself
+# (directive selection, journal parsing, journaling) could not be measured
+# apart from network latency. This module swaps each agent's model for a
+# `ScriptedModel` that replays recorded or scripted responses after a
+# configurable artificial latency, runs cycles against a generated fixture
+# vault, and reports where the time goes. Run it with:
+#   python -m aura_agent.replay --journal-entries 5000 --tasks 500 --cycles 50
+# ---
+
+# A step is {"tool_call": {"name": ..., "arguments": {...}}} or {"text": ...}.
+Responder = Callable[[str], dict]
+
+def _input_text(input) -> str:
+    if isinstance(input, str):
+        return input
+    parts = []
+    for item in input:
+        content = item.get("content") if isinstance(item, dict) else getattr(item, "content", None)
+        if isinstance(content, str):
+            parts.append(content)
+        elif isinstance(content, list):
+            parts.extend(str(c.get("text", "")) if isinstance(c, dict) else str(getattr(c, "text", "")) for c in content)
+    return "\n".join(parts)
+
+class ScriptedRateLimitError(Exception):
+    """What a provider's 429 looks like to the LLM gateway."""
+    status_code = 429
+
+class ScriptedModel(Model):
+    """
+    A stand-in for `LitellmModel` that answers from a script instead of the
+    network. With `error_rate`, that fraction of calls fails with a 429, to
+    exercise the gateway's retries; with `tail_rate`, that fraction takes
+    `tail_latency_s` instead of `latency_s`, to exercise hedging.
+    Streamed responses arrive in STREAM_CHUNKS evenly spaced chunks, the
+    first after STREAM_FIRST_CHUNK_FRACTION of the latency.
+    """
+
+    STREAM_CHUNKS = 10
+    STREAM_FIRST_CHUNK_FRACTION = 0.2
+
+    def __init__(self, respond: Responder, latency_s: float = 0.0, error_rate: float = 0.0, tail_rate: float = 0.0, tail_latency_s: float = 0.0):
+        self.respond = respond
+        self.latency_s = latency_s
+        self.error_rate = error_rate
+        self.tail_rate = tail_rate
+        self.tail_latency_s = tail_latency_s
+        self.calls = 0
+        self.errors = 0
+        self.model_time_s = 0.0
+
+    def _latency_s(self) -> float:
+        return self.tail_latency_s if self.tail_rate and random.random() < self.tail_rate else self.latency_s
+
+    def _maybe_fail(self):
+        if self.error_rate and random.random() < self.error_rate:
+            self.errors += 1
+            raise ScriptedRateLimitError("Scripted rate limit (429).")
+
+    def _output_item(self, input):
+        step = self.respond(_input_text(input))
+        if "tool_call" in step:
+            call = step["tool_call"]
+            return ResponseFunctionToolCall(
+                id=f"fc_{uuid.uuid4().hex}", call_id=f"call_{uuid.uuid4().hex}", type="function_call",
+                name=call["name"], arguments=json.dumps(call.get("arguments", {})), status="completed",
+            )
+        return ResponseOutputMessage(
+            id=f"msg_{uuid.uuid4().hex}", type="message", role="assistant", status="completed",
+            content=[ResponseOutputText(type="output_text", text=step["text"], annotations=[])],
+        )
+
+    async def get_response(self, system_instructions, input, model_settings, tools, output_schema, handoffs, tracing, **kwargs) -> ModelResponse:
+        started = time.perf_counter()
+        try:
+            latency_s = self._latency_s()
+            if latency_s:
+                await asyncio.sleep(latency_s)
+        finally:
+            # Counted even when the gateway cancels this call (a hedge's loser).
+            self.model_time_s += time.perf_counter() - started
+        self._maybe_fail()
+        item = self._output_item(input)
+        self.calls += 1
+        return ModelResponse(output=[item], usage=Usage(requests=1), response_id=None)
+
+    async def stream_response(self, system_instructions, input, model_settings, tools, output_schema, handoffs, tracing, **kwargs):
+        started = time.perf_counter()
+        try:
+            latency_s = self._latency_s()
+            first_chunk_s = latency_s * self.STREAM_FIRST_CHUNK_FRACTION
+            if first_chunk_s:
+                await asyncio.sleep(first_chunk_s)
+            self._maybe_fail()
+            item = self._output_item(input)
+            self.calls += 1
+            text = item.arguments if item.type == "function_call" else item.content[0].text
+            size = max(1, -(-len(text) // self.STREAM_CHUNKS))
+            chunks = [text[i:i + size] for i in range(0, len(text), size)] or [""]
+            sequence = itertools.count()
+            yield ResponseOutputItemAddedEvent(type="response.output_item.added", item=item, output_index=0, sequence_number=next(sequence))
+            for i, chunk in enumerate(chunks):
+                if i and latency_s:
+                    await asyncio.sleep((latency_s - first_chunk_s) / len(chunks))
+                if item.type == "function_call":
+                    yield ResponseFunctionCallArgumentsDeltaEvent(
+                        type="response.function_call_arguments.delta", delta=chunk, item_id=item.id,
+                        output_index=0, sequence_number=next(sequence),
+                    )
+                else:
+                    yield ResponseTextDeltaEvent(
+                        type="response.output_text.delta", delta=chunk, item_id=item.id, content_index=0,
+                        output_index=0, logprobs=[], sequence_number=next(sequence),
+                    )
+            yield ResponseOutputItemDoneEvent(type="response.output_item.done", item=item, output_index=0, sequence_number=next(sequence))
+            if latency_s:
+                await asyncio.sleep((latency_s - first_chunk_s) / len(chunks))
+            response = Response(
+                id=f"resp_{uuid.uuid4().hex}", created_at=time.time(), model="scripted", object="response",
+                output=[item], parallel_tool_calls=False, tool_choice="auto", tools=[],
+            )
+            yield ResponseCompletedEvent(type="response.completed", response=response, sequence_number=next(sequence))
+        finally:
+            # Counted up to where the consumer stopped reading.
+            self.model_time_s += time.perf_counter() - started
+
+# --- Scripts ---
+
+def _default_reflection(prompt: str) -> dict:
+    cycle_ids = re.findall(r'"cycle_id": "([^"]+)"', prompt.split("--- Trace 1 of", 1)[-1])
+    reflections = [
+        {"cycle_id": cycle_id, "summary": "Replayed cycle.", "value_score": 1, "value_type": "Routine",
+         "key_learning": "N/A", "new_tasks_proposed": None}
+        for cycle_id in cycle_ids
+    ]
+    return {"text": json.dumps({"reflections": reflections})}
+
+DEFAULT_SCRIPT: Dict[str, Responder] = {
+    # A cheap, real tool call, so tool execution is part of the measured cycle.
+    "Anamkore-Planner": lambda prompt: {"tool_call": {"name": "read_file", "arguments": {"path": "5-Current_Task.md"}}},
+    "Anamkore-Synthesizer": lambda prompt: {"text": "Replayed synthesis: the tool call completed."},
+    "AURA-Reflector": _default_reflection,
+}
+
+class RecordedScript:
+    """
+    Replays responses recorded as JSONL, one per line:
+    {"agent": "Anamkore-Planner", "tool_call": {"name": ..., "arguments": {...}}}
+    {"agent": "Anamkore-Synthesizer", "text": "..."}
+    Each agent's responses are replayed in order and then wrap around. Agents
+    with no recorded responses fall back to DEFAULT_SCRIPT.
+    """
+
+    def __init__(self, path: str):
+        self.steps: Dict[str, List[dict]] = {}
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    step = json.loads(line)
+                    self.steps.setdefault(step.pop("agent"), []).append(step)
+        self._positions: Dict[str, int] = {}
+
+    def responder(self, agent_name: str) -> Responder:
+        steps = self.steps.get(agent_name)
+        if not steps:
+            return DEFAULT_SCRIPT[agent_name]
+        def respond(prompt: str) -> dict:
+            position = self._positions.get(agent_name, 0)
+            self._positions[agent_name] = position + 1
+            return steps[position % len(steps)]
+        return respond
+
+def install_replay_models(script: Optional[RecordedScript] = None, latency_s: float = 0.0, error_rate: float = 0.0,
+                          tail_rate: float = 0.0, tail_latency_s: float = 0.0) -> Dict[str, ScriptedModel]:
+    """
+    Points every agent at a ScriptedModel, still behind the LLM gateway, with
+    a second ScriptedModel standing in for the fallback model hedges go to.
+    Returns the scripted models, keyed by agent name (fallbacks by
+    "<agent> (fallback)").
+    """
+    from . import agents as aura_agents
+    models = {}
+    for agent in (aura_agents.planner_agent, aura_agents.synthesizer_agent, aura_agents.reflector_agent):
+        respond = script.responder(agent.name) if script else DEFAULT_SCRIPT[agent.name]
+        model_name = agent.model.model_name if isinstance(agent.model, GatewayModel) else config.GEMINI_FLASH_MODEL
+        fallback_name = config.LLM_FALLBACK_MODELS.get(model_name, model_name)
+        models[agent.name] = ScriptedModel(respond, latency_s, error_rate, tail_rate, tail_latency_s)
+        models[f"{agent.name} (fallback)"] = ScriptedModel(respond, latency_s, error_rate, tail_rate, tail_latency_s)
+        agent.model = GatewayModel(models[agent.name], model_name, models[f"{agent.name} (fallback)"], fallback_name)
+    return models
+
+# --- Fixture Vault ---
+
+def generate_fixture_vault(path: str, journal_entries: int, tasks: int, done_fraction: float = 0.5, current_task: bool = True):
+    """Writes a vault with `journal_entries` cycle entries and a queue of `tasks` tasks."""
+    journal_dir = os.path.join(path, "2-Journal")
+    os.makedirs(journal_dir, exist_ok=True)
+    os.makedirs(os.path.join(path, "1-Inbox"), exist_ok=True)
+
+    done = int(tasks * done_fraction)
+    queue_lines = [f"- [{'x' if i < done else ' '}] T{i + 1}: Fixture task number {i + 1}." for i in range(tasks)]
+    with open(os.path.join(path, "3-Task_Queue.md"), "w", encoding="utf-8") as f:
+        f.write("# Task Queue\n\n" + "\n".join(queue_lines) + "\n")
+    with open(os.path.join(path, "4-Async_Mailbox.md"), "w", encoding="utf-8") as f:
+        f.write("# Asynchronous Mailbox\n")
+    with open(os.path.join(path, "5-Current_Task.md"), "w", encoding="utf-8") as f:
+        f.write(f"T{done + 1}: Fixture task number {done + 1}.\n" if current_task and done < tasks else "")
+
+    # Entries are dated in the past so cycles run by the benchmark sort after them.
+    start = datetime.now() - timedelta(days=30)
+    for i in range(journal_entries):
+        cycle_id = (start + timedelta(seconds=i)).isoformat()
+        trace = {
+            "directive": f"Your current task is: 'T{i % max(tasks, 1) + 1}'. Take the next logical step.",
+            "route": "llm",
+            "planner_output": f"Success: Wrote {i} bytes to 'Knowledge/fixture_{i}.md'.",
+            "synthesizer_output": f"Fixture cycle {i} completed.",
+        }
+        content = (
+            f"# Cognitive Cycle: {cycle_id}\n\n**Directive:** {trace['directive']}\n\n"
+            f"**Synthesizer Output:**\n{trace['synthesizer_output']}\n\n## Trace\n```json\n{json.dumps(trace, indent=2)}\n```\n"
+        )
+        filename = f"{(start + timedelta(seconds=i)).strftime('%Y-%m-%d_%H%M%S_%f')}_Cognitive_Cycle_fixture.md"
+        with open(os.path.join(journal_dir, filename), "w", encoding="utf-8") as f:
+            f.write(content)
+
+# --- Benchmark ---
+
+REPLAY_UNLIMITED = 1e9
+
+class _PhaseTimer:
+    def __init__(self):
+        self.totals: Dict[str, float] = {}
+
+    def wrap(self, name: str, fn):
+        if asyncio.iscoroutinefunction(fn):
+            async def timed(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    self.totals[name] = self.totals.get(name, 0.0) + time.perf_counter() - started
+        else:
+            def timed(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.totals[name] = self.totals.get(name, 0.0) + time.perf_counter() - started
+        return timed
+
+    def wrap_stream(self, name: str, fn):
+        async def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                async for event in fn(*args, **kwargs):
+                    yield event
+            finally:
+                self.totals[name] = self.totals.get(name, 0.0) + time.perf_counter() - started
+        return timed
+
+def _summarize(label: str, samples_s: List[float]) -> str:
+    ms = sorted(s * 1000 for s in samples_s)
+    p95 = ms[min(len(ms) - 1, int(len(ms) * 0.95))]
+    p99 = ms[min(len(ms) - 1, int(len(ms) * 0.99))]
+    return f"{label:<28} median {statistics.median(ms):>8.2f} ms   p95 {p95:>8.2f} ms   p99 {p99:>8.2f} ms   max {ms[-1]:>8.2f} ms"
+
+async def run_benchmark(cycles: int, latency_s: float, script: Optional[RecordedScript] = None, quiet: bool = True, error_rate: float = 0.0,
+                        tail_rate: float = 0.0, tail_latency_s: float = 0.0) -> Dict[str, List[float]]:
+    """Runs `cycles` cognitive cycles against the current vault and returns per-cycle phase timings."""
+    from . import cognitive_step
+    from . import agents as aura_agents
+    install_replay_models(script, latency_s, error_rate, tail_rate, tail_latency_s)
+    timer = _PhaseTimer()
+    # Model time is what the cycle waited on its model calls, through the
+    # gateway: with hedging, overlapping requests count once.
+    for agent in (aura_agents.planner_agent, aura_agents.synthesizer_agent):
+        agent.model.get_response = timer.wrap("model", agent.model.get_response)
+        agent.model.stream_response = timer.wrap_stream("model", agent.model.stream_response)
+    phases = {
+        "journal context": "_get_latest_journal_entry",
+        "directive selection": "resolve_directive",
+        "journaling": "_write_journal",
+    }
+    originals = {attr: getattr(cognitive_step, attr) for attr in phases.values()}
+    for name, attr in phases.items():
+        setattr(cognitive_step, attr, timer.wrap(name, originals[attr]))
+
+    samples: Dict[str, List[float]] = {"cycle (wall)": [], "model (scripted)": [], "orchestrator overhead": []}
+    samples.update({name: [] for name in phases})
+    if config.STREAM_MODEL_OUTPUT:
+        samples.update({"planner tool ready": [], "synthesis first token": []})
+    try:
+        for _ in range(cycles):
+            timer.totals.clear()
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()) if quiet else contextlib.nullcontext():
+                await cognitive_step.perform_cognitive_step()
+            wall = time.perf_counter() - started
+            model = timer.totals.get("model", 0.0)
+            samples["cycle (wall)"].append(wall)
+            samples["model (scripted)"].append(model)
+            samples["orchestrator overhead"].append(wall - model)
+            for name in phases:
+                samples[name].append(timer.totals.get(name, 0.0))
+            if config.STREAM_MODEL_OUTPUT and STREAM_TIMINGS["synthesis_first_token_s"] is not None:
+                samples["planner tool ready"].append(STREAM_TIMINGS["planner_tool_ready_s"] or 0.0)
+                samples["synthesis first token"].append(STREAM_TIMINGS["synthesis_first_token_s"])
+    finally:
+        for attr, fn in originals.items():
+            setattr(cognitive_step, attr, fn)
+    return samples
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks Anamkore cognitive cycles offline against a scripted model.")
+    parser.add_argument("--journal-entries", type=int, default=1000, help="Journal entries in the fixture vault.")
+    parser.add_argument("--tasks", type=int, default=100, help="Tasks in the fixture task queue.")
+    parser.add_argument("--done-fraction", type=float, default=0.5, help="Fraction of fixture tasks already done.")
+    parser.add_argument("--cycles", type=int, default=20, help="Cognitive cycles to run.")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Artificial latency of every model call.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of model calls that fail with a 429.")
+    parser.add_argument("--tail-rate", type=float, default=0.0, help="Fraction of model calls that are slow (the latency tail).")
+    parser.add_argument("--tail-latency-ms", type=float, default=0.0, help="Latency of the slow calls.")
+    parser.add_argument("--no-hedge", action="store_true", help="Disable hedged requests, for comparison.")
+    parser.add_argument("--no-stream", action="store_true", help="Wait for whole model responses instead of streaming, for comparison.")
+    parser.add_argument("--rpm", type=float, default=0, help="Gateway requests-per-minute limit per model (default: unlimited).")
+    parser.add_argument("--tpm", type=float, default=0, help="Gateway tokens-per-minute limit per model (default: unlimited).")
+    parser.add_argument("--idle", action="store_true", help="Start with no current task (exercises the directive fast path).")
+    parser.add_argument("--script", help="A JSONL file of recorded model responses to replay.")
+    parser.add_argument("--vault", help="Run against this vault instead of a generated fixture (it WILL be written to).")
+    parser.add_argument("--verbose", action="store_true", help="Show the cycles' own output.")
+    args = parser.parse_args()
+
+    script = RecordedScript(args.script) if args.script else None
+    config.STREAM_MODEL_OUTPUT = not args.no_stream
+    with tempfile.TemporaryDirectory(prefix="anamkore_replay_") as fixture_dir:
+        if args.vault:
+            config.VAULT_PATH = os.path.abspath(args.vault)
+        else:
+            config.VAULT_PATH = fixture_dir
+            started = time.perf_counter()
+            generate_fixture_vault(fixture_dir, args.journal_entries, args.tasks, args.done_fraction, current_task=not args.idle)
+            print(f"Fixture vault: {args.journal_entries} journal entries, {args.tasks} tasks "
+                  f"(generated in {time.perf_counter() - started:.1f} s)")
+
+        # Offline runs are not paced by the live key's limits unless asked to be.
+        limits = (args.rpm or REPLAY_UNLIMITED, args.tpm or REPLAY_UNLIMITED)
+        model_names = (config.GEMINI_FLASH_MODEL, config.GEMINI_FLASH_FALLBACK_MODEL, config.GEMINI_PRO_MODEL)
+        configure_gateway(model_limits={name: limits for name in model_names}, hedging=not args.no_hedge)
+        samples = asyncio.run(run_benchmark(
+            args.cycles, args.latency_ms / 1000, script, quiet=not args.verbose, error_rate=args.error_rate,
+            tail_rate=args.tail_rate, tail_latency_s=args.tail_latency_ms / 1000,
+        ))
+        tail = f", {args.tail_rate:.0%} of calls at {args.tail_latency_ms:g} ms" if args.tail_rate else ""
+        print(f"\n{args.cycles} cycle(s), {args.latency_ms:g} ms artificial model latency{tail}:")
+        for label, values in samples.items():
+            if values:
+                print(_summarize(label, values))
+        print(format_gateway_stats())
+
+if __name__ == "__main__":
+    main()
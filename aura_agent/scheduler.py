@@ -0,0 +1,148 @@
+# aura_agent/scheduler.py
+
+import argparse
+import asyncio
+import time
+from typing import Dict, Optional
+from . import config
+from .core_logic import _load_tasks, _set_task_status, _set_current_task, worker_context
+from .task_graph import TaskGraph, critical_path
+
+# ---
+# Self-Correction Note for Anamkore:
+# The core loop works one task at a time, so a wide backlog took as long as
+# its length. The scheduler dispatches every ready task of the task DAG
+# (`task_graph.py`) to one of N concurrent workers in this process. Each
+# worker runs ordinary background cognitive cycles on its task, with its own
+# current-task file and journal thread, until the queue marks the task done
+# or failed. Finishing a task releases its dependents into the ready set.
+# At the end it reports the makespan against the critical path, the longest
+# chain of dependent work: with enough workers the two converge, i.e. the
+# backlog finishes in time bounded by its depth rather than its length.
+# Like the core loop, the scheduler assumes it owns the vault; tasks left
+# `[~]` by an interrupted run are picked up again. Run it with:
+#   python -m aura_agent.scheduler --workers 4
+# ---
+
+class DagScheduler:
+    def __init__(self, workers: int, max_cycles_per_task: Optional[int] = None):
+        self.workers = max(1, workers)
+        self.max_cycles_per_task = max_cycles_per_task or config.SCHEDULER_MAX_CYCLES_PER_TASK
+        self.graph = TaskGraph(ready_statuses=("todo", "in_progress"))
+        self.started: Dict[str, float] = {}
+        self.finished: Dict[str, float] = {}
+        self.cycles = 0
+        self.makespan_s = 0.0
+
+    def _status(self, task_id: str) -> Optional[str]:
+        return next((t.status for t in _load_tasks() or [] if t.id == task_id), None)
+
+    async def _run_task(self, worker_id: str, task_id: str, description: str) -> str:
+        """Runs cycles on one task until the queue marks it done or failed; returns its final status."""
+        from .cognitive_step import perform_cognitive_step
+        with worker_context(worker_id):
+            _set_task_status(task_id, "in_progress")
+            _set_current_task(f"{task_id}: {description}")
+            try:
+                for _ in range(self.max_cycles_per_task):
+                    await perform_cognitive_step()
+                    self.cycles += 1
+                    status = self._status(task_id)
+                    if status in ("done", "failed", None):
+                        return status or "failed"
+                print(f"[{worker_id}] Giving up on {task_id} after {self.max_cycles_per_task} cycle(s).")
+                _set_task_status(task_id, "failed")
+                return "failed"
+            except Exception as e:
+                print(f"[{worker_id}] Task {task_id} failed: {e}")
+                _set_task_status(task_id, "failed")
+                return "failed"
+            finally:
+                _set_current_task("")
+
+    async def run(self):
+        tasks = _load_tasks()
+        if tasks is None:
+            print("Error: Could not read the task queue.")
+            return
+        self.graph.sync(tasks)
+        free = [f"worker-{i}" for i in range(self.workers, 0, -1)]
+        running: Dict[asyncio.Task, tuple] = {}
+        started = time.monotonic()
+        while True:
+            while free:
+                task = self.graph.pop_ready()
+                if task is None:
+                    break
+                worker_id = free.pop()
+                self.started[task.id] = time.monotonic()
+                print(f"[{worker_id}] Starting {task.id}: {task.description}")
+                job = asyncio.create_task(self._run_task(worker_id, task.id, task.description), name=f"task-{task.id}")
+                running[job] = (worker_id, task.id)
+            if not running:
+                break
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for job in done:
+                worker_id, task_id = running.pop(job)
+                free.append(worker_id)
+                self.finished[task_id] = time.monotonic()
+                if job.result() == "done":
+                    released = self.graph.mark_done(task_id)
+                    print(f"[{worker_id}] Finished {task_id}." + (f" Now ready: {', '.join(released)}." if released else ""))
+                else:
+                    self.graph.mark_failed(task_id)
+                    print(f"[{worker_id}] {task_id} failed.")
+            # Picks up tasks the planner added, and tasks finished outside the scheduler.
+            self.graph.sync(_load_tasks() or [])
+        self.makespan_s = time.monotonic() - started
+
+    def format_stats(self) -> str:
+        tasks = list(self.graph.tasks.values())
+        done = [t for t in tasks if t.status == "done" and t.id in self.finished]
+        failed = [t.id for t in tasks if t.status == "failed" and t.id in self.finished]
+        durations = {task_id: self.finished[task_id] - self.started[task_id] for task_id in self.finished}
+        path_s, path = critical_path(done, durations)
+        blocked = self.graph.blocked()
+        lines = [
+            f"Scheduler: {len(done)} task(s) done, {len(failed)} failed, in {self.makespan_s:.1f} s "
+            f"with {self.workers} worker(s) ({self.cycles} cycle(s)).",
+            f"Critical path: {path_s:.1f} s ({' -> '.join(path) or 'none'}); "
+            f"serial time would have been {sum(durations.values()):.1f} s.",
+        ]
+        if failed:
+            lines.append(f"Failed: {', '.join(failed)}.")
+        if blocked:
+            lines.append("Blocked: " + "; ".join(f"{t} waits on {', '.join(deps)}" for t, deps in blocked.items()) + ".")
+        return "\n".join(lines)
+
+async def run_scheduler(workers: int, max_cycles_per_task: Optional[int] = None) -> DagScheduler:
+    from .llm_gateway import configure_gateway, format_gateway_stats
+    from .reflection_worker import start_reflection_worker, stop_reflection_worker
+    # Every call is background work; no slot is kept for interactive ones.
+    configure_gateway(interactive_reserved=0)
+    start_reflection_worker()
+    scheduler = DagScheduler(workers, max_cycles_per_task)
+    try:
+        await scheduler.run()
+    finally:
+        await stop_reflection_worker()
+        print(scheduler.format_stats())
+        print(format_gateway_stats())
+    return scheduler
+
+def main():
+    parser = argparse.ArgumentParser(description="Works the task queue's dependency graph with concurrent workers.")
+    parser.add_argument("--workers", type=int, default=config.LLM_MAX_IN_FLIGHT, help="Tasks worked on at once.")
+    parser.add_argument("--max-cycles-per-task", type=int, help="Cycles before a task is marked failed.")
+    args = parser.parse_args()
+
+    from .initialization import initialize_vault_sync
+    config.require_api_key()
+    initialize_vault_sync()
+    try:
+        asyncio.run(run_scheduler(args.workers, args.max_cycles_per_task))
+    except KeyboardInterrupt:
+        print("\n--- Scheduler stopped by user. ---")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# aura_agent/streaming.py
+
+import time
+from typing import Dict, Optional
+from agents import Agent, Runner, RunConfig, RunContextWrapper
+from agents.exceptions import ModelBehaviorError
+from agents.models.interface import Model, ModelTracing
+from agents.stream_events import RawResponsesStreamEvent
+from agents.tool import FunctionTool
+from agents.tool_context import ToolContext
+
+# ---
+# Self-Correction Note for Anamkore:
+# Both passes used to be silent until the model had finished: the user saw
+# nothing until the whole synthesis had been generated, and the planner's
+# tool only ran once the model's response was complete. Now:
+#   - The synthesis pass runs with `Runner.run_streamed` and prints text
+#     deltas as they arrive; the accumulated text is what gets journaled.
+#   - The planner streams its response directly from the model and runs
+#     the tool the moment the function call's arguments are complete
+#     (`response.output_item.done`), closing the stream (and with it the
+#     gateway slot) first instead of waiting for the rest of it. The SDK's
+#     streamed runner would only run the tool after `response.completed`.
+#     Like `stop_on_first_tool`, the first tool's output is the planner's
+#     output.
+# ---
+
+# Seconds from the start of each pass to its first visible result, for the
+# most recent cycle. Read by `replay` to report time-to-first-token.
+STREAM_TIMINGS: Dict[str, Optional[float]] = {"planner_tool_ready_s": None, "synthesis_first_token_s": None}
+
+async def stream_planner_tool_call(agent: Agent, prompt: str, run_config: RunConfig) -> str:
+    """Runs `agent`'s first tool call as soon as it has been streamed; returns its output (or the model's text)."""
+    if not isinstance(agent.model, Model):
+        # A model given by name needs the SDK's provider lookup; use the runner.
+        result = await Runner.run(agent, prompt, run_config=run_config)
+        return str(result.final_output)
+
+    started = time.perf_counter()
+    STREAM_TIMINGS["planner_tool_ready_s"] = None
+    context = RunContextWrapper(context=None)
+    system_prompt = await agent.get_system_prompt(context)
+    tools = await agent.get_all_tools(context)
+    tracing = ModelTracing.DISABLED if run_config.tracing_disabled else ModelTracing.ENABLED
+    events = agent.model.stream_response(
+        system_prompt, prompt, agent.model_settings.resolve(run_config.model_settings), tools, None, [], tracing,
+        previous_response_id=None, prompt=None,
+    )
+    text_parts = []
+    call = None
+    try:
+        async for event in events:
+            if event.type == "response.output_text.delta":
+                text_parts.append(event.delta)
+            elif event.type == "response.output_item.done" and event.item.type == "function_call":
+                call = event.item
+                break
+    finally:
+        # Stop generating: nothing after the first tool call is used. Closing
+        # before the tool runs frees the gateway slot and settles the call's usage.
+        await events.aclose()
+    if call is None:
+        return "".join(text_parts)
+    tool = next((t for t in tools if isinstance(t, FunctionTool) and t.name == call.name), None)
+    if tool is None:
+        raise ModelBehaviorError(f"Tool {call.name} not found in agent {agent.name}")
+    STREAM_TIMINGS["planner_tool_ready_s"] = time.perf_counter() - started
+    print(f"Tool call ready: {call.name}({call.arguments})")
+    output = await tool.on_invoke_tool(ToolContext(context=None, tool_call_id=call.call_id), call.arguments)
+    return str(output)
+
+async def stream_synthesis(agent: Agent, prompt: str, run_config: RunConfig) -> str:
+    """Runs `agent` with streaming, printing its answer as it is generated; returns the full text."""
+    started = time.perf_counter()
+    STREAM_TIMINGS["synthesis_first_token_s"] = None
+    result = Runner.run_streamed(agent, prompt, run_config=run_config)
+    text_parts = []
+    async for event in result.stream_events():
+        if isinstance(event, RawResponsesStreamEvent) and event.data.type == "response.output_text.delta":
+            if not text_parts:
+                STREAM_TIMINGS["synthesis_first_token_s"] = time.perf_counter() - started
+                print("\n[ANAMKORE]: ", end="", flush=True)
+            text_parts.append(event.data.delta)
+            print(event.data.delta, end="", flush=True)
+    if text_parts:
+        print()
+    return str(result.final_output) if result.final_output is not None else "".join(text_parts)
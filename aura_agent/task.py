@@ -1,26 +1,43 @@
 # aura_agent/task.py
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Literal, List, Optional
 # --- NEW: Import BaseModel and Field from Pydantic ---
 from pydantic import BaseModel, Field
 
+# MODIFIED: Tasks now form a dependency graph (see `task_graph.py`). In the
+# queue file a task is written as
+#   - [ ] T3: Description (depends_on: T1, T2) (priority: 1)
+# with `[~]` for in progress and `[!]` for failed. The suffixes are only
+# written when set, so plain lists keep their old format.
+TaskStatus = Literal["todo", "in_progress", "done", "failed"]
+STATUS_MARKERS = {"todo": " ", "in_progress": "~", "done": "x", "failed": "!"}
+
 @dataclass
 class Task:
     """A dataclass for internal agent logic and state representation."""
     id: str
-    status: Literal["todo", "done"]
+    status: TaskStatus
     description: str
+    depends_on: List[str] = field(default_factory=list)
+    # Among ready tasks, higher priorities are started first; ties keep queue order.
+    priority: int = 0
 
     def __str__(self):
-        status_marker = "[x]" if self.status == "done" else "[ ]"
-        return f"- {status_marker} {self.id}: {self.description}"
+        line = f"- [{STATUS_MARKERS[self.status]}] {self.id}: {self.description}"
+        if self.depends_on:
+            line += f" (depends_on: {', '.join(self.depends_on)})"
+        if self.priority:
+            line += f" (priority: {self.priority})"
+        return line
 
 class TaskModel(BaseModel):
     """A Pydantic model to define the strict data schema for the tool."""
     id: str
-    status: Literal["todo", "done"]
+    status: TaskStatus
     description: str
+    depends_on: Optional[List[str]] = Field(default=None, description="IDs of tasks that must be done first; null keeps the current dependencies.")
+    priority: Optional[int] = Field(default=None, description="Higher runs first among ready tasks; null keeps the current priority.")
 
 @dataclass
 class TaskQueue:
@@ -34,4 +51,12 @@ class Reflection(BaseModel):
     value_score: int = Field(description="An integer from 1 (trivial) to 5 (transformative) representing the learning value of this cycle.")
     value_type: Literal["Correction", "Insight", "Hypothesis", "Synthesis", "Execution", "Routine"] = Field(description="The primary category of value for this cycle.")
     key_learning: str = Field(description="The single most important lesson, insight, or correction from the cycle. If a value_score is less than 3, this can be 'N/A'.")
-    new_tasks_proposed: Optional[List[str]] = Field(default=None, description="A list of new task descriptions proposed as a result of this learning.")
\ No newline at end of file
+    new_tasks_proposed: Optional[List[str]] = Field(default=None, description="A list of new task descriptions proposed as a result of this learning.")
+# --- NEW: Batched reflections, so one reflector call can score several cycles. ---
+class CycleReflection(Reflection):
+    """A `Reflection` tied to the cognitive cycle it scores."""
+    cycle_id: str = Field(description="The `cycle_id` of the trace this reflection is about, copied exactly.")
+
+class ReflectionBatch(BaseModel):
+    """Structured reflections on a batch of completed cognitive cycles, one per trace."""
+    reflections: List[CycleReflection] = Field(description="One reflection for every trace in the batch, in the same order.")
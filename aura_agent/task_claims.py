@@ -0,0 +1,158 @@
+# aura_agent/task_claims.py
+
+import contextlib
+import fcntl
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+from . import config
+
+# ---
+# Self-Correction Note for Anamkore:
+# With several worker processes on one vault (`fleet.py`), "take the first
+# todo task" is a race: two workers read the same queue and start the same
+# task. Workers now claim tasks in a SQLite table under the vault's `.fleet/`
+# directory. A claim is taken inside one `BEGIN IMMEDIATE` transaction, so
+# exactly one worker gets it, and it is a lease: the holder renews it every
+# cycle, and a claim whose lease has expired (its worker crashed or hung) can
+# be taken by any other worker. The task queue file itself stays the source
+# of truth for what is done; the table only records who is working on what.
+# ---
+
+CLAIMS_DB = "claims.sqlite3"
+QUEUE_LOCK = "queue.lock"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS claims (
+    task_id TEXT PRIMARY KEY,
+    worker_id TEXT NOT NULL,
+    claimed_at REAL NOT NULL,
+    lease_expires REAL NOT NULL,
+    completed_at REAL
+);
+CREATE TABLE IF NOT EXISTS workers (
+    worker_id TEXT PRIMARY KEY,
+    pid INTEGER,
+    started_at REAL,
+    last_seen REAL,
+    cycles INTEGER NOT NULL DEFAULT 0,
+    tasks_done INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+def fleet_path(name: str) -> str:
+    path = os.path.join(config.VAULT_PATH, config.FLEET_DIR)
+    os.makedirs(path, exist_ok=True)
+    return os.path.join(path, name)
+
+class TaskClaims:
+    """Leased task claims and worker heartbeats, shared by every process on the vault."""
+
+    def __init__(self, path: Optional[str] = None, lease_s: Optional[float] = None):
+        self.path = path or fleet_path(CLAIMS_DB)
+        self.lease_s = lease_s if lease_s is not None else config.FLEET_LEASE_S
+        # Autocommit mode: transactions are opened explicitly with BEGIN IMMEDIATE.
+        self._conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def claim_next(self, worker_id: str, task_ids: List[str]) -> Optional[str]:
+        """Claims the first of `task_ids` (ready tasks, in the order to start them) no live lease holds; returns it or None."""
+        now = time.time()
+        with self._transaction() as conn:
+            for task_id in task_ids:
+                row = conn.execute("SELECT worker_id, lease_expires, completed_at FROM claims WHERE task_id = ?", (task_id,)).fetchone()
+                # A completed claim on a todo task means the task was reopened.
+                if row and row["completed_at"] is None and row["lease_expires"] > now and row["worker_id"] != worker_id:
+                    continue
+                conn.execute(
+                    "INSERT OR REPLACE INTO claims (task_id, worker_id, claimed_at, lease_expires, completed_at) VALUES (?, ?, ?, ?, NULL)",
+                    (task_id, worker_id, now, now + self.lease_s),
+                )
+                return task_id
+        return None
+
+    def renew(self, worker_id: str, task_id: str) -> bool:
+        """Extends `worker_id`'s lease on `task_id`. False if the claim was lost to another worker."""
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE claims SET lease_expires = ? WHERE task_id = ? AND worker_id = ? AND completed_at IS NULL",
+                (time.time() + self.lease_s, task_id, worker_id),
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, worker_id: str, task_id: str) -> bool:
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE claims SET completed_at = ? WHERE task_id = ? AND worker_id = ? AND completed_at IS NULL",
+                (time.time(), task_id, worker_id),
+            )
+            if cursor.rowcount:
+                conn.execute("UPDATE workers SET tasks_done = tasks_done + 1 WHERE worker_id = ?", (worker_id,))
+            return cursor.rowcount == 1
+
+    def release(self, worker_id: str, task_id: str):
+        """Gives up an unfinished claim, e.g. when a worker is stopped."""
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM claims WHERE task_id = ? AND worker_id = ? AND completed_at IS NULL", (task_id, worker_id))
+
+    def heartbeat(self, worker_id: str, cycles: int = 0):
+        """Records that `worker_id` is alive, adding `cycles` to its cycle count."""
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO workers (worker_id, pid, started_at, last_seen, cycles) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(worker_id) DO UPDATE SET pid = excluded.pid, last_seen = excluded.last_seen, cycles = cycles + excluded.cycles",
+                (worker_id, os.getpid(), now, now, cycles),
+            )
+
+    def active_claims(self) -> Dict[str, str]:
+        """Unexpired, unfinished claims: task id -> worker id."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT task_id, worker_id FROM claims WHERE completed_at IS NULL AND lease_expires > ?", (time.time(),)
+            ).fetchall()
+        return {row["task_id"]: row["worker_id"] for row in rows}
+
+    def stats(self, since: float = 0.0) -> Dict[str, object]:
+        """Tasks completed since `since`, plus per-worker totals."""
+        with self._lock:
+            done = self._conn.execute("SELECT COUNT(*) FROM claims WHERE completed_at >= ?", (since,)).fetchone()[0]
+            workers = self._conn.execute("SELECT worker_id, cycles, tasks_done, last_seen FROM workers ORDER BY worker_id").fetchall()
+        return {"tasks_done": done, "workers": [dict(row) for row in workers]}
+
+    def close(self):
+        self._conn.close()
+
+@contextlib.contextmanager
+def queue_lock():
+    """An exclusive lock on the task queue, for read-modify-write updates across processes."""
+    with open(fleet_path(QUEUE_LOCK), "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+_claims: Optional[TaskClaims] = None
+
+def get_claims() -> TaskClaims:
+    global _claims
+    if _claims is None or _claims.path != fleet_path(CLAIMS_DB):
+        _claims = TaskClaims()
+    return _claims
@@ -0,0 +1,129 @@
+# aura_agent/task_graph.py
+
+import heapq
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from .task import Task
+
+# ---
+# Self-Correction Note for Anamkore:
+# The queue used to be a flat list worked strictly in order, so independent
+# tasks waited on each other. Tasks now declare `depends_on` and a
+# `priority`, and a task is *ready* once all its dependencies are done.
+# `TaskGraph` keeps the ready set incrementally: each task counts its
+# unfinished dependencies, and finishing a task only visits its own
+# dependents, not the whole queue. `critical_path` gives the longest chain of
+# dependent work, the lower bound on how fast any number of workers can
+# finish a backlog.
+# ---
+
+def ready_tasks(tasks: Sequence[Task], statuses: Tuple[str, ...] = ("todo",)) -> List[Task]:
+    """Tasks in `statuses` whose dependencies are all done: highest priority first, then queue order."""
+    done = {t.id for t in tasks if t.status == "done"}
+    ready = [(i, t) for i, t in enumerate(tasks) if t.status in statuses and all(d in done for d in t.depends_on)]
+    return [t for _, t in sorted(ready, key=lambda pair: (-pair[1].priority, pair[0]))]
+
+class TaskGraph:
+    """The ready set of a task DAG, maintained as tasks finish."""
+
+    def __init__(self, tasks: Iterable[Task] = (), ready_statuses: Tuple[str, ...] = ("todo",)):
+        self.ready_statuses = ready_statuses
+        self.tasks: Dict[str, Task] = {}
+        self._position: Dict[str, int] = {}
+        self._dependents: Dict[str, List[str]] = defaultdict(list)
+        self._unfinished: Dict[str, int] = {}
+        self._ready: List[Tuple[int, int, str]] = []  # (-priority, queue position, id)
+        self._taken: set = set()
+        self.sync(tasks)
+
+    def _push_if_ready(self, task_id: str):
+        task = self.tasks[task_id]
+        if self._unfinished[task_id] == 0 and task.status in self.ready_statuses and task_id not in self._taken:
+            heapq.heappush(self._ready, (-task.priority, self._position[task_id], task_id))
+
+    def sync(self, tasks: Iterable[Task]):
+        """Adds tasks not seen before and applies done/failed states set outside the graph."""
+        added, finished = [], []
+        for task in tasks:
+            known = self.tasks.get(task.id)
+            if known is None:
+                self.tasks[task.id] = Task(**task.__dict__)
+                self._position[task.id] = len(self._position)
+                added.append(task.id)
+            elif task.status in ("done", "failed") and known.status != task.status and task.id not in self._taken:
+                finished.append(task)
+        for task_id in added:
+            task = self.tasks[task_id]
+            self._unfinished[task_id] = 0
+            # A dependency listed twice is still one dependency.
+            for dep in dict.fromkeys(task.depends_on):
+                self._dependents[dep].append(task_id)
+                if self.tasks.get(dep) is None or self.tasks[dep].status != "done":
+                    self._unfinished[task_id] += 1
+            # A task added after its dependents were already counted against it.
+            if task.status == "done":
+                self._release_dependents(task_id, only=set(self._dependents[task_id]) - set(added))
+        for task_id in added:
+            self._push_if_ready(task_id)
+        for task in finished:
+            (self.mark_done if task.status == "done" else self.mark_failed)(task.id)
+
+    def _release_dependents(self, task_id: str, only: Optional[set] = None) -> List[str]:
+        released = []
+        for dependent in self._dependents[task_id]:
+            if only is not None and dependent not in only:
+                continue
+            self._unfinished[dependent] -= 1
+            if self._unfinished[dependent] == 0:
+                self._push_if_ready(dependent)
+                released.append(dependent)
+        return released
+
+    def pop_ready(self) -> Optional[Task]:
+        """The highest-priority ready task, marked as taken; None if nothing is ready."""
+        while self._ready:
+            _, _, task_id = heapq.heappop(self._ready)
+            task = self.tasks[task_id]
+            if task_id not in self._taken and task.status in self.ready_statuses and self._unfinished[task_id] == 0:
+                self._taken.add(task_id)
+                return task
+        return None
+
+    def mark_done(self, task_id: str) -> List[str]:
+        """Marks a task done; returns the dependents that became ready."""
+        self._taken.discard(task_id)
+        if self.tasks[task_id].status == "done":
+            return []
+        self.tasks[task_id].status = "done"
+        return self._release_dependents(task_id)
+
+    def mark_failed(self, task_id: str):
+        # Its dependents stay waiting; `blocked` reports them.
+        self._taken.discard(task_id)
+        self.tasks[task_id].status = "failed"
+
+    def blocked(self) -> Dict[str, List[str]]:
+        """Unfinished tasks that can never become ready, with the dependencies they wait on."""
+        return {
+            task_id: [d for d in dict.fromkeys(task.depends_on) if d not in self.tasks or self.tasks[d].status != "done"]
+            for task_id, task in self.tasks.items()
+            if task.status not in ("done", "failed") and self._unfinished[task_id] > 0
+        }
+
+def critical_path(tasks: Iterable[Task], durations: Dict[str, float]) -> Tuple[float, List[str]]:
+    """The longest chain of dependent tasks by duration, and its length; tasks without a duration count 0."""
+    by_id = {t.id: t for t in tasks}
+    memo: Dict[str, Tuple[float, List[str]]] = {}
+    # On equal durations the longer chain wins, so tasks without a duration stay on the path.
+    length = lambda pair: (pair[0], len(pair[1]))
+
+    def longest_to(task_id: str, visiting: frozenset) -> Tuple[float, List[str]]:
+        if task_id not in memo:
+            best = (0.0, [])
+            for dep in by_id[task_id].depends_on:
+                if dep in by_id and dep not in visiting:
+                    best = max(best, longest_to(dep, visiting | {task_id}), key=length)
+            memo[task_id] = (best[0] + durations.get(task_id, 0.0), best[1] + [task_id])
+        return memo[task_id]
+
+    return max((longest_to(task_id, frozenset()) for task_id in by_id), default=(0.0, []), key=length)
@@ -0,0 +1,63 @@
+# aura_agent/vault_watcher.py
+
+import os
+from . import config
+from . import core_logic
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+
+# ---
+# Self-Correction Note for Anamkore:
+# The vault read cache in `core_logic` validates every hit with one stat.
+# When `watchdog` is installed, this watcher drops cache entries as soon as
+# the OS reports a change (inotify on Linux), which lets `_read_file` trust
+# cached entries without the stat. Without `watchdog` nothing changes: the
+# stat validation keeps the cache correct on its own.
+# ---
+
+# --- NEW: Callbacks for changes to one file, e.g. the mailbox waking the main loop ---
+# They run on the watcher's thread.
+_listeners = {}
+
+def add_change_listener(path: str, callback):
+    _listeners.setdefault(os.path.abspath(path), []).append(callback)
+
+class _VaultEventHandler(FileSystemEventHandler):
+    def on_any_event(self, event):
+        if event.is_directory:
+            return
+        for path in (event.src_path, getattr(event, "dest_path", None)):
+            if path:
+                core_logic._invalidate_vault_cache(path)
+                for callback in _listeners.get(os.path.abspath(path), ()):
+                    callback()
+
+_observer = None
+
+def start_vault_watcher() -> bool:
+    """Starts watching the vault. Returns False if `watchdog` is not installed."""
+    global _observer
+    if Observer is None:
+        return False
+    if _observer is None:
+        _observer = Observer()
+        _observer.schedule(_VaultEventHandler(), config.VAULT_PATH, recursive=True)
+        _observer.daemon = True
+        _observer.start()
+        # Anything read before the watcher started may already be stale.
+        core_logic._invalidate_vault_cache()
+        core_logic._vault_watched = True
+    return True
+
+def stop_vault_watcher():
+    global _observer
+    if _observer is not None:
+        core_logic._vault_watched = False
+        _observer.stop()
+        _observer.join()
+        _observer = None
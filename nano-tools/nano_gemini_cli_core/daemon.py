@@ -0,0 +1,370 @@
+# nano-tools/nano_gemini_cli_core/daemon.py
+import os
+import sys
+import json
+import socket
+import asyncio
+import inspect
+import argparse
+import threading
+import contextlib
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from . import tool_registry
+
+# ---
+# A long-lived process that serves the tools over a Unix-domain socket, so
+# imports, project contexts (git roots, ignore rules), file indexes and the
+# web/search caches stay warm across agent runs and are shared by every
+# client. The protocol is JSON-RPC 2.0, one JSON object per line, with
+# MCP-style method names:
+#   tools/list                      -> {"tools": [function schemas]}
+#   tools/call {name, arguments, cwd, conversation?} -> the tool's result dict
+#   ping, stats, shutdown
+# Tools resolve relative paths against the process CWD, so calls run inside
+# the client's `cwd`: calls for the same directory run concurrently, a call
+# for another directory waits for them to finish before switching. Waiting
+# calls are admitted in arrival order, so a stream of calls for one
+# directory cannot starve a call for another; a single long call (e.g. a
+# slow shell command) still holds its directory until it finishes.
+# ---
+
+# --- Daemon Configuration ---
+MAX_MESSAGE_BYTES = 64 * 1024 * 1024
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+TOOL_ERROR = -32000
+
+def default_socket_path() -> str:
+    return os.environ.get("NANO_TOOLS_SOCKET") or os.path.join(os.path.expanduser("~"), ".gemini", "nano-tools.sock")
+
+class DaemonError(Exception):
+    """An error response from the daemon."""
+
+    def __init__(self, message: str, code: int = TOOL_ERROR):
+        super().__init__(message)
+        self.code = code
+
+class ToolDaemon:
+    def __init__(self, socket_path: Optional[str] = None, watch: bool = True):
+        self.socket_path = socket_path or default_socket_path()
+        self.watch = watch
+        self.stats = {"connections": 0, "requests": 0, "errors": 0, "directory_switches": 0}
+        self._cwd = os.getcwd()
+        self._active_calls = 0
+        # Calls waiting to enter their directory, oldest first.
+        self._waiters: Deque[Tuple[str, asyncio.Future]] = deque()
+        self._stopping: Optional[asyncio.Event] = None
+        self._watched_dirs = set()
+
+    # --- Working Directory ---
+
+    # Everything below runs on the event loop thread without awaiting in
+    # between, so the counters need no lock.
+
+    def _can_enter(self, cwd: str) -> bool:
+        return self._active_calls == 0 or self._cwd == cwd
+
+    def _enter(self, cwd: str):
+        if self._active_calls == 0:
+            # chdir even for the same path: the directory may have been
+            # deleted and recreated since, leaving us in a stale inode.
+            os.chdir(cwd)
+            if self._cwd != cwd:
+                self._cwd = cwd
+                self.stats["directory_switches"] += 1
+        self._active_calls += 1
+
+    def _admit_waiters(self):
+        """Lets in waiting calls from the front of the queue for as long as they can enter."""
+        while self._waiters and self._can_enter(self._waiters[0][0]):
+            cwd, admitted = self._waiters.popleft()
+            if admitted.cancelled():
+                continue
+            self._enter(cwd)
+            admitted.set_result(None)
+
+    def _leave(self):
+        self._active_calls -= 1
+        self._admit_waiters()
+
+    @contextlib.asynccontextmanager
+    async def _in_directory(self, cwd: str):
+        if not self._waiters and self._can_enter(cwd):
+            self._enter(cwd)
+        else:
+            # Queue behind earlier callers, even if this directory is the current one.
+            admitted = asyncio.get_running_loop().create_future()
+            self._waiters.append((cwd, admitted))
+            try:
+                await admitted
+            except asyncio.CancelledError:
+                if admitted.cancelled():
+                    # Still queued: give up the place, which may unblock the calls behind it.
+                    with contextlib.suppress(ValueError):
+                        self._waiters.remove((cwd, admitted))
+                    self._admit_waiters()
+                else:
+                    self._leave()  # Admitted just as it was cancelled.
+                raise
+        try:
+            yield
+        finally:
+            self._leave()
+
+    async def _ensure_watched(self, cwd: str):
+        if not self.watch or cwd in self._watched_dirs:
+            return
+        self._watched_dirs.add(cwd)
+        from .utils.project_context import start_project_watcher
+        try:
+            await asyncio.to_thread(start_project_watcher, cwd)
+        except Exception as e:
+            print(f"Warning: could not watch '{cwd}': {e}", file=sys.stderr)
+
+    # --- Requests ---
+
+    async def _call_tool(self, params: Dict[str, Any]) -> Any:
+        name = params.get("name")
+        arguments = params.get("arguments") or {}
+        conversation = params.get("conversation")
+        cwd = os.path.abspath(params.get("cwd") or self._cwd)
+        if not isinstance(arguments, dict):
+            raise DaemonError("'arguments' must be an object.", INVALID_PARAMS)
+        if conversation is not None and not isinstance(conversation, list):
+            raise DaemonError("'conversation' must be an array.", INVALID_PARAMS)
+        if not os.path.isdir(cwd):
+            raise DaemonError(f"'cwd' is not a directory: {cwd}", INVALID_PARAMS)
+        try:
+            spec = tool_registry.get_tool_spec(name)
+        except KeyError as e:
+            raise DaemonError(str(e.args[0]), INVALID_PARAMS)
+        impl = await asyncio.to_thread(tool_registry.load_impl, name)
+        try:
+            inspect.signature(impl).bind(**arguments)
+        except TypeError as e:
+            raise DaemonError(f"Invalid arguments for '{name}': {e}", INVALID_PARAMS)
+
+        await self._ensure_watched(cwd)
+        recorded = contextlib.nullcontext()
+        if conversation is not None:
+            # Checkpoints taken by this call record the client's conversation.
+            from .utils.checkpoint import conversation_context
+            recorded = conversation_context(conversation)
+        async with self._in_directory(cwd):
+            with recorded:
+                if spec.is_async:
+                    return await impl(**arguments)
+                return await asyncio.to_thread(impl, **arguments)
+
+    async def _dispatch(self, method: str, params: Dict[str, Any]) -> Any:
+        if method == "tools/call":
+            return await self._call_tool(params)
+        if method == "tools/list":
+            return {"tools": tool_registry.get_tool_schemas()}
+        if method == "ping":
+            return {"pong": True, "pid": os.getpid()}
+        if method == "stats":
+            return dict(self.stats)
+        if method == "shutdown":
+            self._stopping.set()
+            return {"stopping": True}
+        raise DaemonError(f"Method not found: {method}", METHOD_NOT_FOUND)
+
+    async def _respond(self, line: bytes, writer: asyncio.StreamWriter, write_lock: asyncio.Lock):
+        request_id = None
+        try:
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise DaemonError(f"Parse error: {e}", PARSE_ERROR)
+            if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+                raise DaemonError("Invalid request.", INVALID_REQUEST)
+            request_id = request.get("id")
+            self.stats["requests"] += 1
+            result = await self._dispatch(request["method"], request.get("params") or {})
+            response = {"jsonrpc": "2.0", "id": request_id, "result": result}
+        except DaemonError as e:
+            self.stats["errors"] += 1
+            response = {"jsonrpc": "2.0", "id": request_id, "error": {"code": e.code, "message": str(e)}}
+        except Exception as e:
+            self.stats["errors"] += 1
+            response = {"jsonrpc": "2.0", "id": request_id, "error": {"code": TOOL_ERROR, "message": f"{type(e).__name__}: {e}"}}
+        async with write_lock:
+            # default=str: a tool returning something JSON cannot encode must not leave the client hanging.
+            writer.write(json.dumps(response, default=str).encode("utf-8") + b"\n")
+            await writer.drain()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.stats["connections"] += 1
+        write_lock = asyncio.Lock()
+        pending = set()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    break  # Message over MAX_MESSAGE_BYTES; drop the connection.
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                # Requests on one connection may be pipelined; each runs as its own task.
+                task = asyncio.create_task(self._respond(line, writer, write_lock))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+        except ConnectionError:
+            pass
+        finally:
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+            writer.close()
+
+    # --- Lifecycle ---
+
+    def _preload_tools(self):
+        """Imports every tool module up front, so the first call of each is warm."""
+        for name in tool_registry.discover_tools():
+            try:
+                tool_registry.load_impl(name)
+            except Exception as e:
+                print(f"Warning: could not load tool '{name}': {e}", file=sys.stderr)
+
+    async def serve(self, ready: Optional[threading.Event] = None):
+        self._stopping = asyncio.Event()
+        os.makedirs(os.path.dirname(os.path.abspath(self.socket_path)), exist_ok=True)
+        if os.path.exists(self.socket_path):
+            if is_daemon_running(self.socket_path):
+                raise RuntimeError(f"A daemon is already listening on {self.socket_path}.")
+            os.unlink(self.socket_path)  # Left behind by a daemon that did not exit cleanly.
+
+        # The tools can edit files and run commands: only the owner may connect.
+        # The socket is created owner-only, rather than chmod-ed after bind,
+        # so there is no window in which others can connect.
+        previous_umask = os.umask(0o177)
+        try:
+            server = await asyncio.start_unix_server(self._handle_connection, path=self.socket_path, limit=MAX_MESSAGE_BYTES)
+        finally:
+            os.umask(previous_umask)
+        preload = asyncio.create_task(asyncio.to_thread(self._preload_tools))
+        print(f"nano-tools daemon listening on {self.socket_path} (pid {os.getpid()})", file=sys.stderr)
+        if ready is not None:
+            ready.set()
+        try:
+            async with server:
+                await self._stopping.wait()
+        finally:
+            await preload
+            # Pooled shells are bound to this loop; reap them before it closes.
+            from .tools.shell import SESSION_POOL
+            await SESSION_POOL.aclose_all()
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(self.socket_path)
+            if self.watch:
+                from .utils.project_context import stop_project_watchers
+                stop_project_watchers()
+
+# --- Client ---
+
+class DaemonClient:
+    """
+    A blocking client for the tool daemon. One request is in flight per
+    client at a time; use one client per thread for concurrent calls.
+    """
+
+    def __init__(self, socket_path: Optional[str] = None, timeout: Optional[float] = None):
+        self.socket_path = socket_path or default_socket_path()
+        self.timeout = timeout
+        self._sock: Optional[socket.socket] = None
+        self._file = None
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self._sock = sock
+        self._file = sock.makefile("rwb")
+
+    def request(self, method: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        with self._lock:
+            if self._sock is None:
+                self._connect()
+            self._next_id += 1
+            message = {"jsonrpc": "2.0", "id": self._next_id, "method": method, "params": params or {}}
+            try:
+                self._file.write(json.dumps(message).encode("utf-8") + b"\n")
+                self._file.flush()
+                line = self._file.readline()
+            except OSError:
+                self.close()
+                raise
+            if not line:
+                self.close()
+                raise ConnectionError("The daemon closed the connection.")
+        response = json.loads(line)
+        if "error" in response:
+            raise DaemonError(response["error"]["message"], response["error"]["code"])
+        return response["result"]
+
+    def call_tool(self, name: str, arguments: Optional[Dict[str, Any]] = None, cwd: Optional[str] = None,
+                  conversation: Optional[List[Dict[str, Any]]] = None) -> Any:
+        """
+        Runs a tool in the daemon, resolving relative paths against `cwd`
+        (default: this process's CWD). `conversation` is the history to record
+        in any checkpoint the call takes.
+        """
+        params = {"name": name, "arguments": arguments or {}, "cwd": cwd or os.getcwd()}
+        if conversation is not None:
+            params["conversation"] = conversation
+        return self.request("tools/call", params)
+
+    def list_tools(self) -> List[Dict[str, Any]]:
+        return self.request("tools/list")["tools"]
+
+    def ping(self) -> Dict[str, Any]:
+        return self.request("ping")
+
+    def shutdown(self):
+        self.request("shutdown")
+        self.close()
+
+    def close(self):
+        if self._sock is not None:
+            with contextlib.suppress(OSError):
+                self._file.close()
+                self._sock.close()
+        self._sock = None
+        self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def is_daemon_running(socket_path: Optional[str] = None) -> bool:
+    try:
+        with DaemonClient(socket_path, timeout=1) as client:
+            client.ping()
+        return True
+    except (OSError, DaemonError, ValueError):
+        return False
+
+def main():
+    parser = argparse.ArgumentParser(description="Serves the nano-tools over a Unix-domain socket (JSON-RPC 2.0).")
+    parser.add_argument("--socket", default=None, help=f"Socket path (default: {default_socket_path()}).")
+    parser.add_argument("--no-watch", action="store_true", help="Do not start file watchers for the projects served.")
+    args = parser.parse_args()
+    try:
+        asyncio.run(ToolDaemon(args.socket, watch=not args.no_watch).serve())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,10 @@
 # nano-tools/nano_gemini_cli_core/prompts.py
 import os
-from .utils.git_utils import is_git_repository
+import threading
+from collections import Counter, OrderedDict
+from typing import List, Optional, Tuple
+from .utils.project_context import get_project_context
+from .utils.memory_store import Bm25Index, fact_hash, tokenize
 
 # We will define the tool names as constants for easy reference,
 # just like the original gemini-cli.
@@ -12,16 +16,142 @@ REPLACE = "replace"
 WRITE_FILE = "write_file"
 RUN_SHELL_COMMAND = "run_shell_command"
 SAVE_MEMORY = "save_memory"
+BATCH_READ = "batch_read"
 
-def get_core_system_prompt(user_memory: str = "") -> str:
+# --- Memory Selection ---
+# Memories are injected up to a fixed budget, so the prompt stays the same
+# size however many facts have been saved.
+MEMORY_TOKEN_BUDGET = 1000
+MAX_INJECTED_MEMORIES = 20
+PROMPT_CACHE_ENTRIES = 32
+
+_prompt_cache: "OrderedDict[tuple, str]" = OrderedDict()
+_prompt_cache_lock = threading.Lock()
+
+def estimate_tokens(text: str) -> int:
+    """A cheap token estimate (about four characters per token)."""
+    return (len(text) + 3) // 4
+
+def split_memory_items(user_memory: str) -> List[str]:
+    """Splits free-form memory text into items: one per bullet, one per plain paragraph. Headings are dropped."""
+    items: List[str] = []
+    paragraph: List[str] = []
+    for line in user_memory.splitlines():
+        stripped = line.strip()
+        is_bullet = stripped.startswith(("- ", "* "))
+        if paragraph and (not stripped or is_bullet or stripped.startswith("#")):
+            items.append(" ".join(paragraph))
+            paragraph = []
+        if is_bullet:
+            items.append(stripped[2:].strip())
+        elif stripped and not stripped.startswith("#"):
+            paragraph.append(stripped)
+    if paragraph:
+        items.append(" ".join(paragraph))
+    return [item for item in items if item]
+
+def select_memories(
+    query: str,
+    items: List[str],
+    token_budget: int = MEMORY_TOKEN_BUDGET,
+    max_items: int = MAX_INJECTED_MEMORIES,
+) -> List[str]:
+    """
+    Picks the memories most relevant to `query` (BM25), then the most recent
+    ones, until `max_items` or `token_budget` is reached. The chosen items
+    keep their original order.
+    """
+    if len(items) <= max_items and sum(estimate_tokens(item) for item in items) <= token_budget:
+        return list(items)
+
+    index = Bm25Index()
+    for item in items:
+        index.add(Counter(tokenize(item)))
+    ranked = [position for position, _ in index.rank(query)]
+    matched = set(ranked)
+    ranked += [position for position in reversed(range(len(items))) if position not in matched]
+
+    chosen = []
+    remaining = token_budget
+    for position in ranked:
+        if len(chosen) >= max_items:
+            break
+        cost = estimate_tokens(items[position])
+        if cost <= remaining:
+            chosen.append(position)
+            remaining -= cost
+    return [items[position] for position in sorted(chosen)]
+
+def _memory_store_state() -> Optional[Tuple[int, int]]:
+    """The save_memory log's (mtime_ns, size), for cache keys; None if nothing has been saved."""
+    from .tools.memory_tool import get_memory_store
+
+    try:
+        stat = os.stat(get_memory_store().log_path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+def _memory_store_items() -> List[str]:
+    """Facts saved with save_memory. Reads the log, so only called on a prompt cache miss."""
+    from .tools.memory_tool import get_memory_store
+
+    return [record.fact for record in get_memory_store().records()]
+
+def clear_prompt_cache():
+    with _prompt_cache_lock:
+        _prompt_cache.clear()
+
+def get_core_system_prompt(
+    user_memory: str = "",
+    task: str = "",
+    include_memory_store: bool = True,
+    memory_token_budget: int = MEMORY_TOKEN_BUDGET,
+    max_memories: int = MAX_INJECTED_MEMORIES,
+) -> str:
     """
     Assembles the complete system prompt for the agent, including core mandates,
     dynamic sections (like git status), and user-specific memories.
+
+    Memories come from `user_memory` and, unless disabled, the save_memory
+    store. Only those most relevant to `task` and the working directory are
+    injected, within `memory_token_budget`; when everything fits,
+    `user_memory` is injected as written. Assembled prompts are cached on
+    the memory log's mtime, the git state and the working directory.
     """
-    
+    context = get_project_context()
+    cwd = context.cwd
+    git_root = context.git_root
+
+    # One stat keys the cache; the log itself is only read on a miss.
+    store_state = _memory_store_state() if include_memory_store else None
+    cache_key = (user_memory, task, cwd, git_root, store_state, memory_token_budget, max_memories)
+    with _prompt_cache_lock:
+        if cache_key in _prompt_cache:
+            _prompt_cache.move_to_end(cache_key)
+            return _prompt_cache[cache_key]
+
+    store_items = _memory_store_items() if store_state is not None else []
+    prompt = _assemble_prompt(user_memory, store_items, task, cwd, git_root, memory_token_budget, max_memories)
+
+    with _prompt_cache_lock:
+        _prompt_cache[cache_key] = prompt
+        while len(_prompt_cache) > PROMPT_CACHE_ENTRIES:
+            _prompt_cache.popitem(last=False)
+    return prompt
+
+def _assemble_prompt(
+    user_memory: str,
+    store_items: List[str],
+    task: str,
+    cwd: str,
+    git_root: Optional[str],
+    memory_token_budget: int,
+    max_memories: int,
+) -> str:
     # --- Dynamic Sections ---
     git_section = ""
-    if is_git_repository(os.getcwd()):
+    if git_root:
         git_section = """
 # Git Repository
 - The current working (project) directory is being managed by a git repository.
@@ -51,7 +181,7 @@ You are an interactive CLI agent specializing in software engineering tasks. You
 
 # Primary Workflows
 When requested to perform tasks like fixing bugs, adding features, or refactoring, follow this sequence:
-1. **Understand:** Use tools like '{SEARCH_FILE_CONTENT}' and '{GLOB}' to understand file structures and conventions. Use '{READ_FILE}' and '{READ_MANY_FILES}' to understand context.
+1. **Understand:** Use tools like '{SEARCH_FILE_CONTENT}' and '{GLOB}' to understand file structures and conventions. Use '{READ_FILE}' and '{READ_MANY_FILES}' to understand context. When you need several independent reads, globs or searches, run them together in a single '{BATCH_READ}' call.
 2. **Plan:** Build a coherent and grounded plan. Share a concise plan with the user if it would help.
 3. **Implement:** Use tools like '{REPLACE}', '{WRITE_FILE}', and '{RUN_SHELL_COMMAND}' to act on the plan.
 4. **Verify:** If applicable, verify the changes using the project's testing and linting procedures.
@@ -68,8 +198,28 @@ Your core function is efficient and safe assistance. Balance conciseness with cl
 """
 
     # --- Memory Injection ---
-    memory_suffix = ""
-    if user_memory and user_memory.strip():
-        memory_suffix = f"\n\n---\n\n## User-Specific Memories\n{user_memory.strip()}"
+    user_items = split_memory_items(user_memory or "")
+    items = []
+    seen = set()
+    for item in user_items + store_items:
+        item_hash = fact_hash(item)
+        if item_hash not in seen:
+            seen.add(item_hash)
+            items.append(item)
+
+    query = " ".join(filter(None, [task, os.path.basename(cwd), os.path.basename(git_root or "")]))
+    selected = select_memories(query, items, memory_token_budget, max_memories)
+
+    memory_body = ""
+    if len(selected) == len(items) and user_memory and user_memory.strip():
+        # Everything fits: user_memory goes in as written, headings and all,
+        # followed by the stored facts it does not already contain.
+        user_hashes = {fact_hash(item) for item in user_items}
+        extra = [item for item in items if fact_hash(item) not in user_hashes]
+        memory_body = user_memory.strip() + "".join(f"\n- {item}" for item in extra)
+    elif selected:
+        memory_body = "\n".join(f"- {item}" for item in selected)
+
+    memory_suffix = f"\n\n---\n\n## User-Specific Memories\n{memory_body}" if memory_body else ""
 
     return f"{base_prompt.strip()}{memory_suffix}"
@@ -0,0 +1,272 @@
+# nano-tools/nano_gemini_cli_core/tool_registry.py
+import ast
+import importlib
+import inspect
+import os
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# ---
+# Importing a tool module imports `agents` (and used to import litellm), which
+# costs seconds. The registry reads the tool modules' source with `ast`
+# instead, and builds the same strict JSON schemas that `@function_tool`
+# would (names, descriptions, parameters), so tool listings and schema
+# exports never import an implementation. `load_tool`/`load_impl` import the
+# module only when a tool is actually called.
+# ---
+
+TOOLS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tools")
+TOOLS_PACKAGE = f"{__package__ or 'nano_gemini_cli_core'}.tools"
+
+_DOCSTRING_SECTIONS = ("Args:", "Arguments:", "Returns:", "Raises:", "Yields:", "Example:", "Examples:", "Note:")
+_SCALAR_TYPES = {"str": "string", "int": "integer", "float": "number", "bool": "boolean"}
+
+class UnsupportedAnnotation(Exception):
+    """A parameter annotation the static schema builder does not understand."""
+
+@dataclass
+class ToolSpec:
+    """What the model sees of a tool, read from source without importing it."""
+    name: str
+    module: str
+    description: str
+    # None if a parameter type could not be resolved statically; load_tool() has the real schema.
+    params_json_schema: Optional[Dict[str, Any]]
+    impl_name: Optional[str]
+    is_async: bool
+
+    def as_function_schema(self) -> Dict[str, Any]:
+        """The OpenAI function-calling form of this tool."""
+        return {"name": self.name, "description": self.description, "parameters": self.params_json_schema}
+
+# --- Docstrings ---
+
+def _split_docstring(docstring: str) -> Tuple[str, Dict[str, str]]:
+    """Splits a Google-style docstring into its description and per-argument descriptions."""
+    lines = inspect.cleandoc(docstring).splitlines()
+    description_lines: List[str] = []
+    arg_descriptions: Dict[str, str] = {}
+    section = None
+    current_arg = None
+    for line in lines:
+        stripped = line.strip()
+        if not line.startswith(" ") and stripped in _DOCSTRING_SECTIONS:
+            section = stripped
+            current_arg = None
+            continue
+        if section is None:
+            description_lines.append(line)
+        elif section in ("Args:", "Arguments:"):
+            match = re.match(r"^ {4}(\*{0,2}\w+)(?: \(.*?\))?:\s*(.*)$", line)
+            if match:
+                current_arg = match.group(1).lstrip("*")
+                arg_descriptions[current_arg] = match.group(2)
+            elif current_arg and stripped:
+                # Continuation lines keep any indentation beyond the item's own, as griffe does.
+                arg_descriptions[current_arg] += "\n" + line[min(8, len(line) - len(line.lstrip())):]
+    return "\n".join(description_lines).strip(), {k: v.strip() for k, v in arg_descriptions.items()}
+
+# --- Annotations ---
+
+def _annotation_name(node: ast.expr) -> str:
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    raise UnsupportedAnnotation(ast.unparse(node))
+
+def _subscript_args(node: ast.Subscript) -> List[ast.expr]:
+    return list(node.slice.elts) if isinstance(node.slice, ast.Tuple) else [node.slice]
+
+class _SchemaBuilder:
+    def __init__(self, module: ast.Module):
+        self.constants: Dict[str, Any] = {}
+        self.models: Dict[str, ast.ClassDef] = {}
+        for node in module.body:
+            if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+                try:
+                    self.constants[node.targets[0].id] = ast.literal_eval(node.value)
+                except ValueError:
+                    pass
+            elif isinstance(node, ast.ClassDef) and any(_annotation_name(b) == "BaseModel" for b in node.bases if isinstance(b, (ast.Name, ast.Attribute))):
+                self.models[node.name] = node
+        self.defs: Dict[str, Dict[str, Any]] = {}
+
+    def value(self, node: ast.expr) -> Any:
+        if isinstance(node, ast.Name) and node.id in self.constants:
+            return self.constants[node.id]
+        return ast.literal_eval(node)
+
+    def schema(self, node: ast.expr) -> Dict[str, Any]:
+        if isinstance(node, ast.Constant) and node.value is None:
+            return {"type": "null"}
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.BitOr):
+            return self._union([node.left, node.right])
+        if isinstance(node, ast.Subscript):
+            origin = _annotation_name(node.value)
+            args = _subscript_args(node)
+            if origin in ("List", "list", "Sequence"):
+                return {"items": self.schema(args[0]), "type": "array"}
+            if origin == "Optional":
+                return self._union([args[0], ast.Constant(value=None)])
+            if origin == "Union":
+                return self._union(args)
+            if origin == "Literal":
+                values = [self.value(a) for a in args]
+                schema: Dict[str, Any] = {"enum": values}
+                if all(isinstance(v, str) for v in values):
+                    schema["type"] = "string"
+                return schema
+            raise UnsupportedAnnotation(ast.unparse(node))
+        name = _annotation_name(node)
+        if name in _SCALAR_TYPES:
+            return {"type": _SCALAR_TYPES[name]}
+        if name in self.models:
+            if name not in self.defs:
+                self.defs[name] = {}  # Reserve the slot for recursive references.
+                self.defs[name] = self._model_schema(self.models[name])
+            return {"$ref": f"#/$defs/{name}"}
+        raise UnsupportedAnnotation(name)
+
+    def _union(self, members: List[ast.expr]) -> Dict[str, Any]:
+        return {"anyOf": [self.schema(m) for m in members]}
+
+    def _model_schema(self, cls: ast.ClassDef) -> Dict[str, Any]:
+        properties: Dict[str, Any] = {}
+        for node in cls.body:
+            if not (isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name)):
+                continue
+            description, default = None, None
+            if isinstance(node.value, ast.Call) and _annotation_name(node.value.func) == "Field":
+                for keyword in node.value.keywords:
+                    if keyword.arg == "description":
+                        description = self.value(keyword.value)
+                    elif keyword.arg == "default":
+                        default = self.value(keyword.value)
+            elif node.value is not None:
+                default = self.value(node.value)
+            properties[node.target.id] = self.property(node.target.id, node.annotation, description, default)
+        schema: Dict[str, Any] = {}
+        docstring = ast.get_docstring(cls)
+        if docstring:
+            schema["description"] = inspect.cleandoc(docstring)
+        schema.update({"properties": properties, "required": list(properties), "title": cls.name, "type": "object", "additionalProperties": False})
+        return schema
+
+    def property(self, name: str, annotation: ast.expr, description: Optional[str], default: Any) -> Dict[str, Any]:
+        prop = dict(self.schema(annotation))
+        if default is not None:
+            prop["default"] = default
+        if description:
+            prop["description"] = description
+        prop["title"] = name.title().replace("_", " ")
+        return prop
+
+# --- Discovery ---
+
+def _is_function_tool(node) -> bool:
+    for decorator in node.decorator_list:
+        target = decorator.func if isinstance(decorator, ast.Call) else decorator
+        if isinstance(target, (ast.Name, ast.Attribute)) and _annotation_name(target) == "function_tool":
+            return True
+    return False
+
+def _impl_name(node) -> Optional[str]:
+    """The private function a tool wrapper delegates to, e.g. `_glob_impl`."""
+    for statement in ast.walk(node):
+        if isinstance(statement, ast.Call) and isinstance(statement.func, ast.Name) and statement.func.id.startswith("_"):
+            return statement.func.id
+    return None
+
+def _specs_from_source(source: str, module_name: str) -> List[ToolSpec]:
+    module = ast.parse(source)
+    builder = _SchemaBuilder(module)
+    specs = []
+    for node in module.body:
+        if not (isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and _is_function_tool(node)):
+            continue
+        description, arg_descriptions = _split_docstring(ast.get_docstring(node, clean=False) or "")
+        builder.defs = {}
+        try:
+            args = node.args.args
+            defaults = [None] * (len(args) - len(node.args.defaults)) + list(node.args.defaults)
+            properties = {}
+            for arg, default in zip(args, defaults):
+                if arg.annotation is None:
+                    raise UnsupportedAnnotation(arg.arg)
+                default_value = builder.value(default) if default is not None else None
+                properties[arg.arg] = builder.property(arg.arg, arg.annotation, arg_descriptions.get(arg.arg), default_value)
+            schema: Dict[str, Any] = {}
+            if builder.defs:
+                schema["$defs"] = builder.defs
+            schema.update({
+                "properties": properties,
+                "required": list(properties),
+                "title": f"{node.name}_args",
+                "type": "object",
+                "additionalProperties": False,
+            })
+        except (UnsupportedAnnotation, ValueError):
+            schema = None
+        specs.append(ToolSpec(
+            name=node.name,
+            module=module_name,
+            description=description,
+            params_json_schema=schema,
+            impl_name=_impl_name(node),
+            is_async=isinstance(node, ast.AsyncFunctionDef),
+        ))
+    return specs
+
+# (path) -> (mtime_ns, specs); a module is re-parsed only after it changes.
+# The lock is held across the parse too: the daemon discovers tools from its
+# preload thread and its event loop at once, and concurrent `ast.parse` calls
+# can fail on Python 3.11 ("AST constructor recursion depth mismatch").
+_parsed: Dict[str, Tuple[int, List[ToolSpec]]] = {}
+_parsed_lock = threading.Lock()
+
+def discover_tools(tools_dir: str = TOOLS_DIR, package: str = TOOLS_PACKAGE) -> Dict[str, ToolSpec]:
+    """All `@function_tool`s defined in `tools_dir`, keyed by tool name, without importing them."""
+    tools: Dict[str, ToolSpec] = {}
+    for filename in sorted(os.listdir(tools_dir)):
+        if not filename.endswith(".py") or filename.startswith("__"):
+            continue
+        path = os.path.join(tools_dir, filename)
+        mtime_ns = os.stat(path).st_mtime_ns
+        with _parsed_lock:
+            cached = _parsed.get(path)
+            if cached and cached[0] == mtime_ns:
+                specs = cached[1]
+            else:
+                with open(path, "r", encoding="utf-8") as f:
+                    specs = _specs_from_source(f.read(), f"{package}.{filename[:-3]}")
+                _parsed[path] = (mtime_ns, specs)
+        for spec in specs:
+            tools[spec.name] = spec
+    return tools
+
+def get_tool_spec(name: str) -> ToolSpec:
+    tools = discover_tools()
+    if name not in tools:
+        raise KeyError(f"Unknown tool '{name}'. Available tools: {', '.join(sorted(tools))}")
+    return tools[name]
+
+def get_tool_schemas() -> List[Dict[str, Any]]:
+    """Function-calling schemas for every tool, for listings and prompt assembly."""
+    return [spec.as_function_schema() for spec in discover_tools().values()]
+
+def load_tool(name: str):
+    """Imports the tool's module and returns its `FunctionTool`."""
+    spec = get_tool_spec(name)
+    return getattr(importlib.import_module(spec.module), spec.name)
+
+def load_impl(name: str) -> Callable:
+    """Imports the tool's module and returns the plain function behind it (e.g. `_glob_impl`)."""
+    spec = get_tool_spec(name)
+    if spec.impl_name is None:
+        raise LookupError(f"Tool '{name}' does not delegate to an implementation function.")
+    return getattr(importlib.import_module(spec.module), spec.impl_name)
@@ -0,0 +1,68 @@
+# nano-tools/nano_gemini_cli_core/tools/background.py
+import signal
+import time
+from typing import Dict
+
+from agents import function_tool
+from .shell import BACKGROUND_PROCESSES
+
+def _list_background_processes_impl() -> Dict[str, str]:
+    """
+    Core implementation for listing background process groups started by `run_shell_command`.
+    """
+    groups = BACKGROUND_PROCESSES.list()
+    if not groups:
+        msg = "No background processes are running."
+        return {"llm_content": msg, "display_content": msg}
+
+    now = time.time()
+    llm_output = []
+    for group in groups:
+        llm_output.append(
+            f"Process Group {group['pgid']}: `{group['command']}` "
+            f"(in {group['cwd']}, started {now - group['started_at']:.0f}s ago)"
+        )
+        for proc in group["processes"]:
+            llm_output.append(
+                f"  PID {proc['pid']} [{proc['state']}]: CPU {proc['cpu_time_s']}s ({proc['cpu_percent']}%), "
+                f"RSS {proc['rss_kb']} KB"
+            )
+
+    process_count = sum(len(group["processes"]) for group in groups)
+    display_output = f"{len(groups)} background process group(s), {process_count} process(es)."
+    return {"llm_content": "\n".join(llm_output), "display_content": display_output}
+
+def _kill_background_process_impl(pgid: int, force: bool = False) -> Dict[str, str]:
+    """
+    Core implementation for killing a background process group.
+    """
+    group = BACKGROUND_PROCESSES.get(pgid)
+    if group is None:
+        msg = f"Error: No background process group with ID {pgid} is being tracked."
+        return {"llm_content": msg, "display_content": msg}
+
+    sig = signal.SIGKILL if force else signal.SIGTERM
+    if not BACKGROUND_PROCESSES.kill(pgid, sig):
+        msg = f"Process group {pgid} had already exited."
+        return {"llm_content": msg, "display_content": msg}
+
+    msg = f"Sent {sig.name} to process group {pgid} (`{group.command}`)."
+    return {"llm_content": msg, "display_content": msg}
+
+@function_tool
+def list_background_processes() -> Dict[str, str]:
+    """
+    Lists the background process groups left running by `run_shell_command`, with CPU and memory usage.
+    """
+    return _list_background_processes_impl()
+
+@function_tool
+def kill_background_process(pgid: int, force: bool = False) -> Dict[str, str]:
+    """
+    Terminates a background process group previously started by `run_shell_command`.
+
+    Args:
+        pgid: The process group ID reported by `run_shell_command` or `list_background_processes`.
+        force: If True, sends SIGKILL instead of SIGTERM. Defaults to False.
+    """
+    return _kill_background_process_impl(pgid, force)
@@ -0,0 +1,132 @@
+# nano-tools/nano_gemini_cli_core/tools/batch_read.py
+import json
+import inspect
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Literal, Optional
+
+from agents import function_tool
+from pydantic import BaseModel, Field
+
+from .glob import _glob_impl
+from .grep import _search_file_content_impl
+from .ls import _list_directory_impl
+from .read_file import _read_file_impl
+
+# --- Batch Configuration ---
+# A single executor is shared by every batch, so MAX_CONCURRENCY is a global
+# cap on read-only tool calls in flight, no matter how many batches overlap.
+MAX_CONCURRENCY = 8
+MAX_CALLS_PER_BATCH = 32
+DEFAULT_TOTAL_CHAR_BUDGET = 100_000
+
+READ_ONLY_TOOLS: Dict[str, Callable[..., Dict[str, str]]] = {
+    "read_file": _read_file_impl,
+    "glob": _glob_impl,
+    "search_file_content": _search_file_content_impl,
+    "list_directory": _list_directory_impl,
+}
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+class ToolInvocation(BaseModel):
+    """A single read-only tool call inside a batch."""
+    tool: Literal["read_file", "glob", "search_file_content", "list_directory"]
+    arguments: str = Field(description="The tool's arguments as a JSON object, e.g. '{\"pattern\": \"**/*.py\"}'.")
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENCY, thread_name_prefix="batch_read")
+        return _executor
+
+def _run_invocation(tool: str, arguments: Dict[str, Any]) -> Dict[str, str]:
+    """Runs one invocation, turning any failure into a structured error result."""
+    impl = READ_ONLY_TOOLS.get(tool)
+    if impl is None:
+        msg = f"Error: '{tool}' is not a read-only tool. Allowed tools: {', '.join(READ_ONLY_TOOLS)}."
+        return {"llm_content": msg, "display_content": msg}
+    try:
+        # Bound first, so a TypeError raised inside the tool is not mistaken for a bad call.
+        inspect.signature(impl).bind(**arguments)
+    except TypeError as e:
+        msg = f"Error: Invalid arguments for '{tool}': {e}"
+        return {"llm_content": msg, "display_content": msg}
+    try:
+        return impl(**arguments)
+    except Exception as e:
+        msg = f"An unexpected error occurred in '{tool}': {e}"
+        return {"llm_content": msg, "display_content": msg}
+
+def _truncate(content: str, budget: int) -> str:
+    if len(content) <= budget:
+        return content
+    return f"{content[:budget]}\n... [truncated {len(content) - budget} of {len(content)} characters]"
+
+def _parse_arguments(arguments: Any) -> Dict[str, Any]:
+    """Accepts arguments either as a dictionary or as a JSON object string."""
+    if isinstance(arguments, str):
+        arguments = json.loads(arguments or "{}")
+    if arguments is None:
+        return {}
+    if not isinstance(arguments, dict):
+        raise ValueError("arguments must be a JSON object")
+    return arguments
+
+def _batch_read_impl(calls: List[Dict[str, Any]], max_total_chars: int = DEFAULT_TOTAL_CHAR_BUDGET) -> Dict[str, str]:
+    """
+    Core implementation for running several read-only tool calls concurrently.
+
+    Each call is a dictionary with a 'tool' name and its 'arguments', given
+    either as a dictionary or as a JSON object string.
+    """
+    if not calls:
+        msg = "Error: At least one tool call is required."
+        return {"llm_content": msg, "display_content": msg}
+    if len(calls) > MAX_CALLS_PER_BATCH:
+        msg = f"Error: A batch may contain at most {MAX_CALLS_PER_BATCH} calls, got {len(calls)}."
+        return {"llm_content": msg, "display_content": msg}
+
+    parsed_calls = []
+    for index, call in enumerate(calls, 1):
+        if not isinstance(call, dict):
+            msg = f"Error: Call {index} must be an object with 'tool' and 'arguments', got {type(call).__name__}."
+            return {"llm_content": msg, "display_content": msg}
+        try:
+            parsed_calls.append((call.get("tool", ""), _parse_arguments(call.get("arguments"))))
+        except ValueError as e:
+            msg = f"Error: Invalid arguments for call {index} ('{call.get('tool')}'): {e}"
+            return {"llm_content": msg, "display_content": msg}
+
+    executor = _get_executor()
+    futures = [executor.submit(_run_invocation, tool, arguments) for tool, arguments in parsed_calls]
+    results = [future.result() for future in futures]
+
+    # Every call gets an equal share of the budget so one huge result cannot crowd out the rest.
+    per_call_budget = max(max_total_chars // len(calls), 1)
+    llm_output = []
+    failures = 0
+    for index, ((tool, arguments), result) in enumerate(zip(parsed_calls, results), 1):
+        content = result.get("llm_content", "")
+        if content.startswith("Error") or content.startswith("An unexpected error"):
+            failures += 1
+        header = f"=== [{index}] {tool}({json.dumps(arguments, sort_keys=True)}) ==="
+        llm_output.append(f"{header}\n{_truncate(content, per_call_budget)}")
+
+    display_output = f"Ran {len(calls)} read-only tool call(s) in parallel ({failures} failed)."
+    return {"llm_content": "\n\n".join(llm_output), "display_content": display_output}
+
+@function_tool
+def batch_read(calls: List[ToolInvocation], max_total_chars: int = DEFAULT_TOTAL_CHAR_BUDGET) -> Dict[str, str]:
+    """
+    Runs several read-only tool calls (read_file, glob, search_file_content, list_directory)
+    concurrently and returns all of their results in a single response. Use this to explore
+    many files or patterns in one step instead of calling each tool separately.
+
+    Args:
+        calls: The tool calls to run. Each has a 'tool' name and its 'arguments' as a JSON object string.
+        max_total_chars: The total output budget, split evenly between the calls. Defaults to 100000.
+    """
+    return _batch_read_impl([call.model_dump() for call in calls], max_total_chars)
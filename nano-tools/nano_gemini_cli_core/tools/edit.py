@@ -4,8 +4,14 @@ import json
 import re
 from typing import Optional, Dict, Any
 from agents import function_tool
-import litellm
 from ..utils.paths import shorten_path
+from ..utils.checkpoint import checkpoint_before
+from ..utils.fs_watcher import notify_changed
+from ..utils.lazy_import import lazy_module
+from ..utils import llm_gateway
+
+# litellm is only needed by the correction path; importing it takes seconds.
+litellm = lazy_module("litellm", "Please install it with 'pip install litellm'.")
 
 CORRECTION_CACHE: Dict[str, Dict[str, Any]] = {}
 
@@ -63,7 +69,8 @@ def _run_correction_agent(
     """
     
     try:
-        response = litellm.completion(
+        response = llm_gateway.completion(
+            litellm.completion,
             model="gemini/gemini-2.5-flash-lite-preview-06-17",
             messages=[{"role": "user", "content": correction_prompt}],
             response_format={"type": "json_object"}
@@ -112,14 +119,17 @@ def _replace_impl(file_path: str, old_string: str, new_string: str, expected_rep
         return {"llm_content": error_msg, "display_content": error_msg}
 
     file_exists = os.path.exists(abs_file_path)
+    tool_args = {"file_path": file_path, "old_string": old_string, "new_string": new_string, "expected_replacements": expected_replacements}
 
     if old_string == "" and not file_exists:
+        checkpoint_before("replace", tool_args, [abs_file_path])
         try:
             parent_dir = os.path.dirname(abs_file_path)
             if parent_dir:
                 os.makedirs(parent_dir, exist_ok=True)
             with open(abs_file_path, 'w', encoding='utf-8') as f:
                 f.write(new_string)
+            notify_changed(abs_file_path)
             msg = f"Successfully created new file: {file_path}"
             return {"llm_content": msg, "display_content": f"Created {shorten_path(file_path)}"}
         except Exception as e:
@@ -158,8 +168,10 @@ def _replace_impl(file_path: str, old_string: str, new_string: str, expected_rep
             
         new_content = content.replace(string_to_replace, string_to_write, expected_replacements)
         
+        checkpoint_before("replace", tool_args, [abs_file_path])
         with open(abs_file_path, 'w', encoding='utf-8') as f:
             f.write(new_content)
+        notify_changed(abs_file_path)
             
         msg = f"Successfully replaced {expected_replacements} occurrence(s) in {file_path}."
         return {"llm_content": msg, "display_content": f"Replaced {expected_replacements} occurrence(s) in {shorten_path(file_path)}."}
@@ -5,22 +5,10 @@ import time
 import fnmatch
 from agents import function_tool
 from typing import List, Optional, Dict
-from ..utils.git_utils import is_git_repository
 from ..utils.paths import shorten_path
-import subprocess
-
-def _get_git_ignored_files(path: str) -> List[str]:
-    """Returns a list of absolute paths for files ignored by git."""
-    if not is_git_repository(path):
-        return []
-    try:
-        result = subprocess.run(
-            ['git', 'ls-files', '--others', '--ignored', '--exclude-standard'],
-            cwd=path, capture_output=True, text=True, check=True
-        )
-        return [os.path.abspath(os.path.join(path, f)) for f in result.stdout.strip().split('\n') if f]
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        return []
+from ..utils.project_context import get_project_context
+from ..utils.fs_watcher import get_file_index
+from ..utils.result_pages import paginate
 
 def _sort_file_entries(entries: List[str]) -> List[str]:
     """
@@ -42,15 +30,19 @@ def _sort_file_entries(entries: List[str]) -> List[str]:
 
     return sorted(entries, key=sort_key, reverse=True)
 
-def _glob_impl(pattern: str, path: str = '.', case_sensitive: bool = False, respect_git_ignore: bool = True) -> Dict[str, str]:
+def _glob_impl(pattern: str, path: str = '.', case_sensitive: bool = False, respect_git_ignore: bool = True, page_size: Optional[int] = None) -> Dict[str, str]:
     """
     Core implementation for finding files matching a glob pattern.
     """
     try:
         search_path = os.path.join(path, pattern)
         
-        # Perform a case-insensitive glob first
-        all_files = py_glob.glob(search_path, recursive=True)
+        # A watched project answers from its file index instead of walking the tree.
+        index = get_file_index(path)
+        all_files = index.glob(pattern, path) if index else None
+        if all_files is None:
+            # Perform a case-insensitive glob first
+            all_files = py_glob.glob(search_path, recursive=True)
         
         # If case_sensitive is True, filter the results
         if case_sensitive:
@@ -61,27 +53,25 @@ def _glob_impl(pattern: str, path: str = '.', case_sensitive: bool = False, resp
         files_only = [f for f in all_files if os.path.isfile(f)]
 
         if respect_git_ignore:
-            ignored_files = set(_get_git_ignored_files(path))
-            if ignored_files:
-                files_only = [f for f in files_only if os.path.abspath(f) not in ignored_files]
+            files_only = get_project_context(path).filter_git_ignored(files_only)
 
         if not files_only:
             msg = f"No files found matching pattern: {pattern}"
             return {"llm_content": msg, "display_content": msg}
 
         sorted_files = _sort_file_entries(files_only)
-        
-        llm_content = "\n".join(sorted_files)
-        display_content = f"Found {len(sorted_files)} matching file(s)."
-        
-        return {"llm_content": llm_content, "display_content": display_content}
+
+        def render(page: List[str], start: int, total: int) -> Dict[str, str]:
+            return {"llm_content": "\n".join(page), "display_content": f"Found {total} matching file(s)."}
+
+        return paginate(sorted_files, render, page_size)
         
     except Exception as e:
         error_msg = f"An error occurred during glob operation: {e}"
         return {"llm_content": error_msg, "display_content": error_msg}
 
 @function_tool
-def glob(pattern: str, path: str = '.', case_sensitive: bool = False, respect_git_ignore: bool = True) -> Dict[str, str]:
+def glob(pattern: str, path: str = '.', case_sensitive: bool = False, respect_git_ignore: bool = True, page_size: Optional[int] = None) -> Dict[str, str]:
     """
     Finds all pathnames matching a specified pattern, with intelligent sorting and gitignore support.
 
@@ -90,8 +80,9 @@ def glob(pattern: str, path: str = '.', case_sensitive: bool = False, respect_gi
         path: The directory to search in. Defaults to the current directory.
         case_sensitive: If True, the search will be case-sensitive. Defaults to False.
         respect_git_ignore: If True, files and directories ignored by git will be excluded. Defaults to True.
+        page_size: The number of paths per page (default 500). Larger results end with a cursor for next_page.
         
     Returns:
         A dictionary containing 'llm_content' for the agent and 'display_content' for the user.
     """
-    return _glob_impl(pattern, path, case_sensitive, respect_git_ignore)
\ No newline at end of file
+    return _glob_impl(pattern, path, case_sensitive, respect_git_ignore, page_size)
\ No newline at end of file
@@ -4,51 +4,91 @@ import re
 import subprocess
 import shutil
 import fnmatch
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple
 from agents import function_tool
-from ..utils.git_utils import is_git_repository
+from ..utils.fs_watcher import glob_to_regex
+from ..utils.project_context import get_project_context
+from ..utils.result_pages import paginate
 
-def _parse_grep_output(output: str, base_path: str) -> Dict[str, List[str]]:
-    """Parses raw grep output into a dictionary grouped by file path."""
+# --- Search Limits ---
+# Searches stop once MAX_TOTAL_MATCHES lines have matched: the child process
+# is killed rather than left to scan (and buffer) the rest of the tree.
+# Results are returned a page at a time (see utils/result_pages.py), so the
+# cap bounds the search itself rather than what reaches the model.
+MAX_TOTAL_MATCHES = 10000
+GREP_THREADS = os.cpu_count() or 1
+
+def _stream_grep_matches(command: List[str], cwd: str, line_number_sep: bytes, max_matches: int) -> Tuple[Dict[str, List[str]], int, bool, int]:
+    """
+    Runs a NUL-framed grep command and parses its output as it arrives.
+
+    Records look like `path\0<line><sep><text>\n`, where the separator after
+    the line number is NUL for git grep and ':' for grep, so paths containing
+    colons parse correctly. Returns (matches_by_file, total, truncated,
+    returncode); once `max_matches` is reached the process is killed.
+    """
     matches_by_file: Dict[str, List[str]] = {}
-    for line in output.strip().split('\n'):
-        if not line:
-            continue
-        
-        parts = line.split(':', 2)
-        if len(parts) < 3:
-            continue
-            
-        file_path, line_num, line_content = parts
-        
-        # Ensure the file path is relative to the search path for consistency
-        full_path = os.path.join(base_path, file_path)
-        relative_path = os.path.relpath(full_path, base_path)
-
-        if relative_path not in matches_by_file:
-            matches_by_file[relative_path] = []
-        
-        matches_by_file[relative_path].append(f"L{line_num}: {line_content.strip()}")
-        
-    return matches_by_file
-
-def _format_matches(matches_by_file: Dict[str, List[str]], pattern: str) -> Dict[str, str]:
-    """Formats the parsed matches into a final, readable string."""
-    total_matches = sum(len(lines) for lines in matches_by_file.values())
+    total = 0
+    truncated = False
+    process = subprocess.Popen(command, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    try:
+        for record in process.stdout:
+            file_path, sep, rest = record.partition(b"\0")
+            if not sep:
+                continue  # e.g. "Binary file ... matches"
+            line_num, sep, line_content = rest.partition(line_number_sep)
+            if not sep or not line_num.isdigit():
+                continue
+            if total >= max_matches:
+                truncated = True
+                break
+            relative_path = os.path.normpath(file_path.decode("utf-8", errors="replace"))
+            matches_by_file.setdefault(relative_path, []).append(
+                f"L{int(line_num)}: {line_content.decode('utf-8', errors='replace').strip()}"
+            )
+            total += 1
+    finally:
+        if process.poll() is None:
+            process.kill()
+        process.stdout.close()
+        returncode = process.wait()
+    return matches_by_file, total, truncated, returncode
+
+def _format_matches(matches_by_file: Dict[str, List[str]], pattern: str, truncated: bool = False, page_size: Optional[int] = None) -> Dict[str, str]:
+    """Formats the parsed matches into readable pages, one match per result-set item."""
+    # Each item is (file_path, "L<n>: text"); a page that starts mid-file repeats the file header.
+    items = [(file_path, line) for file_path, lines in sorted(matches_by_file.items()) for line in lines]
+    total_matches = len(items)
+    file_count = len(matches_by_file)
     match_term = "match" if total_matches == 1 else "matches"
-    
-    llm_output = [f"Found {total_matches} {match_term} for pattern \"{pattern}\":\n---"]
-    
-    for file_path, lines in sorted(matches_by_file.items()):
-        llm_output.append(f"File: {file_path}")
-        llm_output.extend(lines)
+
+    def render(page: List[Tuple[str, str]], start: int, total: int) -> Dict[str, str]:
+        llm_output = [f"Found {total_matches} {match_term} for pattern \"{pattern}\":\n---"]
+        if truncated:
+            llm_output[0] = (
+                f"Found {total_matches} {match_term} for pattern \"{pattern}\" (stopped at the limit of {total_matches}; "
+                f"narrow the pattern, path or include filter to see the rest):\n---"
+            )
+
+        current_file = None
+        for file_path, line in page:
+            if file_path != current_file:
+                if current_file is not None:
+                    llm_output.append("---")
+                llm_output.append(f"File: {file_path}")
+                current_file = file_path
+            llm_output.append(line)
         llm_output.append("---")
-        
-    display_output = f"Found {total_matches} {match_term} in {len(matches_by_file)} file(s) for pattern '{pattern}'."
-    
-    return {"llm_content": "\n".join(llm_output), "display_content": display_output}
 
-def _search_file_content_impl(pattern: str, path: str = '.', include: Optional[str] = None) -> Dict[str, str]:
+        display_output = f"Found {total_matches} {match_term} in {file_count} file(s) for pattern '{pattern}'."
+        if truncated:
+            display_output += " (truncated)"
+
+        return {"llm_content": "\n".join(llm_output), "display_content": display_output}
+
+    return paginate(items, render, page_size)
+
+def _search_file_content_impl(pattern: str, path: str = '.', include: Optional[str] = None, max_matches_per_file: Optional[int] = None, page_size: Optional[int] = None) -> Dict[str, str]:
     """
     Core implementation for searching file content.
     """
@@ -56,33 +96,46 @@ def _search_file_content_impl(pattern: str, path: str = '.', include: Optional[s
     if not os.path.isdir(search_path):
         msg = f"Error: The specified path '{path}' is not a valid directory."
         return {"llm_content": msg, "display_content": msg}
+    # An include with a '/' (e.g. "src/**/*.js") is matched against the path
+    # relative to `path`; without one it is matched against file names.
+    include_is_path = bool(include) and "/" in include
 
     # --- Strategy 1: git grep ---
-    if shutil.which('git') and is_git_repository(search_path):
+    if shutil.which('git') and get_project_context(search_path).is_git:
         try:
-            command = ['git', 'grep', '--untracked', '-n', '-E', '--ignore-case', pattern]
+            command = ['git', 'grep', '--untracked', '-z', '-n', '-E', '--ignore-case', f'--threads={GREP_THREADS}']
+            if max_matches_per_file:
+                # Needs git >= 2.38; older versions reject it and we fall through to grep.
+                command.append(f'--max-count={max_matches_per_file}')
+            command.extend(['-e', pattern])
             if include:
-                command.extend(['--', include])
-            
-            process = subprocess.run(command, cwd=search_path, capture_output=True, text=True, encoding='utf-8')
-            if process.returncode == 0 and process.stdout:
-                parsed = _parse_grep_output(process.stdout, search_path)
-                return _format_matches(parsed, pattern)
-            elif process.returncode == 1:
+                # Glob magic gives '**' its usual meaning in path patterns.
+                command.extend(['--', f":(glob){include}" if include_is_path else include])
+
+            parsed, total, truncated, returncode = _stream_grep_matches(command, search_path, b"\0", MAX_TOTAL_MATCHES)
+            if total:
+                return _format_matches(parsed, pattern, truncated, page_size)
+            elif returncode == 1:
                 msg = "No matches found."
                 return {"llm_content": msg, "display_content": msg}
         except Exception:
             pass # Fall through to other strategies
 
     # --- Strategy 2: System grep ---
-    if shutil.which('grep'):
+    # grep's --include only matches file names, so path patterns go to the fallback.
+    if shutil.which('grep') and not include_is_path:
         try:
-            command = ['grep', '-r', '-n', '-H', '-E', '--exclude-dir=.git', '--exclude-dir=node_modules', pattern, '.']
-            process = subprocess.run(command, cwd=search_path, capture_output=True, text=True, encoding='utf-8')
-            if process.returncode == 0 and process.stdout:
-                parsed = _parse_grep_output(process.stdout, search_path)
-                return _format_matches(parsed, pattern)
-            elif process.returncode == 1:
+            command = ['grep', '-r', '-n', '-H', '-E', '--null', '--exclude-dir=.git', '--exclude-dir=node_modules']
+            if max_matches_per_file:
+                command.append(f'--max-count={max_matches_per_file}')
+            if include:
+                command.append(f'--include={include}')
+            command.extend(['-e', pattern, '.'])
+
+            parsed, total, truncated, returncode = _stream_grep_matches(command, search_path, b":", MAX_TOTAL_MATCHES)
+            if total:
+                return _format_matches(parsed, pattern, truncated, page_size)
+            elif returncode == 1:
                 msg = "No matches found."
                 return {"llm_content": msg, "display_content": msg}
         except Exception:
@@ -96,33 +149,51 @@ def _search_file_content_impl(pattern: str, path: str = '.', include: Optional[s
         msg = f"Error: Invalid regular expression: {e}"
         return {"llm_content": msg, "display_content": msg}
 
+    include_regex = glob_to_regex(include) if include_is_path else None
+    total = 0
+    truncated = False
     for root, _, files in os.walk(search_path):
+        if truncated:
+            break
         if '.git' in root.split(os.sep) or 'node_modules' in root.split(os.sep):
             continue
         for filename in files:
-            if include and not fnmatch.fnmatch(filename, include):
-                continue
-            
             file_path = os.path.join(root, filename)
+            if include_regex is not None:
+                if not include_regex.match(os.path.relpath(file_path, search_path).replace(os.sep, "/")):
+                    continue
+            elif include and not fnmatch.fnmatch(filename, include):
+                continue
+
             try:
                 with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                    file_matches = 0
                     for line_num, line in enumerate(f, 1):
                         if regex.search(line):
+                            if total >= MAX_TOTAL_MATCHES:
+                                truncated = True
+                                break
                             relative_path = os.path.relpath(file_path, search_path)
                             if relative_path not in matches_by_file:
                                 matches_by_file[relative_path] = []
                             matches_by_file[relative_path].append(f"L{line_num}: {line.strip()}")
+                            total += 1
+                            file_matches += 1
+                            if max_matches_per_file and file_matches >= max_matches_per_file:
+                                break
             except Exception:
                 continue
+            if truncated:
+                break
     
     if not matches_by_file:
         msg = "No matches found."
         return {"llm_content": msg, "display_content": msg}
 
-    return _format_matches(matches_by_file, pattern)
+    return _format_matches(matches_by_file, pattern, truncated, page_size)
 
 @function_tool
-def search_file_content(pattern: str, path: str = '.', include: Optional[str] = None) -> Dict[str, str]:
+def search_file_content(pattern: str, path: str = '.', include: Optional[str] = None, max_matches_per_file: Optional[int] = None, page_size: Optional[int] = None) -> Dict[str, str]:
     """
     Searches for a regular expression pattern within file contents.
 
@@ -131,12 +202,17 @@ def search_file_content(pattern: str, path: str = '.', include: Optional[str] =
     2. System `grep`: If `git` is not applicable, it uses the system's `grep` command.
     3. Python fallback: If neither `git` nor `grep` is available, it performs a manual search.
 
+    Results stop at 10000 matching lines; the search is cut short once the limit is reached.
+    Matches are returned a page at a time; a long result ends with a cursor for next_page.
+
     Args:
         pattern: The regular expression (regex) pattern to search for.
         path: The directory to search in. Defaults to the current directory.
         include: A glob pattern to filter which files are searched (e.g., "*.py", "src/**/*.js").
+        max_matches_per_file: If set, at most this many matching lines are reported per file.
+        page_size: The number of matching lines per page (default 500).
     
     Returns:
         A formatted string of the search results or a message if no matches are found.
     """
-    return _search_file_content_impl(pattern, path, include)
\ No newline at end of file
+    return _search_file_content_impl(pattern, path, include, max_matches_per_file, page_size)
\ No newline at end of file
@@ -3,9 +3,9 @@ import os
 import fnmatch
 from agents import function_tool
 from typing import List, Optional, Dict
-from ..utils.git_utils import is_git_repository
 from ..utils.paths import shorten_path
-import subprocess
+from ..utils.project_context import get_project_context
+from ..utils.result_pages import paginate
 
 def _is_path_within_root(path_to_check: str, root_directory: str) -> bool:
     """Checks if a path is within the root directory."""
@@ -13,20 +13,7 @@ def _is_path_within_root(path_to_check: str, root_directory: str) -> bool:
     abs_path = os.path.abspath(path_to_check)
     return os.path.commonpath([abs_root, abs_path]) == abs_root
 
-def _get_git_ignored_files(path: str) -> List[str]:
-    """Returns a list of files ignored by git in the given directory."""
-    if not is_git_repository(path):
-        return []
-    try:
-        result = subprocess.run(
-            ['git', 'ls-files', '--others', '--ignored', '--exclude-standard', '.'],
-            cwd=path, capture_output=True, text=True, check=True
-        )
-        return [os.path.basename(f) for f in result.stdout.strip().split('\n') if f]
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        return []
-
-def _list_directory_impl(path: str = '.', respect_git_ignore: bool = True, ignore: Optional[List[str]] = None) -> Dict[str, str]:
+def _list_directory_impl(path: str = '.', respect_git_ignore: bool = True, ignore: Optional[List[str]] = None, page_size: Optional[int] = None) -> Dict[str, str]:
     """
     Core implementation for listing directory contents.
     """
@@ -45,11 +32,11 @@ def _list_directory_impl(path: str = '.', respect_git_ignore: bool = True, ignor
         all_contents = os.listdir(abs_path)
         
         filtered_contents = []
-        git_ignored_files = set(_get_git_ignored_files(abs_path)) if respect_git_ignore else set()
+        if respect_git_ignore:
+            kept_paths = set(get_project_context(abs_path).filter_git_ignored(os.path.join(abs_path, name) for name in all_contents))
+            all_contents = [name for name in all_contents if os.path.join(abs_path, name) in kept_paths]
         
         for name in all_contents:
-            if name in git_ignored_files:
-                continue
             if ignore and any(fnmatch.fnmatch(name, pattern) for pattern in ignore):
                 continue
             filtered_contents.append(name)
@@ -63,18 +50,21 @@ def _list_directory_impl(path: str = '.', respect_git_ignore: bool = True, ignor
         
         formatted_dirs = [f"[DIR] {d}" for d in dirs]
         final_listing = formatted_dirs + files
-        
-        llm_content = f"Directory listing for '{path}':\n" + "\n".join(final_listing)
-        display_content = f"Listed {len(final_listing)} item(s) in '{shorten_path(path)}'."
-        
-        return {"llm_content": llm_content, "display_content": display_content}
+
+        def render(page: List[str], start: int, total: int) -> Dict[str, str]:
+            return {
+                "llm_content": f"Directory listing for '{path}':\n" + "\n".join(page),
+                "display_content": f"Listed {total} item(s) in '{shorten_path(path)}'.",
+            }
+
+        return paginate(final_listing, render, page_size)
 
     except Exception as e:
         error_msg = f"An error occurred: {e}"
         return {"llm_content": error_msg, "display_content": error_msg}
 
 @function_tool
-def list_directory(path: str = '.', respect_git_ignore: bool = True, ignore: Optional[List[str]] = None) -> Dict[str, str]:
+def list_directory(path: str = '.', respect_git_ignore: bool = True, ignore: Optional[List[str]] = None, page_size: Optional[int] = None) -> Dict[str, str]:
     """
     Lists the contents of a specified directory, with gitignore support and intelligent sorting.
 
@@ -82,8 +72,9 @@ def list_directory(path: str = '.', respect_git_ignore: bool = True, ignore: Opt
         path: The absolute path to the directory to list. Defaults to the current directory.
         respect_git_ignore: If True, files and directories ignored by git will be excluded. Defaults to True.
         ignore: A list of glob patterns to ignore.
+        page_size: The number of entries per page (default 500). Larger listings end with a cursor for next_page.
         
     Returns:
         A dictionary containing 'llm_content' for the agent and 'display_content' for the user.
     """
-    return _list_directory_impl(path, respect_git_ignore, ignore)
+    return _list_directory_impl(path, respect_git_ignore, ignore, page_size)
@@ -1,94 +1,78 @@
 # nano-tools/nano_gemini_cli_core/tools/memory_tool.py
 import os
+import threading
+from typing import Dict, Optional
 from agents import function_tool
 
+from ..utils.memory_store import MemoryStore
+
 # --- Constants matching the gemini-cli implementation ---
 GEMINI_CONFIG_DIR = ".gemini"
 DEFAULT_CONTEXT_FILENAME = "GEMINI.md"
 MEMORY_SECTION_HEADER = "## Gemini Added Memories"
+MEMORY_LOG_FILENAME = "memories.jsonl"
+
+_memory_store: Optional[MemoryStore] = None
+_memory_store_lock = threading.Lock()
 
 def get_global_memory_file_path() -> str:
     """Gets the path to the global memory file."""
     return os.path.join(os.path.expanduser("~"), GEMINI_CONFIG_DIR, DEFAULT_CONTEXT_FILENAME)
 
-def _ensure_newline_separation(content: str) -> str:
-    """Ensures there's a blank line before appending new sections."""
-    if not content:
-        return ""
-    if content.endswith("\n\n"):
-        return ""
-    if content.endswith("\n"):
-        return "\n"
-    return "\n\n"
+def get_memory_store() -> MemoryStore:
+    """Gets the process-wide memory store, whose log lives next to the global GEMINI.md."""
+    global _memory_store
+    with _memory_store_lock:
+        if _memory_store is None:
+            markdown_path = get_global_memory_file_path()
+            log_path = os.path.join(os.path.dirname(markdown_path), MEMORY_LOG_FILENAME)
+            _memory_store = MemoryStore(log_path, markdown_path, MEMORY_SECTION_HEADER)
+        return _memory_store
+
+def render_memory_file() -> bool:
+    """
+    Brings the memory section of GEMINI.md up to date with the memory store.
+    Saves do not touch GEMINI.md; call this when the file itself is needed.
+    """
+    return get_memory_store().write_markdown()
 
 def _save_memory_impl(fact: str) -> Dict[str, str]:
     """
     Core implementation for saving a fact to memory.
+
+    The fact is appended to the memory store's log, which is the store of
+    record; exact and near-duplicates of stored facts are not saved again.
+    GEMINI.md is not rewritten; `render_memory_file` renders it on demand.
     """
     if not fact or not isinstance(fact, str) or not fact.strip():
         msg = "Error: The 'fact' parameter must be a non-empty string."
         return {"llm_content": msg, "display_content": msg}
 
-    memory_file_path = get_global_memory_file_path()
-    
-    try:
-        # Ensure the ~/.gemini directory exists
-        os.makedirs(os.path.dirname(memory_file_path), exist_ok=True)
-        
-        # Sanitize the fact to be saved
-        processed_fact = fact.strip().lstrip("- ").strip()
-        new_memory_item = f"- {processed_fact}"
-
-        # Read existing content, or start fresh if file doesn't exist
-        try:
-            with open(memory_file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except FileNotFoundError:
-            content = ""
-
-        header_index = content.find(MEMORY_SECTION_HEADER)
-
-        if header_index == -1:
-            # Header not found, append header and then the entry
-            separator = _ensure_newline_separation(content)
-            content += f"{separator}{MEMORY_SECTION_HEADER}\n{new_memory_item}\n"
-        else:
-            # Header found, find where to insert the new memory entry
-            # Find the start of the next section to correctly delimit the memory section
-            start_of_section_content = header_index + len(MEMORY_SECTION_HEADER)
-            next_header_index = content.find("\n## ", start_of_section_content)
-            
-            if next_header_index == -1:
-                # Memory section is at the end of the file
-                section_content = content[start_of_section_content:].rstrip()
-                section_content += f"\n{new_memory_item}"
-                content = content[:start_of_section_content] + section_content + "\n"
-            else:
-                # Memory section is in the middle of the file
-                before_section = content[:start_of_section_content]
-                section_content = content[start_of_section_content:next_header_index].rstrip()
-                after_section = content[next_header_index:]
-                
-                section_content += f"\n{new_memory_item}"
-                content = before_section + section_content + "\n\n" + after_section
-
-        with open(memory_file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
-
-        msg = f"Okay, I've remembered that: \"{processed_fact}\""
-        return {"llm_content": msg, "display_content": msg}
+    # Sanitize the fact to be saved
+    processed_fact = fact.strip().lstrip("- ").strip()
 
+    try:
+        status, record = get_memory_store().add(processed_fact)
     except Exception as e:
         msg = f"Error saving fact to memory: {e}"
         return {"llm_content": msg, "display_content": msg}
 
+    if status == "added":
+        msg = f"Okay, I've remembered that: \"{processed_fact}\""
+    elif status == "duplicate":
+        msg = f"I already remember that: \"{record.fact}\""
+    else:
+        msg = f"I already remember something very similar: \"{record.fact}\""
+    return {"llm_content": msg, "display_content": msg}
+
 @function_tool
 def save_memory(fact: str) -> Dict[str, str]:
     """
-    Saves a specific fact to the global long-term memory file (~/.gemini/GEMINI.md).
+    Saves a specific fact to global long-term memory (~/.gemini/memories.jsonl,
+    which can be rendered into the "Gemini Added Memories" section of ~/.gemini/GEMINI.md).
     This is useful for remembering user preferences or key details across sessions.
 
     Args:
         fact: The fact to remember. Should be a clear, self-contained statement.
     """
-    return _save_memory_impl(fact)
\ No newline at end of file
+    return _save_memory_impl(fact)
@@ -0,0 +1,25 @@
+# nano-tools/nano_gemini_cli_core/tools/next_page.py
+from typing import Dict, Optional
+
+from agents import function_tool
+from ..utils import result_pages
+
+def _next_page_impl(cursor: str, page_size: Optional[int] = None) -> Dict[str, str]:
+    """
+    Core implementation for continuing a paginated glob, grep or ls result.
+    """
+    return result_pages.next_page(cursor, page_size)
+
+@function_tool
+def next_page(cursor: str, page_size: Optional[int] = None) -> Dict[str, str]:
+    """
+    Returns the next page of a glob, search_file_content or list_directory result, without searching again.
+
+    Args:
+        cursor: The cursor printed at the end of the previous page.
+        page_size: The number of results per page. Defaults to the page size of the original call.
+
+    Returns:
+        A dictionary containing 'llm_content' for the agent and 'display_content' for the user.
+    """
+    return _next_page_impl(cursor, page_size)
@@ -4,6 +4,7 @@ from agents import function_tool
 from typing import Optional, List, Dict
 import fnmatch
 from ..utils.paths import shorten_path
+from ..utils.project_context import get_project_context
 
 def _is_path_within_root(path_to_check: str, root_directory: str) -> bool:
     """Checks if a path is within the root directory."""
@@ -11,14 +12,6 @@ def _is_path_within_root(path_to_check: str, root_directory: str) -> bool:
     abs_path = os.path.abspath(path_to_check)
     return os.path.commonpath([abs_root, abs_path]) == abs_root
 
-def _get_gemini_ignored_patterns(root_directory: str) -> List[str]:
-    """Reads patterns from a .geminiignore file in the root directory."""
-    ignore_file = os.path.join(root_directory, ".geminiignore")
-    if not os.path.exists(ignore_file):
-        return []
-    with open(ignore_file, "r", encoding="utf-8") as f:
-        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
-
 def _read_file_impl(absolute_path: str, offset: Optional[int] = None, limit: Optional[int] = None) -> Dict[str, str]:
     """
     Core implementation for reading file content.
@@ -41,7 +34,7 @@ def _read_file_impl(absolute_path: str, offset: Optional[int] = None, limit: Opt
         error_msg = "Error: 'offset' cannot be used without 'limit'."
         return {"llm_content": error_msg, "display_content": error_msg}
 
-    ignored_patterns = _get_gemini_ignored_patterns(root_directory)
+    ignored_patterns = get_project_context(root_directory).geminiignore_patterns()
     relative_path = os.path.relpath(absolute_path, root_directory)
     if any(fnmatch.fnmatch(relative_path, pattern) for pattern in ignored_patterns):
         error_msg = f"Error: File '{relative_path}' is ignored by a .geminiignore rule."
@@ -2,28 +2,15 @@
 import os
 import glob as py_glob
 from agents import function_tool
-from typing import List, Optional
-from ..utils.git_utils import is_git_repository
-import subprocess
+from typing import List, Optional, Dict
+from ..utils.project_context import get_project_context
+from ..utils.fs_watcher import get_file_index
 
 DEFAULT_EXCLUDES = [
     '**/node_modules/**', '**/__pycache__/**', '**/.git/**', '**/.vscode/**',
     '**/dist/**', '**/build/**', '**/*.pyc', '**/*.pyo', '**/*.bin'
 ]
 
-def _get_git_ignored_files(path: str) -> List[str]:
-    """Returns a list of absolute paths for files ignored by git."""
-    if not is_git_repository(path):
-        return []
-    try:
-        result = subprocess.run(
-            ['git', 'ls-files', '--others', '--ignored', '--exclude-standard'],
-            cwd=path, capture_output=True, text=True, check=True
-        )
-        return [os.path.abspath(os.path.join(path, f)) for f in result.stdout.strip().split('\n') if f]
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        return []
-
 def _read_many_files_impl(
     paths: List[str], 
     include: Optional[List[str]] = None,
@@ -41,23 +28,23 @@ def _read_many_files_impl(
     
     # --- File Discovery ---
     found_files = set()
+    index = get_file_index(root_directory)
     for pattern in all_patterns:
         # Ensure the pattern is joined with the root for searching
         search_pattern = os.path.join(root_directory, pattern)
-        matched_files = py_glob.glob(search_pattern, recursive=True)
+        matched_files = index.glob(pattern, root_directory) if index else None
+        if matched_files is None:
+            matched_files = py_glob.glob(search_pattern, recursive=True)
         for f in matched_files:
             if os.path.isfile(f):
                 found_files.add(os.path.abspath(f))
 
     # --- Filtering ---
     files_to_read = []
-    git_ignored_files = set(_get_git_ignored_files(root_directory)) if respect_git_ignore else set()
+    if respect_git_ignore:
+        found_files = get_project_context(root_directory).filter_git_ignored(found_files)
 
     for f_path in found_files:
-        # Git ignore check
-        if f_path in git_ignored_files:
-            continue
-        
         # Exclusion check
         is_excluded = False
         for pattern in all_excludes:
@@ -0,0 +1,59 @@
+# nano-tools/nano_gemini_cli_core/tools/restore.py
+import json
+from typing import Dict, Optional
+
+from agents import function_tool
+from ..utils.checkpoint import get_checkpoint_store
+from ..utils.fs_watcher import notify_changed
+from ..utils.paths import shorten_path
+
+def _restore_impl(checkpoint: Optional[str] = None) -> Dict[str, str]:
+    """
+    Core implementation for `/restore`: lists checkpoints, or restores one by name.
+    """
+    store = get_checkpoint_store()
+
+    if not checkpoint:
+        names = store.list()
+        if not names:
+            msg = "No checkpoints found for this project."
+            return {"llm_content": msg, "display_content": msg}
+        llm_content = "Available checkpoints (newest first):\n" + "\n".join(names)
+        return {"llm_content": llm_content, "display_content": f"Found {len(names)} checkpoint(s)."}
+
+    try:
+        manifest = store.restore(checkpoint)
+    except Exception as e:
+        msg = f"Error restoring checkpoint '{checkpoint}': {e}"
+        return {"llm_content": msg, "display_content": msg}
+    if manifest is None:
+        msg = f"Error: No checkpoint named '{checkpoint}'."
+        return {"llm_content": msg, "display_content": msg}
+
+    restored = []
+    for entry in manifest["files"]:
+        notify_changed(entry["path"])
+        action = "removed (did not exist)" if entry["blob"] is None else "restored"
+        restored.append(f"- {entry['path']}: {action}")
+
+    tool_call = manifest["tool_call"]
+    llm_output = [
+        f"Restored checkpoint '{checkpoint}'.",
+        "Files:",
+        *restored,
+        f"Conversation at checkpoint: {len(manifest['conversation'])} message(s).",
+        "The original tool call was:",
+        f"{tool_call['name']}({json.dumps(tool_call['args'])})",
+    ]
+    display_output = f"Restored {len(restored)} file(s) from {shorten_path(checkpoint)}."
+    return {"llm_content": "\n".join(llm_output), "display_content": display_output}
+
+@function_tool
+def restore(checkpoint: Optional[str] = None) -> Dict[str, str]:
+    """
+    Lists the checkpoints taken before file modifications, or restores one.
+
+    Args:
+        checkpoint: The checkpoint name to restore. If omitted, the available checkpoints are listed.
+    """
+    return _restore_impl(checkpoint)
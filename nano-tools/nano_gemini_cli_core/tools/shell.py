@@ -3,31 +3,69 @@ import os
 import sys
 import asyncio
 import subprocess
+import signal
 import tempfile
 import time
 from typing import Optional, Set, Callable, Awaitable, Dict
 
 from agents import function_tool
+from ..utils import shell_session
+from ..utils.process_registry import ProcessRegistry
+from ..utils.project_context import invalidate_project_context
 
 # --- Whitelist for approved commands ---
 # In a real application, this would be part of a larger context object.
 # For this self-contained tool, we'll use a global set.
 COMMAND_WHITELIST: Set[str] = set()
 
+# --- Persistent Shell Sessions ---
+# Shared pool used when a command is run with `persistent=True`.
+SESSION_POOL = shell_session.ShellSessionPool()
+
+# --- Timeouts and Background Processes ---
+DEFAULT_TIMEOUT_S = 300
+KILL_GRACE_PERIOD_S = 2.0
+OUTPUT_DRAIN_TIMEOUT_S = 0.5
+# Process groups left running by commands that backgrounded work (`cmd &`).
+BACKGROUND_PROCESSES = ProcessRegistry()
+
 def _is_path_within_root(path_to_check: str, root_directory: str) -> bool:
     """Checks if a path is within the root directory."""
     abs_root = os.path.abspath(root_directory)
     abs_path = os.path.abspath(path_to_check)
     return os.path.commonpath([abs_root, abs_path]) == abs_root
 
+async def _kill_process_group(process: asyncio.subprocess.Process, pgid: Optional[int]):
+    """Terminates a whole process group, escalating to SIGKILL if it does not exit in time."""
+    if pgid is None:
+        process.kill()
+        await process.wait()
+        return
+    for sig in (signal.SIGTERM, signal.SIGKILL):
+        try:
+            os.killpg(pgid, sig)
+        except ProcessLookupError:
+            break
+        try:
+            await asyncio.wait_for(process.wait(), KILL_GRACE_PERIOD_S)
+            break
+        except asyncio.TimeoutError:
+            continue
+    await process.wait()
+
 async def _stream_subprocess(
     command: str, 
     cwd: str, 
-    update_callback: Callable[[str], Awaitable[None]]
+    update_callback: Callable[[str], Awaitable[None]],
+    timeout: Optional[float] = None,
+    idle_timeout: Optional[float] = None
 ) -> dict:
     """
     Executes a command and streams its output in real-time.
     Also handles background PID discovery.
+
+    If `timeout` (total seconds) or `idle_timeout` (seconds without output) is
+    exceeded, or the calling task is cancelled, the whole process group is killed.
     """
     is_windows = sys.platform == "win32"
     
@@ -61,6 +99,8 @@ async def _stream_subprocess(
         stderr=asyncio.subprocess.PIPE,
         preexec_fn=None if is_windows else os.setsid
     )
+    pgid = None if is_windows else process.pid
+    last_activity = [asyncio.get_running_loop().time()]
 
     async def read_stream(stream, stream_name):
         """Reads and forwards a stream (stdout/stderr) line by line."""
@@ -68,15 +108,44 @@ async def _stream_subprocess(
             line = await stream.readline()
             if not line:
                 break
+            last_activity[0] = asyncio.get_running_loop().time()
             await update_callback(f"[{stream_name}] {line.decode().strip()}")
     
     # Start reading stdout and stderr concurrently
-    await asyncio.gather(
+    readers = asyncio.ensure_future(asyncio.gather(
         read_stream(process.stdout, "STDOUT"),
         read_stream(process.stderr, "STDERR")
-    )
+    ))
+    exited = asyncio.ensure_future(process.wait())
+    watchdog = asyncio.ensure_future(shell_session.watch_deadlines(last_activity, timeout, idle_timeout))
 
-    returncode = await process.wait()
+    killed_reason = None
+    try:
+        # Completion is decided by the shell exiting, not by EOF on its pipes:
+        # a backgrounded child keeps the pipes open for as long as it runs.
+        await asyncio.wait({exited, watchdog}, return_when=asyncio.FIRST_COMPLETED)
+        if not exited.done():
+            killed_reason = watchdog.result()
+            await _kill_process_group(process, pgid)
+        # Keep draining while output is still flowing, then stop waiting on
+        # pipes held open only by background children.
+        while not readers.done():
+            seen = last_activity[0]
+            await asyncio.wait({readers}, timeout=OUTPUT_DRAIN_TIMEOUT_S)
+            if last_activity[0] == seen:
+                await shell_session.cancel_and_reap(readers)
+                break
+    except asyncio.CancelledError:
+        # The agent runner cancelled this tool call; do not leave the command running.
+        await shell_session.cancel_and_reap(readers)
+        await asyncio.shield(_kill_process_group(process, pgid))
+        if pgrep_file and os.path.exists(pgrep_file):
+            os.remove(pgrep_file)
+        raise
+    finally:
+        watchdog.cancel()
+
+    returncode = await exited
 
     # --- PID Discovery and Cleanup ---
     background_pids = []
@@ -87,19 +156,30 @@ async def _stream_subprocess(
             background_pids = [pid for pid in pids if pid != process.pid]
         os.remove(pgrep_file)
 
+    if background_pids and killed_reason is None:
+        BACKGROUND_PROCESSES.register(pgid, command, cwd, background_pids)
+
     return {
         "returncode": returncode,
         "background_pids": background_pids,
-        "pgid": None if is_windows else process.pid
+        "pgid": pgid,
+        "killed_reason": killed_reason
     }
 
 async def _run_shell_command_impl(
     command: str, 
-    directory: Optional[str] = None
+    directory: Optional[str] = None,
+    persistent: bool = False,
+    timeout: Optional[int] = DEFAULT_TIMEOUT_S,
+    idle_timeout: Optional[int] = None
 ) -> Dict[str, str]:
     """
     Core implementation for executing a shell command.
     """
+    # A non-positive limit disables the corresponding timeout.
+    timeout = timeout if timeout and timeout > 0 else None
+    idle_timeout = idle_timeout if idle_timeout and idle_timeout > 0 else None
+
     # --- Whitelist Check ---
     command_root = command.strip().split(' ')[0]
     if command_root in COMMAND_WHITELIST:
@@ -126,23 +206,43 @@ async def _run_shell_command_impl(
         stdout_capture.append(line)
 
     try:
-        result = await _stream_subprocess(command, target_dir, default_callback)
+        if persistent and shell_session.is_supported():
+            try:
+                result = await SESSION_POOL.run(command, target_dir, default_callback, timeout, idle_timeout)
+            except shell_session.ShellCommandTimeout as e:
+                result = {"returncode": None, "background_pids": [], "pgid": e.pgid, "killed_reason": e.reason, "session_reset": True}
+        else:
+            result = await _stream_subprocess(command, target_dir, default_callback, timeout, idle_timeout)
+
+        # The command may have run `git init`, checked out a branch or edited ignore files.
+        invalidate_project_context()
+
+        killed_reason = result.get("killed_reason")
+        if killed_reason:
+            limit = timeout if killed_reason == "timeout" else idle_timeout
+            exit_status = f"{result['returncode']} (killed after {killed_reason.replace('_', ' ')} of {limit}s)"
+        else:
+            exit_status = f"{result['returncode']}"
         
         # --- Structured Output ---
         llm_output = [
             f"Command: {command}",
             f"Directory: {directory or '(root)'}",
-            f"Exit Code: {result['returncode']}",
-            f"Process Group ID: {result['pgid'] or '(N/A on Windows)'}",
+            f"Exit Code: {exit_status}",
+            f"Process Group ID: {result['pgid'] or '(N/A on Windows)'}"
+            + (" (persistent session killed and reset)" if result.get("session_reset") else ""),
             f"Background PIDs: {result['background_pids'] or '(none)'}",
             "---",
             "Output:",
         ] + stdout_capture
         
-        display_output = f"Command finished with exit code {result['returncode']}."
+        display_output = f"Command finished with exit code {exit_status}."
         
         return {"llm_content": "\n".join(llm_output), "display_content": display_output}
 
+    except shell_session.ShellSessionError as e:
+        msg = f"Error: {e}"
+        return {"llm_content": msg, "display_content": msg}
     except Exception as e:
         msg = f"An unexpected error occurred: {e}"
         return {"llm_content": msg, "display_content": msg}
@@ -150,14 +250,25 @@ async def _run_shell_command_impl(
 @function_tool
 async def run_shell_command(
     command: str, 
-    directory: Optional[str] = None
+    directory: Optional[str] = None,
+    persistent: bool = False,
+    timeout: Optional[int] = DEFAULT_TIMEOUT_S,
+    idle_timeout: Optional[int] = None
 ) -> Dict[str, str]:
     """
     Executes a shell command, streams its output, and reports background processes.
+    Commands that exceed a timeout are killed together with their whole process group.
 
     Args:
         command: The shell command to execute.
         directory: The directory to run the command in. Must be a relative path.
+        persistent: If True, the command runs on a pooled long-lived shell instead of a
+                    freshly spawned one. Much faster for many small commands, but background
+                    processes are not reported. Defaults to False.
+        timeout: Maximum total run time in seconds before the command is killed. Defaults to 300.
+                 Use 0 to disable.
+        idle_timeout: Maximum number of seconds without any output before the command is killed.
+                      Disabled by default.
     """
-    return await _run_shell_command_impl(command, directory)
+    return await _run_shell_command_impl(command, directory, persistent, timeout, idle_timeout)
 
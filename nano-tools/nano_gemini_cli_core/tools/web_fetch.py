@@ -1,64 +1,89 @@
 # nano-tools/nano_gemini_cli_core/tools/web_fetch.py
-import requests
 from agents import function_tool
-import litellm
-import re
-try:
-    import html2text
-except ImportError:
-    def html2text_mock(*args, **kwargs):
-        raise ImportError("The 'html2text' package is not installed. Please install it with 'pip install html2text'.")
-    html2text = html2text_mock
+from typing import Dict, List
+from ..utils import http_fetch, html_extract
 
-def _manual_fetch_and_clean(url: str) -> str:
+def _normalize_url(url: str) -> str:
+    """Rewrites GitHub blob URLs to their raw content equivalent."""
+    if 'github.com' in url and '/blob/' in url:
+        url = url.replace('github.com', 'raw.githubusercontent.com').replace('/blob/', '/')
+    return url
+
+def _is_html(result: http_fetch.FetchResult) -> bool:
+    content_type = result.content_type.lower()
+    return not content_type or "html" in content_type
+
+def _clean_fetch_results(results: List[http_fetch.FetchResult]) -> List[str]:
     """
-    Manually fetches a URL and cleans the HTML content using html2text,
-    matching the configuration of the original gemini-cli.
+    Turns fetch results into cleaned text, or error messages starting with 'Error'.
+
+    HTML pages are stripped of boilerplate and converted to markdown (cached by
+    body hash, several pages in parallel); plain-text bodies are returned as-is.
     """
+    html_pages = [result.text for result in results if not result.error and _is_html(result)]
     try:
-        if 'github.com' in url and '/blob/' in url:
-            url = url.replace('github.com', 'raw.githubusercontent.com').replace('/blob/', '/')
-        
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        
-        # Configure html2text to match gemini-cli's implementation
-        h = html2text.HTML2Text()
-        h.ignore_links = True
-        h.ignore_images = True
-        h.body_width = 0  # This disables word wrapping
-        
-        cleaned_text = h.handle(response.text)
-        
-        return cleaned_text
-
-    except requests.exceptions.RequestException as e:
-        return f"Error during manual fetch for {url}: {e}"
+        converted = iter(html_extract.convert_many(html_pages))
     except ImportError as e:
-        return str(e)
+        converted = None
+        conversion_error = f"Error: {e}"
     except Exception as e:
-        return f"An unexpected error occurred during manual fetch: {e}"
+        converted = None
+        conversion_error = f"An unexpected error occurred during manual fetch: {e}"
+
+    cleaned = []
+    for result in results:
+        if result.error:
+            cleaned.append(result.error)
+        elif not _is_html(result):
+            cleaned.append(result.text)
+        elif converted is None:
+            cleaned.append(conversion_error)
+        else:
+            cleaned.append(next(converted))
+    return cleaned
+
+def _manual_fetch_and_clean(url: str) -> str:
+    """
+    Manually fetches a URL through the shared HTTP session and cache,
+    and cleans the HTML content using html2text.
+    """
+    return _clean_fetch_results([http_fetch.fetch_url(_normalize_url(url))])[0]
 
 def _web_fetch_impl(prompt: str) -> Dict[str, str]:
     """
     Core implementation for fetching web content.
     """
     try:
-        urls = re.findall(r'(https?://[^\s]+)', prompt)
+        urls = http_fetch.extract_urls(prompt)
         if not urls:
             msg = "Error: No URL found in the prompt."
             return {"llm_content": msg, "display_content": msg}
             
-        url = urls[0]
-        print(f"Simulating primary fetch failure. Proceeding to manual fallback for {url}")
+        print(f"Simulating primary fetch failure. Proceeding to manual fallback for {', '.join(urls)}")
         
-        content = _manual_fetch_and_clean(url)
-        
-        if content.startswith("Error"):
-            return {"llm_content": content, "display_content": content}
+        # All URLs are fetched concurrently over the shared connection pool.
+        results = http_fetch.fetch_all([_normalize_url(url) for url in urls])
+
+        sections: List[str] = []
+        errors: List[str] = []
+        for url, result, content in zip(urls, results, _clean_fetch_results(results)):
+            if content.startswith("Error") or content.startswith("An unexpected error"):
+                errors.append(content)
+                continue
+            if result.truncated:
+                content += f"\n\n[Content truncated at {http_fetch.MAX_RESPONSE_BYTES} bytes.]"
+            sections.append(f"--- Manually Fetched Content from {url} ---\n\n{content}")
+
+        if not sections:
+            msg = "\n".join(errors)
+            return {"llm_content": msg, "display_content": msg}
 
-        llm_output = f"--- Manually Fetched Content from {url} ---\n\n{content}"
-        display_output = f"Successfully fetched content from {url}."
+        llm_output = "\n\n".join(sections + errors)
+        fetched = len(sections)
+        display_output = (
+            f"Successfully fetched content from {urls[0]}." if len(urls) == 1
+            else f"Successfully fetched content from {fetched} of {len(urls)} URLs."
+        )
         
         return {"llm_content": llm_output, "display_content": display_output}
 
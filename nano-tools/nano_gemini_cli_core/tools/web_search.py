@@ -1,7 +1,15 @@
 # nano-tools/nano_gemini_cli_core/tools/web_search.py
 from agents import function_tool
-import litellm
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
+
+from ..utils import search_cache
+from ..utils.lazy_import import lazy_module
+from ..utils import llm_gateway
+
+litellm = lazy_module("litellm", "Please install it with 'pip install litellm'.")
+
+SEARCH_MODEL = "gemini/gemini-1.5-pro-latest"
+RESULTS_HEADER = "Web search results:"
 
 def _format_search_results(response: Dict[str, Any]) -> str:
     """
@@ -28,47 +36,66 @@ def _format_search_results(response: Dict[str, Any]) -> str:
         # appended or described in the content itself by the model.
         # A full implementation would require deep parsing of grounding metadata.
         
-        return f"Web search results:\n\n{text_content}"
+        return f"{RESULTS_HEADER}\n\n{text_content}"
 
     except (KeyError, IndexError, TypeError) as e:
         return f"Error parsing search results: {e}. Raw response: {response}"
 
 
+def _search_uncached(query: str) -> Tuple[str, bool]:
+    """
+    Runs a search against the model. Returns the formatted results and
+    whether they are worth caching (error and empty results are not).
+    """
+    # This is the correct way to trigger the backend search tool.
+    # We are not calling a function, but telling the model it *can*.
+    response = llm_gateway.completion(
+        litellm.completion,
+        model=SEARCH_MODEL,
+        messages=[{"role": "user", "content": query}],
+        tools=[
+            {
+                "type": "function",
+                "function": {
+                    "name": "google_search",
+                    "description": "Performs a Google search and returns a list of websites and their contents.",
+                }
+            }
+        ],
+        # "any" allows the model to choose between a direct answer or using the tool.
+        tool_choice="any" 
+    )
+
+    # The response object from litellm is a dict, not an object
+    formatted_results = _format_search_results(response.dict())
+    return formatted_results, formatted_results.startswith(RESULTS_HEADER)
+
 def _google_web_search_impl(query: str) -> Dict[str, str]:
     """
     Core implementation for performing a web search.
+
+    Results are cached per normalized query (see utils/search_cache.py), and
+    identical queries issued concurrently share a single request.
     """
     if not query or not query.strip():
         msg = "Error: The 'query' parameter cannot be empty."
         return {"llm_content": msg, "display_content": msg}
 
+    cache = search_cache.get_default_cache()
+    key = f"{SEARCH_MODEL}\n{search_cache.normalize_query(query)}"
     try:
-        # This is the correct way to trigger the backend search tool.
-        # We are not calling a function, but telling the model it *can*.
-        response = litellm.completion(
-            model="gemini/gemini-1.5-pro-latest",
-            messages=[{"role": "user", "content": query}],
-            tools=[
-                {
-                    "type": "function",
-                    "function": {
-                        "name": "google_search",
-                        "description": "Performs a Google search and returns a list of websites and their contents.",
-                    }
-                }
-            ],
-            # "any" allows the model to choose between a direct answer or using the tool.
-            tool_choice="any" 
-        )
-        
-        # The response object from litellm is a dict, not an object
-        formatted_results = _format_search_results(response.dict())
-        return {"llm_content": formatted_results, "display_content": "Web search completed."}
-
+        formatted_results, source = cache.get_or_compute(key, lambda: _search_uncached(query))
     except Exception as e:
         msg = f"An unexpected error occurred during the web search: {e}"
         return {"llm_content": msg, "display_content": msg}
 
+    display = "Web search completed." if source == "computed" else f"Web search completed (cached, {source})."
+    return {"llm_content": formatted_results, "display_content": display}
+
+def get_search_cache_stats() -> Dict[str, float]:
+    """Returns hit/miss counters for the web search result cache."""
+    return search_cache.get_default_cache().stats()
+
 @function_tool
 def google_web_search(query: str) -> Dict[str, str]:
     """
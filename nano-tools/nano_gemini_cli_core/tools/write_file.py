@@ -1,7 +1,14 @@
 # nano-tools/nano_gemini_cli_core/tools/write_file.py
 import os
 from agents import function_tool
-import litellm
+
+from ..utils.checkpoint import checkpoint_before
+from ..utils.fs_watcher import notify_changed
+from ..utils.lazy_import import lazy_module
+from ..utils import llm_gateway
+
+# litellm is only needed by the correction path; importing it takes seconds.
+litellm = lazy_module("litellm", "Please install it with 'pip install litellm'.")
 
 def _is_path_within_root(path_to_check: str, root_directory: str) -> bool:
     """Checks if a path is within the root directory."""
@@ -28,7 +35,8 @@ def _run_correction_agent(file_path: str, proposed_content: str) -> str:
     """
     
     try:
-        response = litellm.completion(
+        response = llm_gateway.completion(
+            litellm.completion,
             model="gemini/gemini-1.5-flash-latest",
             messages=[{"role": "user", "content": correction_prompt}]
         )
@@ -64,6 +72,8 @@ def _write_file_impl(file_path: str, content: str, agentic_correction: bool = Fa
         final_content = _run_correction_agent(file_path, content)
 
     # --- File Writing Logic ---
+    tool_args = {"file_path": file_path, "content": content, "agentic_correction": agentic_correction}
+    checkpoint_before("write_file", tool_args, [abs_file_path])
     try:
         parent_dir = os.path.dirname(abs_file_path)
         if parent_dir:
@@ -71,6 +81,7 @@ def _write_file_impl(file_path: str, content: str, agentic_correction: bool = Fa
             
         with open(abs_file_path, 'w', encoding='utf-8') as f:
             f.write(final_content)
+        notify_changed(abs_file_path)
             
         if os.path.exists(file_path):
             return f"Successfully overwrote file: {file_path}"
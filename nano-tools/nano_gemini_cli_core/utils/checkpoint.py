@@ -0,0 +1,229 @@
+# nano-tools/nano_gemini_cli_core/utils/checkpoint.py
+import os
+import json
+import zlib
+import hashlib
+import tempfile
+import threading
+import time
+import contextvars
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from .project_context import get_project_context
+
+# --- Checkpointing Configuration ---
+# Snapshots only cover the files a tool is about to touch, so this is cheap
+# enough to leave on. Set to False to disable checkpoints entirely.
+CHECKPOINTING_ENABLED = True
+CHECKPOINTS_DIRNAME = "checkpoints"
+COMPRESSION_LEVEL = 6
+# Once there are more checkpoints than this, the oldest are deleted down to
+# 90% of it in one go, along with the blobs only they referenced. Pruning in
+# batches keeps the blob sweep, which reads every manifest, off most creates.
+MAX_CHECKPOINTS = 200
+# Unreferenced blobs touched more recently than this are kept, in case a
+# checkpoint being created by another process is about to reference them.
+BLOB_GRACE_S = 60.0
+
+# The conversation so far, recorded with each checkpoint. An in-process host
+# keeps this up to date with `set_conversation`; the daemon runs each call
+# under `conversation_context` with the history its client sent.
+_conversation: List[Dict[str, Any]] = []
+_call_conversation: contextvars.ContextVar = contextvars.ContextVar("checkpoint_conversation", default=None)
+_stores: Dict[str, "CheckpointStore"] = {}
+_stores_lock = threading.Lock()
+
+def set_conversation(history: List[Dict[str, Any]]):
+    """Records the conversation history that new checkpoints should capture."""
+    global _conversation
+    _conversation = list(history)
+
+@contextmanager
+def conversation_context(history: List[Dict[str, Any]]):
+    """Records `history` for checkpoints created in this context (and threads started from it with its context)."""
+    token = _call_conversation.set(list(history))
+    try:
+        yield
+    finally:
+        _call_conversation.reset(token)
+
+def current_conversation() -> List[Dict[str, Any]]:
+    history = _call_conversation.get()
+    return list(history if history is not None else _conversation)
+
+def _atomic_write(path: str, data: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+class CheckpointStore:
+    """
+    Snapshots of files about to be modified, kept in a content-addressed blob store.
+
+    Each file's bytes are stored once, zlib-compressed, under the SHA-256 of
+    the content, so snapshotting an unchanged file again costs one hash and
+    no write. A checkpoint is a JSON manifest mapping paths to blobs (or to
+    None for files that did not exist yet), plus the pending tool call and
+    the conversation at the time.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.blob_dir = os.path.join(directory, "blobs")
+        self.manifest_dir = os.path.join(directory, "manifests")
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.blob_dir, digest[:2], digest)
+
+    def _store_blob(self, data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(digest)
+        try:
+            # Touched so a concurrent prune sees it as in use.
+            os.utime(path)
+        except FileNotFoundError:
+            _atomic_write(path, zlib.compress(data, COMPRESSION_LEVEL))
+        return digest
+
+    def _load_blob(self, digest: str) -> bytes:
+        with open(self._blob_path(digest), "rb") as f:
+            return zlib.decompress(f.read())
+
+    def create(
+        self,
+        file_paths: List[str],
+        tool_name: str,
+        tool_args: Dict[str, Any],
+        conversation: Optional[List[Dict[str, Any]]] = None,
+    ) -> str:
+        """Snapshots `file_paths` and records the pending tool call. Returns the checkpoint name."""
+        files = []
+        for file_path in file_paths:
+            abs_path = os.path.abspath(file_path)
+            try:
+                with open(abs_path, "rb") as f:
+                    data = f.read()
+                files.append({"path": abs_path, "blob": self._store_blob(data), "mode": os.stat(abs_path).st_mode & 0o7777})
+            except FileNotFoundError:
+                files.append({"path": abs_path, "blob": None, "mode": None})
+
+        now = datetime.now(timezone.utc)
+        timestamp = now.strftime("%Y-%m-%dT%H-%M-%S_") + f"{now.microsecond // 1000:03d}Z"
+        target = os.path.basename(file_paths[0]) if file_paths else "none"
+        name = f"{timestamp}-{target}-{tool_name}"
+        suffix = 1
+        while os.path.exists(os.path.join(self.manifest_dir, f"{name}.json")):
+            suffix += 1
+            name = f"{timestamp}-{target}-{tool_name}-{suffix}"
+
+        manifest = {
+            "name": name,
+            "created_at": now.isoformat(),
+            "tool_call": {"name": tool_name, "args": tool_args},
+            "files": files,
+            "conversation": list(conversation) if conversation is not None else current_conversation(),
+        }
+        _atomic_write(os.path.join(self.manifest_dir, f"{name}.json"), json.dumps(manifest).encode("utf-8"))
+        try:
+            self.prune()
+        except OSError as e:
+            print(f"Warning: could not prune old checkpoints: {e}")
+        return name
+
+    def prune(self, max_checkpoints: Optional[int] = None):
+        """Deletes the oldest checkpoints once there are more than `max_checkpoints`, then their unreferenced blobs."""
+        limit = MAX_CHECKPOINTS if max_checkpoints is None else max_checkpoints
+        names = self.list()
+        if len(names) <= limit:
+            return
+        for name in names[limit * 9 // 10:]:
+            try:
+                os.remove(os.path.join(self.manifest_dir, f"{name}.json"))
+            except FileNotFoundError:
+                pass
+
+        sweep_started = time.time()
+        referenced = set()
+        for name in self.list():
+            manifest = self._read_manifest(name)
+            if manifest is not None:
+                referenced.update(entry["blob"] for entry in manifest["files"] if entry["blob"])
+        for directory, _, files in os.walk(self.blob_dir):
+            for digest in files:
+                path = os.path.join(directory, digest)
+                try:
+                    if digest not in referenced and os.stat(path).st_mtime < sweep_started - BLOB_GRACE_S:
+                        os.remove(path)
+                except FileNotFoundError:
+                    continue
+
+    def list(self) -> List[str]:
+        """Checkpoint names, newest first."""
+        try:
+            names = [f[:-len(".json")] for f in os.listdir(self.manifest_dir) if f.endswith(".json")]
+        except FileNotFoundError:
+            return []
+        return sorted(names, reverse=True)
+
+    def load(self, name: str) -> Optional[Dict[str, Any]]:
+        """The manifest of a checkpoint listed by `list`, or None. Other names (e.g. "../x") are never opened."""
+        if not name or "/" in name or os.sep in name or (os.altsep and os.altsep in name) or name not in self.list():
+            return None
+        return self._read_manifest(name)
+
+    def _read_manifest(self, name: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(os.path.join(self.manifest_dir, f"{name}.json"), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def restore(self, name: str) -> Optional[Dict[str, Any]]:
+        """
+        Puts every file in the checkpoint back as it was; files that did not
+        exist at the time are removed. Returns the manifest, or None if there
+        is no such checkpoint.
+        """
+        manifest = self.load(name)
+        if manifest is None:
+            return None
+        for entry in manifest["files"]:
+            if entry["blob"] is None:
+                if os.path.exists(entry["path"]):
+                    os.remove(entry["path"])
+                continue
+            _atomic_write(entry["path"], self._load_blob(entry["blob"]))
+            if entry.get("mode") is not None:
+                os.chmod(entry["path"], entry["mode"])
+        return manifest
+
+def get_checkpoint_store(cwd: Optional[str] = None) -> CheckpointStore:
+    """Gets the store in the project's temp directory (~/.gemini/tmp/<project_hash>/checkpoints)."""
+    directory = os.path.join(get_project_context(cwd).temp_dir, CHECKPOINTS_DIRNAME)
+    with _stores_lock:
+        if directory not in _stores:
+            _stores[directory] = CheckpointStore(directory)
+        return _stores[directory]
+
+def checkpoint_before(tool_name: str, tool_args: Dict[str, Any], file_paths: List[str]) -> Optional[str]:
+    """
+    Called by mutating tools just before they write. Returns the checkpoint
+    name, or None if checkpointing is disabled or the snapshot failed; a
+    failed snapshot never blocks the tool itself.
+    """
+    if not CHECKPOINTING_ENABLED:
+        return None
+    try:
+        return get_checkpoint_store().create(file_paths, tool_name, tool_args)
+    except OSError as e:
+        print(f"Warning: could not create checkpoint before {tool_name}: {e}")
+        return None
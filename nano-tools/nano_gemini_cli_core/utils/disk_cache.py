@@ -0,0 +1,104 @@
+# nano-tools/nano_gemini_cli_core/utils/disk_cache.py
+import os
+import json
+import hashlib
+import tempfile
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+def get_cache_root() -> str:
+    """Gets the root directory for all on-disk caches (~/.gemini/cache)."""
+    return os.path.join(os.path.expanduser("~"), ".gemini", "cache")
+
+class DiskCache:
+    """
+    A tiny persistent key-value store: one JSON file per key, named by the key's SHA-256.
+
+    Writes go through a temporary file and `os.replace`, so readers in other
+    threads or processes never see a partially written entry. With
+    `max_bytes`, a write that takes the directory over the bound evicts the
+    least recently used entries (hits touch their file) down to 90% of it.
+    """
+
+    def __init__(self, directory: str, max_bytes: Optional[int] = None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # Bytes on disk, counted on the first bounded write and kept up to date by this instance's writes.
+        self._bytes: Optional[int] = None
+
+    def _path_for(self, key: str) -> str:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, digest[:2], f"{digest}.json")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path_for(key), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError, OSError):
+            return None
+        # Guard against the (astronomically unlikely) digest collision.
+        if entry.get("key") != key:
+            return None
+        if self.max_bytes is not None:
+            try:
+                os.utime(self._path_for(key))
+            except OSError:
+                pass
+        return entry.get("value")
+
+    def set(self, key: str, value: Dict[str, Any]):
+        path = self._path_for(key)
+        with self._lock:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            if self.max_bytes is not None and self._bytes is None:
+                self._bytes = sum(size for _, size, _ in self._entries())
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump({"key": key, "value": value}, f)
+                replaced = os.path.getsize(path) if os.path.exists(path) else 0
+                os.replace(tmp_path, path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            if self.max_bytes is not None:
+                self._bytes += os.path.getsize(path) - replaced
+                if self._bytes > self.max_bytes:
+                    self._evict()
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        """(mtime, size, path) of every entry on disk."""
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".json"):
+                    path = os.path.join(root, name)
+                    try:
+                        st = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def _evict(self):
+        """Deletes the least recently used entries down to 90% of `max_bytes`. Lock must be held."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.9
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        self._bytes = total
+
+    def delete(self, key: str):
+        try:
+            os.remove(self._path_for(key))
+        except FileNotFoundError:
+            pass
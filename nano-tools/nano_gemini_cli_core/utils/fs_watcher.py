@@ -0,0 +1,286 @@
+# nano-tools/nano_gemini_cli_core/utils/fs_watcher.py
+import os
+import re
+import threading
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    # Without watchdog (inotify/FSEvents), a background thread polls the tree instead.
+    Observer = None
+    FileSystemEventHandler = object
+
+# --- Watcher Configuration ---
+POLL_INTERVAL_S = 1.0
+
+# (event type, absolute path); the type is "created", "modified" or "deleted".
+ChangeCallback = Callable[[str, str], None]
+
+_watchers: Dict[str, "FileSystemWatcher"] = {}
+_watchers_lock = threading.Lock()
+
+def _in_hidden_dir(root: str, path: str) -> bool:
+    """Hidden directories (.git, .venv, ...) are not watched; hidden files such as .gitignore are."""
+    return any(part.startswith(".") for part in os.path.relpath(path, root).split(os.sep)[:-1])
+
+def _scan_tree(root: str) -> Dict[str, Tuple[int, int]]:
+    """Maps every file under `root`, outside hidden directories, to its (mtime_ns, size)."""
+    snapshot: Dict[str, Tuple[int, int]] = {}
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if not entry.name.startswith("."):
+                                stack.append(entry.path)
+                        elif entry.is_file():
+                            st = entry.stat()
+                            snapshot[entry.path] = (st.st_mtime_ns, st.st_size)
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return snapshot
+
+class _WatchdogHandler(FileSystemEventHandler):
+    def __init__(self, watcher: "FileSystemWatcher"):
+        self.watcher = watcher
+
+    def on_any_event(self, event):
+        if event.is_directory and event.event_type != "moved":
+            return
+        if event.event_type == "moved":
+            self.watcher._publish("deleted", event.src_path)
+            self.watcher._publish("created", event.dest_path)
+        elif event.event_type in ("created", "modified", "deleted"):
+            self.watcher._publish(event.event_type, event.src_path)
+
+class FileSystemWatcher:
+    """
+    Watches a directory tree and publishes file changes to subscribers.
+
+    Uses watchdog when it is installed, otherwise a polling thread that
+    diffs (mtime, size) snapshots every POLL_INTERVAL_S. Either way the work
+    happens off the tools' hot path: caches subscribed here are updated as
+    files change instead of re-scanning on every call.
+    """
+
+    def __init__(self, root: str, poll_interval: float = POLL_INTERVAL_S):
+        self.root = os.path.abspath(root)
+        self.poll_interval = poll_interval
+        self.backend = "watchdog" if Observer is not None else "polling"
+        self._subscribers: List[ChangeCallback] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._observer = None
+        self._thread: Optional[threading.Thread] = None
+        self._snapshot: Dict[str, Tuple[int, int]] = {}
+        self._poll_lock = threading.Lock()
+
+    def subscribe(self, callback: ChangeCallback):
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def _publish(self, event_type: str, path: str):
+        if _in_hidden_dir(self.root, path):
+            return
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(event_type, path)
+            except Exception as e:
+                print(f"Warning: file watcher subscriber failed: {e}")
+
+    def start(self):
+        if self.backend == "watchdog":
+            self._observer = Observer()
+            self._observer.schedule(_WatchdogHandler(self), self.root, recursive=True)
+            self._observer.daemon = True
+            self._observer.start()
+        else:
+            self._snapshot = _scan_tree(self.root)
+            self._thread = threading.Thread(target=self._poll_loop, name=f"fs-watcher:{self.root}", daemon=True)
+            self._thread.start()
+
+    def _poll_loop(self):
+        while not self._stop.wait(self.poll_interval):
+            self.poll_once()
+
+    def poll_once(self):
+        """Diffs the tree against the last snapshot and publishes the differences (polling backend)."""
+        with self._poll_lock:
+            current = _scan_tree(self.root)
+            previous = self._snapshot
+            self._snapshot = current
+        for path, signature in current.items():
+            old = previous.get(path)
+            if old is None:
+                self._publish("created", path)
+            elif old != signature:
+                self._publish("modified", path)
+        for path in previous.keys() - current.keys():
+            self._publish("deleted", path)
+
+    def sync(self):
+        """
+        Makes sure changes made so far have been published. Polling only
+        notices changes on its next scan, so this runs one immediately;
+        watchdog delivers events as they happen.
+        """
+        if self.backend == "polling":
+            self.poll_once()
+
+    def stop(self):
+        self._stop.set()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+        if self._thread is not None:
+            self._thread.join()
+
+def _glob_segment_to_regex(segment: str) -> str:
+    out = []
+    i = 0
+    while i < len(segment):
+        char = segment[i]
+        if char == "*":
+            out.append("[^/]*")
+        elif char == "?":
+            out.append("[^/]")
+        elif char == "[":
+            end = segment.find("]", i + 2)
+            if end == -1:
+                out.append(re.escape(char))
+            else:
+                body = segment[i + 1:end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body.replace(chr(92), chr(92) * 2)}]")
+                i = end
+        else:
+            out.append(re.escape(char))
+        i += 1
+    regex = "".join(out)
+    # Like glob, wildcards never match a leading dot.
+    if segment[:1] in ("*", "?", "["):
+        regex = r"(?!\.)" + regex
+    return regex
+
+def glob_to_regex(pattern: str) -> "re.Pattern":
+    """Translates a recursive glob pattern (relative, '/'-separated) into a regex with glob's semantics."""
+    segments = [s for s in pattern.split("/") if s and s != "."]
+    parts = []
+    for index, segment in enumerate(segments):
+        last = index == len(segments) - 1
+        if segment == "**":
+            parts.append(r"(?:(?!\.)[^/]+/)*(?!\.)[^/]+" if last else r"(?:(?!\.)[^/]+/)*")
+        else:
+            parts.append(_glob_segment_to_regex(segment) + ("" if last else "/"))
+    return re.compile("".join(parts) + r"\Z")
+
+def _is_hidden(root: str, path: str) -> bool:
+    relative = os.path.relpath(path, root)
+    # The root itself is ".", which is not a hidden name.
+    return relative != "." and any(part.startswith(".") for part in relative.split(os.sep))
+
+class FileIndex:
+    """
+    The set of non-hidden files under a watched root, kept current from
+    watcher events, so glob can match patterns without walking the tree.
+    Glob wildcards never match hidden names, so leaving them out of the
+    index changes no results; patterns that name them explicitly fall back
+    to a real glob.
+    """
+
+    def __init__(self, watcher: FileSystemWatcher):
+        self.root = watcher.root
+        self._lock = threading.Lock()
+        self._files: Set[str] = {path for path in _scan_tree(self.root) if not _is_hidden(self.root, path)}
+        watcher.subscribe(self._on_change)
+
+    def _on_change(self, event_type: str, path: str):
+        if _is_hidden(self.root, path):
+            return
+        with self._lock:
+            if event_type == "deleted":
+                self._files.discard(path)
+            elif os.path.isfile(path):
+                self._files.add(path)
+
+    def glob(self, pattern: str, base: str) -> Optional[List[str]]:
+        """
+        Files under `base` whose path relative to it matches `pattern`, joined
+        onto `base` the way glob.glob would. Returns None if the pattern or
+        base cannot be answered from the index.
+        """
+        abs_base = os.path.abspath(base)
+        if os.path.isabs(pattern) or any(s.startswith(".") and s != "." for s in pattern.split("/")):
+            return None
+        if not (abs_base == self.root or abs_base.startswith(self.root + os.sep)) or _is_hidden(self.root, abs_base):
+            return None
+        regex = glob_to_regex(pattern)
+        prefix = abs_base + os.sep
+        with self._lock:
+            files = list(self._files)
+        matches = []
+        for path in files:
+            if path.startswith(prefix):
+                relative = path[len(prefix):]
+                if os.sep != "/":
+                    relative = relative.replace(os.sep, "/")
+                if regex.match(relative):
+                    matches.append(os.path.join(base, path[len(prefix):]))
+        return matches
+
+_indexes: Dict[str, FileIndex] = {}
+
+def start_watching(root: str) -> FileSystemWatcher:
+    """Starts (or returns the running) watcher for `root`, along with its file index."""
+    root = os.path.abspath(root)
+    with _watchers_lock:
+        watcher = _watchers.get(root)
+        if watcher is None:
+            watcher = FileSystemWatcher(root)
+            _indexes[root] = FileIndex(watcher)
+            watcher.start()
+            _watchers[root] = watcher
+        return watcher
+
+def stop_watching(root: Optional[str] = None):
+    """Stops the watcher for `root`, or every watcher."""
+    with _watchers_lock:
+        roots = [os.path.abspath(root)] if root else list(_watchers)
+        for key in roots:
+            watcher = _watchers.pop(key, None)
+            _indexes.pop(key, None)
+            if watcher:
+                watcher.stop()
+
+def _watchers_containing(path: str) -> List[FileSystemWatcher]:
+    abs_path = os.path.abspath(path)
+    with _watchers_lock:
+        return [w for root, w in _watchers.items() if abs_path == root or abs_path.startswith(root + os.sep)]
+
+def notify_changed(path: str):
+    """
+    Publishes a change the tools made themselves (e.g. write_file), so
+    indexes see it at once instead of after the next poll or event.
+    """
+    event_type = "modified" if os.path.exists(path) else "deleted"
+    for watcher in _watchers_containing(path):
+        watcher._publish(event_type, os.path.abspath(path))
+
+def get_file_index(path: str) -> Optional[FileIndex]:
+    """The file index of a watched root containing `path`, if any."""
+    abs_path = os.path.abspath(path)
+    with _watchers_lock:
+        for root, index in _indexes.items():
+            if abs_path == root or abs_path.startswith(root + os.sep):
+                return index
+    return None
@@ -0,0 +1,207 @@
+# nano-tools/nano_gemini_cli_core/utils/html_extract.py
+import os
+import re
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from .disk_cache import DiskCache, get_cache_root
+from .lazy_import import lazy_module
+
+# Imported on first conversion, so cached fetches never load it.
+html2text = lazy_module("html2text", "Please install it with 'pip install html2text'.")
+
+# --- Extraction Configuration ---
+# Elements whose whole subtree is page chrome rather than content.
+BOILERPLATE_TAGS = {"script", "style", "noscript", "template", "svg", "iframe", "nav", "header", "footer", "aside"}
+# If the page marks up its main content, everything outside it is dropped too.
+MAIN_CONTENT_TAGS = {"main", "article"}
+RAW_TEXT_TAGS = {"script", "style"}
+
+# --- Conversion Cache and Pool ---
+MEMORY_CACHE_ENTRIES = 256
+CACHE_DIR = os.path.join(get_cache_root(), "html_markdown")
+_AVAILABLE_CPUS = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+MAX_CONVERSION_WORKERS = min(8, _AVAILABLE_CPUS)
+
+_memory_cache: "OrderedDict[str, str]" = OrderedDict()
+_memory_cache_lock = threading.Lock()
+_disk_cache: Optional[DiskCache] = None
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+# A streaming scan that only stops at the tags it cares about (and comments),
+# instead of tokenizing the whole document.
+_TAG_RE = re.compile(
+    r"<!--.*?-->|<(/?)(" + "|".join(sorted(BOILERPLATE_TAGS | MAIN_CONTENT_TAGS)) + r")(?=[\s/>])[^>]*>",
+    re.IGNORECASE | re.DOTALL,
+)
+# Elements whose content is raw text: a "<nav>" inside a script string is not a tag.
+_RAW_TEXT_END_RE = {tag: re.compile(rf"</{tag}\s*>", re.IGNORECASE) for tag in RAW_TEXT_TAGS}
+
+def _clip_spans(spans: List[Tuple[int, int]], region: Tuple[int, int]) -> List[Tuple[int, int]]:
+    start, end = region
+    return [(max(s, start), min(e, end)) for s, e in spans if s < end and e > start]
+
+def extract_content_html(raw_html: str) -> str:
+    """
+    Strips scripts, styles and navigation chrome, preferring the page's <main>/<article> content.
+
+    The page is scanned once; kept regions are sliced straight out of the
+    original string, so nothing is re-serialized.
+    """
+    kept: List[Tuple[int, int]] = []
+    main_regions: List[Tuple[int, int]] = []
+    keep_from = 0
+    skip_depth = 0
+    main_depth = 0
+    main_start = 0
+    pos = 0
+
+    while True:
+        match = _TAG_RE.search(raw_html, pos)
+        if match is None:
+            break
+        pos = match.end()
+        name = match.group(2)
+
+        if name is None:
+            # Comments are dropped.
+            if not skip_depth:
+                kept.append((keep_from, match.start()))
+                keep_from = match.end()
+            continue
+
+        tag = name.lower()
+        closing = bool(match.group(1))
+
+        if tag in BOILERPLATE_TAGS:
+            if closing:
+                if skip_depth:
+                    skip_depth -= 1
+                    if not skip_depth:
+                        keep_from = match.end()
+                continue
+            if not skip_depth:
+                kept.append((keep_from, match.start()))
+            if match.group(0).endswith("/>"):
+                if not skip_depth:
+                    keep_from = match.end()
+                continue
+            if tag in RAW_TEXT_TAGS:
+                end = _RAW_TEXT_END_RE[tag].search(raw_html, pos)
+                pos = end.end() if end else len(raw_html)
+                if not skip_depth:
+                    keep_from = pos
+                continue
+            skip_depth += 1
+            continue
+
+        # <main> / <article> outside of any boilerplate.
+        if skip_depth:
+            continue
+        if not closing:
+            if not main_depth:
+                main_start = match.start()
+            main_depth += 1
+        elif main_depth:
+            main_depth -= 1
+            if not main_depth:
+                main_regions.append((main_start, match.end()))
+
+    if not skip_depth:
+        kept.append((keep_from, len(raw_html)))
+
+    if main_regions:
+        main_spans = [span for region in main_regions for span in _clip_spans(kept, region)]
+        main_html = "".join(raw_html[s:e] for s, e in main_spans)
+        if main_html.strip():
+            return main_html
+    return "".join(raw_html[s:e] for s, e in kept)
+
+def html_to_markdown(raw_html: str) -> str:
+    """
+    Converts an HTML page to markdown text,
+    matching the html2text configuration of the original gemini-cli.
+    """
+    h = html2text.HTML2Text()
+    h.ignore_links = True
+    h.ignore_images = True
+    h.body_width = 0  # This disables word wrapping
+    return h.handle(extract_content_html(raw_html))
+
+def _body_hash(raw_html: str) -> str:
+    return hashlib.sha256(raw_html.encode("utf-8", errors="replace")).hexdigest()
+
+def _get_disk_cache() -> DiskCache:
+    global _disk_cache
+    if _disk_cache is None:
+        _disk_cache = DiskCache(CACHE_DIR)
+    return _disk_cache
+
+def _cache_get(key: str) -> Optional[str]:
+    with _memory_cache_lock:
+        if key in _memory_cache:
+            _memory_cache.move_to_end(key)
+            return _memory_cache[key]
+    entry = _get_disk_cache().get(key)
+    if entry is None:
+        return None
+    _cache_put(key, entry["markdown"], persist=False)
+    return entry["markdown"]
+
+def _cache_put(key: str, markdown: str, persist: bool = True):
+    with _memory_cache_lock:
+        _memory_cache[key] = markdown
+        _memory_cache.move_to_end(key)
+        while len(_memory_cache) > MEMORY_CACHE_ENTRIES:
+            _memory_cache.popitem(last=False)
+    if persist:
+        _get_disk_cache().set(key, {"markdown": markdown})
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=MAX_CONVERSION_WORKERS)
+        return _pool
+
+def convert_cached(raw_html: str) -> str:
+    """Converts a single page, reusing the cached result for an identical body."""
+    return convert_many([raw_html])[0]
+
+def convert_many(pages: List[str]) -> List[str]:
+    """
+    Converts several pages, keyed on the hash of each body.
+
+    Cache misses are converted in parallel on a process pool when there is
+    more than one of them and more than one CPU; otherwise they are
+    converted inline.
+    """
+    keys = [_body_hash(page) for page in pages]
+    results: List[Optional[str]] = [_cache_get(key) for key in keys]
+
+    misses = {}
+    for index, key in enumerate(keys):
+        if results[index] is None:
+            misses.setdefault(key, []).append(index)
+
+    ordered = list(misses.items())
+    to_convert = [pages[indexes[0]] for _, indexes in ordered]
+    if len(to_convert) > 1 and MAX_CONVERSION_WORKERS > 1:
+        markdowns = list(_get_pool().map(html_to_markdown, to_convert))
+    else:
+        markdowns = [html_to_markdown(page) for page in to_convert]
+    converted = {key: markdown for (key, _), markdown in zip(ordered, markdowns)}
+
+    for key, markdown in converted.items():
+        _cache_put(key, markdown)
+        for index in misses[key]:
+            results[index] = markdown
+    return results
+
+def clear_memory_cache():
+    with _memory_cache_lock:
+        _memory_cache.clear()
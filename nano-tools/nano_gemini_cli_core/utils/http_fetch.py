@@ -0,0 +1,213 @@
+# nano-tools/nano_gemini_cli_core/utils/http_fetch.py
+import os
+import re
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from .disk_cache import DiskCache, get_cache_root
+from .lazy_import import lazy_module
+
+# Loaded when the first fetch opens a session.
+requests = lazy_module("requests", "Please install it with 'pip install requests'.")
+
+# --- Fetch Configuration ---
+DEFAULT_TIMEOUT_S = 10
+MAX_RESPONSE_BYTES = 5 * 1024 * 1024
+MAX_PARALLEL_FETCHES = 8
+CONNECTION_POOL_SIZE = 16
+CHUNK_SIZE_BYTES = 64 * 1024
+USER_AGENT = "nano-gemini-cli/web_fetch"
+CACHE_DIR = os.path.join(get_cache_root(), "web_fetch")
+# Least recently used responses are evicted beyond this.
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+_session: Optional["requests.Session"] = None
+_default_cache: Optional["HttpCache"] = None
+_init_lock = threading.Lock()
+
+@dataclass
+class FetchResult:
+    """The outcome of fetching a single URL."""
+    url: str
+    status: Optional[int] = None
+    text: str = ""
+    content_type: str = ""
+    from_cache: bool = False
+    truncated: bool = False
+    error: Optional[str] = None
+
+def get_session() -> "requests.Session":
+    """Returns the process-wide session, so connections (and TLS handshakes) are reused across fetches."""
+    global _session
+    with _init_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=CONNECTION_POOL_SIZE, pool_maxsize=CONNECTION_POOL_SIZE)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers["User-Agent"] = USER_AGENT
+            _session = session
+        return _session
+
+def get_default_cache() -> "HttpCache":
+    global _default_cache
+    with _init_lock:
+        if _default_cache is None:
+            _default_cache = HttpCache(CACHE_DIR, CACHE_MAX_BYTES)
+        return _default_cache
+
+def _parse_cache_control(header: str) -> Dict[str, Optional[str]]:
+    directives: Dict[str, Optional[str]] = {}
+    for part in header.split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"') or None
+    return directives
+
+def _freshness_lifetime(headers) -> Optional[float]:
+    """Returns how long a response may be served without revalidation, or None if it must not be stored."""
+    directives = _parse_cache_control(headers.get("Cache-Control", ""))
+    if "no-store" in directives:
+        return None
+    if "no-cache" in directives:
+        return 0.0
+    for name in ("s-maxage", "max-age"):
+        if directives.get(name) and directives[name].isdigit():
+            return float(directives[name])
+    return 0.0
+
+class HttpCache:
+    """
+    An on-disk HTTP cache honouring Cache-Control, ETag and Last-Modified.
+
+    Fresh entries are served without touching the network. Stale entries
+    with a validator are revalidated with a conditional request, and a
+    `304 Not Modified` reuses the stored body.
+    """
+
+    def __init__(self, directory: str, max_bytes: Optional[int] = None):
+        self.store = DiskCache(directory, max_bytes)
+
+    def lookup(self, url: str) -> Optional[Dict]:
+        return self.store.get(url)
+
+    def is_fresh(self, entry: Dict) -> bool:
+        return time.time() - entry["stored_at"] < entry["max_age"]
+
+    def conditional_headers(self, entry: Optional[Dict]) -> Dict[str, str]:
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store_response(self, url: str, response: "requests.Response", text: str, truncated: bool):
+        max_age = _freshness_lifetime(response.headers)
+        has_validator = "ETag" in response.headers or "Last-Modified" in response.headers
+        if max_age is None or (max_age == 0 and not has_validator):
+            return
+        self.store.set(url, {
+            "status": response.status_code,
+            "text": text,
+            "content_type": response.headers.get("Content-Type", ""),
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "truncated": truncated,
+            "stored_at": time.time(),
+            "max_age": max_age,
+        })
+
+    def refresh(self, url: str, entry: Dict, response: "requests.Response"):
+        """Records a successful revalidation (304), extending the entry's lifetime."""
+        max_age = _freshness_lifetime(response.headers)
+        entry = dict(entry, stored_at=time.time(), max_age=entry["max_age"] if max_age is None else max_age)
+        if response.headers.get("ETag"):
+            entry["etag"] = response.headers["ETag"]
+        self.store.set(url, entry)
+
+def _result_from_entry(url: str, entry: Dict) -> FetchResult:
+    return FetchResult(
+        url=url,
+        status=entry["status"],
+        text=entry["text"],
+        content_type=entry["content_type"],
+        from_cache=True,
+        truncated=entry.get("truncated", False),
+    )
+
+def _write_cache(write, *args):
+    try:
+        write(*args)
+    except OSError as e:
+        print(f"Warning: could not write the web cache: {e}")
+
+def fetch_url(
+    url: str,
+    cache: Optional[HttpCache] = None,
+    session: Optional["requests.Session"] = None,
+    max_bytes: int = MAX_RESPONSE_BYTES,
+    timeout: float = DEFAULT_TIMEOUT_S,
+) -> FetchResult:
+    """
+    Fetches a URL through the shared session and HTTP cache.
+
+    The body is streamed and cut off at `max_bytes`, so a huge page never
+    has to be held in memory in full. Errors are returned, not raised; a
+    failed cache write only costs the cache entry.
+    """
+    cache = cache if cache is not None else get_default_cache()
+    session = session if session is not None else get_session()
+
+    entry = cache.lookup(url)
+    if entry and cache.is_fresh(entry):
+        return _result_from_entry(url, entry)
+
+    try:
+        with session.get(url, timeout=timeout, stream=True, headers=cache.conditional_headers(entry)) as response:
+            if response.status_code == 304 and entry:
+                _write_cache(cache.refresh, url, entry, response)
+                return _result_from_entry(url, entry)
+            response.raise_for_status()
+
+            chunks: List[bytes] = []
+            received = 0
+            truncated = False
+            for chunk in response.iter_content(chunk_size=CHUNK_SIZE_BYTES):
+                if received + len(chunk) > max_bytes:
+                    chunks.append(chunk[:max_bytes - received])
+                    truncated = True
+                    break
+                chunks.append(chunk)
+                received += len(chunk)
+
+            text = b"".join(chunks).decode(response.encoding or "utf-8", errors="replace")
+            _write_cache(cache.store_response, url, response, text, truncated)
+            return FetchResult(
+                url=url,
+                status=response.status_code,
+                text=text,
+                content_type=response.headers.get("Content-Type", ""),
+                truncated=truncated,
+            )
+    except requests.exceptions.RequestException as e:
+        return FetchResult(url=url, error=f"Error during manual fetch for {url}: {e}")
+
+def fetch_all(urls: List[str], **kwargs) -> List[FetchResult]:
+    """Fetches several URLs concurrently, returning results in input order."""
+    if len(urls) <= 1:
+        return [fetch_url(url, **kwargs) for url in urls]
+    with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_FETCHES, len(urls))) as executor:
+        return list(executor.map(lambda url: fetch_url(url, **kwargs), urls))
+
+def extract_urls(text: str) -> List[str]:
+    """Finds every distinct http(s) URL in a piece of text, in order of appearance."""
+    urls = []
+    for url in re.findall(r'(https?://[^\s]+)', text):
+        url = url.rstrip('.,;:!?)"\'')
+        if url not in urls:
+            urls.append(url)
+    return urls
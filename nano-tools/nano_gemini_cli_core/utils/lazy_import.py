@@ -0,0 +1,52 @@
+# nano-tools/nano_gemini_cli_core/utils/lazy_import.py
+import importlib
+import threading
+import types
+from typing import Optional
+
+class LazyModule(types.ModuleType):
+    """
+    A stand-in for a heavy module that imports it on first attribute access.
+
+    `litellm = lazy_module("litellm")` at module top keeps call sites such as
+    `litellm.completion(...)` (and `mock.patch.object(x.litellm, ...)` in
+    tests) unchanged, while tools that never reach them never pay for the
+    import. A missing package raises ImportError at first use, with the
+    install hint, instead of when the tool module is imported.
+    """
+
+    def __init__(self, name: str, install_hint: Optional[str] = None):
+        super().__init__(name)
+        self.__dict__["_lazy_install_hint"] = install_hint
+        self.__dict__["_lazy_module"] = None
+        self.__dict__["_lazy_lock"] = threading.Lock()
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__["_lazy_module"]
+        if module is None:
+            with self.__dict__["_lazy_lock"]:
+                module = self.__dict__["_lazy_module"]
+                if module is None:
+                    try:
+                        module = importlib.import_module(self.__name__)
+                    except ImportError as e:
+                        hint = self.__dict__["_lazy_install_hint"]
+                        if hint:
+                            raise ImportError(f"The '{self.__name__}' package is not installed. {hint}") from e
+                        raise
+                    self.__dict__["_lazy_module"] = module
+        return module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.__dict__["_lazy_module"] is not None
+
+def lazy_module(name: str, install_hint: Optional[str] = None) -> LazyModule:
+    """Returns a proxy for `name` that is imported the first time it is used."""
+    return LazyModule(name, install_hint)
@@ -0,0 +1,249 @@
+# nano-tools/nano_gemini_cli_core/utils/llm_gateway.py
+import os
+import time
+import heapq
+import random
+import itertools
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# ---
+# Tools that call a model (edit's and write_file's correction agents,
+# google_web_search) used to call `litellm.completion` directly, with no
+# shared limit: concurrent tool calls (batch_read, the daemon's clients)
+# burst straight into provider 429s. They now go through `completion`,
+# which runs the provider call under one process-wide gateway:
+#   - at most MAX_IN_FLIGHT calls at once, INTERACTIVE_RESERVED of them
+#     kept for interactive calls;
+#   - waiting calls are granted slots by lane, interactive first;
+#   - per-model token buckets for requests and tokens per minute, waited
+#     on before a slot is taken and also served by lane, so a call held
+#     by the rate limit neither holds a slot nor queues an interactive
+#     call behind background ones;
+#   - rate-limit and transient errors are retried with full-jitter
+#     backoff (or Retry-After), without holding a slot while sleeping.
+# The provider function is passed in, so tests (and callers) can use a
+# local fake instead of litellm.
+# ---
+
+# --- Gateway Configuration ---
+MAX_IN_FLIGHT = int(os.environ.get("NANO_TOOLS_LLM_MAX_IN_FLIGHT", "4"))
+INTERACTIVE_RESERVED = 1
+# Per-model (requests per minute, tokens per minute): the Gemini API
+# free-tier limits. Raise them for a paid key.
+MODEL_LIMITS: Dict[str, Tuple[float, float]] = {
+    "gemini/gemini-2.5-flash-lite-preview-06-17": (15, 250_000),
+    "gemini/gemini-1.5-flash-latest": (15, 1_000_000),
+    "gemini/gemini-1.5-pro-latest": (2, 32_000),
+}
+DEFAULT_LIMITS = (15, 250_000)
+OUTPUT_TOKEN_ESTIMATE = 1024
+MAX_RETRIES = 4
+RETRY_BASE_S = 1.0
+RETRY_MAX_S = 30.0
+RETRY_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+LANE_PRIORITY = {INTERACTIVE: 0, BACKGROUND: 1}
+
+# NOTE: `TokenBucket`, `_is_retryable` and `_retry_after_s` have twins in
+# aura_agent/llm_gateway.py (the two packages ship separately and share no
+# code). Keep the copies in sync.
+
+class TokenBucket:
+    """
+    A token bucket. `wait_s` says how long until `amount` can be taken, and
+    `take` takes it, so the gateway decides who goes next rather than
+    committing callers in arrival order. An amount above the capacity is
+    allowed once the bucket is full, driving the balance negative.
+    Not thread-safe on its own; the gateway serializes access.
+    """
+
+    def __init__(self, per_minute: float, clock: Callable[[], float] = time.monotonic):
+        self.capacity = float(per_minute)
+        self.rate_per_s = per_minute / 60.0
+        self.clock = clock
+        self.tokens = self.capacity
+        self.updated = clock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate_per_s)
+        self.updated = now
+
+    def wait_s(self, amount: float) -> float:
+        self._refill()
+        return max(0.0, (min(amount, self.capacity) - self.tokens) / self.rate_per_s)
+
+    def take(self, amount: float):
+        self._refill()
+        self.tokens -= amount
+
+    def refund(self, amount: float):
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+def _is_retryable(error: BaseException) -> bool:
+    status = getattr(error, "status_code", None)
+    if isinstance(status, int):
+        return status in RETRY_STATUS_CODES
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    return type(error).__name__ in ("RateLimitError", "APIConnectionError", "APITimeoutError", "Timeout", "ServiceUnavailableError", "InternalServerError")
+
+def _retry_after_s(error: BaseException) -> Optional[float]:
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after") or headers.get("Retry-After"))
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+def estimate_tokens(kwargs: Dict[str, Any]) -> int:
+    """About 4 characters per token of the messages, plus the expected output."""
+    chars = sum(len(str(m.get("content", ""))) for m in kwargs.get("messages", []) if isinstance(m, dict))
+    return chars // 4 + (kwargs.get("max_tokens") or OUTPUT_TOKEN_ESTIMATE)
+
+class LLMGateway:
+    def __init__(self, max_in_flight: int = MAX_IN_FLIGHT, interactive_reserved: int = INTERACTIVE_RESERVED,
+                 model_limits: Optional[Dict[str, Tuple[float, float]]] = None, sleep: Callable[[float], None] = time.sleep,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_in_flight = max(1, max_in_flight)
+        self.interactive_reserved = min(interactive_reserved, self.max_in_flight - 1)
+        self.model_limits = dict(MODEL_LIMITS if model_limits is None else model_limits)
+        # Tests pass a fake sleep that advances a fake clock.
+        self.sleep = sleep
+        self.clock = clock
+        self._buckets: Dict[str, Tuple[TokenBucket, TokenBucket]] = {}
+        # Per model, the calls waiting on its buckets: a heap of (lane priority, ticket).
+        self._pacing: Dict[str, list] = {}
+        self._in_flight = 0
+        self._waiting: list = []
+        self._tickets = itertools.count()
+        self._cond = threading.Condition()
+        self._stats = {
+            "calls": 0, "retries": 0, "failures": 0, "rate_limited": 0,
+            "queued_s": 0.0, "paced_s": 0.0, "max_queue_depth": 0,
+        }
+        self._queue_depth = {lane: 0 for lane in LANE_PRIORITY}
+
+    def _lane_limit(self, lane: str) -> int:
+        return self.max_in_flight if lane == INTERACTIVE else self.max_in_flight - self.interactive_reserved
+
+    def _pace(self, lane: str, model: str, estimated_tokens: int):
+        """
+        Waits until `model`'s buckets can cover the call, then takes from them.
+        Only the head of the model's queue (best lane, then oldest) may take;
+        it sleeps without the lock, so a call in a better lane arriving
+        meanwhile becomes the head and goes first.
+        """
+        with self._cond:
+            requests, tokens = self._buckets_for(model)
+            queue = self._pacing.setdefault(model, [])
+            ticket = (LANE_PRIORITY[lane], next(self._tickets))
+            heapq.heappush(queue, ticket)
+        slept = 0.0
+        try:
+            while True:
+                with self._cond:
+                    self._cond.wait_for(lambda: queue[0] == ticket)
+                    wait_s = max(requests.wait_s(1), tokens.wait_s(estimated_tokens))
+                    if wait_s <= 0:
+                        requests.take(1)
+                        tokens.take(estimated_tokens)
+                        break
+                self.sleep(wait_s)
+                slept += wait_s
+        finally:
+            with self._cond:
+                queue.remove(ticket)
+                heapq.heapify(queue)
+                if slept:
+                    self._stats["rate_limited"] += 1
+                    self._stats["paced_s"] += slept
+                self._cond.notify_all()
+
+    def _acquire(self, lane: str):
+        """Waits for a slot in priority order."""
+        with self._cond:
+            ticket = (LANE_PRIORITY[lane], next(self._tickets))
+            heapq.heappush(self._waiting, ticket)
+            self._queue_depth[lane] += 1
+            self._stats["max_queue_depth"] = max(self._stats["max_queue_depth"], len(self._waiting))
+            started = time.monotonic()
+            try:
+                self._cond.wait_for(lambda: self._waiting[0] == ticket and self._in_flight < self._lane_limit(lane))
+                self._in_flight += 1
+                self._stats["queued_s"] += time.monotonic() - started
+            finally:
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+                self._queue_depth[lane] -= 1
+                self._cond.notify_all()
+
+    def _release(self):
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    def _buckets_for(self, model: str) -> Tuple[TokenBucket, TokenBucket]:
+        if model not in self._buckets:
+            rpm, tpm = self.model_limits.get(model, DEFAULT_LIMITS)
+            self._buckets[model] = (TokenBucket(rpm, self.clock), TokenBucket(tpm, self.clock))
+        return self._buckets[model]
+
+    def call(self, provider: Callable[..., Any], lane: str = INTERACTIVE, **kwargs) -> Any:
+        """
+        Calls `provider(**kwargs)` (e.g. `litellm.completion`) under the
+        gateway's limits, retrying rate-limit and transient errors.
+        """
+        model = kwargs.get("model", "")
+        estimated = estimate_tokens(kwargs)
+        with self._cond:
+            self._stats["calls"] += 1
+        for attempt in range(MAX_RETRIES + 1):
+            self._pace(lane, model, estimated)
+            self._acquire(lane)
+            try:
+                response = provider(**kwargs)
+            except Exception as e:
+                error = e
+            else:
+                self._record_usage(model, response, estimated)
+                return response
+            finally:
+                self._release()
+
+            if attempt == MAX_RETRIES or not _is_retryable(error):
+                with self._cond:
+                    self._stats["failures"] += 1
+                raise error
+            with self._cond:
+                self._stats["retries"] += 1
+            delay = _retry_after_s(error)
+            self.sleep(delay if delay is not None else random.uniform(0, min(RETRY_MAX_S, RETRY_BASE_S * 2 ** attempt)))
+
+    def _record_usage(self, model: str, response: Any, estimated: int):
+        used = getattr(getattr(response, "usage", None), "total_tokens", None)
+        if isinstance(used, int) and used > 0:
+            with self._cond:
+                self._buckets_for(model)[1].refund(estimated - used)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Counters plus the current queue depth per lane and calls in flight."""
+        with self._cond:
+            return {**self._stats, "in_flight": self._in_flight, "queue_depth": dict(self._queue_depth)}
+
+_default_gateway: Optional[LLMGateway] = None
+_init_lock = threading.Lock()
+
+def get_gateway() -> LLMGateway:
+    global _default_gateway
+    with _init_lock:
+        if _default_gateway is None:
+            _default_gateway = LLMGateway()
+        return _default_gateway
+
+def completion(provider: Callable[..., Any], lane: str = INTERACTIVE, **kwargs) -> Any:
+    """`provider(**kwargs)` through the shared gateway, e.g. `completion(litellm.completion, model=..., messages=...)`."""
+    return get_gateway().call(provider, lane, **kwargs)
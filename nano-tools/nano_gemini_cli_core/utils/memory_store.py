@@ -0,0 +1,299 @@
+# nano-tools/nano_gemini_cli_core/utils/memory_store.py
+import os
+import re
+import json
+import math
+import time
+import hashlib
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+try:
+    import fcntl
+except ImportError:
+    # No advisory locking (e.g. on Windows); writes are still serialized within this process.
+    fcntl = None
+
+# --- Store Configuration ---
+NEAR_DUPLICATE_THRESHOLD = 0.8
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.casefold())
+
+def normalize_fact(fact: str) -> str:
+    """Canonical form of a fact, used for exact-duplicate detection."""
+    return " ".join(tokenize(fact))
+
+def fact_hash(fact: str) -> str:
+    return hashlib.sha256(normalize_fact(fact).encode("utf-8")).hexdigest()[:16]
+
+@dataclass
+class MemoryRecord:
+    """A single remembered fact, as stored in the append-only log."""
+    id: str
+    fact: str
+    created_at: float
+    term_counts: Counter = field(default_factory=Counter, repr=False)
+
+class Bm25Index:
+    """An incrementally built inverted index that ranks documents with BM25."""
+
+    def __init__(self):
+        self.term_counts: List[Counter] = []
+        self.lengths: List[int] = []
+        self.postings: Dict[str, Set[int]] = {}
+        self.doc_freq: Counter = Counter()
+        self.total_length = 0
+
+    def add(self, term_counts: Counter) -> int:
+        position = len(self.term_counts)
+        self.term_counts.append(term_counts)
+        self.lengths.append(sum(term_counts.values()))
+        for term in term_counts:
+            self.postings.setdefault(term, set()).add(position)
+            self.doc_freq[term] += 1
+        self.total_length += self.lengths[position]
+        return position
+
+    def candidates(self, terms: Set[str]) -> Set[int]:
+        """Positions of documents sharing at least one term with `terms`."""
+        found: Set[int] = set()
+        for term in terms:
+            found |= self.postings.get(term, set())
+        return found
+
+    def rank(self, query: str, limit: Optional[int] = None) -> List[Tuple[int, float]]:
+        """Returns (position, score) for documents matching `query`, best first."""
+        terms = set(tokenize(query))
+        total = len(self.term_counts)
+        if not total or not terms:
+            return []
+        average_length = self.total_length / total or 1.0
+        scores: Dict[int, float] = {}
+        for term in terms:
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            df = self.doc_freq[term]
+            idf = math.log(1 + (total - df + 0.5) / (df + 0.5))
+            for position in postings:
+                tf = self.term_counts[position][term]
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self.lengths[position] / average_length)
+                scores[position] = scores.get(position, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:limit] if limit is not None else ranked
+
+class MemoryStore:
+    """
+    An append-only store of memories, kept as JSON lines next to GEMINI.md.
+
+    Each save appends one line under an exclusive file lock, so concurrent
+    agents never lose each other's writes. The in-memory index (exact hashes,
+    an inverted token index for near-duplicate detection, and BM25 statistics
+    for `recall`) is updated incrementally by reading only the bytes appended
+    since the last refresh. The "## Gemini Added Memories" section of
+    GEMINI.md is a rendered view, produced on demand by `write_markdown`;
+    saves never rewrite it. Bullets added to the section by hand are imported
+    into the log before each render, so rendering never drops them.
+    """
+
+    def __init__(self, log_path: str, markdown_path: str, section_header: str):
+        self.log_path = log_path
+        self.markdown_path = markdown_path
+        self.section_header = section_header
+        self.lock_path = f"{log_path}.lock"
+        self._thread_lock = threading.RLock()
+        self._reset_index()
+
+    # --- Index maintenance ---
+
+    def _reset_index(self):
+        self._records: List[MemoryRecord] = []
+        self._by_hash: Dict[str, MemoryRecord] = {}
+        self._index = Bm25Index()
+        self._offset = 0
+        self._inode: Optional[int] = None
+
+    def _index_record(self, entry: Dict):
+        record = MemoryRecord(
+            id=entry["id"], fact=entry["fact"], created_at=entry.get("created_at", 0.0),
+            term_counts=Counter(tokenize(entry["fact"])),
+        )
+        if record.id in self._by_hash:
+            return
+        self._records.append(record)
+        self._by_hash[record.id] = record
+        self._index.add(record.term_counts)
+
+    def refresh(self):
+        """Indexes any entries appended to the log (by this or another process) since the last refresh."""
+        with self._thread_lock:
+            try:
+                stat = os.stat(self.log_path)
+            except FileNotFoundError:
+                self._reset_index()
+                return
+            if stat.st_ino != self._inode or stat.st_size < self._offset:
+                self._reset_index()
+                self._inode = stat.st_ino
+            if stat.st_size == self._offset:
+                return
+
+            with open(self.log_path, "rb") as f:
+                f.seek(self._offset)
+                data = f.read(stat.st_size - self._offset)
+            # Only consume complete lines; a concurrent writer may be mid-append.
+            complete = data[:data.rfind(b"\n") + 1]
+            for line in complete.splitlines():
+                try:
+                    self._index_record(json.loads(line))
+                except (json.JSONDecodeError, KeyError):
+                    continue
+            self._offset += len(complete)
+
+    @contextmanager
+    def _exclusive(self):
+        with self._thread_lock:
+            os.makedirs(os.path.dirname(self.log_path) or ".", exist_ok=True)
+            with open(self.lock_path, "a") as lock_file:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    if fcntl:
+                        fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    # --- Queries ---
+
+    def records(self) -> List[MemoryRecord]:
+        self.refresh()
+        with self._thread_lock:
+            return list(self._records)
+
+    def find_near_duplicate(self, fact: str) -> Optional[Tuple[MemoryRecord, float]]:
+        """Returns the most similar stored fact if its token Jaccard similarity reaches the threshold."""
+        terms = set(tokenize(fact))
+        if not terms:
+            return None
+        with self._thread_lock:
+            best: Optional[Tuple[MemoryRecord, float]] = None
+            for position in self._index.candidates(terms):
+                record = self._records[position]
+                other = set(record.term_counts)
+                similarity = len(terms & other) / len(terms | other)
+                if similarity >= NEAR_DUPLICATE_THRESHOLD and (best is None or similarity > best[1]):
+                    best = (record, similarity)
+            return best
+
+    def recall(self, query: str, limit: Optional[int] = None) -> List[Tuple[MemoryRecord, float]]:
+        """Ranks stored facts against `query` with BM25, best first. Facts sharing no terms are omitted."""
+        self.refresh()
+        with self._thread_lock:
+            return [(self._records[position], score) for position, score in self._index.rank(query, limit)]
+
+    # --- Writes ---
+
+    def add(self, fact: str) -> Tuple[str, MemoryRecord]:
+        """
+        Appends a fact unless it is already known.
+
+        Returns ("added" | "duplicate" | "near_duplicate", record), where the
+        record is the stored fact that matched for the two duplicate cases.
+        """
+        fact = fact.strip()
+        with self._exclusive():
+            self._migrate_markdown_if_needed()
+            self.refresh()
+            record_id = fact_hash(fact)
+            if record_id in self._by_hash:
+                return "duplicate", self._by_hash[record_id]
+            near = self.find_near_duplicate(fact)
+            if near:
+                return "near_duplicate", near[0]
+
+            entry = {"id": record_id, "fact": fact, "created_at": time.time()}
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+            self.refresh()
+            return "added", self._by_hash[record_id]
+
+    def _migrate_markdown_if_needed(self):
+        """Seeds a new log with the bullets already in GEMINI.md's memory section. Lock must be held."""
+        if os.path.exists(self.log_path):
+            return
+        self._import_markdown_bullets()
+        open(self.log_path, "a", encoding="utf-8").close()
+
+    def _import_markdown_bullets(self) -> int:
+        """
+        Appends the bullets of GEMINI.md's memory section that the log does not
+        have (e.g. ones added by hand), returning how many. Lock must be held.
+        """
+        self.refresh()
+        _, section, _ = self._split_markdown()
+        lines = []
+        seen = set(self._by_hash)
+        for line in (section or "").splitlines():
+            if line.startswith("- ") and line[2:].strip():
+                fact = line[2:].strip()
+                record_id = fact_hash(fact)
+                if record_id not in seen:
+                    seen.add(record_id)
+                    lines.append(json.dumps({"id": record_id, "fact": fact, "created_at": 0.0}) + "\n")
+        if lines:
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.writelines(lines)
+            self.refresh()
+        return len(lines)
+
+    # --- Rendered GEMINI.md view ---
+
+    def _split_markdown(self) -> Tuple[str, Optional[str], str]:
+        """Splits GEMINI.md into (before, memory section body or None, after)."""
+        try:
+            with open(self.markdown_path, "r", encoding="utf-8") as f:
+                content = f.read()
+        except FileNotFoundError:
+            return "", None, ""
+        header_index = content.find(self.section_header)
+        if header_index == -1:
+            return content, None, ""
+        body_start = header_index + len(self.section_header)
+        next_header_index = content.find("\n## ", body_start)
+        if next_header_index == -1:
+            return content[:header_index], content[body_start:], ""
+        return content[:header_index], content[body_start:next_header_index], content[next_header_index + 1:]
+
+    def render_section(self) -> str:
+        bullets = "".join(f"- {record.fact}\n" for record in self.records())
+        return f"{self.section_header}\n{bullets}"
+
+    def write_markdown(self) -> bool:
+        """
+        Regenerates the memory section of GEMINI.md, leaving the rest of the file intact.
+        Bullets in the section that the log does not have are imported first.
+        Returns False if the file was already up to date.
+        """
+        with self._exclusive():
+            self._import_markdown_bullets()
+            before, section, after = self._split_markdown()
+            rendered = self.render_section()
+            if section is not None and f"{self.section_header}{section.rstrip()}\n" == rendered:
+                return False
+
+            if before and not before.endswith("\n\n"):
+                before = before.rstrip("\n") + "\n\n"
+            content = before + rendered + (f"\n{after}" if after else "")
+            tmp_path = f"{self.markdown_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(content)
+            os.replace(tmp_path, self.markdown_path)
+            return True
@@ -0,0 +1,123 @@
+# nano-tools/nano_gemini_cli_core/utils/process_registry.py
+import os
+import signal
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+_CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+def read_process_stats(pid: int) -> Optional[Dict[str, float]]:
+    """
+    Reads CPU time, CPU usage and resident memory for a process from `/proc`.
+
+    Returns None if the process no longer exists or `/proc` is unavailable.
+    """
+    try:
+        with open(f"/proc/{pid}/stat", "r") as f:
+            stat = f.read()
+        with open("/proc/uptime", "r") as f:
+            uptime_s = float(f.read().split()[0])
+    except (FileNotFoundError, ProcessLookupError, PermissionError, OSError):
+        return None
+
+    # The command name may contain spaces, so split after its closing parenthesis.
+    fields = stat[stat.rfind(")") + 2:].split()
+    state = fields[0]
+    if state == "Z":
+        return None
+    utime, stime = int(fields[11]), int(fields[12])
+    start_ticks = int(fields[19])
+    rss_pages = int(fields[21])
+
+    cpu_time_s = (utime + stime) / _CLOCK_TICKS
+    elapsed_s = max(uptime_s - start_ticks / _CLOCK_TICKS, 1e-6)
+    return {
+        "state": state,
+        "cpu_time_s": round(cpu_time_s, 2),
+        "cpu_percent": round(100.0 * cpu_time_s / elapsed_s, 1),
+        "rss_kb": rss_pages * _PAGE_SIZE // 1024,
+        "elapsed_s": round(elapsed_s, 1),
+    }
+
+def _list_group_pids(pgid: int) -> List[int]:
+    """Finds all live processes in a process group by scanning `/proc`."""
+    pids = []
+    try:
+        entries = os.listdir("/proc")
+    except OSError:
+        return pids
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "r") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        fields = stat[stat.rfind(")") + 2:].split()
+        if int(fields[2]) == pgid and fields[0] != "Z":
+            pids.append(int(entry))
+    return sorted(pids)
+
+@dataclass
+class BackgroundProcessGroup:
+    """A process group left running by a shell command."""
+    pgid: int
+    command: str
+    cwd: str
+    pids: List[int]
+    started_at: float = field(default_factory=time.time)
+
+class ProcessRegistry:
+    """Tracks background process groups started by `run_shell_command` so they can be inspected and killed."""
+
+    def __init__(self):
+        self._groups: Dict[int, BackgroundProcessGroup] = {}
+
+    def register(self, pgid: int, command: str, cwd: str, pids: List[int]) -> BackgroundProcessGroup:
+        group = BackgroundProcessGroup(pgid=pgid, command=command, cwd=cwd, pids=pids)
+        self._groups[pgid] = group
+        return group
+
+    def get(self, pgid: int) -> Optional[BackgroundProcessGroup]:
+        return self._groups.get(pgid)
+
+    def list(self) -> List[Dict]:
+        """Returns every live group with per-process stats, forgetting groups that have exited."""
+        snapshot = []
+        for pgid, group in list(self._groups.items()):
+            live_pids = _list_group_pids(pgid) if os.path.isdir("/proc") else group.pids
+            processes = []
+            for pid in live_pids:
+                stats = read_process_stats(pid)
+                if stats is not None:
+                    processes.append({"pid": pid, **stats})
+            if not processes:
+                del self._groups[pgid]
+                continue
+            snapshot.append({
+                "pgid": pgid,
+                "command": group.command,
+                "cwd": group.cwd,
+                "started_at": group.started_at,
+                "processes": processes,
+            })
+        return snapshot
+
+    def kill(self, pgid: int, sig: int = signal.SIGTERM) -> bool:
+        """Signals a registered process group. Returns False if it is unknown or already gone."""
+        if pgid not in self._groups:
+            return False
+        try:
+            os.killpg(pgid, sig)
+        except ProcessLookupError:
+            del self._groups[pgid]
+            return False
+        del self._groups[pgid]
+        return True
+
+    def kill_all(self, sig: int = signal.SIGTERM):
+        for pgid in list(self._groups):
+            self.kill(pgid, sig)
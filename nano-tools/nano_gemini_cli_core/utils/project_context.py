@@ -0,0 +1,177 @@
+# nano-tools/nano_gemini_cli_core/utils/project_context.py
+import os
+import time
+import threading
+import subprocess
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Set
+
+from . import fs_watcher
+from .git_utils import find_git_root
+from .paths import get_project_hash, get_project_temp_dir
+
+# --- Context Configuration ---
+GEMINI_IGNORE_FILENAME = ".geminiignore"
+# Ignored files change whenever a build runs, so this list is only trusted briefly.
+GIT_IGNORED_TTL_S = 2.0
+# Contexts are kept for the most recently used directories only; an evicted
+# one is simply resolved again (one upward walk) on its next lookup.
+MAX_PROJECT_CONTEXTS = 64
+
+_contexts: "OrderedDict[str, ProjectContext]" = OrderedDict()
+_contexts_lock = threading.Lock()
+# Project roots with a running filesystem watcher (see start_project_watcher).
+_watched_roots: Set[str] = set()
+
+class ProjectContext:
+    """
+    Everything the tools need to know about the project around a directory,
+    resolved once: the git root, the project hash and temp directory, the
+    .geminiignore patterns and the files git ignores.
+
+    The git root is found with a single upward walk when the context is
+    created. .geminiignore is re-read only when its mtime changes, and the
+    git-ignored set is refreshed after GIT_IGNORED_TTL_S.
+    """
+
+    def __init__(self, cwd: str):
+        self.cwd = os.path.abspath(cwd)
+        self.git_root: Optional[str] = find_git_root(self.cwd)
+        self.project_root = self.git_root or self.cwd
+        self.project_hash = get_project_hash(self.project_root)
+        self.temp_dir = get_project_temp_dir(self.project_root)
+        self._lock = threading.Lock()
+        self._ignore_patterns: List[str] = []
+        self._ignore_mtime: Optional[int] = None
+        self._git_ignored: Optional[Set[str]] = None
+        self._git_ignored_at = 0.0
+        # With a watcher reporting changes, the git-ignored set is trusted
+        # until a change arrives instead of expiring after a TTL.
+        self.watched = self.cwd in _watched_roots
+
+    @property
+    def is_git(self) -> bool:
+        return self.git_root is not None
+
+    def geminiignore_patterns(self) -> List[str]:
+        """Patterns from the .geminiignore file in the working directory, re-read only when it changes."""
+        ignore_file = os.path.join(self.cwd, GEMINI_IGNORE_FILENAME)
+        try:
+            mtime = os.stat(ignore_file).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        with self._lock:
+            if mtime != self._ignore_mtime:
+                patterns = []
+                if mtime is not None:
+                    with open(ignore_file, "r", encoding="utf-8") as f:
+                        patterns = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+                self._ignore_patterns = patterns
+                self._ignore_mtime = mtime
+            return list(self._ignore_patterns)
+
+    def git_ignored_paths(self) -> Set[str]:
+        """
+        Absolute paths of untracked files and directories that git ignores.
+        Wholly ignored directories are listed once rather than file by file.
+        """
+        if not self.is_git:
+            return set()
+        if self.cwd != self.git_root:
+            # Every directory in a repository shares the list held by the root's context.
+            return get_project_context(self.git_root).git_ignored_paths()
+        with self._lock:
+            if self._git_ignored is not None and (self.watched or time.monotonic() - self._git_ignored_at < GIT_IGNORED_TTL_S):
+                return self._git_ignored
+            try:
+                result = subprocess.run(
+                    ['git', 'ls-files', '--others', '--ignored', '--exclude-standard', '--directory'],
+                    cwd=self.git_root, capture_output=True, text=True, check=True
+                )
+                ignored = {os.path.join(self.git_root, f.rstrip('/')) for f in result.stdout.split('\n') if f}
+            except (subprocess.CalledProcessError, FileNotFoundError):
+                ignored = set()
+            self._git_ignored = ignored
+            self._git_ignored_at = time.monotonic()
+            return ignored
+
+    def _is_ignored_in(self, path: str, ignored: Set[str]) -> bool:
+        current = os.path.abspath(path)
+        # A separator-terminated prefix, so /repo2 is not taken to be inside /repo.
+        root_prefix = os.path.join(self.git_root, "")
+        while current.startswith(root_prefix):
+            if current in ignored:
+                return True
+            current = os.path.dirname(current)
+        return False
+
+    def is_git_ignored(self, path: str) -> bool:
+        """Whether a path, or any directory above it inside the repository, is ignored by git."""
+        ignored = self.git_ignored_paths()
+        return bool(ignored) and self._is_ignored_in(path, ignored)
+
+    def filter_git_ignored(self, paths: Iterable[str]) -> List[str]:
+        """Drops the paths git ignores, keeping the others in order."""
+        ignored = self.git_ignored_paths()
+        if not ignored:
+            return list(paths)
+        return [p for p in paths if not self._is_ignored_in(p, ignored)]
+
+    def on_file_change(self, event_type: str, path: str):
+        """Watcher callback: any change may add or remove ignored files."""
+        with self._lock:
+            self._git_ignored = None
+
+def get_project_context(cwd: Optional[str] = None) -> ProjectContext:
+    """Gets the memoized project context for a directory (the current working directory by default)."""
+    key = os.path.abspath(cwd or os.getcwd())
+    with _contexts_lock:
+        context = _contexts.get(key)
+        if context is None:
+            context = ProjectContext(key)
+            _contexts[key] = context
+            while len(_contexts) > MAX_PROJECT_CONTEXTS:
+                _contexts.popitem(last=False)
+        else:
+            _contexts.move_to_end(key)
+        return context
+
+def invalidate_project_context(cwd: Optional[str] = None):
+    """
+    Forgets memoized contexts, so the next lookup resolves them again.
+    With no argument every context is dropped (e.g. after a shell command
+    that may have run `git init` or edited ignore files).
+    """
+    with _contexts_lock:
+        if cwd is None:
+            _contexts.clear()
+        else:
+            _contexts.pop(os.path.abspath(cwd), None)
+
+def _on_watched_change(root: str, event_type: str, path: str):
+    with _contexts_lock:
+        context = _contexts.get(root)
+    if context is not None:
+        context.on_file_change(event_type, path)
+
+def start_project_watcher(cwd: Optional[str] = None) -> fs_watcher.FileSystemWatcher:
+    """
+    Watches the project root in the background. The root's git-ignored set
+    and the file index used by glob and read_many_files are then kept
+    current from change events instead of being rebuilt on every call.
+    """
+    root = get_project_context(cwd).project_root
+    watcher = fs_watcher.start_watching(root)
+    with _contexts_lock:
+        if root in _watched_roots:
+            return watcher
+        _watched_roots.add(root)
+        _contexts.pop(root, None)
+    watcher.subscribe(lambda event_type, path: _on_watched_change(root, event_type, path))
+    return watcher
+
+def stop_project_watchers():
+    with _contexts_lock:
+        _watched_roots.clear()
+        _contexts.clear()
+    fs_watcher.stop_watching()
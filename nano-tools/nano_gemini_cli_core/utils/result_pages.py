@@ -0,0 +1,154 @@
+# nano-tools/nano_gemini_cli_core/utils/result_pages.py
+import time
+import secrets
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# ---
+# glob, grep and ls can produce hundreds of thousands of lines in a large
+# repository: too much to build into one string, and far too much for the
+# model's context. Listing tools hand their full, sorted result set to
+# `paginate`, which returns the first page plus an opaque cursor and keeps
+# the set in a bounded in-process LRU. `next_page(cursor)` then slices the
+# cached set instead of walking the tree again. Pages are a snapshot of the
+# moment the search ran; a cursor that has been evicted or has expired asks
+# the model to run the search again.
+# ---
+
+# --- Pagination Configuration ---
+DEFAULT_PAGE_SIZE = 500
+MAX_PAGE_SIZE = 5000
+MAX_RESULT_SETS = 32
+MAX_CACHED_ITEMS = 1_000_000
+RESULT_SET_TTL_S = 30 * 60
+
+# (page_items, start_index, total) -> {"llm_content", "display_content"}
+PageRenderer = Callable[[List[Any], int, int], Dict[str, str]]
+
+@dataclass
+class ResultSet:
+    """A complete, ordered result set and how to render a slice of it."""
+    items: List[Any]
+    render: PageRenderer
+    page_size: int
+    created_at: float
+
+class ResultSetCache:
+    """
+    An LRU of result sets, bounded by the number of sets, the total number of
+    items held across them, and their age. The newest set is always kept,
+    even when it alone exceeds the item budget.
+    """
+
+    def __init__(self, max_sets: int = MAX_RESULT_SETS, max_items: int = MAX_CACHED_ITEMS, ttl_s: float = RESULT_SET_TTL_S):
+        self.max_sets = max_sets
+        self.max_items = max_items
+        self.ttl_s = ttl_s
+        self._sets: "OrderedDict[str, ResultSet]" = OrderedDict()
+        self._item_count = 0
+        self._lock = threading.Lock()
+
+    def put(self, items: List[Any], render: PageRenderer, page_size: int = DEFAULT_PAGE_SIZE) -> str:
+        """Stores a result set and returns its id."""
+        set_id = secrets.token_hex(6)
+        with self._lock:
+            self._sets[set_id] = ResultSet(items, render, page_size, time.monotonic())
+            self._item_count += len(items)
+            while len(self._sets) > 1 and (len(self._sets) > self.max_sets or self._item_count > self.max_items):
+                self._evict_oldest()
+        return set_id
+
+    def get(self, set_id: str) -> Optional[ResultSet]:
+        with self._lock:
+            result_set = self._sets.get(set_id)
+            if result_set is None:
+                return None
+            if time.monotonic() - result_set.created_at > self.ttl_s:
+                self._item_count -= len(result_set.items)
+                del self._sets[set_id]
+                return None
+            self._sets.move_to_end(set_id)
+            return result_set
+
+    def _evict_oldest(self):
+        _, result_set = self._sets.popitem(last=False)
+        self._item_count -= len(result_set.items)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"result_sets": len(self._sets), "items": self._item_count}
+
+    def clear(self):
+        with self._lock:
+            self._sets.clear()
+            self._item_count = 0
+
+_default_cache: Optional[ResultSetCache] = None
+_init_lock = threading.Lock()
+
+def get_result_cache() -> ResultSetCache:
+    global _default_cache
+    with _init_lock:
+        if _default_cache is None:
+            _default_cache = ResultSetCache()
+        return _default_cache
+
+# --- Cursors ---
+
+def _parse_cursor(cursor: str) -> Optional[Tuple[str, int]]:
+    set_id, sep, offset = cursor.strip().partition(":")
+    if not sep or not set_id or not offset.isdigit():
+        return None
+    return set_id, int(offset)
+
+def _page_size(page_size: Optional[int]) -> int:
+    return max(1, min(page_size or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE))
+
+def _render_page(result_set: ResultSet, set_id: str, offset: int, page_size: int) -> Dict[str, str]:
+    total = len(result_set.items)
+    page = result_set.items[offset:offset + page_size]
+    end = offset + len(page)
+    result = dict(result_set.render(page, offset, total))
+    if end < total:
+        cursor = f"{set_id}:{end}"
+        result["llm_content"] += (
+            f"\n\n[Showing results {offset + 1}-{end} of {total}. "
+            f"Call next_page with cursor \"{cursor}\" to see more.]"
+        )
+        result["display_content"] += f" (showing {offset + 1}-{end})"
+        result["next_cursor"] = cursor
+    else:
+        result["llm_content"] += f"\n\n[Showing results {offset + 1}-{end} of {total}; this is the last page.]"
+        result["display_content"] += f" (showing {offset + 1}-{end}, last page)"
+    return result
+
+def paginate(items: List[Any], render: PageRenderer, page_size: Optional[int] = None) -> Dict[str, str]:
+    """
+    Renders the first page of `items`. If there is more than one page, the
+    set is cached and the result carries a `next_cursor` (also spelled out in
+    `llm_content`) for `next_page`.
+    """
+    page_size = _page_size(page_size)
+    if len(items) <= page_size:
+        return render(items, 0, len(items))
+    cache = get_result_cache()
+    set_id = cache.put(items, render, page_size)
+    return _render_page(cache.get(set_id), set_id, 0, page_size)
+
+def next_page(cursor: str, page_size: Optional[int] = None) -> Dict[str, str]:
+    """Renders the page a cursor points at, by default in the original call's page size."""
+    parsed = _parse_cursor(cursor)
+    if parsed is None:
+        msg = f"Error: '{cursor}' is not a valid cursor."
+        return {"llm_content": msg, "display_content": msg}
+    set_id, offset = parsed
+    result_set = get_result_cache().get(set_id)
+    if result_set is None:
+        msg = "Error: This cursor has expired. Run the original search again."
+        return {"llm_content": msg, "display_content": msg}
+    if offset >= len(result_set.items):
+        msg = f"Error: The cursor is past the end of the results ({len(result_set.items)} in total)."
+        return {"llm_content": msg, "display_content": msg}
+    return _render_page(result_set, set_id, offset, _page_size(page_size or result_set.page_size))
@@ -0,0 +1,134 @@
+# nano-tools/nano_gemini_cli_core/utils/search_cache.py
+import os
+import re
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Dict, Optional, Tuple
+
+from .disk_cache import DiskCache, get_cache_root
+
+# --- Cache Configuration ---
+DEFAULT_TTL_S = 6 * 60 * 60
+MEMORY_CACHE_ENTRIES = 512
+CACHE_DIR = os.path.join(get_cache_root(), "web_search")
+
+_default_cache: Optional["SearchCache"] = None
+_init_lock = threading.Lock()
+
+def normalize_query(query: str) -> str:
+    """Normalizes a query so trivially different spellings share a cache entry."""
+    return re.sub(r"\s+", " ", query).strip().casefold()
+
+def get_default_cache() -> "SearchCache":
+    global _default_cache
+    with _init_lock:
+        if _default_cache is None:
+            _default_cache = SearchCache(CACHE_DIR)
+        return _default_cache
+
+class SearchCache:
+    """
+    A TTL cache of formatted search results with single-flight deduplication.
+
+    Entries live in a small in-memory LRU backed by a DiskCache, so results
+    survive across sessions. Concurrent lookups of the same query while it
+    is being fetched wait for the one in-flight request instead of issuing
+    their own.
+    """
+
+    def __init__(self, directory: str, ttl_s: float = DEFAULT_TTL_S, memory_entries: int = MEMORY_CACHE_ENTRIES):
+        self.store = DiskCache(directory)
+        self.ttl_s = ttl_s
+        self.memory_entries = memory_entries
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._in_flight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "coalesced": 0}
+
+    def _is_fresh(self, stored_at: float) -> bool:
+        return time.time() - stored_at < self.ttl_s
+
+    def _remember(self, key: str, stored_at: float, value: str):
+        self._memory[key] = (stored_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _lookup(self, key: str) -> Optional[Tuple[str, str]]:
+        """Returns (value, source) for a fresh entry. Must be called with the lock held."""
+        cached = self._memory.get(key)
+        if cached and self._is_fresh(cached[0]):
+            self._memory.move_to_end(key)
+            return cached[1], "memory"
+        self._memory.pop(key, None)
+
+        entry = self.store.get(key)
+        if entry and self._is_fresh(entry["stored_at"]):
+            self._remember(key, entry["stored_at"], entry["value"])
+            return entry["value"], "disk"
+        return None
+
+    def get_or_compute(self, key: str, compute: Callable[[], Tuple[str, bool]]) -> Tuple[str, str]:
+        """
+        Returns (value, source) for `key`, calling `compute` only on a miss.
+
+        `compute` returns (value, cacheable); uncacheable values such as error
+        messages are handed to any waiting callers but not stored. `source`
+        is one of "memory", "disk", "coalesced" or "computed".
+        """
+        with self._lock:
+            found = self._lookup(key)
+            if found:
+                self._stats["memory_hits" if found[1] == "memory" else "disk_hits"] += 1
+                return found
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._in_flight[key] = future
+                self._stats["misses"] += 1
+            else:
+                self._stats["coalesced"] += 1
+
+        if not leader:
+            return future.result(), "coalesced"
+
+        try:
+            value, cacheable = compute()
+        except BaseException as e:
+            with self._lock:
+                del self._in_flight[key]
+            future.set_exception(e)
+            raise
+
+        try:
+            if cacheable:
+                stored_at = time.time()
+                with self._lock:
+                    self._remember(key, stored_at, value)
+                # The result is already in memory, so a failed disk write only
+                # costs persistence across sessions.
+                try:
+                    self.store.set(key, {"stored_at": stored_at, "value": value})
+                except OSError as e:
+                    print(f"Warning: could not write the search cache: {e}")
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            future.set_result(value)
+        return value, "computed"
+
+    def stats(self) -> Dict[str, float]:
+        """Returns hit/miss counters and the overall hit rate since this cache was created."""
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = sum(stats.values())
+        served = stats["memory_hits"] + stats["disk_hits"] + stats["coalesced"]
+        stats["hit_rate"] = served / lookups if lookups else 0.0
+        return stats
+
+    def clear_memory(self):
+        with self._lock:
+            self._memory.clear()
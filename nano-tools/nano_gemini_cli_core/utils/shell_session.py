@@ -0,0 +1,256 @@
+# nano-tools/nano_gemini_cli_core/utils/shell_session.py
+import os
+import sys
+import uuid
+import shlex
+import signal
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Optional
+
+# --- Pool Configuration ---
+# Long-lived shells are kept per working directory so that a burst of small
+# commands (`ls`, `git status`, ...) does not pay the spawn and shell-init cost.
+SHELL_EXECUTABLE = "/bin/sh"
+MAX_IDLE_SESSIONS_PER_DIR = 4
+DEFAULT_COMMAND_TIMEOUT_S = 300.0
+STREAM_LIMIT_BYTES = 1024 * 1024
+
+DEADLINE_POLL_INTERVAL_S = 0.1
+
+async def watch_deadlines(
+    last_activity: List[float],
+    timeout: Optional[float] = None,
+    idle_timeout: Optional[float] = None,
+) -> str:
+    """
+    Sleeps until either deadline is exceeded and returns which one fired.
+
+    `last_activity[0]` holds the loop time of the most recent output and is
+    updated by the caller's stream readers. Never returns if both are None.
+    """
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    while True:
+        await asyncio.sleep(DEADLINE_POLL_INTERVAL_S)
+        now = loop.time()
+        if timeout is not None and now - started >= timeout:
+            return "timeout"
+        if idle_timeout is not None and now - last_activity[0] >= idle_timeout:
+            return "idle_timeout"
+
+async def cancel_and_reap(future: asyncio.Future):
+    """Cancels a future and waits for it, retrieving its outcome so nothing is logged as unhandled."""
+    future.cancel()
+    await asyncio.gather(future, return_exceptions=True)
+
+class ShellSessionError(Exception):
+    """Raised when a persistent shell session dies or cannot run a command."""
+
+class ShellCommandTimeout(ShellSessionError):
+    """Raised when a command in a persistent shell session exceeds its timeout."""
+
+    def __init__(self, message: str, reason: str = "timeout", pgid: Optional[int] = None):
+        super().__init__(message)
+        self.reason = reason
+        # The process group of the session that was killed (and will not be reused).
+        self.pgid = pgid
+
+class ShellSession:
+    """
+    A single long-lived shell process.
+
+    Each command is framed with a unique sentinel that is echoed to stdout
+    (together with the exit code) and to stderr once the command finishes.
+    Commands run in a subshell with stdin detached, so `cd`, `export` and
+    similar state changes never leak into the next command.
+    """
+
+    def __init__(self, cwd: str):
+        self.cwd = cwd
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def start(self) -> "ShellSession":
+        self.loop = asyncio.get_running_loop()
+        self.process = await asyncio.create_subprocess_exec(
+            SHELL_EXECUTABLE,
+            cwd=self.cwd,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            limit=STREAM_LIMIT_BYTES,
+            preexec_fn=os.setsid,
+        )
+        return self
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self.process.pid if self.process else None
+
+    def is_bound_to_running_loop(self) -> bool:
+        try:
+            return self.loop is asyncio.get_running_loop() and not self.loop.is_closed()
+        except RuntimeError:
+            return False
+
+    def is_usable(self) -> bool:
+        """A session is usable if its shell is alive and bound to the running loop."""
+        if self.process is None or self.process.returncode is not None:
+            return False
+        return self.is_bound_to_running_loop()
+
+    def close(self):
+        """
+        Kills the shell and everything it started. The process is not reaped;
+        use `aclose` from the session's own loop where possible.
+        """
+        if self.process is None or self.process.returncode is not None:
+            return
+        try:
+            os.killpg(self.process.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    async def aclose(self):
+        """
+        Kills the shell and reaps it. Its pipes are closed while the loop still
+        runs; a transport left for garbage collection after its loop has
+        closed raises "Event loop is closed" from `__del__`.
+        """
+        self.close()
+        if self.process is None or not self.is_bound_to_running_loop():
+            return
+        await self.process.wait()
+        self.process._transport.close()
+
+    async def run(
+        self,
+        command: str,
+        update_callback: Callable[[str], Awaitable[None]],
+        timeout: Optional[float] = DEFAULT_COMMAND_TIMEOUT_S,
+        idle_timeout: Optional[float] = None,
+    ) -> int:
+        """
+        Runs a single command in this session and returns its exit code.
+
+        Output lines are forwarded to `update_callback` prefixed with their
+        stream name, exactly like the one-shot subprocess path.
+        """
+        if not self.is_usable():
+            raise ShellSessionError("Shell session is not running.")
+
+        sentinel = f"__NANO_SHELL_DONE_{uuid.uuid4().hex}__"
+        # `eval` keeps a malformed command from swallowing the sentinel lines.
+        script = (
+            f"cd {shlex.quote(self.cwd)} 2>/dev/null\n"
+            f"( eval {shlex.quote(command)} ) < /dev/null\n"
+            f"printf '%s %d\\n' {sentinel} $?\n"
+            f"printf '%s\\n' {sentinel} >&2\n"
+        )
+        self.process.stdin.write(script.encode())
+        await self.process.stdin.drain()
+
+        exit_code: List[int] = []
+        last_activity = [asyncio.get_running_loop().time()]
+
+        async def read_until_sentinel(stream, stream_name):
+            while True:
+                raw = await stream.readline()
+                if not raw:
+                    raise ShellSessionError("Shell session exited unexpectedly.")
+                last_activity[0] = asyncio.get_running_loop().time()
+                line = raw.decode(errors="replace")
+                marker = line.find(sentinel)
+                if marker == -1:
+                    await update_callback(f"[{stream_name}] {line.strip()}")
+                    continue
+                # Output that did not end with a newline shares a line with the sentinel.
+                if line[:marker].strip():
+                    await update_callback(f"[{stream_name}] {line[:marker].strip()}")
+                if stream_name == "STDOUT":
+                    exit_code.append(int(line[marker + len(sentinel):].strip() or 1))
+                return
+
+        readers = asyncio.ensure_future(asyncio.gather(
+            read_until_sentinel(self.process.stdout, "STDOUT"),
+            read_until_sentinel(self.process.stderr, "STDERR"),
+        ))
+        watchdog = asyncio.ensure_future(watch_deadlines(last_activity, timeout, idle_timeout))
+        try:
+            await asyncio.wait({readers, watchdog}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            watchdog.cancel()
+            finished = readers.done()
+            if not finished:
+                await cancel_and_reap(readers)
+
+        if not finished:
+            pgid = self.pid
+            await self.aclose()
+            reason = watchdog.result()
+            limit = timeout if reason == "timeout" else idle_timeout
+            raise ShellCommandTimeout(f"Command killed after {reason.replace('_', ' ')} of {limit} seconds.", reason, pgid)
+        readers.result()
+        return exit_code[0]
+
+class ShellSessionPool:
+    """Keeps idle `ShellSession`s per working directory and hands them out one command at a time."""
+
+    def __init__(self, max_idle_per_dir: int = MAX_IDLE_SESSIONS_PER_DIR):
+        self.max_idle_per_dir = max_idle_per_dir
+        self._idle: Dict[str, List[ShellSession]] = {}
+        self.sessions_started = 0
+
+    async def acquire(self, cwd: str) -> ShellSession:
+        idle = self._idle.get(cwd, [])
+        while idle:
+            session = idle.pop()
+            if session.is_usable():
+                return session
+            await session.aclose()
+        self.sessions_started += 1
+        return await ShellSession(cwd).start()
+
+    async def release(self, session: ShellSession):
+        idle = self._idle.setdefault(session.cwd, [])
+        if session.is_usable() and len(idle) < self.max_idle_per_dir:
+            idle.append(session)
+        else:
+            await session.aclose()
+
+    async def run(
+        self,
+        command: str,
+        cwd: str,
+        update_callback: Callable[[str], Awaitable[None]],
+        timeout: Optional[float] = DEFAULT_COMMAND_TIMEOUT_S,
+        idle_timeout: Optional[float] = None,
+    ) -> Dict:
+        """Runs a command on a pooled session, returning the same shape as `_stream_subprocess`."""
+        session = await self.acquire(cwd)
+        try:
+            returncode = await session.run(command, update_callback, timeout, idle_timeout)
+        except BaseException:
+            # A failed or cancelled command leaves the session in an unknown state.
+            await session.aclose()
+            raise
+        await self.release(session)
+        return {"returncode": returncode, "background_pids": [], "pgid": session.pid}
+
+    async def aclose_all(self):
+        """Kills and reaps every idle session; call it before the loop the sessions run on is closed."""
+        sessions = [session for idle in self._idle.values() for session in idle]
+        self._idle.clear()
+        for session in sessions:
+            await session.aclose()
+
+    def close_all(self):
+        """Kills every idle session without reaping it, for callers outside the sessions' loop."""
+        for sessions in self._idle.values():
+            for session in sessions:
+                session.close()
+        self._idle.clear()
+
+def is_supported() -> bool:
+    """Persistent sessions rely on POSIX process groups and a Bourne shell."""
+    return sys.platform != "win32" and os.path.exists(SHELL_EXECUTABLE)
@@ -0,0 +1,68 @@
+# nano-tools/scripts/bench_html_convert.py
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+# Allow running the script directly from anywhere in the repository.
+NANO_TOOLS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, NANO_TOOLS_DIR)
+
+import html2text
+from nano_gemini_cli_core.utils import html_extract
+from nano_gemini_cli_core.utils.disk_cache import DiskCache
+
+FIXTURES_DIR = os.path.join(NANO_TOOLS_DIR, "tests", "fixtures", "html")
+
+def load_corpus(copies: int):
+    """Loads the saved HTML fixtures, repeating each one with a unique marker so bodies hash differently."""
+    pages = []
+    for filename in sorted(os.listdir(FIXTURES_DIR)):
+        if filename.endswith(".html"):
+            with open(os.path.join(FIXTURES_DIR, filename), "r", encoding="utf-8") as f:
+                content = f.read()
+            pages.extend(content.replace("</body>", f"<!-- copy {i} --></body>") for i in range(copies))
+    return pages
+
+def baseline_convert(raw_html: str) -> str:
+    """The previous web_fetch path: a fresh HTML2Text over the full page."""
+    h = html2text.HTML2Text()
+    h.ignore_links = True
+    h.ignore_images = True
+    h.body_width = 0
+    return h.handle(raw_html)
+
+def timed(label: str, fn, pages):
+    started = time.perf_counter()
+    outputs = fn(pages)
+    elapsed = time.perf_counter() - started
+    total_chars = sum(len(output) for output in outputs)
+    print(f"{label:<42} {elapsed * 1000:>9.1f} ms  {elapsed * 1000 / len(pages):>7.2f} ms/page  {total_chars:>9} chars out")
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks web_fetch HTML-to-markdown conversion on the saved fixtures.")
+    parser.add_argument("--copies", type=int, default=8, help="How many distinct copies of each fixture to convert.")
+    args = parser.parse_args()
+
+    pages = load_corpus(args.copies)
+    print(f"Corpus: {len(pages)} pages, {sum(len(p) for p in pages) / 1024:.0f} KiB of HTML\n")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        html_extract._disk_cache = DiskCache(cache_dir)
+        html_extract.clear_memory_cache()
+
+        timed("baseline (full page, serial)", lambda ps: [baseline_convert(p) for p in ps], pages)
+        timed("extraction + convert (serial)", lambda ps: [html_extract.html_to_markdown(p) for p in ps], pages)
+        if html_extract.MAX_CONVERSION_WORKERS > 1:
+            # Warm the worker pool so process start-up is not attributed to conversion.
+            html_extract._get_pool().submit(len, "").result()
+        label = f"extraction + convert ({html_extract.MAX_CONVERSION_WORKERS} worker(s), cold)"
+        timed(label, html_extract.convert_many, pages)
+        timed("cached (memory)", html_extract.convert_many, pages)
+        html_extract.clear_memory_cache()
+        timed("cached (disk)", html_extract.convert_many, pages)
+
+if __name__ == "__main__":
+    main()
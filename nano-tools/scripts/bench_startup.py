@@ -0,0 +1,80 @@
+# nano-tools/scripts/bench_startup.py
+import os
+import sys
+import argparse
+import subprocess
+from typing import Dict, List, Set, Tuple
+
+# Allow running the script directly from anywhere in the repository.
+NANO_TOOLS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+REPO_ROOT = os.path.dirname(NANO_TOOLS_DIR)
+
+# Entry point -> (cumulative import budget in ms, modules it must not import).
+# Budgets are for a typical developer machine; scale them with --budget-scale.
+# The forbidden lists are the real regression check: they do not depend on
+# machine speed.
+STARTUP_BUDGETS: Dict[str, Tuple[float, List[str]]] = {
+    "nano_gemini_cli_core.tool_registry": (150, ["agents", "litellm", "requests", "html2text"]),
+    "test_tools": (400, ["agents", "litellm"]),
+    "nano_gemini_cli_core.tools.edit": (2500, ["litellm"]),
+    "nano_gemini_cli_core.tools.write_file": (2500, ["litellm"]),
+    "nano_gemini_cli_core.tools.web_fetch": (2500, ["litellm", "requests", "html2text"]),
+    "nano_gemini_cli_core.tools.web_search": (2500, ["litellm"]),
+    "aura_agent.config": (150, ["agents", "litellm"]),
+}
+
+def measure_import(module: str) -> Tuple[float, Set[str]]:
+    """Imports `module` in a fresh interpreter under -X importtime; returns (cumulative ms, imported modules)."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([NANO_TOOLS_DIR, REPO_ROOT, os.environ.get("PYTHONPATH", "")]))
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=NANO_TOOLS_DIR, env=env, capture_output=True, text=True,
+    )
+    if process.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{process.stderr[-2000:]}")
+    cumulative_us = None
+    imported: Set[str] = set()
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|", 2)
+        name = name.strip()
+        if not cumulative.strip().isdigit():
+            continue  # The header line.
+        imported.add(name.split(".")[0])
+        imported.add(name)
+        if name == module:
+            cumulative_us = int(cumulative)
+    if cumulative_us is None:
+        raise RuntimeError(f"No import timing found for {module}.")
+    return cumulative_us / 1000, imported
+
+def main():
+    parser = argparse.ArgumentParser(description="Measures cold import time of the entry points against a budget.")
+    parser.add_argument("--runs", type=int, default=3, help="Imports per entry point; the fastest run counts.")
+    parser.add_argument("--budget-scale", type=float, default=1.0, help="Multiplies every time budget (e.g. 2 on slow CI).")
+    parser.add_argument("modules", nargs="*", help="Only check these entry points.")
+    args = parser.parse_args()
+
+    failures = []
+    print(f"{'entry point':<42} {'import ms':>10} {'budget ms':>10}  status")
+    for module, (budget_ms, forbidden) in STARTUP_BUDGETS.items():
+        if args.modules and module not in args.modules:
+            continue
+        runs = [measure_import(module) for _ in range(args.runs)]
+        elapsed_ms = min(ms for ms, _ in runs)
+        imported = runs[0][1]
+        budget = budget_ms * args.budget_scale
+        problems = [f"imports {name}" for name in forbidden if name in imported]
+        if elapsed_ms > budget:
+            problems.append("over budget")
+        print(f"{module:<42} {elapsed_ms:>10.1f} {budget:>10.0f}  {'; '.join(problems) or 'ok'}")
+        if problems:
+            failures.append(module)
+
+    if failures:
+        print(f"\nStartup regression in: {', '.join(failures)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -7,18 +7,50 @@ import os
 
 # --- Import all our tools ---
 # We assume this script is run from the root of the 'nano-tools' directory
-# and that the package is installed in editable mode.
-from nano_gemini_cli_core.tools.edit import _replace_impl as replace
-from nano_gemini_cli_core.tools.glob import _glob_impl as glob
-from nano_gemini_cli_core.tools.grep import _search_file_content_impl as search_file_content
-from nano_gemini_cli_core.tools.ls import _list_directory_impl as list_directory
-from nano_gemini_cli_core.tools.read_file import _read_file_impl as read_file
-from nano_gemini_cli_core.tools.shell import _run_shell_command_impl as run_shell_command
-from nano_gemini_cli_core.tools.write_file import _write_file_impl as write_file
+# and that the package is installed in editable mode. Tool modules are only
+# imported when their command runs, so `--help` and `schemas` start instantly.
+from nano_gemini_cli_core import tool_registry
+
+# Set by --daemon: tools then run in the shared, warm daemon process.
+_daemon_client = None
+
+def _lazy_impl(tool_name: str):
+    def call(**kwargs):
+        if _daemon_client is None:
+            return tool_registry.load_impl(tool_name)(**kwargs)
+        result = _daemon_client.call_tool(tool_name, kwargs)
+        if tool_registry.get_tool_spec(tool_name).is_async:
+            async def done():
+                return result
+            return done()
+        return result
+    return call
+
+replace = _lazy_impl("replace")
+glob = _lazy_impl("glob")
+search_file_content = _lazy_impl("search_file_content")
+list_directory = _lazy_impl("list_directory")
+read_file = _lazy_impl("read_file")
+restore = _lazy_impl("restore")
+run_shell_command = _lazy_impl("run_shell_command")
+write_file = _lazy_impl("write_file")
+next_page = _lazy_impl("next_page")
+list_background_processes = _lazy_impl("list_background_processes")
+kill_background_process = _lazy_impl("kill_background_process")
 
 app = typer.Typer(help="A CLI to test the nano-gemini-cli tools in a standalone fashion.")
 console = Console()
 
+@app.callback()
+def main(daemon: Annotated[bool, typer.Option(help="Run the tools in the nano-tools daemon (start it with `python -m nano_gemini_cli_core.daemon`).")] = False):
+    global _daemon_client
+    if daemon:
+        from nano_gemini_cli_core.daemon import DaemonClient, is_daemon_running
+        if not is_daemon_running():
+            console.print("[bold red]No nano-tools daemon is running.[/bold red] Start it with `python -m nano_gemini_cli_core.daemon`.")
+            raise typer.Exit(code=1)
+        _daemon_client = DaemonClient()
+
 def _print_result(result: dict | str):
     """Prints the structured result from a tool call in a nice format."""
     if isinstance(result, str):
@@ -35,10 +67,10 @@ def _print_result(result: dict | str):
     console.print(table)
 
 @app.command(name="ls")
-def test_ls(path: Annotated[str, typer.Option(help="The path to list.")] = '.'):
+def test_ls(path: Annotated[str, typer.Option(help="The path to list.")] = '.', page_size: Annotated[int, typer.Option(help="Entries per page.")] = 500):
     """Tests the list_directory tool."""
     console.print(f"[bold]Testing 'list_directory' on path: '{path}'[/bold]\n")
-    result = list_directory(path=path)
+    result = list_directory(path=path, page_size=page_size)
     _print_result(result)
 
 @app.command(name="read-file")
@@ -51,17 +83,17 @@ def test_read_file(file_path: Annotated[str, typer.Argument(help="The file to re
     _print_result(result)
 
 @app.command(name="glob")
-def test_glob(pattern: Annotated[str, typer.Option(help="The glob pattern.")]):
+def test_glob(pattern: Annotated[str, typer.Option(help="The glob pattern.")], page_size: Annotated[int, typer.Option(help="Paths per page.")] = 500):
     """Tests the glob tool."""
     console.print(f"[bold]Testing 'glob' with pattern: '{pattern}'[/bold]\n")
-    result = glob(pattern=pattern)
+    result = glob(pattern=pattern, page_size=page_size)
     _print_result(result)
 
 @app.command(name="grep")
-def test_grep(pattern: Annotated[str, typer.Option(help="The regex pattern.")], path: Annotated[str, typer.Option(help="The path to search.")] = '.'):
+def test_grep(pattern: Annotated[str, typer.Option(help="The regex pattern.")], path: Annotated[str, typer.Option(help="The path to search.")] = '.', page_size: Annotated[int, typer.Option(help="Matches per page.")] = 500):
     """Tests the search_file_content tool."""
     console.print(f"[bold]Testing 'grep' with pattern: '{pattern}' in '{path}'[/bold]\n")
-    result = search_file_content(pattern=pattern, path=path)
+    result = search_file_content(pattern=pattern, path=path, page_size=page_size)
     _print_result(result)
 
 @app.command(name="edit")
@@ -89,14 +121,62 @@ def test_write_file(
     _print_result(result)
 
 @app.command(name="shell")
-def test_shell(command: Annotated[str, typer.Argument(help="The shell command to run.")]):
+def test_shell(
+    command: Annotated[str, typer.Argument(help="The shell command to run.")],
+    persistent: Annotated[bool, typer.Option(help="Run on a pooled persistent shell.")] = False,
+):
     """Tests the run_shell_command tool."""
     console.print(f"[bold]Testing 'shell' with command: '{command}'[/bold]\n")
     # This tool is async, so we need to run it in an event loop
     import asyncio
-    result = asyncio.run(run_shell_command(command=command))
+    result = asyncio.run(run_shell_command(command=command, persistent=persistent))
+    _print_result(result)
+
+@app.command(name="bg-list")
+def test_list_background_processes():
+    """Tests the list_background_processes tool. Background processes belong to the process that ran the shell, so use it with --daemon."""
+    console.print("[bold]Testing 'list_background_processes'[/bold]\n")
+    result = list_background_processes()
+    _print_result(result)
+
+@app.command(name="bg-kill")
+def test_kill_background_process(
+    pgid: Annotated[int, typer.Argument(help="The process group ID to terminate.")],
+    force: Annotated[bool, typer.Option(help="Send SIGKILL instead of SIGTERM.")] = False,
+):
+    """Tests the kill_background_process tool. Use it with --daemon, like bg-list."""
+    console.print(f"[bold]Testing 'kill_background_process' with pgid: {pgid}[/bold]\n")
+    result = kill_background_process(pgid=pgid, force=force)
+    _print_result(result)
+
+@app.command(name="restore")
+def test_restore(checkpoint: Annotated[str, typer.Argument(help="The checkpoint to restore. Lists checkpoints if omitted.")] = ""):
+    """Tests the restore tool."""
+    console.print(f"[bold]Testing 'restore' with checkpoint: '{checkpoint or '(list)'}'[/bold]\n")
+    result = restore(checkpoint=checkpoint or None)
     _print_result(result)
 
+@app.command(name="next-page")
+def test_next_page(cursor: Annotated[str, typer.Argument(help="The cursor from the previous page.")]):
+    """Tests the next_page tool. Cursors live in the process that ran the search, so use it with --daemon."""
+    console.print(f"[bold]Testing 'next_page' with cursor: '{cursor}'[/bold]\n")
+    result = next_page(cursor=cursor)
+    _print_result(result)
+
+@app.command(name="render-memory")
+def test_render_memory():
+    """Renders the save_memory log into the memory section of ~/.gemini/GEMINI.md."""
+    from nano_gemini_cli_core.tools.memory_tool import get_global_memory_file_path, render_memory_file
+    changed = render_memory_file()
+    console.print(f"{get_global_memory_file_path()} {'updated' if changed else 'already up to date'}.")
+
+@app.command(name="schemas")
+def test_schemas(tool: Annotated[str, typer.Argument(help="Only show this tool.")] = ""):
+    """Prints the tool schemas from the registry, without importing any tool."""
+    import json
+    schemas = [tool_registry.get_tool_spec(tool).as_function_schema()] if tool else tool_registry.get_tool_schemas()
+    console.print_json(json.dumps(schemas))
+
 
 if __name__ == "__main__":
     app()
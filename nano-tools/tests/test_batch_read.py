@@ -0,0 +1,84 @@
+# nano-tools/tests/test_batch_read.py
+import unittest
+import os
+import shutil
+from unittest import mock
+from nano_gemini_cli_core.tools import batch_read
+
+class TestBatchReadTool(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a temporary directory with files to explore."""
+        self.test_dir = "temp_test_dir_for_batch_read"
+        os.makedirs(os.path.join(self.test_dir, "subdir"), exist_ok=True)
+
+        with open(os.path.join(self.test_dir, "file1.py"), "w") as f:
+            f.write("import os\nprint('hello batch')\n")
+        with open(os.path.join(self.test_dir, "subdir", "file2.txt"), "w") as f:
+            f.write("x" * 5000)
+
+        self.original_cwd = os.getcwd()
+        os.chdir(self.test_dir)
+
+    def tearDown(self):
+        """Clean up the temporary directory."""
+        os.chdir(self.original_cwd)
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_mixed_calls_in_one_batch(self):
+        """Test that results of different read-only tools are combined in call order."""
+        result = batch_read._batch_read_impl([
+            {"tool": "read_file", "arguments": {"absolute_path": os.path.abspath("file1.py")}},
+            {"tool": "glob", "arguments": '{"pattern": "**/*.txt"}'},
+            {"tool": "list_directory", "arguments": {"path": "."}},
+            {"tool": "search_file_content", "arguments": {"pattern": "hello"}},
+        ])
+        llm_content = result["llm_content"]
+        self.assertIn("print('hello batch')", llm_content)
+        self.assertIn("file2.txt", llm_content)
+        self.assertIn("[DIR] subdir", llm_content)
+        self.assertLess(llm_content.index("=== [1] read_file"), llm_content.index("=== [4] search_file_content"))
+        self.assertIn("Ran 4 read-only tool call(s)", result["display_content"])
+
+    def test_per_call_budget(self):
+        """Test that each call's output is truncated to its share of the budget."""
+        result = batch_read._batch_read_impl([
+            {"tool": "read_file", "arguments": {"absolute_path": os.path.abspath(os.path.join("subdir", "file2.txt"))}},
+            {"tool": "read_file", "arguments": {"absolute_path": os.path.abspath("file1.py")}},
+        ], max_total_chars=2000)
+        self.assertIn("[truncated 4000 of 5000 characters]", result["llm_content"])
+        self.assertIn("print('hello batch')", result["llm_content"])
+
+    def test_rejects_mutating_and_invalid_calls(self):
+        """Test that non read-only tools and bad arguments are reported per call."""
+        result = batch_read._batch_read_impl([
+            {"tool": "write_file", "arguments": {}},
+            {"tool": "glob", "arguments": {"no_such_argument": 1}},
+        ])
+        self.assertIn("'write_file' is not a read-only tool", result["llm_content"])
+        self.assertIn("Invalid arguments for 'glob'", result["llm_content"])
+        self.assertIn("2 failed", result["display_content"])
+
+    def test_malformed_json_arguments(self):
+        """Test that malformed JSON arguments fail the whole batch up front."""
+        result = batch_read._batch_read_impl([{"tool": "glob", "arguments": "{not json"}])
+        self.assertIn("Error: Invalid arguments for call 1", result["llm_content"])
+
+    def test_type_error_inside_a_tool(self):
+        """Test that a TypeError raised by the tool itself is reported as a tool error, not as bad arguments."""
+        def broken_glob(pattern, path=None):
+            raise TypeError("unsupported operand")
+
+        with mock.patch.dict(batch_read.READ_ONLY_TOOLS, {"glob": broken_glob}):
+            result = batch_read._batch_read_impl([{"tool": "glob", "arguments": {"pattern": "*"}}])
+        self.assertIn("An unexpected error occurred in 'glob': unsupported operand", result["llm_content"])
+        self.assertNotIn("Invalid arguments", result["llm_content"])
+
+    def test_non_object_calls(self):
+        """Test that a call that is not an object fails the batch with an error instead of raising."""
+        result = batch_read._batch_read_impl([{"tool": "glob", "arguments": {"pattern": "*"}}, "glob"])
+        self.assertEqual(result["llm_content"], "Error: Call 2 must be an object with 'tool' and 'arguments', got str.")
+
+if __name__ == '__main__':
+    unittest.main()
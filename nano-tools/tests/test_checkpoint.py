@@ -0,0 +1,136 @@
+# nano-tools/tests/test_checkpoint.py
+import unittest
+import os
+import shutil
+import tempfile
+from unittest import mock
+from nano_gemini_cli_core.tools import edit, restore, write_file
+from nano_gemini_cli_core.utils import checkpoint, project_context
+
+class TestCheckpointing(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a project directory and a temporary home for checkpoint storage."""
+        self.test_dir = os.path.abspath("temp_test_dir_for_checkpoint")
+        os.makedirs(self.test_dir, exist_ok=True)
+        self.file_path = os.path.join(self.test_dir, "notes.txt")
+        with open(self.file_path, "w") as f:
+            f.write("original line\n")
+
+        self.home_dir = tempfile.mkdtemp(prefix="checkpoint_home_")
+        for patcher in (
+            mock.patch.dict(os.environ, {"HOME": self.home_dir}),
+            mock.patch.object(checkpoint, "_stores", {}),
+            mock.patch.object(checkpoint, "CHECKPOINTING_ENABLED", True),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.original_cwd = os.getcwd()
+        os.chdir(self.test_dir)
+        project_context.invalidate_project_context()
+
+    def tearDown(self):
+        """Clean up the temporary directories and restore CWD."""
+        os.chdir(self.original_cwd)
+        project_context.invalidate_project_context()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+        shutil.rmtree(self.home_dir, ignore_errors=True)
+
+    def _read(self, path):
+        with open(path) as f:
+            return f.read()
+
+    def test_write_file_checkpoint_and_restore(self):
+        """Test that write_file snapshots the old content and restore brings it back."""
+        checkpoint.set_conversation([{"role": "user", "content": "rewrite notes"}])
+        write_file._write_file_impl(self.file_path, "rewritten\n")
+        self.assertEqual(self._read(self.file_path), "rewritten\n")
+
+        listing = restore._restore_impl()
+        self.assertIn("Found 1 checkpoint(s).", listing["display_content"])
+        name = listing["llm_content"].splitlines()[1]
+        self.assertTrue(name.endswith("-notes.txt-write_file"))
+
+        result = restore._restore_impl(name)
+        self.assertEqual(self._read(self.file_path), "original line\n")
+        self.assertIn("write_file(", result["llm_content"])
+        self.assertIn("1 message(s)", result["llm_content"])
+
+    def test_call_conversation_overrides_the_host_conversation(self):
+        """Test that a call's conversation context wins over set_conversation, and only for that call."""
+        checkpoint.set_conversation([{"role": "user", "content": "host"}])
+        self.addCleanup(checkpoint.set_conversation, [])
+        with checkpoint.conversation_context([{"role": "user", "content": "a"}, {"role": "user", "content": "b"}]):
+            self.assertEqual(len(checkpoint.current_conversation()), 2)
+        self.assertEqual(checkpoint.current_conversation(), [{"role": "user", "content": "host"}])
+
+    def test_restore_removes_created_file(self):
+        """Test that restoring a checkpoint taken before a file was created deletes it again."""
+        new_path = os.path.join(self.test_dir, "new.txt")
+        edit._replace_impl(new_path, "", "fresh\n")
+        self.assertTrue(os.path.exists(new_path))
+
+        name = checkpoint.get_checkpoint_store().list()[0]
+        restore._restore_impl(name)
+        self.assertFalse(os.path.exists(new_path))
+
+    def test_blobs_are_deduplicated(self):
+        """Test that snapshotting identical content stores one compressed blob."""
+        store = checkpoint.get_checkpoint_store()
+        edit._replace_impl(self.file_path, "original line", "original line")
+        edit._replace_impl(self.file_path, "original line", "original line")
+        self.assertEqual(len(store.list()), 2)
+
+        blob_files = [f for _, _, files in os.walk(store.blob_dir) for f in files]
+        self.assertEqual(len(blob_files), 1)
+
+    def test_store_lives_in_project_temp_dir(self):
+        """Test that checkpoints are kept under ~/.gemini/tmp/<project_hash>/checkpoints."""
+        store = checkpoint.get_checkpoint_store()
+        expected = os.path.join(project_context.get_project_context().temp_dir, "checkpoints")
+        self.assertEqual(store.directory, expected)
+        self.assertTrue(store.directory.startswith(self.home_dir))
+
+    def test_disabled(self):
+        """Test that no checkpoint is taken when checkpointing is disabled."""
+        with mock.patch.object(checkpoint, "CHECKPOINTING_ENABLED", False):
+            write_file._write_file_impl(self.file_path, "changed\n")
+        self.assertIn("No checkpoints found", restore._restore_impl()["llm_content"])
+
+    def test_unknown_checkpoint(self):
+        """Test that restoring a missing checkpoint reports an error."""
+        result = restore._restore_impl("does-not-exist")
+        self.assertIn("No checkpoint named", result["llm_content"])
+
+    def test_names_outside_the_store_are_rejected(self):
+        """Test that a name pointing outside the manifest directory is never loaded or restored."""
+        store = checkpoint.get_checkpoint_store()
+        outside = os.path.join(store.directory, "evil.json")
+        os.makedirs(store.directory, exist_ok=True)
+        with open(outside, "w") as f:
+            f.write('{"files": [{"path": "%s", "blob": null}], "conversation": []}' % self.file_path)
+
+        for name in ("../evil", os.path.join("..", "evil"), ""):
+            self.assertIsNone(store.load(name))
+            self.assertIn("No checkpoint named", restore._restore_impl(name or "..")["llm_content"])
+        self.assertTrue(os.path.exists(self.file_path))
+
+    def test_old_checkpoints_are_pruned(self):
+        """Test that the oldest checkpoints and the blobs only they used are deleted past the limit."""
+        store = checkpoint.get_checkpoint_store()
+        with mock.patch.object(checkpoint, "MAX_CHECKPOINTS", 10), mock.patch.object(checkpoint, "BLOB_GRACE_S", -1):
+            for i in range(11):
+                with open(self.file_path, "w") as f:
+                    f.write(f"version {i}\n")
+                store.create([self.file_path], "write_file", {})
+        names = store.list()
+        self.assertEqual(len(names), 9)
+        blob_files = [f for _, _, files in os.walk(store.blob_dir) for f in files]
+        self.assertEqual(len(blob_files), 9)
+        self.assertIn("version 10", self._read(self.file_path))
+        store.restore(names[-1])
+        self.assertEqual(self._read(self.file_path), "version 2\n")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,190 @@
+# nano-tools/tests/test_daemon.py
+import unittest
+import os
+import sys
+import stat
+import time
+import asyncio
+import shutil
+import tempfile
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from nano_gemini_cli_core.daemon import DaemonClient, DaemonError, ToolDaemon, INVALID_PARAMS, METHOD_NOT_FOUND, is_daemon_running
+
+NANO_TOOLS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+class TestToolDaemon(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Start one daemon for the whole class, as clients would share it."""
+        cls.temp_dir = tempfile.mkdtemp(prefix="nano_daemon_")
+        cls.socket_path = os.path.join(cls.temp_dir, "tools.sock")
+        cls.process = subprocess.Popen(
+            [sys.executable, "-m", "nano_gemini_cli_core.daemon", "--socket", cls.socket_path, "--no-watch"],
+            cwd=NANO_TOOLS_DIR, stderr=subprocess.DEVNULL,
+            env=dict(os.environ, HOME=cls.temp_dir),  # Keep checkpoints out of the real home.
+        )
+        deadline = time.monotonic() + 30
+        while not is_daemon_running(cls.socket_path):
+            if time.monotonic() > deadline or cls.process.poll() is not None:
+                cls.process.kill()
+                raise RuntimeError("The daemon did not start.")
+            time.sleep(0.05)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Shut the daemon down and check it exits and removes its socket."""
+        with DaemonClient(cls.socket_path) as client:
+            client.shutdown()
+        cls.process.wait(timeout=30)
+        socket_removed = not os.path.exists(cls.socket_path)
+        shutil.rmtree(cls.temp_dir, ignore_errors=True)
+        assert socket_removed, "The daemon left its socket behind."
+
+    def setUp(self):
+        """Set up two small projects for the daemon to work in."""
+        self.projects = []
+        for name in ("alpha", "beta"):
+            project = os.path.join(self.temp_dir, name)
+            os.makedirs(os.path.join(project, "src"), exist_ok=True)
+            with open(os.path.join(project, "src", f"{name}.py"), "w") as f:
+                f.write(f"PROJECT = '{name}'\n")
+            self.projects.append(project)
+        self.client = DaemonClient(self.socket_path, timeout=60)
+
+    def tearDown(self):
+        """Close the client and remove the projects."""
+        self.client.close()
+        for project in self.projects:
+            shutil.rmtree(project, ignore_errors=True)
+
+    def test_socket_is_owner_only(self):
+        """Test that only the daemon's owner can connect to the socket."""
+        self.assertEqual(stat.S_IMODE(os.stat(self.socket_path).st_mode), 0o600)
+
+    def test_list_tools(self):
+        """Test that the daemon lists the tool schemas."""
+        names = {tool["name"] for tool in self.client.list_tools()}
+        self.assertTrue({"glob", "search_file_content", "read_file", "list_directory", "replace"} <= names)
+
+    def test_calls_run_in_client_cwd(self):
+        """Test that relative paths resolve against each call's cwd."""
+        alpha, beta = self.projects
+        self.assertIn("alpha.py", self.client.call_tool("glob", {"pattern": "**/*.py"}, cwd=alpha)["llm_content"])
+        result = self.client.call_tool("search_file_content", {"pattern": "PROJECT"}, cwd=beta)["llm_content"]
+        self.assertIn("beta.py", result)
+        self.assertNotIn("alpha.py", result)
+
+    def test_read_and_replace(self):
+        """Test that file tools work end to end through the socket."""
+        project = self.projects[0]
+        path = os.path.join(project, "src", "alpha.py")
+        self.client.call_tool("replace", {"file_path": path, "old_string": "'alpha'", "new_string": "'ALPHA'"}, cwd=project)
+        content = self.client.call_tool("read_file", {"absolute_path": path}, cwd=project)["llm_content"]
+        self.assertIn("PROJECT = 'ALPHA'", content)
+
+    def test_checkpoints_record_the_client_conversation(self):
+        """Test that a checkpoint taken by a daemon call records the conversation the client sent."""
+        project = self.projects[1]
+        path = os.path.join(project, "src", "beta.py")
+        conversation = [{"role": "user", "content": "shout the name"}, {"role": "assistant", "content": "ok"}]
+        self.client.call_tool("replace", {"file_path": path, "old_string": "'beta'", "new_string": "'BETA'"},
+                              cwd=project, conversation=conversation)
+        listing = self.client.call_tool("restore", {}, cwd=project)["llm_content"]
+        name = next(line for line in listing.splitlines() if line.endswith("-beta.py-replace"))
+        result = self.client.call_tool("restore", {"checkpoint": name}, cwd=project)["llm_content"]
+        self.assertIn("Conversation at checkpoint: 2 message(s).", result)
+
+    def test_concurrent_clients(self):
+        """Test that several clients, in different projects, can call the daemon at once."""
+        def search(index):
+            project = self.projects[index % 2]
+            with DaemonClient(self.socket_path, timeout=60) as client:
+                result = client.call_tool("glob", {"pattern": "src/*.py"}, cwd=project)["llm_content"]
+            return os.path.basename(project), result
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(search, range(24)))
+        for name, result in results:
+            self.assertIn(f"{name}.py", result)
+
+    def test_errors(self):
+        """Test that unknown tools, bad arguments and unknown methods are reported as JSON-RPC errors."""
+        with self.assertRaises(DaemonError) as ctx:
+            self.client.call_tool("no_such_tool")
+        self.assertEqual(ctx.exception.code, INVALID_PARAMS)
+        with self.assertRaises(DaemonError) as ctx:
+            self.client.call_tool("glob", {"no_such_argument": 1})
+        self.assertEqual(ctx.exception.code, INVALID_PARAMS)
+        with self.assertRaises(DaemonError) as ctx:
+            self.client.call_tool("glob", {"pattern": "*"}, conversation="not a list")
+        self.assertEqual(ctx.exception.code, INVALID_PARAMS)
+        with self.assertRaises(DaemonError) as ctx:
+            self.client.request("no/such/method")
+        self.assertEqual(ctx.exception.code, METHOD_NOT_FOUND)
+        # The connection stays usable after errors.
+        self.assertTrue(self.client.ping()["pong"])
+
+class TestDirectoryScheduling(unittest.TestCase):
+
+    def setUp(self):
+        """Two directories to switch between, restoring CWD afterwards."""
+        self.dirs = [tempfile.mkdtemp(prefix="nano_daemon_cwd_") for _ in range(2)]
+        self.original_cwd = os.getcwd()
+
+    def tearDown(self):
+        os.chdir(self.original_cwd)
+        for directory in self.dirs:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    def test_waiting_call_is_not_starved(self):
+        """Test that calls for the current directory queue behind an earlier call for another one."""
+        first, second = self.dirs
+        daemon = ToolDaemon(socket_path=os.path.join(first, "unused.sock"), watch=False)
+        order = []
+
+        async def call(name, cwd, hold_s):
+            async with daemon._in_directory(cwd):
+                order.append((name, os.getcwd()))
+                await asyncio.sleep(hold_s)
+
+        async def scenario():
+            long_call = asyncio.create_task(call("a1", first, 0.2))
+            await asyncio.sleep(0.01)
+            other_dir = asyncio.create_task(call("b1", second, 0))
+            await asyncio.sleep(0.01)
+            same_dir = asyncio.create_task(call("a2", first, 0))
+            await asyncio.gather(long_call, other_dir, same_dir)
+
+        asyncio.run(scenario())
+        self.assertEqual([name for name, _ in order], ["a1", "b1", "a2"])
+        self.assertEqual([cwd for _, cwd in order], [os.path.realpath(first), os.path.realpath(second), os.path.realpath(first)])
+        self.assertEqual(daemon._active_calls, 0)
+
+    def test_cancelled_waiter_unblocks_the_queue(self):
+        """Test that a call cancelled while queued does not hold up the calls behind it."""
+        first, second = self.dirs
+        daemon = ToolDaemon(socket_path=os.path.join(first, "unused.sock"), watch=False)
+
+        async def call(cwd, hold_s):
+            async with daemon._in_directory(cwd):
+                await asyncio.sleep(hold_s)
+                return os.getcwd()
+
+        async def scenario():
+            long_call = asyncio.create_task(call(first, 0.1))
+            await asyncio.sleep(0.01)
+            doomed = asyncio.create_task(call(second, 0))
+            behind = asyncio.create_task(call(first, 0))
+            await asyncio.sleep(0.01)
+            doomed.cancel()
+            return await asyncio.gather(long_call, behind)
+
+        results = asyncio.run(scenario())
+        self.assertEqual(results, [os.path.realpath(first)] * 2)
+        self.assertEqual(daemon._active_calls, 0)
+        self.assertFalse(daemon._waiters)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+# nano-tools/tests/test_fs_watcher.py
+import unittest
+import os
+import shutil
+import tempfile
+import glob as py_glob
+from unittest import mock
+from nano_gemini_cli_core.tools import glob, write_file
+from nano_gemini_cli_core.utils import fs_watcher, project_context
+
+class TestFileSystemWatcher(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a temporary directory tree, including hidden files and directories."""
+        # Outside any git checkout, so the watched project root is the test directory itself.
+        self.test_dir = os.path.realpath(tempfile.mkdtemp(prefix="nano_fs_watcher_"))
+        files = [
+            "README.md", "setup.py", ".env", "src/app.py", "src/util.py", "src/.hidden.py",
+            "src/pkg/mod.py", "src/pkg/data.json", "docs/index.md", ".venv/lib/site.py", "node_modules/x/index.js",
+        ]
+        for name in files:
+            path = os.path.join(self.test_dir, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                f.write(name)
+
+        self.original_cwd = os.getcwd()
+        os.chdir(self.test_dir)
+        project_context.invalidate_project_context()
+
+    def tearDown(self):
+        """Stop all watchers, clean up the temporary directory and restore CWD."""
+        project_context.stop_project_watchers()
+        os.chdir(self.original_cwd)
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _start_polling_watcher(self):
+        with mock.patch.object(fs_watcher, "Observer", None), mock.patch.object(fs_watcher, "POLL_INTERVAL_S", 3600):
+            return project_context.start_project_watcher(self.test_dir)
+
+    def test_index_matches_glob(self):
+        """Test that the file index answers patterns exactly like glob.glob."""
+        watcher = self._start_polling_watcher()
+        index = fs_watcher.get_file_index(self.test_dir)
+        self.assertEqual(watcher.backend, "polling")
+        self.assertEqual(watcher.root, self.test_dir)
+        for base in (".", "src", self.test_dir):
+            for pattern in ("**/*.py", "*.md", "src/*.py", "**/pkg/*", "*/*.json", "**", "s?c/**/*.py", "[rs]*.py", "**/index.*"):
+                expected = sorted(f for f in py_glob.glob(os.path.join(base, pattern), recursive=True) if os.path.isfile(f))
+                self.assertEqual(sorted(index.glob(pattern, base)), expected, f"{pattern!r} in {base!r}")
+        self.assertIsNotNone(index.glob("**/*.py", "."))
+        self.assertIsNone(index.glob(".env", "."))
+
+    def test_polling_publishes_changes(self):
+        """Test that the polling backend reports created, modified and deleted files, but not hidden directories."""
+        watcher = self._start_polling_watcher()
+        events = []
+        watcher.subscribe(lambda event_type, path: events.append((event_type, os.path.relpath(path, self.test_dir))))
+
+        with open("new.py", "w") as f:
+            f.write("new")
+        with open("README.md", "w") as f:
+            f.write("a longer readme")
+        os.remove("setup.py")
+        with open(".venv/lib/site.py", "w") as f:
+            f.write("ignored change")
+        watcher.sync()
+
+        self.assertEqual(sorted(events), [("created", "new.py"), ("deleted", "setup.py"), ("modified", "README.md")])
+        result = glob._glob_impl("*.py")["llm_content"]
+        self.assertIn("new.py", result)
+        self.assertNotIn("setup.py", result)
+
+    def test_tool_writes_are_visible_immediately(self):
+        """Test that files written by the tools are in the index without waiting for a poll."""
+        self._start_polling_watcher()
+        write_file._write_file_impl(os.path.join(self.test_dir, "src", "fresh.py"), "x = 1\n")
+        self.assertIn("fresh.py", glob._glob_impl("src/*.py")["llm_content"])
+
+    def test_watched_project_skips_rescans(self):
+        """Test that glob does not walk the tree once the project is watched."""
+        self._start_polling_watcher()
+        with mock.patch.object(glob.py_glob, "glob") as walk:
+            result = glob._glob_impl("**/*.py")
+        walk.assert_not_called()
+        self.assertIn("mod.py", result["llm_content"])
+
+    @unittest.skipUnless(shutil.which("git"), "git is not installed")
+    def test_change_events_refresh_git_ignored_set(self):
+        """Test that a watched project's git-ignored set is kept until a change arrives."""
+        import subprocess
+        subprocess.run(["git", "init", "-q"], cwd=self.test_dir, check=True)
+        project_context.invalidate_project_context()
+        watcher = self._start_polling_watcher()
+        context = project_context.get_project_context()
+        self.assertTrue(context.watched)
+        self.assertFalse(context.is_git_ignored(os.path.join(self.test_dir, "docs", "index.md")))
+
+        with mock.patch.object(project_context, "GIT_IGNORED_TTL_S", 0), \
+             mock.patch.object(project_context.subprocess, "run", wraps=subprocess.run) as run:
+            context.is_git_ignored("README.md")
+            context.is_git_ignored("README.md")
+            self.assertEqual(run.call_count, 0)
+
+            with open(".gitignore", "w") as f:
+                f.write("docs/\n")
+            watcher.sync()
+            self.assertTrue(context.is_git_ignored(os.path.join(self.test_dir, "docs", "index.md")))
+            self.assertEqual(run.call_count, 1)
+
+if __name__ == '__main__':
+    unittest.main()
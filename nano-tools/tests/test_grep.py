@@ -3,7 +3,9 @@ import unittest
 import os
 import shutil
 import subprocess
+from unittest import mock
 from nano_gemini_cli_core.tools import grep
+from nano_gemini_cli_core.utils import project_context
 
 class TestGrepTool(unittest.TestCase):
 
@@ -69,5 +71,80 @@ class TestGrepTool(unittest.TestCase):
         self.assertIn("file1.txt", result["llm_content"])
         self.assertIn("file2.log", result["llm_content"])
 
+class TestStreamingGrep(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a git repository with an awkward filename and many matching lines."""
+        self.test_dir = os.path.abspath("temp_test_dir_for_streaming_grep")
+        os.makedirs(os.path.join(self.test_dir, "logs"), exist_ok=True)
+        with open(os.path.join(self.test_dir, "a:b.txt"), "w") as f:
+            f.write("first: needle here\n")
+        for name in ("one.log", "two.log"):
+            with open(os.path.join(self.test_dir, "logs", name), "w") as f:
+                f.writelines(f"needle {i}\n" for i in range(10))
+        with open(os.path.join(self.test_dir, "big.txt"), "w") as f:
+            f.writelines(f"needle line {i}\n" for i in range(20000))
+
+        self.original_cwd = os.getcwd()
+        os.chdir(self.test_dir)
+        project_context.invalidate_project_context()
+        self.has_git = shutil.which("git") is not None
+        if self.has_git:
+            subprocess.run(["git", "init", "-q"], check=True)
+
+    def tearDown(self):
+        """Clean up the temporary directory and restore CWD."""
+        os.chdir(self.original_cwd)
+        project_context.invalidate_project_context()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _strategies(self):
+        """Yields a label for each strategy while forcing it to be the one used."""
+        real_which = shutil.which
+        if self.has_git:
+            yield "git grep"
+        if real_which("grep"):
+            with mock.patch.object(grep.shutil, "which", side_effect=lambda name: None if name == "git" else real_which(name)):
+                yield "grep"
+        with mock.patch.object(grep.shutil, "which", return_value=None):
+            yield "python"
+
+    def test_filenames_with_colons(self):
+        """Test that NUL framing keeps paths containing ':' intact."""
+        for strategy in self._strategies():
+            result = grep._search_file_content_impl("first", include="*.txt")["llm_content"]
+            self.assertIn("File: a:b.txt", result, strategy)
+            self.assertIn("L1: first: needle here", result, strategy)
+
+    def test_total_cap_stops_search(self):
+        """Test that results stop at MAX_TOTAL_MATCHES and are marked as truncated."""
+        with mock.patch.object(grep, "MAX_TOTAL_MATCHES", 50):
+            for strategy in self._strategies():
+                result = grep._search_file_content_impl("needle")
+                self.assertTrue(result["llm_content"].startswith("Found 50 matches"), strategy)
+                self.assertIn("stopped at the limit", result["llm_content"], strategy)
+                self.assertIn("(truncated)", result["display_content"], strategy)
+
+    def test_include_with_directories(self):
+        """Test that an include pattern containing '/' is matched against relative paths by every strategy."""
+        os.makedirs(os.path.join("logs", "old"), exist_ok=True)
+        with open(os.path.join("logs", "old", "three.log"), "w") as f:
+            f.write("needle old\n")
+        for strategy in self._strategies():
+            result = grep._search_file_content_impl("needle", include="logs/**/*.log")["llm_content"]
+            self.assertIn("Found 21 matches", result, strategy)
+            self.assertIn("File: logs/old/three.log", result, strategy)
+            self.assertNotIn("big.txt", result, strategy)
+            result = grep._search_file_content_impl("needle", include="logs/*.log")["llm_content"]
+            self.assertIn("Found 20 matches", result, strategy)
+
+    def test_max_matches_per_file(self):
+        """Test that the per-file cap is applied by every strategy."""
+        for strategy in self._strategies():
+            result = grep._search_file_content_impl("needle", path="logs", max_matches_per_file=3)
+            self.assertIn("Found 6 matches", result["llm_content"], strategy)
+            self.assertIn("L3: needle 2", result["llm_content"], strategy)
+            self.assertNotIn("L4:", result["llm_content"], strategy)
+
 if __name__ == '__main__':
     unittest.main()
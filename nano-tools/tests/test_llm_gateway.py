@@ -0,0 +1,148 @@
+# nano-tools/tests/test_llm_gateway.py
+import unittest
+import threading
+import time
+from unittest import mock
+from nano_gemini_cli_core.utils import llm_gateway
+from nano_gemini_cli_core.utils.llm_gateway import LLMGateway, INTERACTIVE, BACKGROUND
+
+UNLIMITED = {"fake-model": (1e9, 1e9)}
+
+class FakeRateLimitError(Exception):
+    status_code = 429
+
+class FakeProvider:
+    """A local stand-in for litellm.completion that records concurrency and can fail on demand."""
+
+    def __init__(self, delay_s: float = 0.0, failures: int = 0, error=FakeRateLimitError, tokens_used: int = 10):
+        self.delay_s = delay_s
+        self.tokens_used = tokens_used
+        self.failures = failures
+        self.error = error
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, **kwargs):
+        with self._lock:
+            self.calls.append(kwargs.get("tag"))
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            fail = self.failures > 0
+            self.failures -= fail
+        try:
+            time.sleep(self.delay_s)
+            if fail:
+                raise self.error("provider error")
+            return mock.Mock(usage=mock.Mock(total_tokens=self.tokens_used))
+        finally:
+            with self._lock:
+                self.active -= 1
+
+class TestLLMGateway(unittest.TestCase):
+
+    def setUp(self):
+        """Record backoff and pacing sleeps instead of sleeping, advancing a fake clock."""
+        self.sleeps = []
+        self.now = 1000.0
+
+    def _sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    def _gateway(self, **kwargs):
+        return LLMGateway(sleep=self._sleep, clock=lambda: self.now, **kwargs)
+
+    def test_concurrency_limit_and_priority(self):
+        """Test that calls in flight are bounded and waiting interactive calls go before background ones."""
+        gateway = LLMGateway(max_in_flight=2, interactive_reserved=1, model_limits=UNLIMITED)
+        provider = FakeProvider(delay_s=0.1)
+        threads = [threading.Thread(target=gateway.call, args=(provider, BACKGROUND), kwargs={"model": "fake-model", "tag": f"bg{i}"}) for i in range(3)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.03)
+        # Background work may only use one of the two slots; the other is kept for interactive calls.
+        self.assertEqual(gateway.metrics()["in_flight"], 1)
+        self.assertEqual(gateway.metrics()["queue_depth"][BACKGROUND], 2)
+
+        interactive = [threading.Thread(target=gateway.call, args=(provider, INTERACTIVE), kwargs={"model": "fake-model", "tag": f"fg{i}"}) for i in range(2)]
+        for thread in interactive:
+            thread.start()
+            time.sleep(0.01)
+        for thread in threads + interactive:
+            thread.join()
+        self.assertLessEqual(provider.peak, 2)
+        self.assertEqual(provider.calls[:3], ["bg0", "fg0", "fg1"])
+
+    def test_retries_with_backoff(self):
+        """Test that rate-limit errors are retried with jittered, growing backoff."""
+        gateway = self._gateway(model_limits=UNLIMITED)
+        provider = FakeProvider(failures=3)
+        gateway.call(provider, model="fake-model")
+        self.assertEqual(len(provider.calls), 4)
+        self.assertEqual(gateway.metrics()["retries"], 3)
+        for attempt, slept in enumerate(self.sleeps):
+            self.assertLessEqual(slept, llm_gateway.RETRY_BASE_S * 2 ** attempt)
+
+    def test_retry_after_and_permanent_errors(self):
+        """Test that Retry-After is honoured and non-retryable errors are raised at once."""
+        class RetryAfterError(FakeRateLimitError):
+            def __init__(self, message):
+                super().__init__(message)
+                self.response = mock.Mock(headers={"retry-after": "7"})
+        gateway = self._gateway(model_limits=UNLIMITED)
+        gateway.call(FakeProvider(failures=1, error=RetryAfterError), model="fake-model")
+        self.assertEqual(self.sleeps, [7.0])
+
+        class BadRequestError(Exception):
+            status_code = 400
+        provider = FakeProvider(failures=1, error=BadRequestError)
+        with self.assertRaises(BadRequestError):
+            gateway.call(provider, model="fake-model")
+        self.assertEqual(len(provider.calls), 1)
+        self.assertEqual(gateway.metrics()["failures"], 1)
+
+    def test_requests_per_minute(self):
+        """Test that calls beyond a model's request budget are paced."""
+        gateway = self._gateway(model_limits={"fake-model": (6, 1e9)})
+        provider = FakeProvider()
+        for _ in range(8):
+            gateway.call(provider, model="fake-model")
+        # A full bucket allows a burst of 6; the next calls wait for new tokens, one every 10 s.
+        self.assertEqual(len(self.sleeps), 2)
+        self.assertAlmostEqual(self.sleeps[0], 10, delta=0.5)
+        self.assertAlmostEqual(self.sleeps[1], 10, delta=0.5)
+        self.assertEqual(gateway.metrics()["rate_limited"], 2)
+
+    def test_tokens_per_minute(self):
+        """Test that prompt tokens count against the model's token budget, settled by the real usage."""
+        gateway = self._gateway(model_limits={"fake-model": (1e9, 3000)})
+        prompt = [{"role": "user", "content": "x" * 4000}]  # ~1000 tokens plus the output estimate.
+        gateway.call(FakeProvider(tokens_used=100), model="fake-model", messages=prompt)
+        gateway.call(FakeProvider(tokens_used=100), model="fake-model", messages=prompt)
+        self.assertEqual(self.sleeps, [])  # The unused part of each estimate was refunded.
+        gateway.call(FakeProvider(tokens_used=2800), model="fake-model", messages=prompt)
+        gateway.call(FakeProvider(), model="fake-model", messages=prompt)
+        self.assertEqual(len(self.sleeps), 1)
+
+    def test_rate_limited_calls_wait_by_lane_without_a_slot(self):
+        """Test that calls paced by the rate limit hold no slot, and an interactive call is paced before background ones."""
+        gateway = LLMGateway(max_in_flight=2, interactive_reserved=1, model_limits={"fake-model": (600, 1e9)})
+        gateway._buckets_for("fake-model")[0].take(600)  # Empty: one request every 0.1 s from now.
+        provider = FakeProvider()
+        threads = [threading.Thread(target=gateway.call, args=(provider, BACKGROUND), kwargs={"model": "fake-model", "tag": f"bg{i}"}) for i in range(3)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.03)
+        threads.append(threading.Thread(target=gateway.call, args=(provider, INTERACTIVE), kwargs={"model": "fake-model", "tag": "fg"}))
+        threads[-1].start()
+        time.sleep(0.02)
+        self.assertEqual(gateway.metrics()["in_flight"], 0)
+        for thread in threads:
+            thread.join()
+        self.assertEqual(provider.calls, ["fg", "bg0", "bg1", "bg2"])
+        self.assertEqual(gateway.metrics()["rate_limited"], 4)
+
+if __name__ == '__main__':
+    unittest.main()
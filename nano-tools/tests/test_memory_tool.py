@@ -0,0 +1,121 @@
+# nano-tools/tests/test_memory_tool.py
+import unittest
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+from unittest import mock
+from nano_gemini_cli_core.tools import memory_tool
+from nano_gemini_cli_core.utils.memory_store import MemoryStore
+
+class TestMemoryStore(unittest.TestCase):
+
+    def setUp(self):
+        """Point the memory store at a temporary ~/.gemini directory."""
+        self.gemini_dir = tempfile.mkdtemp(prefix="gemini_memory_")
+        self.markdown_path = os.path.join(self.gemini_dir, "GEMINI.md")
+        self.log_path = os.path.join(self.gemini_dir, "memories.jsonl")
+        self.store = self._new_store()
+        patcher = mock.patch.object(memory_tool, "_memory_store", self.store)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.gemini_dir, ignore_errors=True)
+
+    def _new_store(self):
+        return MemoryStore(self.log_path, self.markdown_path, memory_tool.MEMORY_SECTION_HEADER)
+
+    def test_save_and_render(self):
+        """Test that saves only append to the log and GEMINI.md is rendered on demand."""
+        result = memory_tool._save_memory_impl("- The user prefers tabs over spaces.")
+        self.assertIn("remembered", result["llm_content"])
+        self.assertFalse(os.path.exists(self.markdown_path))
+        self.assertEqual(len(self.store.records()), 1)
+
+        memory_tool._save_memory_impl("The user's name is Sam")
+        self.assertTrue(memory_tool.render_memory_file())
+        with open(self.markdown_path) as f:
+            self.assertEqual(f.read(), "## Gemini Added Memories\n- The user prefers tabs over spaces.\n- The user's name is Sam\n")
+        self.assertFalse(memory_tool.render_memory_file())
+
+    def test_render_keeps_hand_added_bullets(self):
+        """Test that bullets added to the section by hand after the log exists are imported, not dropped."""
+        memory_tool._save_memory_impl("The user prefers tabs over spaces")
+        memory_tool.render_memory_file()
+        with open(self.markdown_path, "a") as f:
+            f.write("- Added by hand\n")
+        memory_tool._save_memory_impl("The user's name is Sam")
+        memory_tool.render_memory_file()
+        with open(self.markdown_path) as f:
+            self.assertEqual(
+                f.read(),
+                "## Gemini Added Memories\n- The user prefers tabs over spaces\n- The user's name is Sam\n- Added by hand\n",
+            )
+        self.assertEqual([r.fact for r in self._new_store().records()][-1], "Added by hand")
+
+    def test_duplicates_and_near_duplicates(self):
+        """Test that exact and near-duplicate facts are not stored twice."""
+        memory_tool._save_memory_impl("The project uses Python 3.11 and pytest")
+        duplicate = memory_tool._save_memory_impl("the project uses python 3.11 and pytest!")
+        near = memory_tool._save_memory_impl("The project uses Python 3.11 and pytest for testing")
+        different = memory_tool._save_memory_impl("The user's name is Sam")
+        self.assertIn("already remember that", duplicate["llm_content"])
+        self.assertIn("very similar", near["llm_content"])
+        self.assertIn("remembered", different["llm_content"])
+        self.assertEqual(len(self.store.records()), 2)
+
+    def test_migrates_existing_section_and_preserves_other_content(self):
+        """Test that bullets already in GEMINI.md are imported and surrounding sections survive rendering."""
+        with open(self.markdown_path, "w") as f:
+            f.write("# Notes\nKeep me.\n\n## Gemini Added Memories\n- Old fact one\n- Old fact two\n\n## Other\nAlso keep me.\n")
+        memory_tool._save_memory_impl("New fact three")
+        memory_tool.render_memory_file()
+        with open(self.markdown_path) as f:
+            content = f.read()
+        self.assertEqual(
+            content,
+            "# Notes\nKeep me.\n\n## Gemini Added Memories\n- Old fact one\n- Old fact two\n- New fact three\n\n## Other\nAlso keep me.\n",
+        )
+
+    def test_recall_ranks_relevant_facts(self):
+        """Test that recall returns only facts relevant to the query, best match first."""
+        for fact in ("Deploys go through the staging cluster first",
+                     "The user likes concise answers",
+                     "Run database migrations before deploys to staging"):
+            self.store.add(fact)
+        results = self.store.recall("how do deploys to staging work", limit=5)
+        facts = [record.fact for record, _ in results]
+        self.assertEqual(len(facts), 2)
+        self.assertNotIn("The user likes concise answers", facts)
+        self.assertEqual(self.store.recall("unrelated words"), [])
+
+    def test_sees_writes_from_other_instances(self):
+        """Test that a store picks up entries appended by another store (e.g. another process)."""
+        other = self._new_store()
+        self.store.add("Written by the first agent")
+        other.add("Written by the second agent")
+        self.assertEqual(len(self.store.records()), 2)
+        self.assertEqual(other.add("Written by the first agent")[0], "duplicate")
+
+    def test_concurrent_saves(self):
+        """Test that concurrent saves from several stores are all kept."""
+        stores = [self._new_store() for _ in range(4)]
+        threads = [
+            threading.Thread(target=lambda s=s, i=i: [s.add(f"note {uuid.uuid4().hex} from agent {i}") for j in range(10)])
+            for i, s in enumerate(stores)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(self._new_store().records()), 40)
+
+    def test_empty_fact(self):
+        """Test that an empty fact is rejected."""
+        result = memory_tool._save_memory_impl("   ")
+        self.assertIn("non-empty string", result["llm_content"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+# nano-tools/tests/test_next_page.py
+import unittest
+import os
+import shutil
+from unittest import mock
+from nano_gemini_cli_core.tools import glob, grep, ls, next_page
+from nano_gemini_cli_core.utils import result_pages
+
+class TestNextPage(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a directory with more files than fit on one page."""
+        self.test_dir = "temp_test_dir_for_next_page"
+        os.makedirs(self.test_dir, exist_ok=True)
+        for i in range(25):
+            with open(os.path.join(self.test_dir, f"file{i:02d}.txt"), "w") as f:
+                f.write(f"needle {i}\nneedle again {i}\n")
+        self.original_cwd = os.getcwd()
+        os.chdir(self.test_dir)
+        result_pages.get_result_cache().clear()
+
+    def tearDown(self):
+        """Clean up the temporary directory."""
+        os.chdir(self.original_cwd)
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def _collect(self, first_page, item_prefix):
+        """Follows cursors to the last page; returns (pages, items) in order."""
+        pages = [first_page]
+        while "next_cursor" in pages[-1]:
+            pages.append(next_page._next_page_impl(pages[-1]["next_cursor"]))
+        items = [line for page in pages for line in page["llm_content"].splitlines() if line.startswith(item_prefix)]
+        return pages, items
+
+    def test_glob_pages(self):
+        """Test that glob returns the first page and next_page walks the rest without repeats."""
+        first = glob._glob_impl("*.txt", page_size=10)
+        self.assertIn("Found 25 matching file(s). (showing 1-10)", first["display_content"])
+        pages, files = self._collect(first, os.path.join(".", "file"))
+        self.assertEqual(len(pages), 3)
+        self.assertIn("this is the last page", pages[-1]["llm_content"])
+        self.assertEqual(sorted(os.path.basename(f) for f in files), [f"file{i:02d}.txt" for i in range(25)])
+
+    def test_small_results_have_no_cursor(self):
+        """Test that a result that fits on one page is returned as before."""
+        result = glob._glob_impl("file0*.txt")
+        self.assertNotIn("next_cursor", result)
+        self.assertEqual(result["display_content"], "Found 10 matching file(s).")
+        self.assertEqual(result_pages.get_result_cache().stats()["result_sets"], 0)
+
+    def test_grep_pages_repeat_file_headers(self):
+        """Test that grep pages split by match and a page starting mid-file names its file."""
+        with mock.patch.object(grep.shutil, "which", return_value=None):
+            first = grep._search_file_content_impl("needle", page_size=3)
+        pages, matches = self._collect(first, "L")
+        self.assertEqual(len(matches), 50)
+        self.assertTrue(pages[1]["llm_content"].startswith("Found 50 matches"))
+        self.assertIn("File: file01.txt\nL2: needle again 1", pages[1]["llm_content"])
+
+    def test_ls_pages(self):
+        """Test that directory listings page too."""
+        first = ls._list_directory_impl(".", page_size=20)
+        pages, entries = self._collect(first, "file")
+        self.assertEqual(len(pages), 2)
+        self.assertTrue(pages[1]["llm_content"].startswith("Directory listing for '.'"))
+        self.assertEqual(len(entries), 25)
+
+    def test_next_page_does_not_search_again(self):
+        """Test that later pages come from the cached result set, not the file system."""
+        first = glob._glob_impl("*.txt", page_size=10)
+        for name in os.listdir("."):
+            os.remove(name)
+        second = next_page._next_page_impl(first["next_cursor"])
+        self.assertIn("file10.txt", second["llm_content"])
+
+    def test_invalid_and_evicted_cursors(self):
+        """Test that bad cursors and cursors evicted from the LRU are reported."""
+        self.assertIn("not a valid cursor", next_page._next_page_impl("nonsense")["llm_content"])
+        cache = result_pages.ResultSetCache(max_sets=2)
+        with mock.patch.object(result_pages, "_default_cache", cache):
+            first = glob._glob_impl("*.txt", page_size=10)
+            glob._glob_impl("*.txt", page_size=5)
+            glob._glob_impl("*.txt", page_size=5)
+            self.assertEqual(cache.stats()["result_sets"], 2)
+            self.assertIn("expired", next_page._next_page_impl(first["next_cursor"])["llm_content"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+# nano-tools/tests/test_project_context.py
+import unittest
+import os
+import shutil
+import subprocess
+import time
+from unittest import mock
+from nano_gemini_cli_core.tools import glob, ls, read_file
+from nano_gemini_cli_core.utils import project_context
+from nano_gemini_cli_core.utils.paths import get_project_hash
+
+@unittest.skipUnless(shutil.which("git"), "git is not installed")
+class TestProjectContext(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a temporary git repository with ignored files and directories."""
+        self.test_dir = os.path.abspath("temp_test_dir_for_project_context")
+        os.makedirs(os.path.join(self.test_dir, "src"), exist_ok=True)
+        os.makedirs(os.path.join(self.test_dir, "build", "nested"), exist_ok=True)
+        subprocess.run(["git", "init", "-q"], cwd=self.test_dir, check=True)
+        files = {
+            ".gitignore": "build/\n*.log\n",
+            "src/main.py": "print('hi')\n",
+            "src/debug.log": "noise\n",
+            "build/nested/out.py": "generated\n",
+            "secret.txt": "do not read\n",
+        }
+        for name, content in files.items():
+            with open(os.path.join(self.test_dir, name), "w") as f:
+                f.write(content)
+
+        self.original_cwd = os.getcwd()
+        os.chdir(self.test_dir)
+        project_context.invalidate_project_context()
+
+    def tearDown(self):
+        """Clean up the temporary directory and restore CWD."""
+        os.chdir(self.original_cwd)
+        project_context.invalidate_project_context()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_resolves_project_once(self):
+        """Test that the context is memoized per directory and resolves the git root and project hash."""
+        src_dir = os.path.join(self.test_dir, "src")
+        context = project_context.get_project_context(src_dir)
+        self.assertIs(context, project_context.get_project_context(src_dir))
+        self.assertEqual(context.git_root, os.path.realpath(self.test_dir))
+        self.assertEqual(context.project_hash, get_project_hash(context.git_root))
+
+        project_context.invalidate_project_context(src_dir)
+        self.assertIsNot(context, project_context.get_project_context(src_dir))
+
+    def test_git_ignored_paths(self):
+        """Test that ignored files and everything under ignored directories are recognised."""
+        context = project_context.get_project_context()
+        self.assertTrue(context.is_git_ignored(os.path.join(self.test_dir, "src", "debug.log")))
+        self.assertTrue(context.is_git_ignored(os.path.join(self.test_dir, "build", "nested", "out.py")))
+        self.assertFalse(context.is_git_ignored(os.path.join(self.test_dir, "src", "main.py")))
+
+    def test_git_ignored_list_is_reused(self):
+        """Test that repeated tool calls share one `git ls-files` run within the TTL."""
+        with mock.patch.object(project_context.subprocess, "run", wraps=subprocess.run) as run:
+            glob._glob_impl("**/*.py")
+            ls._list_directory_impl(".")
+            ls._list_directory_impl("src")
+            glob._glob_impl("**/*.log", path="src")
+        self.assertEqual(run.call_count, 1)
+
+        with mock.patch.object(project_context, "GIT_IGNORED_TTL_S", 0), \
+             mock.patch.object(project_context.subprocess, "run", wraps=subprocess.run) as run:
+            glob._glob_impl("**/*.py")
+        self.assertEqual(run.call_count, 1)
+
+    def test_tools_respect_git_ignore(self):
+        """Test that glob and ls filter through the shared context."""
+        result = glob._glob_impl("**/*.py")
+        self.assertIn("main.py", result["llm_content"])
+        self.assertNotIn("out.py", result["llm_content"])
+
+        listing = ls._list_directory_impl(".")["llm_content"]
+        self.assertIn("[DIR] src", listing)
+        self.assertNotIn("build", listing)
+
+    def test_geminiignore_reloaded_on_change(self):
+        """Test that .geminiignore edits are picked up without invalidating the context."""
+        secret = os.path.join(self.test_dir, "secret.txt")
+        self.assertIn("do not read", read_file._read_file_impl(secret)["llm_content"])
+
+        with open(".geminiignore", "w") as f:
+            f.write("secret.txt\n")
+        # Make sure the mtime moves even on coarse-grained filesystems.
+        future = time.time() + 5
+        os.utime(".geminiignore", (future, future))
+        self.assertIn(".geminiignore", read_file._read_file_impl(secret)["llm_content"])
+
+    def test_contexts_are_bounded(self):
+        """Test that only the most recently used contexts are kept."""
+        src_dir = os.path.join(self.test_dir, "src")
+        with mock.patch.object(project_context, "MAX_PROJECT_CONTEXTS", 2):
+            context = project_context.get_project_context(src_dir)
+            project_context.get_project_context(self.test_dir)
+            self.assertIs(context, project_context.get_project_context(src_dir))
+            project_context.get_project_context(os.path.join(self.test_dir, "build"))
+            self.assertEqual(len(project_context._contexts), 2)
+            self.assertIs(context, project_context.get_project_context(src_dir))
+            self.assertNotIn(self.test_dir, project_context._contexts)
+
+    def test_sibling_directory_is_not_inside_repository(self):
+        """Test that a directory sharing the root's name as a prefix is not treated as inside it."""
+        context = project_context.get_project_context()
+        sibling_build = os.path.realpath(self.test_dir) + "2" + os.sep + "build"
+        self.assertTrue(context.is_git_ignored(os.path.join(self.test_dir, "build")))
+        self.assertFalse(context._is_ignored_in(sibling_build, {os.path.realpath(self.test_dir) + "2"}))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+# nano-tools/tests/test_prompts.py
+import unittest
+import os
+import shutil
+import tempfile
+from unittest import mock
+from nano_gemini_cli_core import prompts
+from nano_gemini_cli_core.tools import memory_tool
+from nano_gemini_cli_core.utils.memory_store import MemoryStore
+
+class TestSystemPromptMemories(unittest.TestCase):
+
+    def setUp(self):
+        """Use a temporary memory store and an empty prompt cache."""
+        self.gemini_dir = tempfile.mkdtemp(prefix="gemini_prompt_")
+        self.store = MemoryStore(
+            os.path.join(self.gemini_dir, "memories.jsonl"),
+            os.path.join(self.gemini_dir, "GEMINI.md"),
+            memory_tool.MEMORY_SECTION_HEADER,
+        )
+        patcher = mock.patch.object(memory_tool, "_memory_store", self.store)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        prompts.clear_prompt_cache()
+
+    def tearDown(self):
+        shutil.rmtree(self.gemini_dir, ignore_errors=True)
+
+    def test_small_memory_is_injected_whole(self):
+        """Test that memories within the budget are all included, from both sources, without duplicates."""
+        self.store.add("The user prefers tabs")
+        prompt = prompts.get_core_system_prompt("# Notes\n- Use pytest\n- The user prefers tabs\n")
+        self.assertIn("## User-Specific Memories\n# Notes\n- Use pytest\n- The user prefers tabs", prompt)
+        self.assertEqual(prompt.count("The user prefers tabs"), 1)
+
+        self.store.add("Deploy with make release")
+        prompt = prompts.get_core_system_prompt("# Notes\nKeep commits small.\n")
+        self.assertTrue(prompt.endswith("## User-Specific Memories\n# Notes\nKeep commits small.\n- The user prefers tabs\n- Deploy with make release"))
+
+    def test_prompt_size_stays_flat(self):
+        """Test that the prompt stops growing once the memory budget is reached, keeping relevant facts."""
+        self.store.add("Deployments of the billing service go through the staging cluster")
+        sizes = []
+        for batch in range(3):
+            for i in range(100):
+                self.store.add(f"Unrelated note {batch}-{i}: {'lorem ipsum dolor ' * (i % 5 + 1)}")
+            prompt = prompts.get_core_system_prompt(task="deploy the billing service", memory_token_budget=300)
+            sizes.append(len(prompt))
+        self.assertIn("billing service go through the staging cluster", prompt)
+        self.assertLess(max(sizes) - min(sizes), 300 * 4)
+        memory_section = prompt.split("## User-Specific Memories\n", 1)[1]
+        self.assertLessEqual(prompts.estimate_tokens(memory_section), 300 + prompts.MAX_INJECTED_MEMORIES)
+
+    def test_prompt_is_cached_until_memory_changes(self):
+        """Test that the assembled prompt is reused until a new memory is saved."""
+        with mock.patch.object(prompts, "_assemble_prompt", wraps=prompts._assemble_prompt) as assemble:
+            first = prompts.get_core_system_prompt(task="anything")
+            second = prompts.get_core_system_prompt(task="anything")
+            self.assertEqual(assemble.call_count, 1)
+            self.assertIs(first, second)
+
+            with mock.patch.object(self.store, "records", wraps=self.store.records) as records:
+                prompts.get_core_system_prompt(task="anything")
+            records.assert_not_called()
+
+            self.store.add("A brand new fact")
+            third = prompts.get_core_system_prompt(task="anything")
+            self.assertEqual(assemble.call_count, 2)
+            self.assertIn("A brand new fact", third)
+
+    def test_select_memories_respects_limits(self):
+        """Test that selection honours both the item cap and the token budget, keeping original order."""
+        items = [f"fact about topic {i}" for i in range(50)]
+        selected = prompts.select_memories("topic 7", items, token_budget=1000, max_items=5)
+        self.assertEqual(len(selected), 5)
+        self.assertIn("fact about topic 7", selected)
+        self.assertEqual(selected, sorted(selected, key=items.index))
+
+        selected = prompts.select_memories("topic", items, token_budget=12, max_items=50)
+        self.assertLessEqual(sum(prompts.estimate_tokens(item) for item in selected), 12)
+
+if __name__ == '__main__':
+    unittest.main()
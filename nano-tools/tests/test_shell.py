@@ -0,0 +1,181 @@
+# nano-tools/tests/test_shell.py
+import unittest
+import os
+import shutil
+import sys
+import time
+import asyncio
+from nano_gemini_cli_core.tools import shell, background
+from nano_gemini_cli_core.utils import shell_session
+
+def _run_persistent(command: str, **kwargs):
+    """Runs the shell tool on a pooled session, reaping the pool before the event loop closes."""
+    async def scenario():
+        try:
+            return await shell._run_shell_command_impl(command, persistent=True, **kwargs)
+        finally:
+            await shell.SESSION_POOL.aclose_all()
+    return asyncio.run(scenario())
+
+@unittest.skipUnless(shell_session.is_supported(), "Persistent shell sessions require a POSIX shell.")
+class TestPersistentShellSessions(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a temporary directory to run commands in."""
+        self.test_dir = "temp_test_dir_for_shell"
+        os.makedirs(os.path.join(self.test_dir, "subdir"), exist_ok=True)
+        with open(os.path.join(self.test_dir, "subdir", "marker.txt"), "w") as f:
+            f.write("marker")
+
+        self.original_cwd = os.getcwd()
+        os.chdir(self.test_dir)
+
+    def tearDown(self):
+        """Clean up the temporary directory and any pooled session."""
+        shell.SESSION_POOL.close_all()
+        os.chdir(self.original_cwd)
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_persistent_command_output_and_exit_code(self):
+        """Test that output and the exit code are captured through the sentinel framing."""
+        result = _run_persistent("echo hello; exit 3")
+        self.assertIn("[STDOUT] hello", result["llm_content"])
+        self.assertIn("Exit Code: 3", result["llm_content"])
+
+    def test_persistent_stderr_and_directory(self):
+        """Test that stderr is captured and the directory argument is honoured."""
+        result = _run_persistent("ls; echo oops >&2", directory="subdir")
+        self.assertIn("[STDOUT] marker.txt", result["llm_content"])
+        self.assertIn("[STDERR] oops", result["llm_content"])
+
+    def test_session_is_reused_and_state_is_reset(self):
+        """Test that a pooled session runs several commands without leaking state between them."""
+        async def scenario():
+            pool = shell_session.ShellSessionPool()
+            lines = []
+            async def collect(line):
+                lines.append(line)
+            try:
+                await pool.run("cd subdir; export LEAK=1", os.getcwd(), collect)
+                result = await pool.run("pwd; echo \"leak=${LEAK:-}\"; printf no-newline", os.getcwd(), collect)
+            finally:
+                await pool.aclose_all()
+            return pool, result, lines
+
+        pool, result, lines = asyncio.run(scenario())
+        self.assertEqual(pool.sessions_started, 1)
+        self.assertEqual(result["returncode"], 0)
+        self.assertIn(f"[STDOUT] {os.getcwd()}", lines)
+        self.assertIn("[STDOUT] leak=", lines)
+        self.assertIn("[STDOUT] no-newline", lines)
+
+    def test_timeout_discards_session(self):
+        """Test that a command exceeding its timeout is killed and its session is not reused."""
+        async def scenario():
+            pool = shell_session.ShellSessionPool()
+            async def ignore(line):
+                pass
+            try:
+                with self.assertRaises(shell_session.ShellCommandTimeout):
+                    await pool.run("sleep 5", os.getcwd(), ignore, timeout=0.2)
+                result = await pool.run("true", os.getcwd(), ignore)
+            finally:
+                await pool.aclose_all()
+            return pool, result
+
+        pool, result = asyncio.run(scenario())
+        self.assertEqual(pool.sessions_started, 2)
+        self.assertEqual(result["returncode"], 0)
+
+@unittest.skipIf(sys.platform == "win32", "Process group management requires POSIX.")
+class TestShellTimeoutsAndBackground(unittest.TestCase):
+
+    def tearDown(self):
+        """Make sure no test leaves background processes or pooled sessions behind."""
+        shell.BACKGROUND_PROCESSES.kill_all()
+        shell.SESSION_POOL.close_all()
+
+    def test_timeout_kills_command(self):
+        """Test that a command exceeding its timeout is killed and reported."""
+        started = time.monotonic()
+        result = asyncio.run(shell._run_shell_command_impl("echo start; sleep 30", timeout=1))
+        self.assertLess(time.monotonic() - started, 10)
+        self.assertIn("[STDOUT] start", result["llm_content"])
+        self.assertIn("killed after timeout of 1s", result["llm_content"])
+
+    def test_persistent_timeout_reports_reset_session(self):
+        """Test that a timeout in a persistent session reports the killed session's process group."""
+        result = _run_persistent("sleep 30", timeout=1)
+        self.assertIn("killed after timeout of 1s", result["llm_content"])
+        self.assertRegex(result["llm_content"], r"Process Group ID: \d+ \(persistent session killed and reset\)")
+        self.assertNotIn("N/A on Windows", result["llm_content"])
+
+    def test_idle_timeout_kills_silent_command(self):
+        """Test that a command producing no output for too long is killed."""
+        result = asyncio.run(shell._run_shell_command_impl("sleep 30", timeout=0, idle_timeout=1))
+        self.assertIn("killed after idle timeout of 1s", result["display_content"])
+
+    def test_cancellation_kills_process_group(self):
+        """Test that cancelling the tool call kills the process group it started."""
+        async def scenario():
+            task = asyncio.ensure_future(shell._stream_subprocess("sleep 30", os.getcwd(), self._ignore))
+            await asyncio.sleep(0.5)
+            pgids = [pid for pid in _pids_of("sleep 30")]
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            return pgids
+
+        pids = asyncio.run(scenario())
+        self.assertTrue(pids)
+        for pid in pids:
+            self.assertFalse(_is_alive(pid))
+
+    def test_background_process_registry(self):
+        """Test that backgrounded commands are registered, listed with stats, and killable."""
+        result = asyncio.run(shell._run_shell_command_impl("sleep 30 > /dev/null 2>&1 &"))
+        self.assertNotIn("Background PIDs: (none)", result["llm_content"])
+
+        listing = background._list_background_processes_impl()
+        self.assertIn("sleep 30", listing["llm_content"])
+        self.assertIn("RSS", listing["llm_content"])
+
+        pgid = shell.BACKGROUND_PROCESSES.list()[0]["pgid"]
+        killed = background._kill_background_process_impl(pgid)
+        self.assertIn("SIGTERM", killed["llm_content"])
+        time.sleep(0.2)
+        self.assertIn("No background processes", background._list_background_processes_impl()["llm_content"])
+
+    def test_kill_unknown_group(self):
+        """Test that killing an untracked process group is rejected."""
+        result = background._kill_background_process_impl(999999)
+        self.assertIn("Error", result["llm_content"])
+
+    @staticmethod
+    async def _ignore(line):
+        pass
+
+def _pids_of(command_line: str):
+    """Finds PIDs whose command line matches exactly, using /proc."""
+    pids = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/cmdline", "rb") as f:
+                if f.read().replace(b"\0", b" ").strip() == command_line.encode():
+                    pids.append(int(entry))
+        except OSError:
+            continue
+    return pids
+
+def _is_alive(pid: int) -> bool:
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().split(")")[-1].split()[0] != "Z"
+    except OSError:
+        return False
+
+if __name__ == '__main__':
+    unittest.main()
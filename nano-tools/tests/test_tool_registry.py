@@ -0,0 +1,94 @@
+# nano-tools/tests/test_tool_registry.py
+import unittest
+import os
+import sys
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+from nano_gemini_cli_core import tool_registry
+from nano_gemini_cli_core.utils.lazy_import import lazy_module
+
+NANO_TOOLS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+def _modules_after_import(statement: str):
+    """Runs `statement` in a fresh interpreter and returns the names in sys.modules afterwards."""
+    code = f"{statement}\nimport sys\nprint('\\n'.join(sys.modules))"
+    process = subprocess.run([sys.executable, "-c", code], cwd=NANO_TOOLS_DIR, capture_output=True, text=True, check=True)
+    return set(process.stdout.split())
+
+class TestToolRegistry(unittest.TestCase):
+
+    def test_schemas_match_function_tools(self):
+        """Test that the statically built schemas are exactly what @function_tool produces."""
+        specs = tool_registry.discover_tools()
+        self.assertIn("search_file_content", specs)
+        for name, spec in specs.items():
+            tool = tool_registry.load_tool(name)
+            self.assertEqual(spec.params_json_schema, tool.params_json_schema, name)
+            self.assertEqual(spec.description, tool.description, name)
+
+    def test_load_impl(self):
+        """Test that tools resolve to the implementation functions they delegate to."""
+        from nano_gemini_cli_core.tools import glob, shell
+        self.assertIs(tool_registry.load_impl("glob"), glob._glob_impl)
+        self.assertIs(tool_registry.load_impl("run_shell_command"), shell._run_shell_command_impl)
+        self.assertTrue(tool_registry.get_tool_spec("run_shell_command").is_async)
+        with self.assertRaises(KeyError):
+            tool_registry.get_tool_spec("no_such_tool")
+
+    def test_concurrent_discovery_parses_one_module_at_a_time(self):
+        """Test that threads discovering tools at once never parse concurrently, and parse each module once."""
+        parse = tool_registry._specs_from_source
+        active, overlaps, parsed = [0], [], []
+        guard = threading.Lock()
+
+        def tracked_parse(source, module_name):
+            with guard:
+                active[0] += 1
+                overlaps.append(active[0] > 1)
+                parsed.append(module_name)
+            time.sleep(0.005)
+            try:
+                return parse(source, module_name)
+            finally:
+                with guard:
+                    active[0] -= 1
+
+        with mock.patch.dict(tool_registry._parsed, clear=True), mock.patch.object(tool_registry, "_specs_from_source", tracked_parse):
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                results = list(pool.map(lambda _: tool_registry.discover_tools(), range(4)))
+        self.assertFalse(any(overlaps))
+        self.assertEqual(len(parsed), len(set(parsed)))
+        self.assertTrue(all(r.keys() == results[0].keys() for r in results))
+
+    def test_discovery_imports_no_tools(self):
+        """Test that listing tool schemas does not import agents or any tool module."""
+        modules = _modules_after_import(
+            "from nano_gemini_cli_core import tool_registry\ntool_registry.get_tool_schemas()"
+        )
+        self.assertNotIn("agents", modules)
+        self.assertFalse([m for m in modules if m.startswith("nano_gemini_cli_core.tools.")])
+
+    def test_heavy_dependencies_load_on_first_use(self):
+        """Test that importing the tools does not import litellm, requests or html2text."""
+        modules = _modules_after_import(
+            "from nano_gemini_cli_core.tools import edit, write_file, web_fetch, web_search"
+        )
+        for heavy in ("litellm", "requests", "html2text"):
+            self.assertNotIn(heavy, modules)
+
+    def test_lazy_module(self):
+        """Test that a lazy module imports on attribute access and reports missing packages then."""
+        json_module = lazy_module("json")
+        self.assertFalse(json_module.is_loaded)
+        self.assertEqual(json_module.dumps([1]), "[1]")
+        self.assertTrue(json_module.is_loaded)
+
+        missing = lazy_module("no_such_package_for_nano_tools", "Please install it.")
+        with self.assertRaisesRegex(ImportError, "Please install it."):
+            missing.anything
+
+if __name__ == '__main__':
+    unittest.main()
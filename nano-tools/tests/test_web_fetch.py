@@ -0,0 +1,249 @@
+# nano-tools/tests/test_web_fetch.py
+import unittest
+import os
+import shutil
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from nano_gemini_cli_core.tools import web_fetch
+from nano_gemini_cli_core.utils import http_fetch, html_extract
+from nano_gemini_cli_core.utils.disk_cache import DiskCache
+
+PAGE_HTML = "<html><body><h1>Stand-in Page</h1><p>Served locally.</p></body></html>"
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    """A local HTTP stand-in that counts requests per path."""
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        server.hits[self.path] = server.hits.get(self.path, 0) + 1
+
+        if self.path == "/etag":
+            if self.headers.get("If-None-Match") == '"v1"':
+                self.send_response(304)
+                self.send_header("ETag", '"v1"')
+                self.end_headers()
+                return
+            self._send_html(PAGE_HTML, {"ETag": '"v1"', "Cache-Control": "no-cache"})
+        elif self.path == "/max-age":
+            self._send_html(PAGE_HTML, {"Cache-Control": "max-age=60"})
+        elif self.path == "/no-store":
+            self._send_html(PAGE_HTML, {"Cache-Control": "no-store"})
+        elif self.path == "/big":
+            self._send_html("<p>" + "a" * 200_000 + "</p>", {})
+        elif self.path == "/other":
+            self._send_html("<html><body><p>Second page.</p></body></html>", {})
+        else:
+            self.send_response(404)
+            self.end_headers()
+
+    def _send_html(self, body: str, headers: dict):
+        payload = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+class TestWebFetchTool(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Start the local HTTP stand-in server."""
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInHandler)
+        cls.server.hits = {}
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        """Point the default HTTP cache at a temporary directory."""
+        self.server.hits.clear()
+        self.cache_dir = tempfile.mkdtemp(prefix="web_fetch_cache_")
+        for patcher in (
+            mock.patch.object(http_fetch, "_default_cache", http_fetch.HttpCache(os.path.join(self.cache_dir, "http"))),
+            mock.patch.object(html_extract, "_disk_cache", DiskCache(os.path.join(self.cache_dir, "markdown"))),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_fetch_and_clean(self):
+        """Test that a page is fetched and converted to text."""
+        result = web_fetch._web_fetch_impl(f"Summarize {self.base_url}/max-age please")
+        self.assertIn("Stand-in Page", result["llm_content"])
+        self.assertIn("Successfully fetched content", result["display_content"])
+
+    def test_max_age_served_from_cache(self):
+        """Test that a fresh cached response is served without a network request."""
+        first = http_fetch.fetch_url(f"{self.base_url}/max-age")
+        second = http_fetch.fetch_url(f"{self.base_url}/max-age")
+        self.assertFalse(first.from_cache)
+        self.assertTrue(second.from_cache)
+        self.assertEqual(second.text, PAGE_HTML)
+        self.assertEqual(self.server.hits["/max-age"], 1)
+
+    def test_etag_revalidation(self):
+        """Test that a stale entry is revalidated and a 304 reuses the cached body."""
+        http_fetch.fetch_url(f"{self.base_url}/etag")
+        second = http_fetch.fetch_url(f"{self.base_url}/etag")
+        self.assertTrue(second.from_cache)
+        self.assertEqual(second.text, PAGE_HTML)
+        self.assertEqual(self.server.hits["/etag"], 2)
+
+    def test_cache_persists_on_disk(self):
+        """Test that a new cache instance over the same directory reuses stored entries."""
+        http_fetch.fetch_url(f"{self.base_url}/max-age")
+        result = http_fetch.fetch_url(f"{self.base_url}/max-age", cache=http_fetch.HttpCache(os.path.join(self.cache_dir, "http")))
+        self.assertTrue(result.from_cache)
+
+    def test_no_store_is_not_cached(self):
+        """Test that responses marked no-store are always fetched again."""
+        http_fetch.fetch_url(f"{self.base_url}/no-store")
+        result = http_fetch.fetch_url(f"{self.base_url}/no-store")
+        self.assertFalse(result.from_cache)
+        self.assertEqual(self.server.hits["/no-store"], 2)
+
+    def test_size_cap(self):
+        """Test that the streamed download stops at the size cap."""
+        result = http_fetch.fetch_url(f"{self.base_url}/big", max_bytes=1000)
+        self.assertTrue(result.truncated)
+        self.assertEqual(len(result.text), 1000)
+
+    def test_cache_write_failure_is_a_cache_miss(self):
+        """Test that a cache that cannot be written to still returns fetched pages, from stores and revalidations alike."""
+        cache = http_fetch.get_default_cache()
+        http_fetch.fetch_url(f"{self.base_url}/etag")
+        with mock.patch.object(cache.store, "set", side_effect=OSError("disk full")), mock.patch("builtins.print"):
+            results = http_fetch.fetch_all([f"{self.base_url}/max-age", f"{self.base_url}/etag"])
+        self.assertEqual([r.error for r in results], [None, None])
+        self.assertEqual([r.text for r in results], [PAGE_HTML, PAGE_HTML])
+        self.assertFalse(http_fetch.fetch_url(f"{self.base_url}/max-age").from_cache)
+
+    def test_multiple_urls_and_errors(self):
+        """Test that every URL in the prompt is fetched, with failures reported alongside successes."""
+        prompt = f"Compare {self.base_url}/max-age, {self.base_url}/other and {self.base_url}/missing."
+        result = web_fetch._web_fetch_impl(prompt)
+        self.assertIn("Stand-in Page", result["llm_content"])
+        self.assertIn("Second page.", result["llm_content"])
+        self.assertIn("404", result["llm_content"])
+        self.assertIn("2 of 3 URLs", result["display_content"])
+
+    def test_no_url(self):
+        """Test that a prompt without a URL is rejected."""
+        result = web_fetch._web_fetch_impl("Summarize nothing")
+        self.assertEqual("Error: No URL found in the prompt.", result["llm_content"])
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "html")
+
+class TestHtmlExtraction(unittest.TestCase):
+
+    def setUp(self):
+        """Use a temporary conversion cache."""
+        self.cache_dir = tempfile.mkdtemp(prefix="html_markdown_cache_")
+        patcher = mock.patch.object(html_extract, "_disk_cache", DiskCache(self.cache_dir))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        html_extract.clear_memory_cache()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_strips_boilerplate(self):
+        """Test that scripts, styles, comments and navigation chrome are removed."""
+        page = (
+            '<html><head><style>p {}</style><script>var s = "<nav>not a tag</nav>";</script></head>'
+            '<body><nav><a href="/">Home</a></nav><!-- hidden --><div><p>Keep me</p></div>'
+            '<footer>Copyright</footer></body></html>'
+        )
+        extracted = html_extract.extract_content_html(page)
+        self.assertIn("<p>Keep me</p>", extracted)
+        for dropped in ("Home", "Copyright", "hidden", "not a tag", "p {}"):
+            self.assertNotIn(dropped, extracted)
+
+    def test_prefers_main_content(self):
+        """Test that only <main>/<article> content is kept when the page marks it up."""
+        page = "<body><p>Outside</p><main><h1>Title</h1><aside>Side</aside><p>Body</p></main></body>"
+        markdown = html_extract.html_to_markdown(page)
+        self.assertIn("# Title", markdown)
+        self.assertIn("Body", markdown)
+        self.assertNotIn("Outside", markdown)
+        self.assertNotIn("Side", markdown)
+
+    def test_fixture_conversion(self):
+        """Test extraction on the saved documentation fixtures."""
+        with open(os.path.join(FIXTURES_DIR, "api_reference.html"), encoding="utf-8") as f:
+            markdown = html_extract.html_to_markdown(f.read())
+        self.assertIn("# API Reference", markdown)
+        self.assertNotIn("Section 1:", markdown)  # sidebar navigation
+        self.assertNotIn("gtag", markdown)
+        self.assertNotIn("Copyright", markdown)
+
+    def test_conversion_cache(self):
+        """Test that identical bodies are converted once and served from memory, then disk."""
+        page = "<html><body><p>Cached body</p></body></html>"
+        with mock.patch.object(html_extract, "html_to_markdown", wraps=html_extract.html_to_markdown) as convert:
+            first = html_extract.convert_many([page, page])
+            second = html_extract.convert_cached(page)
+            html_extract.clear_memory_cache()
+            third = html_extract.convert_cached(page)
+        self.assertEqual(convert.call_count, 1)
+        self.assertEqual(first[0], first[1])
+        self.assertEqual(first[0], second)
+        self.assertEqual(second, third)
+
+class TestDiskCacheBound(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp(prefix="disk_cache_")
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def _age(self, cache, key, mtime):
+        os.utime(cache._path_for(key), (mtime, mtime))
+
+    def test_evicts_least_recently_used(self):
+        """Test that a write over the bound evicts the least recently used entries, and that hits count as use."""
+        cache = DiskCache(self.cache_dir, max_bytes=2500)
+        cache.set("a", {"text": "x" * 1000})
+        cache.set("b", {"text": "x" * 1000})
+        self._age(cache, "a", 1000)
+        self._age(cache, "b", 2000)
+        self.assertIsNotNone(cache.get("a"))
+        cache.set("c", {"text": "x" * 1000})
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNotNone(cache.get("c"))
+
+    def test_counts_entries_already_on_disk(self):
+        """Test that a new instance over a full directory evicts on its first write."""
+        DiskCache(self.cache_dir).set("a", {"text": "x" * 1000})
+        DiskCache(self.cache_dir).set("b", {"text": "x" * 1000})
+        cache = DiskCache(self.cache_dir, max_bytes=2500)
+        self._age(cache, "a", 1000)
+        cache.set("c", {"text": "x" * 1000})
+        self.assertEqual([cache.get(key) is None for key in "abc"], [True, False, False])
+
+    def test_unbounded_by_default(self):
+        """Test that a cache without a bound keeps every entry."""
+        cache = DiskCache(self.cache_dir)
+        for key in "abcde":
+            cache.set(key, {"text": "x" * 1000})
+        self.assertTrue(all(cache.get(key) for key in "abcde"))
+
+if __name__ == '__main__':
+    unittest.main()
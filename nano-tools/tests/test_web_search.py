@@ -0,0 +1,136 @@
+# nano-tools/tests/test_web_search.py
+import unittest
+import shutil
+import tempfile
+import threading
+import time
+from unittest import mock
+from nano_gemini_cli_core.tools import web_search
+from nano_gemini_cli_core.utils import search_cache, llm_gateway
+
+def _fake_response(content):
+    response = mock.Mock()
+    response.dict.return_value = {"choices": [{"message": {"content": content}}]}
+    return response
+
+class TestWebSearchCache(unittest.TestCase):
+
+    def setUp(self):
+        """Point the default search cache at a temporary directory and fake the model call."""
+        self.cache_dir = tempfile.mkdtemp(prefix="web_search_cache_")
+        self.cache = search_cache.SearchCache(self.cache_dir)
+        cache_patcher = mock.patch.object(search_cache, "_default_cache", self.cache)
+        cache_patcher.start()
+        self.addCleanup(cache_patcher.stop)
+
+        # The fake provider has no rate limit to respect.
+        gateway = llm_gateway.LLMGateway(model_limits={web_search.SEARCH_MODEL: (1e9, 1e9)})
+        gateway_patcher = mock.patch.object(llm_gateway, "_default_gateway", gateway)
+        gateway_patcher.start()
+        self.addCleanup(gateway_patcher.stop)
+
+        self.completion = mock.Mock(side_effect=lambda **kwargs: _fake_response(f"Answer to {kwargs['messages'][0]['content']}"))
+        completion_patcher = mock.patch.object(web_search.litellm, "completion", self.completion)
+        completion_patcher.start()
+        self.addCleanup(completion_patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_repeat_query_is_cached(self):
+        """Test that a repeated query, differing only in case and whitespace, is served from the cache."""
+        first = web_search._google_web_search_impl("python asyncio gather")
+        second = web_search._google_web_search_impl("  Python   asyncio\tGATHER ")
+        self.assertEqual(self.completion.call_count, 1)
+        self.assertEqual(first["llm_content"], second["llm_content"])
+        self.assertEqual("Web search completed.", first["display_content"])
+        self.assertIn("cached", second["display_content"])
+        self.assertEqual(self.cache.stats()["memory_hits"], 1)
+
+    def test_disk_backend(self):
+        """Test that a fresh cache instance over the same directory reuses stored results."""
+        web_search._google_web_search_impl("disk query")
+        with mock.patch.object(search_cache, "_default_cache", search_cache.SearchCache(self.cache_dir)):
+            result = web_search._google_web_search_impl("disk query")
+        self.assertEqual(self.completion.call_count, 1)
+        self.assertIn("cached, disk", result["display_content"])
+
+    def test_ttl_expiry(self):
+        """Test that an expired entry triggers a new search."""
+        self.cache.ttl_s = 0
+        web_search._google_web_search_impl("expiring query")
+        web_search._google_web_search_impl("expiring query")
+        self.assertEqual(self.completion.call_count, 2)
+
+    def test_errors_are_not_cached(self):
+        """Test that failed and empty searches are retried rather than cached."""
+        self.completion.side_effect = RuntimeError("quota exceeded")
+        result = web_search._google_web_search_impl("failing query")
+        self.assertIn("quota exceeded", result["llm_content"])
+
+        self.completion.side_effect = lambda **kwargs: _fake_response("")
+        web_search._google_web_search_impl("failing query")
+        web_search._google_web_search_impl("failing query")
+        self.assertEqual(self.completion.call_count, 3)
+
+    def test_concurrent_queries_are_coalesced(self):
+        """Test that identical queries in flight at the same time share one request."""
+        release = threading.Event()
+        def slow_completion(**kwargs):
+            release.wait(5)
+            return _fake_response("Shared answer")
+        self.completion.side_effect = slow_completion
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(web_search._google_web_search_impl("same query"))) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        deadline = time.time() + 5
+        while self.cache.stats()["coalesced"] < 3 and time.time() < deadline:
+            time.sleep(0.01)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.completion.call_count, 1)
+        self.assertEqual(len(results), 4)
+        self.assertTrue(all("Shared answer" in r["llm_content"] for r in results))
+        stats = web_search.get_search_cache_stats()
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["coalesced"], 3)
+        self.assertAlmostEqual(stats["hit_rate"], 0.75)
+
+    def test_disk_write_failure_does_not_strand_waiters(self):
+        """Test that a failed disk write still answers coalesced callers and leaves no query in flight."""
+        release = threading.Event()
+        def slow_compute():
+            release.wait(5)
+            return "computed answer", True
+
+        results = []
+        with mock.patch.object(self.cache.store, "set", side_effect=OSError("No space left on device")):
+            leader = threading.Thread(target=lambda: results.append(self.cache.get_or_compute("full disk", slow_compute)))
+            leader.start()
+            while not self.cache._in_flight:
+                time.sleep(0.01)
+            follower = threading.Thread(target=lambda: results.append(self.cache.get_or_compute("full disk", slow_compute)))
+            follower.start()
+            while self.cache.stats()["coalesced"] < 1:
+                time.sleep(0.01)
+            release.set()
+            leader.join(5)
+            follower.join(5)
+
+        self.assertEqual(sorted(source for _, source in results), ["coalesced", "computed"])
+        self.assertEqual(self.cache._in_flight, {})
+        self.cache.clear_memory()
+        self.assertEqual(self.cache.get_or_compute("full disk", lambda: ("again", True)), ("again", "computed"))
+
+    def test_empty_query(self):
+        """Test that an empty query is rejected without a model call."""
+        result = web_search._google_web_search_impl("   ")
+        self.assertIn("cannot be empty", result["llm_content"])
+        self.completion.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
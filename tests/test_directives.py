@@ -0,0 +1,92 @@
+# tests/test_directives.py
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from aura_agent import config, directives, mailbox
+from aura_agent.core_logic import _load_tasks, _set_current_task, _write_task_queue
+from aura_agent.directives import _fast_read_task_queue, _fast_take_next_task, resolve_directive
+from aura_agent.task import Task
+
+class TestResolveDirective(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a temporary vault with a task queue and an empty mailbox."""
+        self.vault_dir = tempfile.mkdtemp(prefix="anamkore_vault_")
+        for patcher in (
+            mock.patch.object(config, "VAULT_PATH", self.vault_dir),
+            mock.patch.object(config, "FLEET_WORKER_ID", None),
+            mock.patch.object(mailbox, "_mailbox", None),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        _write_task_queue([Task("T1", "done", "Set up the vault"), Task("T2", "todo", "Write the parser", depends_on=["T1"])])
+
+    def tearDown(self):
+        shutil.rmtree(self.vault_dir, ignore_errors=True)
+
+    def _send_mail(self):
+        with open(os.path.join(self.vault_dir, config.MAILBOX_PATH), "w", encoding="utf-8") as f:
+            f.write("## Docs\nPlease add a task to write the README.\n")
+
+    def _current_task(self):
+        with open(os.path.join(self.vault_dir, "5-Current_Task.md"), encoding="utf-8") as f:
+            return f.read().strip()
+
+    def test_priority_order(self):
+        """Test that each rule wins over the ones below it."""
+        queue_summary = '[{"id": "T2", "status": "todo"}]'
+        self.assertEqual(resolve_directive(None, "").rule, "read_task_queue")
+        self.assertEqual(resolve_directive(None, queue_summary).rule, "take_next_task")
+        _set_current_task("T2: Write the parser")
+        self.assertEqual(resolve_directive(None, queue_summary).rule, "continue_task")
+        self.assertEqual(resolve_directive(None, "Error: the tool failed").rule, "fix_failure")
+        self.assertEqual(resolve_directive("do this", "Error: the tool failed").rule, "user_command")
+
+    def test_mail_comes_before_a_failure(self):
+        """Test that new mail is answered even when the last cycle failed."""
+        self._send_mail()
+        self.assertEqual(resolve_directive(None, "Error: the tool failed").rule, "mailbox")
+
+    def test_workers_leave_the_mailbox_alone(self):
+        """Test that a fleet worker does not take the mailbox directive."""
+        self._send_mail()
+        with mock.patch.object(config, "FLEET_WORKER_ID", "worker-1"):
+            self.assertEqual(resolve_directive(None, "").rule, "read_task_queue")
+
+    def test_deterministic_rules_have_fast_paths(self):
+        """Test that only the deterministic directives skip the LLM."""
+        self.assertIs(resolve_directive(None, "").fast_path, _fast_read_task_queue)
+        self.assertIs(resolve_directive(None, '{"id": "T2", "status": "todo"}').fast_path, _fast_take_next_task)
+        self.assertIsNone(resolve_directive(None, "Error: the tool failed").fast_path)
+
+    def test_fast_read_task_queue(self):
+        """Test that the read fast path returns the queue as JSON and summarizes it."""
+        planner_output, summary = _fast_read_task_queue()
+        self.assertEqual([task["id"] for task in json.loads(planner_output)], ["T1", "T2"])
+        self.assertEqual(summary, "Read the task queue: 2 task(s), 1 still to do, 1 ready to start.")
+
+    def test_fast_read_task_queue_without_a_queue(self):
+        """Test that a missing queue is reported as an error."""
+        os.remove(os.path.join(self.vault_dir, "3-Task_Queue.md"))
+        _, summary = _fast_read_task_queue()
+        self.assertTrue(summary.startswith("Error: Could not read the task queue."))
+
+    def test_fast_take_next_task(self):
+        """Test that the take fast path starts the ready task and makes it current."""
+        _, summary = _fast_take_next_task()
+        self.assertEqual(summary, "Started task T2: Write the parser")
+        self.assertEqual([t.status for t in _load_tasks()], ["done", "in_progress"])
+        self.assertEqual(self._current_task(), "T2: Write the parser")
+
+    def test_fast_take_next_task_reports_a_failed_status_change(self):
+        """Test that a task whose status could not be set is not made current."""
+        with mock.patch.object(directives, "_set_task_status", return_value="Error: the queue is locked."):
+            planner_output, summary = _fast_take_next_task()
+        self.assertEqual((planner_output, summary), ("Error: the queue is locked.", "Error: the queue is locked."))
+        self.assertFalse(os.path.exists(os.path.join(self.vault_dir, "5-Current_Task.md")))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+# tests/test_journal.py
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from aura_agent import config
+from aura_agent.core_logic import _get_latest_journal_entry, worker_context
+
+class TestLatestJournalEntry(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a temporary vault whose journal holds a single-process entry and a newer fleet worker's entry."""
+        self.vault_dir = tempfile.mkdtemp(prefix="anamkore_vault_")
+        for patcher in (mock.patch.object(config, "VAULT_PATH", self.vault_dir), mock.patch.object(config, "FLEET_WORKER_ID", None)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        journal_dir = os.path.join(self.vault_dir, "2-Journal")
+        os.makedirs(journal_dir)
+        for filename, content in (
+            ("2026-01-01_090000_000000_Main_cycle.md", "main entry"),
+            ("2026-01-01_100000_000000_@worker-1_Worker_cycle.md", "worker entry"),
+        ):
+            with open(os.path.join(journal_dir, filename), "w", encoding="utf-8") as f:
+                f.write(content)
+
+    def tearDown(self):
+        shutil.rmtree(self.vault_dir, ignore_errors=True)
+
+    def test_single_process_skips_worker_entries(self):
+        """Test that without a worker id the newest untagged entry is returned."""
+        self.assertEqual(_get_latest_journal_entry(), "main entry")
+
+    def test_worker_reads_its_own_entries(self):
+        """Test that a fleet worker only follows entries tagged with its id."""
+        with worker_context("worker-1"):
+            self.assertEqual(_get_latest_journal_entry(), "worker entry")
+
+if __name__ == '__main__':
+    unittest.main()
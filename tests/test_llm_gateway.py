@@ -0,0 +1,157 @@
+# tests/test_llm_gateway.py
+import asyncio
+import types
+import unittest
+from unittest import mock
+from aura_agent import config, llm_gateway
+from aura_agent.llm_gateway import LLMGateway
+
+def _event(kind, **fields):
+    return types.SimpleNamespace(type=kind, **fields)
+
+def _gateway(**kwargs):
+    kwargs.setdefault("max_in_flight", 4)
+    kwargs.setdefault("interactive_reserved", 0)
+    kwargs.setdefault("model_limits", {"m": (6000, 1e9), "b": (6000, 1e9)})
+    return LLMGateway(**kwargs)
+
+class TestStreamDeadlines(unittest.TestCase):
+
+    def setUp(self):
+        for patcher in (
+            mock.patch.object(config, "LLM_STREAM_FIRST_EVENT_TIMEOUT_S", 0.05),
+            mock.patch.object(config, "LLM_STREAM_IDLE_TIMEOUT_S", 0.05),
+            mock.patch.object(llm_gateway, "_backoff_s", lambda attempt: 0.0),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _collect(self, gateway, open_stream):
+        async def run():
+            return [event.type async for event in gateway.stream("m", open_stream, 100)]
+        return asyncio.run(run())
+
+    def test_stall_before_first_event_is_retried(self):
+        """Test that a stream with no first event in time is reopened."""
+        opened = []
+
+        async def open_stream():
+            opened.append(True)
+            if len(opened) == 1:
+                await asyncio.sleep(10)
+            yield _event("response.output_text.delta", delta="hi")
+            yield _event("response.completed", response=None)
+
+        gateway = _gateway()
+        self.assertEqual(self._collect(gateway, open_stream), ["response.output_text.delta", "response.completed"])
+        self.assertEqual(len(opened), 2)
+        self.assertEqual((gateway.stats["timeouts"], gateway.stats["retries"]), (1, 1))
+        self.assertEqual(gateway._in_flight, 0)
+
+    def test_stall_between_events_fails(self):
+        """Test that a stream stalling after its first event raises, releasing its slot and closing the provider stream."""
+        closed = []
+
+        async def open_stream():
+            try:
+                yield _event("response.output_text.delta", delta="hi")
+                await asyncio.sleep(10)
+                yield _event("response.completed", response=None)
+            finally:
+                closed.append(True)
+
+        gateway = _gateway()
+        with self.assertRaises(asyncio.TimeoutError):
+            self._collect(gateway, open_stream)
+        self.assertEqual(closed, [True])
+        self.assertEqual((gateway.stats["timeouts"], gateway.stats["failures"], gateway._in_flight), (1, 1, 0))
+
+    def test_early_close_settles_usage(self):
+        """Test that a stream closed early is charged for the prompt and the output streamed so far."""
+        async def open_stream():
+            for _ in range(100):
+                yield _event("response.output_text.delta", delta="abcd")
+
+        async def run(gateway):
+            events = gateway.stream("m", open_stream, 1000 + config.LLM_OUTPUT_TOKEN_ESTIMATE)
+            async for _ in events:
+                break
+            await events.aclose()
+
+        gateway = _gateway(model_limits={"m": (6000, 6000)})
+        bucket = gateway._buckets_for("m")[1]
+        before = bucket.tokens
+        asyncio.run(run(gateway))
+        self.assertAlmostEqual(before - bucket.tokens, 1001, delta=5)
+        self.assertEqual(gateway._in_flight, 0)
+
+class TestCallHedged(unittest.TestCase):
+
+    def setUp(self):
+        for patcher in (
+            mock.patch.object(config, "LLM_HEDGE_MIN_SAMPLES", 5),
+            mock.patch.object(config, "LLM_HEDGE_MIN_DELAY_S", 0.02),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.cancelled = []
+
+    def _gateway(self, **kwargs):
+        gateway = _gateway(hedging=True, **kwargs)
+        gateway.latency["m"].samples.extend([0.01] * 5)
+        return gateway
+
+    def _send(self, name, seconds):
+        """A fake provider request that answers `name` after `seconds`, noting if it is cancelled."""
+        async def send():
+            try:
+                await asyncio.sleep(seconds)
+            except asyncio.CancelledError:
+                self.cancelled.append(name)
+                raise
+            return types.SimpleNamespace(output=[name], usage=None)
+        return send
+
+    def _call(self, gateway, primary_s, backup_s):
+        async def run():
+            return await gateway.call_hedged("m", self._send("primary", primary_s), "b", self._send("backup", backup_s))
+        return asyncio.run(run()).output[0]
+
+    def test_hedge_fires_and_wins(self):
+        """Test that a call outlasting the model's p95 is hedged, and the faster backup's answer is returned."""
+        gateway = self._gateway()
+        self.assertEqual(self._call(gateway, 10, 0.01), "backup")
+        self.assertEqual((gateway.stats["hedges"], gateway.stats["hedges_won"]), (1, 1))
+        self.assertEqual(self.cancelled, ["primary"])
+        self.assertEqual(gateway._in_flight, 0)
+
+    def test_primary_wins_the_race(self):
+        """Test that a hedged primary answering first is returned, and the backup is cancelled."""
+        gateway = self._gateway()
+        self.assertEqual(self._call(gateway, 0.1, 10), "primary")
+        self.assertEqual((gateway.stats["hedges"], gateway.stats["hedges_won"]), (1, 0))
+        self.assertEqual(self.cancelled, ["backup"])
+
+    def test_hedge_skipped_without_a_free_slot(self):
+        """Test that no hedge is sent when it would have to queue for a slot."""
+        gateway = self._gateway(max_in_flight=1)
+        self.assertEqual(self._call(gateway, 0.1, 0.01), "primary")
+        self.assertEqual((gateway.stats["hedges"], gateway.stats["hedges_skipped"]), (0, 1))
+
+    def test_no_hedge_before_enough_samples(self):
+        """Test that calls are not hedged until the model has a trusted latency percentile."""
+        gateway = _gateway(hedging=True)
+        self.assertEqual(self._call(gateway, 0.1, 0.01), "primary")
+        self.assertEqual((gateway.stats["hedges"], gateway.stats["hedges_skipped"]), (0, 0))
+
+    def test_timeout_is_recorded_as_latency(self):
+        """Test that a call timing out is recorded in the histogram at the timeout."""
+        gateway = _gateway()
+        with mock.patch.object(config, "LLM_CALL_TIMEOUT_S", 0.02), mock.patch.object(config, "LLM_MAX_RETRIES", 0):
+            with self.assertRaises(asyncio.TimeoutError):
+                asyncio.run(gateway.call("m", self._send("primary", 10)))
+        self.assertEqual(list(gateway.latency["m"].samples), [0.02])
+        self.assertEqual(gateway.stats["timeouts"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
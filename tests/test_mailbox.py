@@ -0,0 +1,70 @@
+# tests/test_mailbox.py
+import asyncio
+import json
+import os
+import re
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from aura_agent import cognitive_step, config, mailbox
+from aura_agent.agentic_layer import anamkore_tools
+from aura_agent.core_logic import _load_tasks, _update_task_queue, _write_task_queue
+from aura_agent.directives import resolve_directive
+from aura_agent.task import Task, TaskModel
+
+class TestMailboxCycle(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a temporary vault with a task queue and one mailbox message."""
+        self.vault_dir = tempfile.mkdtemp(prefix="anamkore_vault_")
+        for patcher in (
+            mock.patch.object(config, "VAULT_PATH", self.vault_dir),
+            mock.patch.object(config, "FLEET_WORKER_ID", None),
+            mock.patch.object(mailbox, "_mailbox", None),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        os.makedirs(os.path.join(self.vault_dir, "journal"), exist_ok=True)
+        _write_task_queue([Task("T1", "done", "Set up the vault"), Task("T2", "todo", "Write the parser")])
+        with open(os.path.join(self.vault_dir, config.MAILBOX_PATH), "w", encoding="utf-8") as f:
+            f.write("## Docs\nPlease add a task to write the README.\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.vault_dir, ignore_errors=True)
+
+    def test_directive_names_only_planner_tools(self):
+        """Test that the mailbox directive only asks for tools the planner has, and carries the queue."""
+        directive = resolve_directive(None, "")
+        self.assertEqual(directive.rule, "mailbox")
+        self.assertEqual(len(directive.mailbox_ids), 1)
+        planner_tools = {tool.name for tool in anamkore_tools}
+        named = set(re.findall(r"`(\w+)`", directive.text))
+        self.assertIn("update_task_queue", named)
+        self.assertLessEqual(named, planner_tools)
+        self.assertIn('"id": "T2"', directive.text)
+        self.assertIn("Please add a task to write the README.", directive.text)
+
+    def test_mailbox_cycle(self):
+        """Test that a mailbox cycle can add a task with the queue it is given, and consumes the message."""
+        seen = {}
+
+        async def plan_and_synthesize(directive, latest_journal_summary, run_config):
+            # Stands in for the planner: one update_task_queue call built from the directive's queue.
+            seen["directive"] = directive
+            queue_json = directive.split("--- Current Task Queue ---\n", 1)[1].split("\n\n", 1)[0]
+            tasks = [TaskModel(**task) for task in json.loads(queue_json)]
+            tasks.append(TaskModel(id="T3", status="todo", description="Write the README"))
+            return _update_task_queue(tasks), "Added T3 to write the README."
+
+        with mock.patch.object(cognitive_step, "_plan_and_synthesize", plan_and_synthesize), \
+             mock.patch.object(cognitive_step, "submit_trace"):
+            asyncio.run(cognitive_step.perform_cognitive_step())
+
+        self.assertIn("mailbox", seen["directive"])
+        self.assertEqual([(t.id, t.status) for t in _load_tasks()], [("T1", "done"), ("T2", "todo"), ("T3", "todo")])
+        self.assertEqual(mailbox.get_mailbox().pending(), [])
+        self.assertNotEqual(resolve_directive(None, "").rule, "mailbox")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+# tests/test_reflection_worker.py
+import asyncio
+import json
+import os
+import re
+import shutil
+import tempfile
+import types
+import unittest
+from unittest import mock
+from aura_agent import config, reflection_worker
+from aura_agent.core_logic import REFLECTION_INDEX_PATH
+from aura_agent.reflection_worker import ReflectionWorker, start_reflection_worker, stop_reflection_worker, submit_trace
+from aura_agent.task import CycleReflection, ReflectionBatch
+
+def _reflection(cycle_id):
+    return CycleReflection(
+        cycle_id=cycle_id, summary=f"Ran {cycle_id}.", value_score=2, value_type="Routine", key_learning="N/A",
+    )
+
+class TestReflectionWorker(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a temporary vault and a stand-in reflector that scores every trace it is shown."""
+        self.vault_dir = tempfile.mkdtemp(prefix="anamkore_vault_")
+        self.prompts = []
+        for patcher in (
+            mock.patch.object(config, "VAULT_PATH", self.vault_dir),
+            mock.patch.object(reflection_worker, "REFLECTION_BATCH_WINDOW_S", 0.05),
+            mock.patch.object(reflection_worker, "_worker", None),
+            mock.patch.object(reflection_worker.Runner, "run", self._run_reflector),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.vault_dir, ignore_errors=True)
+
+    async def _run_reflector(self, agent, prompt, run_config=None):
+        self.prompts.append(prompt)
+        cycle_ids = [re.search(r'"cycle_id": "([^"]+)"', trace).group(1) for trace in prompt.split("--- Trace ")[1:]]
+        return types.SimpleNamespace(final_output=ReflectionBatch(reflections=[_reflection(i) for i in cycle_ids]))
+
+    def _index(self):
+        with open(os.path.join(self.vault_dir, REFLECTION_INDEX_PATH), encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    def test_traces_are_batched(self):
+        """Test that traces queued together are reflected on in one call, up to the batch size."""
+        async def run():
+            worker = ReflectionWorker()
+            for i in range(7):
+                worker.submit({"cycle_id": f"c{i}"})
+            worker.start()
+            self.assertTrue(await worker.drain(5))
+            await worker.stop()
+            return worker
+
+        with mock.patch.object(reflection_worker, "REFLECTION_BATCH_SIZE", 5):
+            worker = asyncio.run(run())
+        self.assertEqual(len(self.prompts), 2)
+        self.assertEqual((worker.stats["batches"], worker.stats["reflections"]), (2, 7))
+        # The second batch sees the last trace of the first as context only.
+        self.assertIn("Previous Cycle (context only", self.prompts[1])
+
+    def test_reflections_are_appended_to_the_index(self):
+        """Test that each batch appends one JSON line per reflection, keeping earlier lines."""
+        async def run():
+            worker = ReflectionWorker()
+            worker.start()
+            for i in range(2):
+                worker.submit({"cycle_id": f"c{i}"})
+                self.assertTrue(await worker.drain(5))
+            await worker.stop()
+
+        asyncio.run(run())
+        index = self._index()
+        self.assertEqual([record["cycle_id"] for record in index], ["c0", "c1"])
+        self.assertIn("reflected_at", index[0])
+
+    def test_unknown_cycle_ids_are_dropped(self):
+        """Test that reflections for cycles not in the batch are not indexed."""
+        async def stray_reflector(agent, prompt, run_config=None):
+            return types.SimpleNamespace(final_output=ReflectionBatch(reflections=[_reflection("c0"), _reflection("other")]))
+
+        async def run():
+            worker = ReflectionWorker()
+            worker.submit({"cycle_id": "c0"})
+            worker.start()
+            await worker.drain(5)
+            await worker.stop()
+
+        with mock.patch.object(reflection_worker.Runner, "run", stray_reflector):
+            asyncio.run(run())
+        self.assertEqual([record["cycle_id"] for record in self._index()], ["c0"])
+
+    def test_shutdown_drains_pending_traces(self):
+        """Test that stopping the worker first reflects on every trace still queued."""
+        async def run():
+            start_reflection_worker()
+            for i in range(3):
+                self.assertTrue(submit_trace({"cycle_id": f"c{i}"}))
+            await stop_reflection_worker(timeout=5)
+            self.assertFalse(submit_trace({"cycle_id": "late"}))
+
+        asyncio.run(run())
+        self.assertEqual([record["cycle_id"] for record in self._index()], ["c0", "c1", "c2"])
+
+    def test_failed_batch_does_not_stop_the_worker(self):
+        """Test that a failing reflector call is counted and the next batch still runs."""
+        calls = []
+
+        async def flaky_reflector(agent, prompt, run_config=None):
+            calls.append(prompt)
+            if len(calls) == 1:
+                raise RuntimeError("provider error")
+            return await self._run_reflector(agent, prompt, run_config)
+
+        async def run():
+            worker = ReflectionWorker()
+            worker.start()
+            for i in range(2):
+                worker.submit({"cycle_id": f"c{i}"})
+                await worker.drain(5)
+            await worker.stop()
+            return worker
+
+        with mock.patch.object(reflection_worker.Runner, "run", flaky_reflector):
+            worker = asyncio.run(run())
+        self.assertEqual(worker.stats["failed_batches"], 1)
+        self.assertEqual([record["cycle_id"] for record in self._index()], ["c1"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+# tests/test_scheduler.py
+import asyncio
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from aura_agent import cognitive_step, config
+from aura_agent.core_logic import (
+    _current_task_path, _load_tasks, _read_file, _set_task_status, _update_task_queue, _write_task_queue, current_worker_id,
+)
+from aura_agent.scheduler import DagScheduler
+from aura_agent.task import Task, TaskModel
+
+class TestDagScheduler(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a temporary vault; cycles are replaced by `self.work`, called with the worker's current task id."""
+        self.vault_dir = tempfile.mkdtemp(prefix="anamkore_vault_")
+        for patcher in (
+            mock.patch.object(config, "VAULT_PATH", self.vault_dir),
+            mock.patch.object(config, "FLEET_WORKER_ID", None),
+            mock.patch.object(cognitive_step, "perform_cognitive_step", self._cycle),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.cycles = []
+        self.running = set()
+        self.max_running = 0
+        self.work = self._finish
+
+    def tearDown(self):
+        shutil.rmtree(self.vault_dir, ignore_errors=True)
+
+    async def _cycle(self, user_command=None):
+        task_id = _read_file(_current_task_path()).split(":", 1)[0]
+        self.cycles.append((current_worker_id(), task_id))
+        self.running.add(task_id)
+        self.max_running = max(self.max_running, len(self.running))
+        try:
+            await asyncio.sleep(0.01)
+            self.work(task_id)
+        finally:
+            self.running.discard(task_id)
+
+    def _finish(self, task_id):
+        _set_task_status(task_id, "done")
+
+    def _run(self, workers, max_cycles_per_task=None):
+        scheduler = DagScheduler(workers, max_cycles_per_task)
+        with mock.patch("builtins.print"):
+            asyncio.run(scheduler.run())
+        return scheduler
+
+    def _statuses(self):
+        return {t.id: t.status for t in _load_tasks()}
+
+    def test_dispatches_ready_tasks_concurrently(self):
+        """Test that independent tasks run at once and a dependent task only after both."""
+        _write_task_queue([Task("T1", "todo", "a"), Task("T2", "todo", "b"), Task("T3", "todo", "c", depends_on=["T1", "T2"])])
+        scheduler = self._run(workers=2)
+        self.assertEqual(self.max_running, 2)
+        self.assertEqual([task_id for _, task_id in self.cycles], ["T1", "T2", "T3"])
+        self.assertEqual({worker for worker, _ in self.cycles[:2]}, {"worker-1", "worker-2"})
+        self.assertEqual(self._statuses(), {"T1": "done", "T2": "done", "T3": "done"})
+        self.assertEqual(scheduler.cycles, 3)
+        self.assertIn("3 task(s) done, 0 failed", scheduler.format_stats())
+
+    def test_gives_up_after_max_cycles(self):
+        """Test that a task not done within its cycle budget is failed and its dependents stay blocked."""
+        _write_task_queue([Task("T1", "todo", "a"), Task("T2", "todo", "b", depends_on=["T1"])])
+        self.work = lambda task_id: None
+        scheduler = self._run(workers=2, max_cycles_per_task=3)
+        self.assertEqual(self.cycles, [("worker-1", "T1")] * 3)
+        self.assertEqual(self._statuses(), {"T1": "failed", "T2": "todo"})
+        self.assertEqual(scheduler.graph.blocked(), {"T2": ["T1"]})
+        self.assertIn("Blocked: T2 waits on T1.", scheduler.format_stats())
+
+    def test_runs_tasks_the_planner_adds(self):
+        """Test that a task added to the queue during a cycle is picked up once its dependency is done."""
+        _write_task_queue([Task("T1", "todo", "a")])
+
+        def add_follow_up(task_id):
+            if task_id == "T1":
+                _update_task_queue([TaskModel(id="T2", status="todo", description="b", depends_on=["T1"])])
+            self._finish(task_id)
+
+        self.work = add_follow_up
+        self._run(workers=2)
+        self.assertEqual([task_id for _, task_id in self.cycles], ["T1", "T2"])
+        self.assertEqual(self._statuses(), {"T1": "done", "T2": "done"})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+# tests/test_task_claims.py
+import asyncio
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from aura_agent import config, fleet, task_claims
+from aura_agent.core_logic import _apply_task_update
+from aura_agent.task import Task, TaskModel
+from aura_agent.task_claims import TaskClaims
+
+class TestTaskClaims(unittest.TestCase):
+
+    def setUp(self):
+        """Point the vault at a temporary directory shared by two workers' claim tables."""
+        self.vault_dir = tempfile.mkdtemp(prefix="anamkore_vault_")
+        patcher = mock.patch.object(config, "VAULT_PATH", self.vault_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.now = 1000.0
+        clock = mock.patch.object(task_claims.time, "time", lambda: self.now)
+        clock.start()
+        self.addCleanup(clock.stop)
+        self.first = TaskClaims(lease_s=300)
+        self.second = TaskClaims(lease_s=300)
+
+    def tearDown(self):
+        self.first.close()
+        self.second.close()
+        shutil.rmtree(self.vault_dir, ignore_errors=True)
+
+    def test_claims_share_the_vault_database(self):
+        """Test that both instances use the claims database under the vault's fleet directory."""
+        self.assertEqual(self.first.path, os.path.join(self.vault_dir, config.FLEET_DIR, task_claims.CLAIMS_DB))
+        self.assertEqual(self.first.path, self.second.path)
+
+    def test_claim_next_is_exclusive(self):
+        """Test that a task claimed by one worker is skipped by the other."""
+        self.assertEqual(self.first.claim_next("w1", ["T1", "T2"]), "T1")
+        self.assertEqual(self.second.claim_next("w2", ["T1", "T2"]), "T2")
+        self.assertIsNone(self.second.claim_next("w3", ["T1", "T2"]))
+        self.assertEqual(self.second.active_claims(), {"T1": "w1", "T2": "w2"})
+
+    def test_own_claim_can_be_taken_again(self):
+        """Test that a worker asking again gets back the task it already holds."""
+        self.assertEqual(self.first.claim_next("w1", ["T1"]), "T1")
+        self.assertEqual(self.second.claim_next("w1", ["T1"]), "T1")
+
+    def test_expired_lease_is_taken_over(self):
+        """Test that once a lease expires another worker can claim the task."""
+        self.first.claim_next("w1", ["T1"])
+        self.now += 299
+        self.assertIsNone(self.second.claim_next("w2", ["T1"]))
+        self.now += 2
+        self.assertEqual(self.first.active_claims(), {})
+        self.assertEqual(self.second.claim_next("w2", ["T1"]), "T1")
+        self.assertEqual(self.first.active_claims(), {"T1": "w2"})
+
+    def test_renew_extends_the_lease(self):
+        """Test that a renewed claim outlives its original lease."""
+        self.first.claim_next("w1", ["T1"])
+        self.now += 200
+        self.assertTrue(self.first.renew("w1", "T1"))
+        self.now += 200
+        self.assertIsNone(self.second.claim_next("w2", ["T1"]))
+
+    def test_renew_after_loss(self):
+        """Test that renewing a claim taken over by another worker fails."""
+        self.first.claim_next("w1", ["T1"])
+        self.now += 301
+        self.second.claim_next("w2", ["T1"])
+        self.assertFalse(self.first.renew("w1", "T1"))
+        self.assertFalse(self.first.complete("w1", "T1"))
+        self.assertTrue(self.second.renew("w2", "T1"))
+
+    def test_complete_and_release(self):
+        """Test that completed and released claims no longer hold their tasks."""
+        self.first.claim_next("w1", ["T1", "T2"])
+        self.first.claim_next("w1", ["T2"])
+        self.first.heartbeat("w1")
+        self.assertTrue(self.first.complete("w1", "T1"))
+        self.first.release("w1", "T2")
+        self.assertEqual(self.second.active_claims(), {})
+        stats = self.second.stats()
+        self.assertEqual(stats["tasks_done"], 1)
+        self.assertEqual(stats["workers"][0]["tasks_done"], 1)
+        # A completed claim on a task that is todo again means it was reopened.
+        self.assertEqual(self.second.claim_next("w2", ["T1"]), "T1")
+
+    def test_lease_is_renewed_during_a_long_cycle(self):
+        """Test that the in-cycle renewer keeps a claim alive past its original lease."""
+        self.first.claim_next("w1", ["T1"])
+
+        async def long_cycle():
+            renewer = asyncio.create_task(fleet._renew_during_cycle(self.first, "w1"))
+            for _ in range(3):
+                self.now += 200
+                await asyncio.sleep(0.02)
+            renewer.cancel()
+
+        with mock.patch.object(config, "FLEET_RENEW_INTERVAL_S", 0.01), mock.patch.object(fleet, "_current_task_id", return_value="T1"):
+            asyncio.run(long_cycle())
+        self.assertIsNone(self.second.claim_next("w2", ["T1"]))
+        self.assertEqual(self.second.active_claims(), {"T1": "w1"})
+
+class TestApplyTaskUpdate(unittest.TestCase):
+
+    def test_merge_does_not_reopen_finished_tasks(self):
+        """Test that a stale update cannot move a task back from done, failed or in progress."""
+        on_disk = [
+            Task("T1", "done", "First"),
+            Task("T2", "failed", "Second"),
+            Task("T3", "in_progress", "Third"),
+            Task("T4", "todo", "Fourth"),
+        ]
+        stale = [TaskModel(id=t.id, status="todo", description=t.description) for t in on_disk]
+        merged = _apply_task_update(stale, on_disk, merge=True)
+        self.assertEqual([t.status for t in merged], ["done", "failed", "in_progress", "todo"])
+
+    def test_merge_keeps_order_and_tasks(self):
+        """Test that a merge keeps the queue's order, drops no task and appends new ones."""
+        on_disk = [Task("T1", "todo", "First", depends_on=["T0"], priority=2), Task("T2", "todo", "Second")]
+        update = [
+            TaskModel(id="T3", status="todo", description="Third"),
+            TaskModel(id="T1", status="done", description="First"),
+        ]
+        merged = _apply_task_update(update, on_disk, merge=True)
+        self.assertEqual([t.id for t in merged], ["T1", "T2", "T3"])
+        self.assertEqual(merged[0].status, "done")
+        self.assertEqual((merged[0].depends_on, merged[0].priority), (["T0"], 2))
+
+    def test_without_merge_the_update_replaces_the_queue(self):
+        """Test that a single worker's update is taken as the whole queue, status changes included."""
+        on_disk = [Task("T1", "done", "First"), Task("T2", "todo", "Second")]
+        update = [TaskModel(id="T1", status="todo", description="First again")]
+        replaced = _apply_task_update(update, on_disk, merge=False)
+        self.assertEqual([(t.id, t.status) for t in replaced], [("T1", "todo")])
+
+if __name__ == '__main__':
+    unittest.main()
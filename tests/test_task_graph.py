@@ -0,0 +1,146 @@
+# tests/test_task_graph.py
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from aura_agent import config
+from aura_agent.core_logic import _load_tasks, _write_task_queue
+from aura_agent.directives import _fast_take_next_task
+from aura_agent.task import Task
+from aura_agent.task_graph import TaskGraph, critical_path, ready_tasks
+
+def _ids(tasks):
+    return [t.id for t in tasks]
+
+class TestTaskGraph(unittest.TestCase):
+
+    def _drain(self, graph):
+        taken = []
+        while (task := graph.pop_ready()) is not None:
+            taken.append(task.id)
+        return taken
+
+    def test_ready_order(self):
+        """Test that ready tasks come out by priority, then queue order, and only once."""
+        graph = TaskGraph([
+            Task("T1", "todo", "a"),
+            Task("T2", "todo", "b", priority=2),
+            Task("T3", "todo", "c", depends_on=["T1"]),
+            Task("T4", "done", "d"),
+        ])
+        self.assertEqual(self._drain(graph), ["T2", "T1"])
+        self.assertEqual(graph.mark_done("T1"), ["T3"])
+        self.assertEqual(self._drain(graph), ["T3"])
+
+    def test_late_added_dependency(self):
+        """Test that a task waits on a dependency the queue only lists later, and is released when it is done."""
+        graph = TaskGraph([Task("T2", "todo", "b", depends_on=["T1"])])
+        self.assertIsNone(graph.pop_ready())
+        self.assertEqual(graph.blocked(), {"T2": ["T1"]})
+
+        graph.sync([Task("T2", "todo", "b", depends_on=["T1"]), Task("T1", "todo", "a")])
+        self.assertEqual(self._drain(graph), ["T1"])
+        self.assertEqual(graph.mark_done("T1"), ["T2"])
+        self.assertEqual(self._drain(graph), ["T2"])
+
+    def test_late_added_done_dependency(self):
+        """Test that a dependency first seen already done releases the tasks counted against it."""
+        graph = TaskGraph([Task("T2", "todo", "b", depends_on=["T1"]), Task("T3", "todo", "c", depends_on=["T1", "T2"])])
+        graph.sync([Task("T1", "done", "a"), Task("T4", "todo", "d", depends_on=["T1"])])
+        self.assertEqual(self._drain(graph), ["T2", "T4"])
+        self.assertEqual(graph.mark_done("T2"), ["T3"])
+
+    def test_failed_dependency_blocks_dependents(self):
+        """Test that the dependents of a failed task never become ready and are reported as blocked."""
+        graph = TaskGraph([Task("T1", "todo", "a"), Task("T2", "todo", "b", depends_on=["T1"])])
+        self.assertEqual(self._drain(graph), ["T1"])
+        graph.mark_failed("T1")
+        self.assertIsNone(graph.pop_ready())
+        self.assertEqual(graph.blocked(), {"T2": ["T1"]})
+
+    def test_failure_synced_from_the_queue(self):
+        """Test that a task failed outside the graph blocks its dependents too."""
+        graph = TaskGraph([Task("T1", "todo", "a"), Task("T2", "todo", "b", depends_on=["T1"])])
+        graph.sync([Task("T1", "failed", "a"), Task("T2", "todo", "b", depends_on=["T1"])])
+        self.assertEqual(self._drain(graph), [])
+        self.assertEqual(graph.blocked(), {"T2": ["T1"]})
+
+    def test_duplicate_depends_on(self):
+        """Test that a dependency listed twice is released by finishing it once."""
+        graph = TaskGraph([Task("T1", "todo", "a"), Task("T2", "todo", "b", depends_on=["T1", "T1"])])
+        self.assertEqual(graph.blocked(), {"T2": ["T1"]})
+        self.assertEqual(self._drain(graph), ["T1"])
+        self.assertEqual(graph.mark_done("T1"), ["T2"])
+        self.assertEqual(self._drain(graph), ["T2"])
+
+    def test_duplicate_depends_on_added_late(self):
+        """Test that a duplicated dependency first seen already done leaves no count behind."""
+        graph = TaskGraph([Task("T2", "todo", "b", depends_on=["T1", "T1"])])
+        graph.sync([Task("T1", "done", "a")])
+        self.assertEqual(self._drain(graph), ["T2"])
+        self.assertEqual(graph.blocked(), {})
+
+    def test_ready_tasks_matches_the_graph(self):
+        """Test that the one-shot ready_tasks agrees with a fresh graph."""
+        tasks = [
+            Task("T1", "done", "a"),
+            Task("T2", "in_progress", "b", depends_on=["T1"]),
+            Task("T3", "todo", "c", depends_on=["T1"], priority=1),
+            Task("T4", "todo", "d", depends_on=["T2"]),
+        ]
+        statuses = ("todo", "in_progress")
+        self.assertEqual(_ids(ready_tasks(tasks, statuses)), ["T3", "T2"])
+        self.assertEqual(self._drain(TaskGraph(tasks, ready_statuses=statuses)), ["T3", "T2"])
+
+class TestCriticalPath(unittest.TestCase):
+
+    def test_diamond(self):
+        """Test that the longest chain through a diamond-shaped DAG is found."""
+        tasks = [
+            Task("T1", "todo", "a"),
+            Task("T2", "todo", "b", depends_on=["T1"]),
+            Task("T3", "todo", "c", depends_on=["T1"]),
+            Task("T4", "todo", "d", depends_on=["T2", "T3"]),
+            Task("T5", "todo", "e"),
+        ]
+        durations = {"T1": 1.0, "T2": 5.0, "T3": 2.0, "T4": 1.0, "T5": 6.0}
+        self.assertEqual(critical_path(tasks, durations), (7.0, ["T1", "T2", "T4"]))
+
+    def test_missing_durations_and_dependencies(self):
+        """Test that tasks without a duration count 0 and unknown dependencies are ignored."""
+        tasks = [Task("T1", "todo", "a", depends_on=["T9"]), Task("T2", "todo", "b", depends_on=["T1"])]
+        self.assertEqual(critical_path(tasks, {"T2": 3.0}), (3.0, ["T1", "T2"]))
+        self.assertEqual(critical_path([], {}), (0.0, []))
+
+class TestTakeNextTask(unittest.TestCase):
+
+    def setUp(self):
+        self.vault_dir = tempfile.mkdtemp(prefix="anamkore_vault_")
+        for patcher in (mock.patch.object(config, "VAULT_PATH", self.vault_dir), mock.patch.object(config, "FLEET_WORKER_ID", None)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.vault_dir, ignore_errors=True)
+
+    def _current_task(self):
+        with open(os.path.join(self.vault_dir, "5-Current_Task.md"), encoding="utf-8") as f:
+            return f.read().strip()
+
+    def test_in_progress_task_is_taken_up_again(self):
+        """Test that a task left in progress with no current task is started again."""
+        _write_task_queue([Task("T1", "done", "a"), Task("T2", "in_progress", "b"), Task("T3", "todo", "c")])
+        _, summary = _fast_take_next_task()
+        self.assertEqual(summary, "Started task T2: b")
+        self.assertEqual(self._current_task(), "T2: b")
+
+    def test_waiting_tasks_are_not_started(self):
+        """Test that nothing is started while every unfinished task waits on a dependency."""
+        _write_task_queue([Task("T1", "failed", "a"), Task("T2", "todo", "b", depends_on=["T1"])])
+        _, summary = _fast_take_next_task()
+        self.assertIn("1 wait on unfinished dependencies", summary)
+        self.assertEqual([t.status for t in _load_tasks()], ["failed", "todo"])
+
+if __name__ == '__main__':
+    unittest.main()
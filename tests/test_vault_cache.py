@@ -0,0 +1,102 @@
+# tests/test_vault_cache.py
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from aura_agent import config, core_logic
+from aura_agent.core_logic import (
+    _cache_vault_file, _invalidate_vault_cache, _load_tasks, _read_file, _set_task_status,
+    _vault_generation, _write_task_queue, worker_context,
+)
+from aura_agent.task import Task
+
+class TestVaultCache(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a temporary vault and an empty read cache."""
+        self.vault_dir = tempfile.mkdtemp(prefix="anamkore_vault_")
+        for patcher in (
+            mock.patch.object(config, "VAULT_PATH", self.vault_dir),
+            mock.patch.object(config, "FLEET_WORKER_ID", None),
+            mock.patch.object(core_logic, "VAULT_CACHE_STATS", {"hits": 0, "misses": 0}),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        _invalidate_vault_cache()
+        self.addCleanup(_invalidate_vault_cache)
+
+    def tearDown(self):
+        shutil.rmtree(self.vault_dir, ignore_errors=True)
+
+    def _put(self, name, content, mtime_ns=None):
+        """Writes a vault file behind the cache's back, optionally pinning its mtime."""
+        path = os.path.join(self.vault_dir, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+        if mtime_ns is not None:
+            os.utime(path, ns=(mtime_ns, mtime_ns))
+        return path
+
+    def test_hit_and_miss(self):
+        """Test that an unchanged file is read from disk once and then served from the cache."""
+        self._put("a.md", "alpha")
+        self.assertEqual(_read_file("a.md"), "alpha")
+        self.assertEqual(_read_file("a.md"), "alpha")
+        self.assertEqual(core_logic.VAULT_CACHE_STATS, {"hits": 1, "misses": 1})
+
+    def test_change_in_mtime_or_size_invalidates(self):
+        """Test that entries are keyed on (mtime_ns, size): a change to either is seen, an identical pair is not."""
+        self._put("a.md", "alpha", mtime_ns=10**18)
+        _read_file("a.md")
+        self._put("a.md", "alpha, longer", mtime_ns=10**18)
+        self.assertEqual(_read_file("a.md"), "alpha, longer")
+        self._put("a.md", "omega, longer", mtime_ns=10**18 + 1)
+        self.assertEqual(_read_file("a.md"), "omega, longer")
+        # Same size within the same mtime tick: only the key's limits stop this being seen.
+        self._put("a.md", "gamma, longer", mtime_ns=10**18 + 1)
+        self.assertEqual(_read_file("a.md"), "omega, longer")
+        self.assertEqual(_read_file("a.md", cached=False), "gamma, longer")
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted once the cache exceeds its byte budget."""
+        for name in ("a.md", "b.md", "c.md"):
+            self._put(name, "1234")
+        with mock.patch.object(core_logic, "VAULT_CACHE_MAX_BYTES", 10):
+            _read_file("a.md")
+            _read_file("b.md")
+            _read_file("a.md")
+            _read_file("c.md")
+        cached = [os.path.basename(path) for path in core_logic._vault_cache]
+        self.assertEqual(cached, ["a.md", "c.md"])
+
+    def test_invalidation_during_a_read_is_not_lost(self):
+        """Test that a read does not cache what it read if the path was invalidated since the read began."""
+        path = self._put("a.md", "alpha")
+        generation = _vault_generation(path)
+        _invalidate_vault_cache(path)
+        _cache_vault_file(path, 1, 5, "alpha", generation)
+        self.assertNotIn(path, core_logic._vault_cache)
+
+        generation = _vault_generation(path)
+        _invalidate_vault_cache()
+        _cache_vault_file(path, 1, 5, "alpha", generation)
+        self.assertNotIn(path, core_logic._vault_cache)
+
+    def test_queue_update_under_the_lock_reads_from_disk(self):
+        """Test that a worker's status change is applied to the queue on disk, not to a same-size stale copy."""
+        _write_task_queue([Task("T1", "todo", "a"), Task("T2", "todo", "b")])
+        queue_path = os.path.join(self.vault_dir, "3-Task_Queue.md")
+        os.utime(queue_path, ns=(10**18, 10**18))
+        self.assertEqual([t.status for t in _load_tasks()], ["todo", "todo"])
+        # Another worker starts T1 within the same mtime tick; the file keeps its size.
+        with open(queue_path, encoding="utf-8") as f:
+            flipped = f.read().replace("[ ] T1", "[~] T1")
+        self._put("3-Task_Queue.md", flipped, mtime_ns=10**18)
+
+        with worker_context("worker-2"):
+            self.assertTrue(_set_task_status("T2", "in_progress").startswith("Success"))
+        self.assertEqual([t.status for t in _load_tasks()], ["in_progress", "in_progress"])
+
+if __name__ == '__main__':
+    unittest.main()